@@ -149,7 +149,8 @@ def test_append_interfaces_count_with_type_specified(interfaces, dirs_count, vla
             data[dir] = []
         expected_data = copy.deepcopy(data)
         mock_db = MagicMock()
-        mock_db.keys.return_value = ["DHCPV4_COUNTER_TABLE:" + vlan_interface + ":" + intf for intf in interfaces]
+        mock_db.get_redis_client.return_value.scan.return_value = (
+            0, ["DHCPV4_COUNTER_TABLE:" + vlan_interface + ":" + intf for intf in interfaces])
         show_dhcp_relay.append_interfaces_count_with_type_specified(data, mock_db, list(dirs_count.keys()),
                                                                     vlan_interface, "", dummy_summary, vlan_members,
                                                                     mgmt_intfs)
@@ -236,7 +237,8 @@ def test_append_interfaces_count_without_type_specified(types_count):
 
     mock_db = MagicMock()
     interfaces = ["Ethernet0", "Ethernet1"]
-    mock_db.keys.return_value = ["DHCPV4_COUNTER_TABLE:Vlan1000:{}".format(intf) for intf in interfaces]
+    mock_db.get_redis_client.return_value.scan.return_value = (
+        0, ["DHCPV4_COUNTER_TABLE:Vlan1000:{}".format(intf) for intf in interfaces])
     dummy_summary = "dummy"
     data = {
         dummy_summary: [],
@@ -287,6 +289,41 @@ def test_generate_output_without_type_specified():
         assert expected_output == output
 
 
+def test_scan_keys():
+    mock_db = MagicMock()
+    mock_client = mock_db.get_redis_client.return_value
+    mock_client.scan.side_effect = [
+        (5, ["COUNTERS_DHCPV4:Vlan1000:TX"]),
+        (7, []),
+        (0, ["COUNTERS_DHCPV4:Vlan1000:RX", "COUNTERS_DHCPV4:Vlan1000:TX"])
+    ]
+    result = show_dhcp_relay.scan_keys(mock_db, "COUNTERS_DB", "COUNTERS_DHCPV4:*")
+    assert result == ["COUNTERS_DHCPV4:Vlan1000:TX", "COUNTERS_DHCPV4:Vlan1000:RX"]
+    mock_db.get_redis_client.assert_called_once_with("COUNTERS_DB")
+    mock_client.scan.assert_has_calls([
+        call(0, "COUNTERS_DHCPV4:*", show_dhcp_relay.SCAN_COUNT),
+        call(5, "COUNTERS_DHCPV4:*", show_dhcp_relay.SCAN_COUNT),
+        call(7, "COUNTERS_DHCPV4:*", show_dhcp_relay.SCAN_COUNT)
+    ])
+
+
+@pytest.mark.parametrize("vlan_intf", ["", "Vlan1000"])
+def test_dhcpv4_counter_clear_table(vlan_intf):
+    keys = ["COUNTERS_DHCPV4:Vlan1000:TX", "COUNTERS_DHCPV4:Vlan2000:RX"]
+    with patch.object(show_dhcp_relay, "SonicV2Connector") as mock_connector, \
+         patch.object(show_dhcp_relay, "scan_keys", return_value=keys) as mock_scan_keys:
+        mock_db = mock_connector.return_value
+        mock_db.get_db_separator.return_value = ":"
+        counter = show_dhcp_relay.DHCPv4_Counter()
+        counter.clear_table(None, None, vlan_intf)
+        mock_scan_keys.assert_called_once_with(mock_db, mock_db.COUNTERS_DB, "COUNTERS_DHCPV4:*")
+        expected_keys = keys if not vlan_intf else keys[:1]
+        assert mock_db.hmset.call_args_list == [
+            call(mock_db.COUNTERS_DB, key, {msg: "0" for msg in show_dhcp_relay.dhcpv4_messages})
+            for key in expected_keys
+        ]
+
+
 def test_get_mgmt_intfs():
     mock_db = MagicMock()
     mock_db.keys.return_value = [
@@ -304,14 +341,15 @@ def test_get_mgmt_intfs():
 ])
 def test_get_vlans_from_counters_db(vlan, expected_result):
     mock_db = MagicMock()
-    mock_db.keys.return_value = [
+    mock_db.get_redis_client.return_value.scan.return_value = (0, [
         "DHCPV4_COUNTER_TABLE:Vlan1000",
         "DHCPV4_COUNTER_TABLE:Vlan100",
         "DHCPV4_COUNTER_TABLE:Vlan1000:Ethernet0",
         "DHCPV4_COUNTER_TABLE:Vlan2000"
-    ]
+    ])
     result = show_dhcp_relay.get_vlans_from_counters_db(vlan, mock_db)
     assert result == expected_result
+    assert not mock_db.keys.called
 
 
 def test_print_dhcpv4_relay_counter_data_with_type_specified():
@@ -44,9 +44,26 @@ VLAN_MEMBER_TABLE_PREFIX = "VLAN_MEMBER"
 COUNTERS_DB_SEPRATOR = ":"
 CONFIG_DB_SEPRATOR = "|"
 MGMT_PORT_TABLE = "MGMT_PORT"
+# Number of keys redis checks in each SCAN iteration
+SCAN_COUNT = 1000
 config_db = ConfigDBConnector()
 
 
+def scan_keys(db, db_name, pattern):
+    """
+    Get keys match pattern by SCAN, unlike KEYS it doesn't block redis while walking the whole db
+    """
+    client = db.get_redis_client(db_name)
+    keys = {}
+    cursor = 0
+    while True:
+        cursor, part_keys = client.scan(cursor, pattern, SCAN_COUNT)
+        # SCAN may return a key more than once
+        keys.update(dict.fromkeys(part_keys))
+        if int(cursor) == 0:
+            return list(keys)
+
+
 def check_sonic_dhcpv4_relay_flag():
     if config_db is None:
         return
@@ -84,7 +101,7 @@ class DHCPv4_Counter(object):
         """Fetch DHCP counter data from Redis COUNTERS_DB."""
         dhcp_data = {}
 
-        for key in self.db.keys(self.db.COUNTERS_DB):
+        for key in scan_keys(self.db, self.db.COUNTERS_DB, self.table_name + "*"):
             if DHCPv4_COUNTER_TABLE in key:
                table_data = self.db.get_all(self.db.COUNTERS_DB, key)
 
@@ -179,7 +196,7 @@ class DHCPv4_Counter(object):
         for msg in dhcpv4_messages:
             v4_cnts[msg] = '0'
 
-        for key in self.db.keys(self.db.COUNTERS_DB):
+        for key in scan_keys(self.db, self.db.COUNTERS_DB, self.table_name + "*"):
             if DHCPv4_COUNTER_TABLE in key:
                 if vlan_intf and vlan_intf not in key:
                     continue
@@ -216,7 +233,7 @@ class DHCPv6_Counter(object):
     def get_interface(self):
         """ Get all names of all interfaces in DHCPv6_COUNTER_TABLE """
         vlans = []
-        for key in self.db.keys(self.db.STATE_DB, self.table_name + "*"):
+        for key in scan_keys(self.db, self.db.STATE_DB, self.table_name + "*"):
             vlans.append(key[self.table_prefix_len:])
         return vlans
 
@@ -226,17 +243,19 @@ class DHCPv6_Counter(object):
         data = [str(msg), count]
         return data
 
+    def get_dhcp6relay_msg_counts(self, interface):
+        """ Get counts of all dhcp6relay messages """
+        counts = self.db.get_all(self.db.STATE_DB, self.table_name + str(interface)) or {}
+        return [[msg, counts.get(msg)] for msg in messages]
+
     def clear_table(self, interface):
         """ Reset all message counts to 0 """
-        for msg in messages:
-            self.db.set(self.db.STATE_DB, self.table_name + str(interface), str(msg), '0')
+        self.db.hmset(self.db.STATE_DB, self.table_name + str(interface), {msg: '0' for msg in messages})
 
 
 def print_count(counter, intf):
     """Print count of each message"""
-    data = []
-    for i in messages:
-        data.append(counter.get_dhcp6relay_msg_count(intf, i))
+    data = counter.get_dhcp6relay_msg_counts(intf)
     print(tabulate(data, headers=["Message Type", intf], tablefmt='simple', stralign='right') + "\n")
 
 #
@@ -414,7 +433,7 @@ def get_interfaces_type(interface_name, mgmt_intfs, vlan_interface, vlan_members
 def append_interfaces_count_with_type_specified(data, db, dirs, vlan_interface, current_type, summary, vlan_members,
                                                 mgmt_intfs):
     key_pattern = DHCPV4_COUNTER_TABLE_PREFIX + COUNTERS_DB_SEPRATOR + vlan_interface + COUNTERS_DB_SEPRATOR + "*"
-    keys = sorted(db.keys(db.COUNTERS_DB, key_pattern), key=natural_sort_key)
+    keys = sorted(scan_keys(db, db.COUNTERS_DB, key_pattern), key=natural_sort_key)
     for key in keys:
         interface_name = key.split(COUNTERS_DB_SEPRATOR)[2]
         data[summary].append(interface_name)
@@ -462,7 +481,7 @@ def natural_sort_key(string):
 def append_interfaces_count_without_type_specified(data, db, dir, vlan_interface, types, summary, vlan_members,
                                                    mgmt_intfs):
     key_pattern = DHCPV4_COUNTER_TABLE_PREFIX + COUNTERS_DB_SEPRATOR + vlan_interface + COUNTERS_DB_SEPRATOR + "*"
-    keys = sorted(db.keys(db.COUNTERS_DB, key_pattern), key=natural_sort_key)
+    keys = sorted(scan_keys(db, db.COUNTERS_DB, key_pattern), key=natural_sort_key)
     for key in keys:
         interface_name = key.split(COUNTERS_DB_SEPRATOR)[2]
         data[summary].append(interface_name)
@@ -502,7 +521,7 @@ def get_vlans_from_counters_db(vlan_interface, db):
     # Get vlan set from COUNTERS_DB
     counters_key = DHCPV4_COUNTER_TABLE_PREFIX + COUNTERS_DB_SEPRATOR + vlan_interface + "*"
     vlans = set()
-    for key in db.keys(db.COUNTERS_DB, counters_key):
+    for key in scan_keys(db, db.COUNTERS_DB, counters_key):
         splits = key.split(COUNTERS_DB_SEPRATOR)
         if vlan_interface == "" or vlan_interface == splits[1]:
             vlans.add(splits[1])
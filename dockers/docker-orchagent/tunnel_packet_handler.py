@@ -6,24 +6,33 @@ When receiving tunnel packets, if the hardware doesn't contain neighbor
 information for the inner packet's destination IP, the entire encapsulated
 packet is trapped to the CPU. In this case, we should ping the inner
 destination IP to trigger the process of obtaining neighbor information
+
+Tunnel packets are received through a TPACKET_V3 ring with a BPF filter
+attached, so only the tunnel packets destined to this device are copied to
+user space, and only their headers. The neighbor of each inner destination is
+resolved through a netlink neighbor probe instead of pinging it.
 """
+import ctypes
+import mmap
+import select
+import socket
+import struct
 import subprocess
 import sys
 import time
 from datetime import datetime
-from ipaddress import ip_interface
-from queue import Queue
+from ipaddress import ip_address, ip_interface
+from queue import Empty, Queue
 from threading import Lock, Event, Thread
 
+import redis
 from swsscommon.swsscommon import ConfigDBConnector, SonicV2Connector, \
-                                  DBConnector, Select, SubscriberStateTable
+                                  DBConnector, Select, SubscriberStateTable, SonicDBConfig
 from sonic_py_common import logger as log
 
 from pyroute2 import IPRoute
 from pyroute2.netlink.exceptions import NetlinkError
-from scapy.layers.inet import IP
-from scapy.layers.inet6 import IPv6
-from scapy.sendrecv import AsyncSniffer
+from pyroute2.netlink.rtnl import ndmsg
 
 
 logger = log.Logger()
@@ -47,6 +56,32 @@ IPINIP_TUNNEL = 'ipinip'
 RTM_NEWLINK = 'RTM_NEWLINK'
 SELECT_TIMEOUT = 1000
 
+ETH_P_IP = 0x0800
+IPPROTO_IPIP = 4
+IPPROTO_IPV6 = 41
+SO_ATTACH_FILTER = 26
+SOL_PACKET = 263
+PACKET_RX_RING = 5
+PACKET_VERSION = 10
+TPACKET_V3 = 2
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1
+# The ring of each interface is made of RING_BLOCK_NR blocks, a block is
+# passed to user space when it is full or RING_BLOCK_TIMEOUT_MS after its
+# first packet was received
+RING_BLOCK_SIZE = 1 << 16
+RING_BLOCK_NR = 16
+RING_FRAME_SIZE = 1 << 11
+RING_BLOCK_TIMEOUT_MS = 10
+RING_POLL_TIMEOUT_MS = 100
+# Enough to hold the ethernet header, the outer IPv4 header with options and
+# the inner IPv4/IPv6 header
+PKT_SNAPLEN = 128
+# Seconds during which a destination is not probed again
+PROBE_TTL = 1
+# Seconds between updates of the packet counter in COUNTERS_DB
+COUNTER_FLUSH_INTERVAL = 1
+
 nl_msgs = Queue()
 portchannel_intfs = None
 
@@ -62,6 +97,149 @@ def add_msg_to_queue(target, msg):
     if msg.get_attr('IFLA_IFNAME') in portchannel_intfs:
         nl_msgs.put(msg)
 
+def build_tunnel_pkt_filter(self_ip, peer_ip):
+    """
+    Builds a classic BPF program accepting the IPinIP and IPv6inIP packets
+    sent from peer_ip to self_ip, except non-first fragments
+
+    Returns:
+        (list) of (code, jt, jf, k) BPF instructions
+    """
+    return [
+        (0x28, 0, 0, 12),                           # ldh [12]
+        (0x15, 0, 10, ETH_P_IP),                    # jeq #ETH_P_IP else drop
+        (0x30, 0, 0, 23),                           # ldb [23]
+        (0x15, 1, 0, IPPROTO_IPIP),                 # jeq #IPPROTO_IPIP
+        (0x15, 0, 7, IPPROTO_IPV6),                 # jeq #IPPROTO_IPV6 else drop
+        (0x20, 0, 0, 26),                           # ld [26]
+        (0x15, 0, 5, int(ip_address(peer_ip))),     # jeq #peer_ip else drop
+        (0x20, 0, 0, 30),                           # ld [30]
+        (0x15, 0, 3, int(ip_address(self_ip))),     # jeq #self_ip else drop
+        (0x28, 0, 0, 20),                           # ldh [20]
+        (0x45, 1, 0, 0x1fff),                       # jset #0x1fff drop
+        (0x06, 0, 0, PKT_SNAPLEN),                  # ret #PKT_SNAPLEN
+        (0x06, 0, 0, 0),                            # drop: ret #0
+    ]
+
+
+class TunnelPacketSniffer(object):
+    """
+    This class receives tunnel packets through a TPACKET_V3 ring on each
+    interface and passes the inner destination IPs to a callback
+    """
+
+    def __init__(self, intfs, self_ip, peer_ip, callback):
+        self.intfs = intfs
+        self.pkt_filter = build_tunnel_pkt_filter(self_ip, peer_ip)
+        self.callback = callback
+        self.rings = []
+        self.stop_event = Event()
+        self.thread = None
+
+    def open_ring(self, intf):
+        """
+        Opens a packet socket on an interface and maps its receive ring
+
+        Returns:
+            (socket, mmap) The packet socket and its receive ring
+        """
+        # Don't receive any packet before the filter is attached, the
+        # protocol is set when binding the socket
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, 0)
+        try:
+            insns = ctypes.create_string_buffer(
+                b''.join(struct.pack('HBBI', *insn) for insn in self.pkt_filter)
+            )
+            sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER,
+                            struct.pack('HP', len(self.pkt_filter), ctypes.addressof(insns)))
+            sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+            sock.setsockopt(SOL_PACKET, PACKET_RX_RING, struct.pack(
+                'IIIIIII', RING_BLOCK_SIZE, RING_BLOCK_NR, RING_FRAME_SIZE,
+                RING_BLOCK_SIZE * RING_BLOCK_NR // RING_FRAME_SIZE,
+                RING_BLOCK_TIMEOUT_MS, 0, 0
+            ))
+            ring = mmap.mmap(sock.fileno(), RING_BLOCK_SIZE * RING_BLOCK_NR)
+            sock.bind((intf, ETH_P_IP))
+        except OSError:
+            sock.close()
+            raise
+        return sock, ring
+
+    def read_block(self, ring, offset, dst_ips):
+        """
+        Appends the inner destination IP of each packet in a ring block
+
+        Args:
+            ring: the receive ring
+            offset: the offset of the block in the ring
+            dst_ips: the list the inner destination IPs are appended to
+        """
+        num_pkts, pkt_offset = struct.unpack_from('II', ring, offset + 12)
+        pkt_offset += offset
+        for _ in range(num_pkts):
+            next_offset, snaplen = struct.unpack_from('I8xI', ring, pkt_offset)
+            mac, net = struct.unpack_from('HH', ring, pkt_offset + 24)
+            end = pkt_offset + mac + snaplen
+            outer = pkt_offset + net
+            inner = outer + (ring[outer] & 0x0f) * 4
+            if ring[outer + 9] == IPPROTO_IPIP and inner + 20 <= end:
+                dst_ips.append(socket.inet_ntop(socket.AF_INET, ring[inner + 16:inner + 20]))
+            elif ring[outer + 9] == IPPROTO_IPV6 and inner + 40 <= end:
+                dst_ips.append(socket.inet_ntop(socket.AF_INET6, ring[inner + 24:inner + 40]))
+            pkt_offset += next_offset
+
+    def sniff(self):
+        """
+        Reads the filled blocks of all rings, and passes the inner destination
+        IPs of each round to the callback
+        """
+        poller = select.poll()
+        for sock, _ in self.rings:
+            poller.register(sock, select.POLLIN | select.POLLERR)
+        blocks = [0] * len(self.rings)
+
+        while not self.stop_event.is_set():
+            dst_ips = []
+            for idx, (_, ring) in enumerate(self.rings):
+                # Bound the blocks read from one ring so all rings are served
+                for _ in range(RING_BLOCK_NR):
+                    offset = blocks[idx] * RING_BLOCK_SIZE
+                    status, = struct.unpack_from('I', ring, offset + 8)
+                    if not status & TP_STATUS_USER:
+                        break
+                    self.read_block(ring, offset, dst_ips)
+                    struct.pack_into('I', ring, offset + 8, TP_STATUS_KERNEL)
+                    blocks[idx] = (blocks[idx] + 1) % RING_BLOCK_NR
+            if dst_ips:
+                self.callback(dst_ips)
+            else:
+                poller.poll(RING_POLL_TIMEOUT_MS)
+
+    def start(self):
+        """
+        Opens the rings and starts the sniffing thread
+        """
+        for intf in self.intfs:
+            try:
+                self.rings.append(self.open_ring(intf))
+            except OSError as error:
+                logger.log_warning('Failed to open packet ring on {}: {}'
+                                   .format(intf, error))
+        self.thread = Thread(target=self.sniff, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the sniffing thread and closes the rings
+        """
+        self.stop_event.set()
+        self.thread.join()
+        for sock, ring in self.rings:
+            ring.close()
+            sock.close()
+        self.rings = []
+
+
 class TunnelPacketHandler(object):
     """
     This class handles unroutable tunnel packets that are trapped
@@ -80,11 +258,14 @@ class TunnelPacketHandler(object):
         self._portchannel_intfs = None
         self.up_portchannels = None
         self.netlink_api = IPRoute()
+        # Used only by the thread probing neighbors, IPRoute is not thread safe
+        self.probe_netlink_api = IPRoute()
         self.sniffer = None
         self.self_ip = ''
+        self.peer_ip = ''
         self.packet_filter = ''
         self.sniff_intfs = set()
-        self.pending_cmds = Queue()
+        self.pending_dsts = Queue()
 
         global portchannel_intfs
         portchannel_intfs = [name for name, _ in self.portchannel_intfs]
@@ -245,24 +426,6 @@ class TunnelPacketHandler(object):
 
         return None, None
 
-    def get_inner_pkt_type(self, packet):
-        """
-        Get the type of an inner encapsulated packet
-
-        Returns:
-            (str)  'v4' if the inner packet is IPv4
-            (str)  'v6' if the inner packet is IPv6
-            (bool) False if `packet` is not an IPinIP packet
-        """
-        if packet.haslayer(IP):
-            # Determine inner packet type based on IP protocol number
-            # The outer packet type should always be IPv4
-            if packet[IP].proto == 4:
-                return IP
-            elif packet[IP].proto == 41:
-                return IPv6
-        return False
-
     def sniffer_restart_required(self, lag, fvs):
         """
         Determines if the packet sniffer needs to be restarted
@@ -288,7 +451,7 @@ class TunnelPacketHandler(object):
 
     def start_sniffer(self):
         """
-        Starts an AsyncSniffer and waits for it to inititalize fully
+        Starts a TunnelPacketSniffer on the portchannels which are up
         """
         start = datetime.now()
         
@@ -302,54 +465,85 @@ class TunnelPacketHandler(object):
             self.sniff_intfs = self.get_up_portchannels()
             time.sleep(10)
 
-        self.sniffer = AsyncSniffer(
-            iface=list(self.sniff_intfs),
-            filter=self.packet_filter,
-            prn=self.ping_inner_dst,
-            store=0
+        self.sniffer = TunnelPacketSniffer(
+            self.sniff_intfs,
+            self.self_ip,
+            self.peer_ip,
+            self.pending_dsts.put
         )
         self.sniffer.start()
 
-        while not hasattr(self.sniffer, 'stop_cb'):
-            time.sleep(0.1)
-
-    def write_count_to_db(self):
-        while True:
-            # use a set to automatically deduplicate destination IPs
-            to_run = set()
-
-            to_run.add(tuple(self.pending_cmds.get()))
-            pkt_count = 1
-            while not self.pending_cmds.empty() and len(to_run) < 100:
-                to_run.add(tuple(self.pending_cmds.get()))
-                # we should always count each packet, but only ping for each unique IP
-                pkt_count += 1
-
-            for cmds in to_run:
-                logger.log_info("Running command '{}'".format(' '.join(cmds)))
-                subprocess.run(cmds, stdout=subprocess.DEVNULL)
-            try:
-                curr_count = int(self.counters_db.get(COUNTERS_DB, self.tunnel_counter_table, COUNTER_KEY))
-            except TypeError:
-                curr_count = 0
-            self.counters_db.set(COUNTERS_DB, self.tunnel_counter_table, COUNTER_KEY, str(curr_count + pkt_count))
-
-    def ping_inner_dst(self, packet):
+    def probe_neighbor(self, dst_ip):
         """
-        Pings the inner destination IP for an encapsulated packet
+        Triggers the kernel to resolve the neighbor used to reach an IP
+
+        The neighbor is created in the kernel if needed and probed through
+        NTF_USE, the same as the kernel does when sending a packet to it.
+        If that fails, the IP is pinged instead.
 
         Args:
-            packet: The encapsulated packet received
+            dst_ip: the inner destination IP of a tunnel packet
         """
-        inner_packet_type = self.get_inner_pkt_type(packet)
-        if inner_packet_type and packet[IP].dst == self.self_ip:
+        family = socket.AF_INET6 if ip_address(dst_ip).version == 6 else socket.AF_INET
+        try:
+            route = self.probe_netlink_api.route('get', dst=dst_ip, family=family)[0]
+            neighbor_ip = route.get_attr('RTA_GATEWAY') or dst_ip
+            logger.log_info("Probing neighbor {} for {}".format(neighbor_ip, dst_ip))
+            self.probe_netlink_api.neigh(
+                'replace',
+                family=family,
+                dst=neighbor_ip,
+                ifindex=route.get_attr('RTA_OIF'),
+                state=ndmsg.NUD_NONE,
+                flags=ndmsg.NTF_USE
+            )
+        except NetlinkError as error:
             cmds = ['timeout', '0.2', 'ping', '-c1',
                     '-W1', '-i0', '-n', '-q']
-            if inner_packet_type == IPv6:
+            if family == socket.AF_INET6:
                 cmds.append('-6')
-            dst_ip = packet[IP].payload[inner_packet_type].dst
             cmds.append(dst_ip)
-            self.pending_cmds.put(cmds)
+            logger.log_info("Failed to probe neighbor for {}: {}, running command '{}'"
+                            .format(dst_ip, error, ' '.join(cmds)))
+            subprocess.run(cmds, stdout=subprocess.DEVNULL)
+
+    def write_count_to_db(self):
+        """
+        Probes the neighbor of each inner destination IP, and adds the number
+        of received tunnel packets to COUNTERS_DB every COUNTER_FLUSH_INTERVAL
+        """
+        counters_client = redis.Redis(
+            unix_socket_path=SonicDBConfig.getDbSock(COUNTERS_DB),
+            db=SonicDBConfig.getDbId(COUNTERS_DB)
+        )
+        # Destination IP to the time it can be probed again
+        probed_dsts = {}
+        pkt_count = 0
+        last_flush = time.monotonic()
+
+        while True:
+            timeout = None
+            if pkt_count:
+                timeout = max(0, last_flush + COUNTER_FLUSH_INTERVAL - time.monotonic())
+            try:
+                dst_ips = self.pending_dsts.get(timeout=timeout)
+            except Empty:
+                dst_ips = []
+
+            # we should always count each packet, but only probe each destination once per PROBE_TTL
+            pkt_count += len(dst_ips)
+            now = time.monotonic()
+            for dst_ip in set(dst_ips):
+                if probed_dsts.get(dst_ip, 0) > now:
+                    continue
+                probed_dsts[dst_ip] = now + PROBE_TTL
+                self.probe_neighbor(dst_ip)
+
+            if pkt_count and now - last_flush >= COUNTER_FLUSH_INTERVAL:
+                counters_client.hincrby(self.tunnel_counter_table, COUNTER_KEY, pkt_count)
+                pkt_count = 0
+                last_flush = now
+                probed_dsts = {dst_ip: expiry for dst_ip, expiry in probed_dsts.items() if expiry > now}
 
     def listen_for_tunnel_pkts(self):
         """
@@ -358,13 +552,13 @@ class TunnelPacketHandler(object):
         These packets may be trapped if there is no neighbor info for the
         inner packet destination IP in the hardware.
         """
-        self.self_ip, peer_ip = self.get_ipinip_tunnel_addrs()
-        if self.self_ip is None or peer_ip is None:
+        self.self_ip, self.peer_ip = self.get_ipinip_tunnel_addrs()
+        if self.self_ip is None or self.peer_ip is None:
             logger.log_notice('Could not get tunnel addresses from '
                               'config DB, exiting...')
             return None
 
-        self.packet_filter = 'host {} and host {}'.format(self.self_ip, peer_ip)
+        self.packet_filter = 'src {} and dst {}'.format(self.peer_ip, self.self_ip)
         logger.log_notice('Starting tunnel packet handler for {}'
                           .format(self.packet_filter))
 
@@ -49,13 +49,13 @@ class NhLoggerMixin(syslogger.SysLogger):
         super().__init__(log_identifier, enable_runtime_config=True)
         self._class_name: str = self.__class__.__name__
 
-    def log(self, priority: Any, msg: str, also_print_to_console: bool = False) -> None:
+    def log(self, priority: Any, msg: str, *args: Any, also_print_to_console: bool = False) -> None:
         """
         Log a message with specified priority, automatically prefixed with class name.
 
         Args:
             priority: Syslog priority level
-            msg (str): Message to log
+            msg (str): Message to log, formatted with args
             also_print_to_console (bool): Whether to also print to console
         """
-        super().log(priority, f"{self._class_name}: {msg}", also_print_to_console)
+        super().log(priority, f"{self._class_name}: {msg}", *args, also_print_to_console=also_print_to_console)
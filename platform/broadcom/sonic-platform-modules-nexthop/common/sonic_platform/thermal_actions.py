@@ -505,8 +505,8 @@ class PIDController(NhLoggerMixin):
                       f"gains=[Kp={proportional_gain}, Ki={integral_gain}, Kd={derivative_gain}], "
                       f"output_range=[{output_min}, {output_max}], interval={interval}s")
 
-    def log(self, priority: Any, msg: str, also_print_to_console: bool = False) -> None:
-        super().log(priority, f"[{self._domain}] {msg}", also_print_to_console)
+    def log(self, priority: Any, msg: str, *args: Any, also_print_to_console: bool = False) -> None:
+        super().log(priority, f"[{self._domain}] {msg}", *args, also_print_to_console=also_print_to_console)
 
     def set_output_max(self, output_max: float) -> None:
         """Updates the maximum output value (fan speed %) as this can change at runtime."""
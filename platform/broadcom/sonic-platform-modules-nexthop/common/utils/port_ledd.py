@@ -31,7 +31,7 @@ class PortLedd(daemon_base.DaemonBase):
         try:
             self.led_control = self.load_platform_util(LED_MODULE_NAME, LED_CLASS_NAME)
         except Exception as e:
-            self.log_error("Failed to load led_control: %s" % (str(e)), True)
+            self.log_error("Failed to load led_control: %s" % (str(e)), also_print_to_console=True)
             sys.exit(1)
 
         self.sel = swsscommon.Select()
@@ -116,7 +116,7 @@ class ModuleHostMgmtInitializer:
         if utils.wait_until(os.path.exists, MODULE_READY_MAX_WAIT_TIME, MODULE_READY_CHECK_INTERVAL, module_ready_file):
             self.initialized = True
         else:
-            logger.log_error('Module initialization timeout', True)
+            logger.log_error('Module initialization timeout', also_print_to_console=True)
             
     def is_initialization_owner(self):
         """Indicate whether current thread is the owner of doing module initialization
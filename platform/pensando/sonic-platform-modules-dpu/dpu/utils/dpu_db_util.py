@@ -19,10 +19,10 @@ SYSLOG_IDENTIFIER = 'dpu-db-utild'
 logger_instance = syslogger.SysLogger(SYSLOG_IDENTIFIER)
 
 def log_info(msg, also_print_to_console=False):
-    logger_instance.log_info(msg, also_print_to_console)
+    logger_instance.log_info(msg, also_print_to_console=also_print_to_console)
 
 def log_err(msg, also_print_to_console=False):
-    logger_instance.log_error(msg, also_print_to_console)
+    logger_instance.log_error(msg, also_print_to_console=also_print_to_console)
 
 try:
     from sonic_py_common import daemon_base
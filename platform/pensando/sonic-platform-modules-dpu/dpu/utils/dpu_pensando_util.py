@@ -21,10 +21,10 @@ SYSLOG_IDENTIFIER = 'dpu_pensando_util'
 logger_instance = syslogger.SysLogger(SYSLOG_IDENTIFIER)
 
 def log_info(msg, also_print_to_console=False):
-    logger_instance.log_info(msg, also_print_to_console)
+    logger_instance.log_info(msg, also_print_to_console=also_print_to_console)
 
 def log_err(msg, also_print_to_console=True):
-    logger_instance.log_error(msg, also_print_to_console)
+    logger_instance.log_error(msg, also_print_to_console=also_print_to_console)
 
 def run_cmd(cmd):
     status, output = subprocess.getstatusoutput(cmd)
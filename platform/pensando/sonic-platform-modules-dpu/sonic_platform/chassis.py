@@ -42,7 +42,7 @@ SYSLOG_IDENTIFIER = "sonic_platform.chassis"
 logger_instance = syslogger.SysLogger(SYSLOG_IDENTIFIER)
 
 def log_info(msg, also_print_to_console=False):
-    logger_instance.log_info(msg, also_print_to_console)
+    logger_instance.log_info(msg, also_print_to_console=also_print_to_console)
 
 REBOOT_CAUSE_MAP = {
     25 : "ASIC warm reset",
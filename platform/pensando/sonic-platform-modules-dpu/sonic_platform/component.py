@@ -31,7 +31,7 @@ SYSLOG_IDENTIFIER = 'dpu-db-utild'
 logger_instance = syslogger.SysLogger(SYSLOG_IDENTIFIER)
 
 def log_err(msg, also_print_to_console=False):
-    logger_instance.log_error(msg, also_print_to_console)
+    logger_instance.log_error(msg, also_print_to_console=also_print_to_console)
 
 def parse_re(pattern, buffer, index = 0, alt_val = "N/A"):
         res_list = re.findall(pattern, buffer)
@@ -1,4 +1,9 @@
+import argparse
 import json
+import os
+import select
+import socket
+import struct
 import subprocess
 import time
 import syslog
@@ -6,15 +11,123 @@ from datetime import datetime, timezone
 from swsscommon import swsscommon
 from sonic_py_common import device_info
 from sonic_py_common.general import getstatusoutput_noshell
+from bgpcfgd.frr import VtyClient
+
+# bfdd control socket protocol, see bfdd/bfdctl.h in FRR
+BFDD_CONTROL_SOCKET = "/var/run/frr/bfdd.sock"
+BMT_RESPONSE = 0x01
+BMT_NOTIFY = 0x04
+BMT_VERSION = 1
+BCM_NOTIFY_ALL = 0xffffffffffffffff
+BFD_CONTROL_HEADER = struct.Struct("!IHBB")
+
+
+class BfddControlClient:
+    """
+    Listener of the bfdd control socket. bfdd sends a notification for every
+    BFD session state change and for every removed session
+    """
+    TIMEOUT = 5
+
+    def __init__(self, path=BFDD_CONTROL_SOCKET):
+        self.path = path
+        self.sock = None
+        self.buffer = b''
+
+    def connect(self):
+        """
+        Connect to bfdd and register for notifications
+        :return: True if the notifications are registered, False otherwise
+        """
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.settimeout(self.TIMEOUT)
+            self.sock.connect(self.path)
+            data = struct.pack("!Q", BCM_NOTIFY_ALL)
+            self.sock.sendall(BFD_CONTROL_HEADER.pack(len(data), 1, BMT_NOTIFY, BMT_VERSION) + data)
+            while True:
+                msg_type, msg = self.__read_message()
+                if msg_type == BMT_RESPONSE:
+                    break
+        except (socket.error, OSError, ValueError) as e:
+            syslog.syslog(syslog.LOG_WARNING, "*WARNING* Can't register for bfdd notifications: {}".format(e))
+            self.close()
+            return False
+        if msg.get("status") != "ok":
+            syslog.syslog(syslog.LOG_WARNING, "*WARNING* bfdd rejected the notification request: {}".format(msg))
+            self.close()
+            return False
+        self.sock.settimeout(None)
+        return True
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        self.buffer = b''
+
+    def __recv(self):
+        chunk = self.sock.recv(65536)
+        if not chunk:
+            raise socket.error("connection closed by bfdd")
+        self.buffer += chunk
+
+    def __read_message(self):
+        while len(self.buffer) < BFD_CONTROL_HEADER.size:
+            self.__recv()
+        length, _, msg_type, _ = BFD_CONTROL_HEADER.unpack(self.buffer[:BFD_CONTROL_HEADER.size])
+        while len(self.buffer) < BFD_CONTROL_HEADER.size + length:
+            self.__recv()
+        data = self.buffer[BFD_CONTROL_HEADER.size:BFD_CONTROL_HEADER.size + length]
+        self.buffer = self.buffer[BFD_CONTROL_HEADER.size + length:]
+        return msg_type, json.loads(data.decode('utf-8').rstrip('\0'))
+
+    def read_events(self, timeout):
+        """
+        Wait for notifications
+        :param timeout: maximum time to wait in seconds
+        :return: list of tuples (peer, status). status is None for a removed session
+        """
+        events = []
+        if not self.buffer:
+            readable, _, _ = select.select([self.sock], [], [], timeout)
+            if not readable:
+                return events
+            self.__recv()
+        while len(self.buffer) >= BFD_CONTROL_HEADER.size:
+            length, = struct.unpack("!I", self.buffer[:4])
+            if len(self.buffer) < BFD_CONTROL_HEADER.size + length:
+                break
+            msg_type, msg = self.__read_message()
+            peer = msg.get("peer-address")
+            if msg_type != BMT_NOTIFY or peer is None:
+                continue
+            if msg.get("op") == "status":
+                status = msg.get("state")
+                events.append((peer, "shutdown" if status == "adm-down" else status))
+            elif msg.get("op") == "delete":
+                events.append((peer, None))
+        return events
+
 
 class BfdFrrMon:
-    def __init__(self):
+    def __init__(self, publish_session_list=True):
         # Initialize local sets to store current BFD peer states
         self.local_v4_peers = set()
         self.local_v6_peers = set()
+        # State of every BFD session as published in the state DB, and as read from FRR
+        self.local_sessions = {}
+        self.frr_sessions = {}
+        # The list of up sessions in the summary row is rewritten on every change.
+        # It can be omitted when all the consumers use the per-session rows
+        self.publish_session_list = publish_session_list
         self.status_table = "DPU_BFD_PROBE_STATE"
+        self.session_table_name = "DPU_BFD_PROBE_SESSION_STATE"
         self.db_connector = swsscommon.DBConnector("STATE_DB", 0)
         self.table = swsscommon.Table(self.db_connector, self.status_table)
+        self.pipe = swsscommon.RedisPipeline(self.db_connector)
+        self.session_table = swsscommon.Table(self.pipe, self.session_table_name, True)
+        self.vty = VtyClient("bfdd")
 
         self.bfdd_running = False
         self.init_done = False
@@ -22,12 +135,18 @@ class BfdFrrMon:
 
         self.remote_status_table = "DASH_BFD_PROBE_STATE"
         switch_type = device_info.get_localhost_info("switch_type")
+        self.remote_session_table_name = "DASH_BFD_PROBE_SESSION_STATE"
         if switch_type and switch_type == "dpu":
+            # All the updates of the remote DB are sent in one pipeline
             self.remote_db_connector = swsscommon.DBConnector("DPU_STATE_DB", 0, True)
-            self.remote_table = swsscommon.Table(self.remote_db_connector, self.remote_status_table)
+            self.remote_pipe = swsscommon.RedisPipeline(self.remote_db_connector)
+            self.remote_table = swsscommon.Table(self.remote_pipe, self.remote_status_table, True)
+            self.remote_session_table = swsscommon.Table(self.remote_pipe, self.remote_session_table_name, True)
         else:
             self.remote_db_connector = None
+            self.remote_pipe = None
             self.remote_table = None
+            self.remote_session_table = None
 
     def check_bfdd(self):
         """
@@ -47,13 +166,15 @@ class BfdFrrMon:
 
     def get_bfd_sessions(self):
         """
-        Get BFD session information from FRR using vtysh.
-        Updates two sets: one for IPv4 peers and another for IPv6 peers whose BFD state is 'up'.
+        Get BFD session information from FRR over the bfdd vty session, or using vtysh.
+        Updates two sets: one for IPv4 peers and another for IPv6 peers whose BFD state is 'up',
+        and the dictionary of the state of every session.
         Returns True if peer info was retreived successfully, False otherwise.
         """
     
         self.frr_v4_peers = set()
         self.frr_v6_peers = set()
+        self.frr_sessions = {}
 
         # Update bfdd state if it wasn't previously running
         if not self.bfdd_running:
@@ -67,7 +188,11 @@ class BfdFrrMon:
         cmd = ['vtysh', '-c', 'show bfd peers json']
         while retry_attempt < self.MAX_RETRY_ATTEMPTS:
             try:
-                rc, output = getstatusoutput_noshell(cmd)
+                results = self.vty.execute([cmd[-1]])
+                if results is not None:
+                    rc, output = results[0]
+                else:
+                    rc, output = getstatusoutput_noshell(cmd)
                 if rc:
                     syslog.syslog(syslog.LOG_ERR, "*ERROR* Failed with rc:{} when execute: {}".format(rc, cmd))
                     return False
@@ -78,12 +203,9 @@ class BfdFrrMon:
                 bfd_data = json.loads(output)
                 if bfd_data:
                     for session in bfd_data:
-                        if "status" in session and session["status"] == "up":
-                            if "peer" in session:
-                                if ":" in session["peer"]:  # IPv6
-                                    self.frr_v6_peers.add(session["peer"])
-                                else:  # IPv4
-                                    self.frr_v4_peers.add(session["peer"])
+                        if "peer" in session and "status" in session:
+                            self.frr_sessions[session["peer"]] = session["status"]
+                self.update_up_peers()
                 return True
             except json.JSONDecodeError as e:
                 # Log the exception and retry if within the maximum attempts
@@ -106,10 +228,47 @@ class BfdFrrMon:
             "*ERROR* Maximum retry attempts reached. Failed to execute: {}".format(cmd))
         return False
     
+    def update_up_peers(self):
+        """
+        Derive the IPv4 and IPv6 up peer sets from the state of the sessions
+        """
+        self.frr_v4_peers = set()
+        self.frr_v6_peers = set()
+        for peer, status in self.frr_sessions.items():
+            if status == "up":
+                if ":" in peer:  # IPv6
+                    self.frr_v6_peers.add(peer)
+                else:  # IPv4
+                    self.frr_v4_peers.add(peer)
+
+    def update_session_rows(self, timestamp):
+        """
+        Write the rows of the sessions which changed state, and remove the rows of the removed sessions.
+        Returns the number of changed rows.
+        """
+        changes = 0
+        for peer, status in self.frr_sessions.items():
+            if self.local_sessions.get(peer) != status:
+                values = [("status", status), ("timestamp", json.dumps(timestamp))]
+                self.session_table.set(peer, values)
+                if self.remote_session_table:
+                    self.remote_session_table.set(peer, values)
+                changes += 1
+        for peer in self.local_sessions.keys() - self.frr_sessions.keys():
+            self.session_table.delete(peer)
+            if self.remote_session_table:
+                self.remote_session_table.delete(peer)
+            changes += 1
+        self.local_sessions = dict(self.frr_sessions)
+        return changes
+
     def update_state_db(self):
         """
         Update the state DB only with changes (additions or deletions) to the peer list.
         """
+        timestamp = datetime.now(timezone.utc).strftime("%a %b %d %I:%M:%S %p UTC %Y")
+        session_changes = self.update_session_rows(timestamp)
+        summary_changed = False
         # Check differences between local sets and new data
         new_v4_peers = self.frr_v4_peers - self.local_v4_peers  # Peers to add
         removed_v4_peers = self.local_v4_peers - self.frr_v4_peers  # Peers to remove
@@ -124,11 +283,13 @@ class BfdFrrMon:
 
             # Update Redis with the new peer sets
             values = [
-                ("v4_bfd_up_sessions", json.dumps(list(self.local_v4_peers)).strip("[]")),
-                ("v6_bfd_up_sessions", json.dumps(list(self.local_v6_peers)).strip("[]"))
+                ("v4_bfd_up_count", str(len(self.local_v4_peers))),
+                ("v6_bfd_up_count", str(len(self.local_v6_peers)))
             ]
+            if self.publish_session_list:
+                values.append(("v4_bfd_up_sessions", json.dumps(list(self.local_v4_peers)).strip("[]")))
+                values.append(("v6_bfd_up_sessions", json.dumps(list(self.local_v6_peers)).strip("[]")))
 
-            timestamp = datetime.now(timezone.utc).strftime("%a %b %d %I:%M:%S %p UTC %Y")
             if new_v4_peers or removed_v4_peers:
                 values.append(("v4_bfd_up_sessions_timestamp", json.dumps(timestamp)))
             if new_v6_peers or removed_v6_peers:
@@ -146,13 +307,75 @@ class BfdFrrMon:
                     self.remote_status_table, self.local_v4_peers, self.local_v6_peers))
 
             self.init_done = True
-    
+            summary_changed = True
+
+        if session_changes:
+            self.pipe.flush()
+        if self.remote_pipe and (session_changes or summary_changed):
+            self.remote_pipe.flush()
+
+    def apply_events(self, events):
+        """
+        Apply the session changes reported by bfdd to the FRR session state
+        :param events: list of tuples (peer, status). status is None for a removed session
+        """
+        for peer, status in events:
+            if status is None:
+                self.frr_sessions.pop(peer, None)
+            else:
+                self.frr_sessions[peer] = status
+        self.update_up_peers()
+
+    def run_events(self, client, coalesce_window, resync_interval):
+        """
+        Follow the bfdd notifications until the control socket is lost.
+        Changes received within coalesce_window seconds of the first one are written together.
+        A full read of the sessions is done every resync_interval seconds
+        """
+        last_resync = time.monotonic()
+        while True:
+            timeout = max(0, last_resync + resync_interval - time.monotonic())
+            events = client.read_events(timeout)
+            if events:
+                deadline = time.monotonic() + coalesce_window
+                while time.monotonic() < deadline:
+                    events.extend(client.read_events(max(0, deadline - time.monotonic())))
+                self.apply_events(events)
+                self.update_state_db()
+            if time.monotonic() - last_resync >= resync_interval:
+                if self.get_bfd_sessions():
+                    self.update_state_db()
+                last_resync = time.monotonic()
+
 def main():
     SLEEP_TIME = 2 # Wait in seconds between each iteration
+    parser = argparse.ArgumentParser(description="Publish the state of FRR BFD sessions to the state DB")
+    parser.add_argument("--poll", action="store_true", help="poll the sessions instead of following bfdd notifications")
+    parser.add_argument("--coalesce-ms", type=int, default=200,
+                        help="time in milliseconds to collect session changes before writing them (default: 200)")
+    parser.add_argument("--resync-interval", type=int, default=60,
+                        help="interval in seconds between full reads of the sessions in event mode (default: 60)")
+    parser.add_argument("--no-session-list", action="store_true",
+                        help="don't publish the list of up sessions in the summary row, only the counters")
+    args = parser.parse_args()
+
     syslog.syslog(syslog.LOG_INFO, "bfdmon service started")
-    bfd_mon = BfdFrrMon()
+    bfd_mon = BfdFrrMon(publish_session_list=not args.no_session_list)
+    client = BfddControlClient()
 
     while True:
+        if not args.poll and os.path.exists(client.path) and client.connect():
+            syslog.syslog(syslog.LOG_INFO, "bfdmon follows bfdd notifications")
+            # read the sessions after the registration to not miss a change
+            if bfd_mon.get_bfd_sessions():
+                bfd_mon.update_state_db()
+            try:
+                bfd_mon.run_events(client, args.coalesce_ms / 1000.0, args.resync_interval)
+            except (socket.error, OSError, ValueError) as e:
+                syslog.syslog(syslog.LOG_WARNING, "*WARNING* Lost bfdd notifications: {}".format(e))
+            client.close()
+            bfd_mon.bfdd_running = False
+
         # Sleep for a while before checking again (adjust as necessary)
         time.sleep(SLEEP_TIME)
 
@@ -1,3 +1,219 @@
+import re
+from collections import OrderedDict
+
+from .log import log_debug
+
+
+class FrrConfigIndex(object):
+    """
+    FRR running configuration indexed by the names of the objects bgpcfgd looks up:
+    prefix-lists, community-lists, as-path lists, route-maps, peer-groups and neighbor route-maps.
+    The index follows the configuration changes pushed by bgpcfgd, see apply()
+    """
+    RE_PREFIX_LIST = re.compile(r'^(ip|ipv6) prefix-list (\S+) seq (\d+) (.+)$')
+    RE_NO_PREFIX_LIST = re.compile(r'^no (ip|ipv6) prefix-list (\S+)(?: seq (\d+) .+)?$')
+    RE_COMMUNITY_LIST = re.compile(r'^bgp community-list standard (\S+) (permit|deny) (.+)$')
+    RE_NO_COMMUNITY_LIST = re.compile(r'^no bgp community-list standard (\S+)(?: (permit|deny) (.+))?$')
+    RE_AS_PATH_LIST = re.compile(r'^bgp as-path access-list (\S+) .+$')
+    RE_ROUTE_MAP = re.compile(r'^route-map (\S+) (permit|deny) (\d+)$')
+    RE_NO_ROUTE_MAP = re.compile(r'^no route-map (\S+)(?: (permit|deny) (\d+))?$')
+    RE_ROUTER_BGP = re.compile(r'^router bgp \d+')
+    RE_PEER_GROUP = re.compile(r'^\s*neighbor\s+(\S+)\s+peer-group\s*$')
+    RE_NEIGHBOR_ROUTE_MAP = re.compile(r'^\s*neighbor (\S+) route-map (\S+) (in|out)$')
+    # route-map entry commands which replace the previous value of the same command
+    ROUTE_MAP_SINGLE_VALUE_COMMANDS = [
+        'match ip address prefix-list ',
+        'match ipv6 address prefix-list ',
+        'match community ',
+        'set community ',
+        'set tag ',
+        'call ',
+    ]
+
+    def __init__(self, lines, generation=0):
+        """
+        Constructor
+        :param lines: FRR running configuration lines without comments
+        :param generation: generation of ConfigMgr changes which the configuration reflects
+        """
+        self.generation = generation
+        self.prefix_lists = {}          # (family, name) -> seq -> rule
+        self.community_lists = {}       # name -> list of (action, value)
+        self.as_path_lists = {}         # name -> list of lines
+        self.route_maps = {}            # name -> seq -> {'action': action, 'lines': lines}
+        self.peer_groups = []
+        self.neighbor_route_maps = {}   # (neighbor, direction) -> route-map name
+        entry = None
+        for line in lines:
+            if line[:1].isspace():
+                s_line = line.strip()
+                if entry is not None and s_line:
+                    entry['lines'].append(s_line)
+                self.__add_neighbor_line(line, False)
+                continue
+            entry = None
+            m = self.RE_ROUTE_MAP.match(line)
+            if m:
+                entry = self.route_maps.setdefault(m.group(1), {}).setdefault(int(m.group(3)), {'action': m.group(2), 'lines': []})
+                continue
+            self.__add_list_line(line)
+
+    def __add_list_line(self, line):
+        m = self.RE_PREFIX_LIST.match(line)
+        if m:
+            self.prefix_lists.setdefault((m.group(1), m.group(2)), {})[int(m.group(3))] = m.group(4)
+            return True
+        m = self.RE_COMMUNITY_LIST.match(line)
+        if m:
+            entries = self.community_lists.setdefault(m.group(1), [])
+            if (m.group(2), m.group(3)) not in entries:
+                entries.append((m.group(2), m.group(3)))
+            return True
+        m = self.RE_AS_PATH_LIST.match(line)
+        if m and ' seq ' in line:  # without the sequence number the line is different in FRR configuration
+            self.as_path_lists.setdefault(m.group(1), []).append(line)
+            return True
+        return False
+
+    def __add_neighbor_line(self, line, replace):
+        m = self.RE_PEER_GROUP.match(line)
+        if m:
+            if m.group(1) not in self.peer_groups:
+                self.peer_groups.append(m.group(1))
+            return
+        m = self.RE_NEIGHBOR_ROUTE_MAP.match(line)
+        if m:
+            key = m.group(1), m.group(3)
+            if replace or key not in self.neighbor_route_maps:
+                self.neighbor_route_maps[key] = m.group(2)
+
+    def __remove_list_line(self, line):
+        m = self.RE_NO_PREFIX_LIST.match(line)
+        if m:
+            key = m.group(1), m.group(2)
+            if m.group(3) is None:
+                self.prefix_lists.pop(key, None)
+            elif key in self.prefix_lists:
+                self.prefix_lists[key].pop(int(m.group(3)), None)
+                if not self.prefix_lists[key]:
+                    del self.prefix_lists[key]
+            return True
+        m = self.RE_NO_COMMUNITY_LIST.match(line)
+        if m:
+            if m.group(2) is None:
+                self.community_lists.pop(m.group(1), None)
+            elif (m.group(2), m.group(3)) in self.community_lists.get(m.group(1), []):
+                self.community_lists[m.group(1)].remove((m.group(2), m.group(3)))
+            return True
+        m = self.RE_NO_ROUTE_MAP.match(line)
+        if m:
+            if m.group(2) is None:
+                self.route_maps.pop(m.group(1), None)
+            elif self.route_maps.get(m.group(1), {}).get(int(m.group(3)), {}).get('action') == m.group(2):
+                del self.route_maps[m.group(1)][int(m.group(3))]
+            return True
+        if line.startswith('no bgp as-path access-list '):
+            m = self.RE_AS_PATH_LIST.match(line[len('no '):])
+            if m and line[len('no '):] in self.as_path_lists.get(m.group(1), []):
+                self.as_path_lists[m.group(1)].remove(line[len('no '):])
+                return True
+        return False
+
+    def __apply_route_map_line(self, entry, line):
+        for command in self.ROUTE_MAP_SINGLE_VALUE_COMMANDS:
+            if line.startswith(command):
+                entry['lines'] = [l for l in entry['lines'] if not l.startswith(command)] + [line]
+                return True
+        return False
+
+    def apply(self, changes):
+        """
+        Apply configuration changes, pushed to FRR, to the index
+        :param changes: FRR configuration commands
+        :return: True if all commands were applied. False if the index can't follow the changes and must be re-read
+        """
+        entry = None
+        router_bgp = False
+        for line in changes.split('\n'):
+            s_line = line.strip()
+            if s_line == '' or s_line.startswith('!'):
+                continue
+            if line[:1].isspace():
+                if entry is not None:
+                    if not self.__apply_route_map_line(entry, s_line):
+                        return False
+                elif router_bgp:
+                    if s_line.startswith('no '):
+                        return False
+                    self.__add_neighbor_line(line, True)
+                else:
+                    return False
+                continue
+            entry = None
+            router_bgp = False
+            if s_line in ('exit', 'end'):
+                continue
+            m = self.RE_ROUTE_MAP.match(s_line)
+            if m:
+                entries = self.route_maps.setdefault(m.group(1), {})
+                seq = int(m.group(3))
+                if seq in entries and entries[seq]['action'] != m.group(2):
+                    return False
+                entry = entries.setdefault(seq, {'action': m.group(2), 'lines': []})
+                continue
+            if self.RE_ROUTER_BGP.match(s_line):
+                router_bgp = True
+                continue
+            if s_line.startswith('no '):
+                if not self.__remove_list_line(s_line):
+                    return False
+            elif not self.__add_list_line(s_line):
+                return False
+        return True
+
+    def get_prefix_list(self, family, name):
+        """
+        Get prefix-list rules
+        :param family: 'ip' or 'ipv6'
+        :param name: name of the prefix-list
+        :return: list of rules ordered by sequence number, without 'seq N'. None if the prefix-list doesn't exist
+        """
+        entries = self.prefix_lists.get((family, name))
+        if not entries:
+            return None
+        return [entries[seq] for seq in sorted(entries)]
+
+    def get_community_list(self, name):
+        """ Get entries of a standard community-list as a list of tuples (action, value) """
+        return list(self.community_lists.get(name, []))
+
+    def get_as_path_list(self, name):
+        """ Get lines of an as-path access-list """
+        return list(self.as_path_lists.get(name, []))
+
+    def get_route_map(self, name):
+        """
+        Get route-map entries
+        :param name: name of the route-map
+        :return: OrderedDict: sequence number -> {'action': 'permit' or 'deny', 'lines': list of entry commands}
+        """
+        entries = self.route_maps.get(name, {})
+        return OrderedDict((seq, entries[seq]) for seq in sorted(entries))
+
+    def get_peer_groups(self):
+        """ Get names of defined peer-groups """
+        return list(self.peer_groups)
+
+    def get_neighbor_route_map(self, neighbor, direction):
+        """
+        Get a route-map name applied to a neighbor or a peer-group
+        :param neighbor: neighbor address or peer-group name
+        :param direction: 'in' or 'out'
+        :return: the route-map name, None if there is no route-map
+        """
+        return self.neighbor_route_maps.get((neighbor, direction))
+
+
 class ConfigMgr(object):
     """ The class represents frr configuration """
     def __init__(self, frr):
@@ -6,6 +222,8 @@ class ConfigMgr(object):
         self.current_config_raw = None
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.generation = 0
+        self.index = None
 
     def reset(self):
         """ Reset stored config """
@@ -13,6 +231,7 @@ class ConfigMgr(object):
         self.current_config_raw = None
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.index = None
 
     def update(self):
         """ Read current config from FRR """
@@ -27,6 +246,31 @@ class ConfigMgr(object):
         text += ["     "]  # Add empty line to have something to work on, if there is no text
         self.current_config_raw = text
         self.current_config = self.to_canonical(out)  # FIXME: use text as an input
+        self.index = FrrConfigIndex(text, self.generation)
+        if self.changes.strip() != "" and not self.index.apply(self.changes):
+            log_debug("ConfigMgr::update: the index doesn't follow all pending changes until they are committed")
+
+    def get_index(self):
+        """
+        Get indexed FRR configuration, which includes the changes pushed but not committed yet.
+        FRR configuration is read when the index was invalidated or couldn't follow the pushed changes.
+        The pending changes are never committed here: changes which the index can't follow,
+        e.g. an as-path entry without seq, are visible only after an explicit commit()
+        :return: FrrConfigIndex object
+        """
+        if self.index is None or self.index.generation != self.generation:
+            self.update()
+        return self.index
+
+    def invalidate_index(self):
+        """ Make the next get_index() re-read FRR configuration to catch changes made outside of bgpcfgd """
+        self.index = None
+
+    def __apply_to_index(self, changes):
+        """ Make the index follow changes, otherwise the index becomes outdated """
+        self.generation += 1
+        if self.index is not None and self.index.generation == self.generation - 1 and self.index.apply(changes):
+            self.index.generation = self.generation
 
     def push_list(self, cmdlist):
         """
@@ -34,6 +278,7 @@ class ConfigMgr(object):
         :param cmdlist: configuration change for FRR. Type: List of Strings
         """
         self.changes += "\n".join(cmdlist) + "\n"
+        self.__apply_to_index("\n".join(cmdlist))
 
     def push(self, cmd):
         """
@@ -41,6 +286,7 @@ class ConfigMgr(object):
         :param cmd: configuration change for FRR. Type: String
         """
         self.changes += cmd + "\n"
+        self.__apply_to_index(cmd)
         return True
 
     def restart_peer_groups(self, peer_groups):
@@ -59,7 +305,9 @@ class ConfigMgr(object):
             return True
         rc_write = self.frr.write(self.changes)
         rc_restart = self.frr.restart_peer_groups(self.peer_groups_to_restart)
+        index = self.index if rc_write and rc_restart else None  # FRR configuration is unknown after a failure
         self.reset()
+        self.index = index
         return rc_write and rc_restart
 
     def get_text(self):
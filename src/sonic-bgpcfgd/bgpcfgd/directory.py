@@ -5,10 +5,23 @@ from .log import log_err
 
 class Directory(object):
     """ This class stores values and notifies callbacks which were registered to be executed as soon
-        as some value is changed. This class works as DB cache mostly """
+        as some value is changed. This class works as DB cache mostly.
+        Registered paths are indexed by the slot and the first element of the path (the key),
+        so a change of a key only looks at the paths under the key and at the whole slot subscriptions.
+        Existence of the subscribed paths is tracked, every subscribed list of dependencies keeps
+        a counter of unavailable paths, which makes available_deps() cheap """
     def __init__(self):
         self.data = defaultdict(dict)  # storage. A key is a slot name, a value is a dictionary with data
-        self.notify = defaultdict(lambda: defaultdict(list))  # registered callbacks: slot -> path -> handlers[]
+        # registered callbacks: slot -> key -> path -> handlers[]. The key is '' for the whole slot subscriptions
+        self.notify = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+        self.deps_groups = {}  # tuple of dependencies -> {'unavailable': counter, 'slots': whole slot dependencies}
+        self.path_state = defaultdict(lambda: defaultdict(dict))  # tracked paths: slot -> key -> path -> True if exists
+        self.path_groups = defaultdict(list)  # (slot, path) -> dependency groups with the path
+
+    @staticmethod
+    def get_path_key(path):
+        """ Return the first element of the path, which is the key in the slot """
+        return path.split("/", 1)[0]
 
     @staticmethod
     def get_slot_name(db, table):
@@ -71,12 +84,13 @@ class Directory(object):
         """
         slot = self.get_slot_name(db, table)
         self.data[slot][key] = value
+        self.update_path_state(slot, [key])
         if slot in self.notify:
             handlers_to_run = []
-
-            for path in self.notify[slot].keys():
-                if self.path_exist(db, table, path):
-                    handlers_to_run += self.notify[slot][path]
+            for path_key in set([key, '']):
+                for path, handlers in list(self.notify[slot].get(path_key, {}).items()):
+                    if self.path_traverse(slot, path)[0]:
+                        handlers_to_run += [handler for handler in handlers if handler not in handlers_to_run]
 
             for handler in handlers_to_run:
                 handler()
@@ -113,6 +127,7 @@ class Directory(object):
         if slot in self.data:
             if key in self.data[slot]:
                 del self.data[slot][key]
+                self.update_path_state(slot, [key])
             else:
                 log_err("Directory: Can't remove key '%s' from slot '%s'. The key doesn't exist" % (key, slot))
         else:
@@ -127,6 +142,7 @@ class Directory(object):
         slot = self.get_slot_name(db, table)
         if slot in self.data:
             del self.data[slot]
+            self.update_path_state(slot, list(self.path_state[slot].keys()))
         else:
             log_err("Directory: Can't remove slot '%s'. The slot doesn't exist" % slot)
 
@@ -146,10 +162,48 @@ class Directory(object):
         :param deps: list of dependencies
         :return: True if all dependencies are presented, False otherwise
         """
-        res = True
-        for db, table, path in deps:
-            res = res and self.path_exist(db, table, path)
-        return res
+        group = self.deps_groups.get(tuple(deps))
+        if group is None:  # not subscribed dependencies are not tracked
+            return all(self.path_exist(db, table, path) for db, table, path in deps)
+        return group['unavailable'] == 0 and all(slot in self.data for slot in group['slots'])
+
+    def track_deps(self, deps):
+        """
+        Start tracking of the dependencies availability
+        :param deps: list of dependencies
+        """
+        if tuple(deps) in self.deps_groups:
+            return
+        group = {'unavailable': 0, 'slots': []}
+        for slot, path in set((self.get_slot_name(db, table), path) for db, table, path in deps):
+            if path == '':
+                # whole slot dependency. The slot could be created by reading it, so it's checked every time
+                group['slots'].append(slot)
+                continue
+            path_key = self.get_path_key(path)
+            if path not in self.path_state[slot][path_key]:
+                self.path_state[slot][path_key][path] = self.path_traverse(slot, path)[0]
+            if not self.path_state[slot][path_key][path]:
+                group['unavailable'] += 1
+            self.path_groups[(slot, path)].append(group)
+        self.deps_groups[tuple(deps)] = group
+
+    def update_path_state(self, slot, keys):
+        """
+        Update existence of the tracked paths after the keys were changed
+        :param slot: slot name
+        :param keys: changed keys of the slot
+        """
+        if slot not in self.path_state:
+            return
+        for key in keys:
+            for path, exists in self.path_state[slot].get(key, {}).items():
+                new_exists = self.path_traverse(slot, path)[0]
+                if new_exists == exists:
+                    continue
+                self.path_state[slot][key][path] = new_exists
+                for group in self.path_groups[(slot, path)]:
+                    group['unavailable'] += -1 if new_exists else 1
 
     def subscribe(self, deps, handler):
         """
@@ -160,11 +214,13 @@ class Directory(object):
         """
         for db, table, path in deps:
             slot = self.get_slot_name(db, table)
-            self.notify[slot][path].append(handler)
+            self.notify[slot][self.get_path_key(path)][path].append(handler)
+        self.track_deps(deps)
 
     def unsubscribe(self, deps):
         for db, table, path in deps:
             slot = self.get_slot_name(db, table)
             if slot in self.notify:
-                if path in self.notify[slot]:
-                    del self.notify[slot][path]
\ No newline at end of file
+                path_key = self.get_path_key(path)
+                if path in self.notify[slot].get(path_key, {}):
+                    del self.notify[slot][path_key][path]
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 import datetime
+import socket
 import time
 import tempfile
 
@@ -8,10 +9,81 @@ from .vars import g_debug
 from .utils import run_command
 
 
+class VtyClient(object):
+    """
+    Persistent session with the vty socket of one FRR daemon.
+    The vtysh protocol is used: a command is terminated by '\\0',
+    the reply is terminated by three '\\0' followed by the return code
+    """
+    VTY_DIR = '/run/frr'
+    TIMEOUT = 120
+
+    def __init__(self, daemon):
+        self.daemon = daemon
+        self.sock = None
+
+    def connect(self):
+        """
+        Connect to the daemon and enter the enable mode
+        :return: True if the session is established, False otherwise
+        """
+        path = os.path.join(self.VTY_DIR, '%s.vty' % self.daemon)
+        if not os.path.exists(path):
+            return False
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.settimeout(self.TIMEOUT)
+            self.sock.connect(path)
+            ret_code, out = self.__execute('enable')
+        except (socket.error, OSError) as e:
+            log_warn("Can't connect to the vty of FRR daemon '%s': %s" % (self.daemon, str(e)))
+            self.close()
+            return False
+        if ret_code != 0:
+            log_warn("Can't enter enable mode on FRR daemon '%s': rc=%d out='%s'" % (self.daemon, ret_code, out))
+            self.close()
+            return False
+        return True
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def __execute(self, command):
+        self.sock.sendall(command.encode('utf-8') + b'\0')
+        reply = b''
+        while len(reply) < 4 or reply[-4:-1] != b'\0\0\0':
+            chunk = self.sock.recv(16384)
+            if not chunk:
+                raise socket.error("connection closed by FRR daemon '%s'" % self.daemon)
+            reply += chunk
+        return reply[-1], reply[:-4].decode('utf-8', 'replace')
+
+    def execute(self, commands):
+        """
+        Execute commands in the session, connecting first if required
+        :param commands: list of commands to execute
+        :return: list of tuples (return code, output), one per command. None if the daemon isn't reachable
+        """
+        if self.sock is None and not self.connect():
+            return None
+        results = []
+        try:
+            for command in commands:
+                results.append(self.__execute(command))
+        except (socket.error, OSError) as e:
+            log_warn("Lost the vty session with FRR daemon '%s': %s" % (self.daemon, str(e)))
+            self.close()
+            return None
+        return results
+
+
 class FRR(object):
     """Proxy object with FRR"""
     def __init__(self, daemons):
         self.daemons = daemons
+        self.bgpd_vty = VtyClient("bgpd")
 
     def wait_for_daemons(self, seconds):
         """
@@ -54,15 +126,21 @@ class FRR(object):
                 os.remove(tmp_filename)
         return ret_code == 0
 
-    @staticmethod
-    def restart_peer_groups(peer_groups):
+    def restart_peer_groups(self, peer_groups):
         """ Restart peer-groups which support BBR
+        All peer-groups are restarted in one session with bgpd. vtysh is used when bgpd vty isn't reachable
         :param peer_groups: List of peer_groups to restart
         :return: True if restart of all peer-groups was successful, False otherwise
         """
+        peer_groups = sorted(set(peer_groups))
+        commands = ["clear bgp peer-group %s soft in" % peer_group for peer_group in peer_groups]
+        results = self.bgpd_vty.execute(commands) if commands else []
+        if results is None:
+            results = [run_command(["vtysh", "-c", command]) for command in commands]
+        else:
+            results = [(rc, out, "") for rc, out in results]
         res = True
-        for peer_group in sorted(peer_groups):
-            rc, out, err = run_command(["vtysh", "-c", "clear bgp peer-group %s soft in" % peer_group])
+        for peer_group, (rc, out, err) in zip(peer_groups, results):
             if rc != 0:
                 log_value = peer_group, rc, out, err
                 log_crit("Can't restart bgp peer-group '%s'. rc='%d', out='%s', err='%s'" % log_value)
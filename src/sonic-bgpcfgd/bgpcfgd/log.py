@@ -2,32 +2,37 @@ import syslog
 
 from .vars import g_debug
 
-def log_debug(msg):
-    """ Send a message msg to the syslog as DEBUG """
+def _format(msg, args):
+    """ Format msg % args. The arguments are only formatted for the messages which are sent """
+    return msg % args if args else msg
+
+
+def log_debug(msg, *args):
+    """ Send a message msg % args to the syslog as DEBUG """
     if g_debug:
-        syslog.syslog(syslog.LOG_DEBUG, msg)
+        syslog.syslog(syslog.LOG_DEBUG, _format(msg, args))
 
 
-def log_notice(msg):
-    """ Send a message msg to the syslog as NOTICE """
-    syslog.syslog(syslog.LOG_NOTICE, msg)
+def log_notice(msg, *args):
+    """ Send a message msg % args to the syslog as NOTICE """
+    syslog.syslog(syslog.LOG_NOTICE, _format(msg, args))
 
 
-def log_info(msg):
-    """ Send a message msg to the syslog as INFO """
-    syslog.syslog(syslog.LOG_INFO, msg)
+def log_info(msg, *args):
+    """ Send a message msg % args to the syslog as INFO """
+    syslog.syslog(syslog.LOG_INFO, _format(msg, args))
 
 
-def log_warn(msg):
-    """ Send a message msg to the syslog as WARNING """
-    syslog.syslog(syslog.LOG_WARNING, msg)
+def log_warn(msg, *args):
+    """ Send a message msg % args to the syslog as WARNING """
+    syslog.syslog(syslog.LOG_WARNING, _format(msg, args))
 
 
-def log_err(msg):
-    """ Send a message msg to the syslog as ERR """
-    syslog.syslog(syslog.LOG_ERR, msg)
+def log_err(msg, *args):
+    """ Send a message msg % args to the syslog as ERR """
+    syslog.syslog(syslog.LOG_ERR, _format(msg, args))
 
 
-def log_crit(msg):
-    """ Send a message msg to the syslog as CRIT """
-    syslog.syslog(syslog.LOG_CRIT, msg)
\ No newline at end of file
+def log_crit(msg, *args):
+    """ Send a message msg % args to the syslog as CRIT """
+    syslog.syslog(syslog.LOG_CRIT, _format(msg, args))
@@ -1,3 +1,4 @@
+import argparse
 import os
 import signal
 import subprocess
@@ -32,7 +33,7 @@ from .managers_prefix_list import PrefixListMgr
 from .managers_as_path import AsPathMgr
 from .static_rt_timer import StaticRouteTimer
 from .runner import Runner, signal_handler
-from .template import TemplateFabric
+from .template import TemplateFabric, TEMPLATE_CACHE_DIR
 from .utils import read_constants
 from .frr import FRR
 from .vars import g_debug
@@ -66,7 +67,7 @@ def do_work():
     common_objs = {
         'directory': Directory(),
         'cfg_mgr':   ConfigMgr(frr),
-        'tf':        TemplateFabric(),
+        'tf':        TemplateFabric(cache_dir=TEMPLATE_CACHE_DIR),
         'constants': read_constants(),
         'state_db_conn': swsscommon.DBConnector("STATE_DB", 0)
     }
@@ -137,7 +138,22 @@ def do_work():
     runner.run()
 
 
+def precompile_templates():
+    """ Compile the FRR templates into the bytecode cache, run at image build time """
+    if not os.path.isdir(TEMPLATE_CACHE_DIR):
+        os.makedirs(TEMPLATE_CACHE_DIR)
+    compiled = TemplateFabric(cache_dir=TEMPLATE_CACHE_DIR).precompile()
+    print("Compiled %d templates into %s" % (compiled, TEMPLATE_CACHE_DIR))
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Dynamically generate BGP configuration for FRR")
+    parser.add_argument("--precompile-templates", help="compile the templates into the bytecode cache and exit", action='store_true')
+    args = parser.parse_args()
+    if args.precompile_templates:
+        precompile_templates()
+        return
+
     rc = 0
     try:
         syslog.openlog('bgpcfgd')
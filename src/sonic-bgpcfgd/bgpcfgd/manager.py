@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from swsscommon import swsscommon
 
 from .log import log_debug, log_err
@@ -20,7 +22,7 @@ class Manager(object):
         self.db_name = database
         self.table_name = table_name
         self.wait_for_all_deps = wait_for_all_deps  # control whether the manager should wait for all dependencies to be set before processing any 'SET' command
-        self.set_queue = []
+        self.set_queue = OrderedDict()  # key -> data of 'SET' commands which are not processed yet
         self.directory.subscribe(deps, self.on_deps_change)  # subscribe this class method on directory changes
 
     def get_database(self):
@@ -31,6 +33,16 @@ class Manager(object):
         """ Return associated table name"""
         return self.table_name
 
+    def batch_handler(self, events):
+        """
+        This method is executed with all events received for the table since the previous call.
+        Superseded events of the same key are already removed by the Runner.
+        Override it to handle the events together, the default implementation calls handler() for each event.
+        :param events: list of tuples (key, op, data)
+        """
+        for key, op, data in events:
+            self.handler(key, op, data)
+
     def handler(self, key, op, data):
         """
         This method is executed on each add/remove event on the table.
@@ -42,26 +54,34 @@ class Manager(object):
             if (not self.wait_for_all_deps) or self.directory.available_deps(self.deps):  # all required dependencies are set in the Directory?
                 res = self.set_handler(key, data)
                 if not res:  # set handler returned False, which means it is not ready to process is. Save it for later.
-                    log_debug("'SET' handler returned NOT_READY for the Manager: %s" % self.__class__)
-                    self.set_queue.append((key, data))
+                    log_debug("'SET' handler returned NOT_READY for the Manager: %s", self.__class__)
+                    self.__enqueue(key, data)
             else:
-                log_debug("Not all dependencies are met for the Manager: %s" % self.__class__)
-                self.set_queue.append((key, data))
+                log_debug("Not all dependencies are met for the Manager: %s", self.__class__)
+                self.__enqueue(key, data)
         elif op == swsscommon.DEL_COMMAND:
+            self.set_queue.pop(key, None)  # the entry is removed, the postponed 'SET' is outdated
             self.del_handler(key)
         else:
             log_err("Invalid operation '%s' for key '%s'" % (op, key))
 
+    def __enqueue(self, key, data):
+        """ Postpone 'SET' command. Only the latest data is kept for the key """
+        self.set_queue.pop(key, None)
+        self.set_queue[key] = data
+
     def on_deps_change(self):
         """ This method is being executed on every dependency change """
+        if not self.set_queue:
+            return
         if self.wait_for_all_deps and not self.directory.available_deps(self.deps):
             return
-        new_queue = []
-        for key, data in self.set_queue:
+        for key, data in list(self.set_queue.items()):
+            if self.set_queue.get(key) is not data:
+                continue  # the entry was updated or removed by a handler executed before
             res = self.set_handler(key, data)
-            if not res:
-                new_queue.append((key, data))
-        self.set_queue = new_queue
+            if res and self.set_queue.get(key) is data:
+                del self.set_queue[key]
 
     def set_handler(self, key, data):
         """ Placeholder for 'SET' command """
@@ -45,6 +45,23 @@ class BGPAllowListMgr(Manager):
         self.enabled = self.__get_enabled()
         self.prefix_match_tag = self.__get_routemap_tag()
         self.__load_constant_lists()
+        self.batch_peer_group_maps = None  # peer-group to route-map and route-map to call mappings of the handled batch
+        self.batch_peer_groups = None  # peer-groups to restart after the handled batch
+
+    def batch_handler(self, events):
+        """
+        Handle the events of a batch together. The peer-group route-maps are looked up once per batch,
+        the policies don't change them. The affected peer-groups are scheduled for restart once
+        :param events: list of tuples (key, op, data)
+        """
+        self.batch_peer_groups = set()
+        try:
+            super(BGPAllowListMgr, self).batch_handler(events)
+        finally:
+            peer_groups, self.batch_peer_groups = self.batch_peer_groups, None
+            self.batch_peer_group_maps = None
+            if peer_groups:
+                self.cfg_mgr.restart_peer_groups(sorted(peer_groups))
 
     def set_handler(self, key, data):
         """
@@ -163,7 +180,6 @@ class BGPAllowListMgr(Manager):
         msg += " neighbor_type %s"
         log_info(msg % info)
         names = self.__generate_names(deployment_id, community_value, neighbor_type)
-        self.cfg_mgr.update()
         cmds = []
         cmds += self.__update_prefix_list(self.V4, names['pl_v4'], prefixes_v4)
         cmds += self.__update_prefix_list(self.V6, names['pl_v6'], prefixes_v6)
@@ -175,7 +191,7 @@ class BGPAllowListMgr(Manager):
         if cmds:
             self.cfg_mgr.push_list(cmds)
             peer_groups = self.__find_peer_group(deployment_id, neighbor_type)
-            self.cfg_mgr.restart_peer_groups(peer_groups)
+            self.__restart_peer_groups(peer_groups)
             log_debug("BGPAllowListMgr::__update_policy. The peers configuration scheduled for updates")
         else:
             log_debug("BGPAllowListMgr::__update_policy. Nothing to update")
@@ -196,7 +212,6 @@ class BGPAllowListMgr(Manager):
 
         default_action = self.__get_default_action_community()
         names = self.__generate_names(deployment_id, community_value, neighbor_type)
-        self.cfg_mgr.update()
         cmds = []
         cmds += self.__remove_allow_route_map_entry(self.V4, names['pl_v4'], names['community'], names['rm_v4'])
         cmds += self.__remove_allow_route_map_entry(self.V6, names['pl_v6'], names['community'], names['rm_v6'])
@@ -208,7 +223,7 @@ class BGPAllowListMgr(Manager):
         if cmds:
             self.cfg_mgr.push_list(cmds)
             peer_groups = self.__find_peer_group(deployment_id, neighbor_type)
-            self.cfg_mgr.restart_peer_groups(peer_groups)
+            self.__restart_peer_groups(peer_groups)
             log_debug("BGPAllowListMgr::__remove_policy. 'Allow list' policy was scheduled for removal")
         else:
             log_debug("BGPAllowListMgr::__remove_policy. Nothing to remove")
@@ -236,7 +251,7 @@ class BGPAllowListMgr(Manager):
                 'neigh_type': neighbor_type,
             }
             arguments = deployment_id, community_value, str(names)
-            log_debug("BGPAllowListMgr::__generate_names. deployment_id: %d, community: %s. names: %s" % arguments)
+            log_debug("BGPAllowListMgr::__generate_names. deployment_id: %d, community: %s. names: %s", *arguments)
         else:
             if community_value == BGPAllowListMgr.EMPTY_COMMUNITY:
                 community_name = BGPAllowListMgr.EMPTY_COMMUNITY
@@ -250,7 +265,7 @@ class BGPAllowListMgr(Manager):
                 "community": community_name,
             }
             arguments = deployment_id, neighbor_type, community_value, str(names)
-            log_debug("BGPAllowListMgr::__generate_names. deployment_id: %d, neighbor_type: %s, community: %s. names: %s" % arguments)
+            log_debug("BGPAllowListMgr::__generate_names. deployment_id: %d, neighbor_type: %s, community: %s. names: %s", *arguments)
         return names
 
     def __update_prefix_list(self, af, pl_name, allow_list):
@@ -264,7 +279,7 @@ class BGPAllowListMgr(Manager):
         assert af == self.V4 or af == self.V6
         constant_list = self.__get_constant_list(af)
         allow_list = self.__to_prefix_list(af, allow_list)
-        log_debug("BGPAllowListMgr::__update_prefix_list. af='%s' prefix-list name=%s" % (af, pl_name))
+        log_debug("BGPAllowListMgr::__update_prefix_list. af='%s' prefix-list name=%s", af, pl_name)
         '''
             Need to check exist and equality of the allowed prefix list.
             A. If exist and equal, no operation needed.
@@ -273,7 +288,7 @@ class BGPAllowListMgr(Manager):
         '''
         exist, correct = self.__is_prefix_list_valid(af, pl_name, allow_list, constant_list)
         if correct:
-            log_debug("BGPAllowListMgr::__update_prefix_list. the prefix-list '%s' exists and correct" % pl_name)
+            log_debug("BGPAllowListMgr::__update_prefix_list. the prefix-list '%s' exists and correct", pl_name)
             return []
         family = self.__af_to_family(af)
         cmds = []
@@ -293,10 +308,10 @@ class BGPAllowListMgr(Manager):
         :return: True if operation was successful, False otherwise
         """
         assert af == self.V4 or af == self.V6
-        log_debug("BGPAllowListMgr::__remove_prefix_lists. af='%s' pl_names='%s'" % (af, pl_name))
+        log_debug("BGPAllowListMgr::__remove_prefix_lists. af='%s' pl_names='%s'", af, pl_name)
         exist, _ = self.__is_prefix_list_valid(af, pl_name, [], [])
         if not exist:
-            log_debug("BGPAllowListMgr::__remove_prefix_lists: prefix_list '%s' not found" % pl_name)
+            log_debug("BGPAllowListMgr::__remove_prefix_lists: prefix_list '%s' not found", pl_name)
             return []
         family = self.__af_to_family(af)
         return ["no %s prefix-list %s" % (family, pl_name)]
@@ -332,20 +347,12 @@ class BGPAllowListMgr(Manager):
         """
         assert af == self.V4 or af == self.V6
         family = self.__af_to_family(af)
-        match_string = '%s prefix-list %s seq ' % (family, pl_name)
-        conf = self.cfg_mgr.get_text()
-        if not any(line.strip().startswith(match_string) for line in conf):
+        config_list = self.cfg_mgr.get_index().get_prefix_list(family, pl_name)
+        if config_list is None:
             return False, False  # if the prefix list is not exists, it is not correct
         expect_set = set(self.__normalize_ipnetwork(af, constant_list))
         expect_set.update(set(self.__normalize_ipnetwork(af, allow_list)))
 
-        config_list = []
-        for line in conf:
-            if line.startswith(match_string):
-                found = line[len(match_string):].strip().split(' ')
-                rule = " ".join(found[1:])
-                config_list.append(rule)
-
         # Return double Ture, when running configuraiton is identical with config db + constants.
         return True, expect_set == set(self.__normalize_ipnetwork(af, config_list))
 
@@ -356,7 +363,7 @@ class BGPAllowListMgr(Manager):
         :param community_value: community value for the peer
         :return: True if operation was successful, False otherwise
         """
-        log_debug("BGPAllowListMgr::__update_community. community_name='%s' community='%s'" % (community_name, community_value))
+        log_debug("BGPAllowListMgr::__update_community. community_name='%s' community='%s'", community_name, community_value)
         if community_value == self.EMPTY_COMMUNITY:  # we don't need to do anything for EMPTY community
             log_debug("BGPAllowListMgr::__update_community. Empty community. exiting")
             return []
@@ -364,7 +371,7 @@ class BGPAllowListMgr(Manager):
         exists, found_community_value = self.__is_community_presented(community_name)
         if exists:
             if community_value == found_community_value:
-                log_debug("BGPAllowListMgr::__update_community. community '%s' is already presented" % community_name)
+                log_debug("BGPAllowListMgr::__update_community. community '%s' is already presented", community_name)
                 return []
             else:
                 msg = "BGPAllowListMgr::__update_community. "
@@ -380,7 +387,7 @@ class BGPAllowListMgr(Manager):
         :param community_name: community value for the peer
         :return: True if operation was successful, False otherwise
         """
-        log_debug("BGPAllowListMgr::__remove_community. community='%s'" % community_name)
+        log_debug("BGPAllowListMgr::__remove_community. community='%s'", community_name)
         if community_name == self.EMPTY_COMMUNITY:  # we don't need to do anything for EMPTY community
             log_debug("BGPAllowListMgr::__remove_community. There is nothing to remove in empty community")
             return []
@@ -397,14 +404,11 @@ class BGPAllowListMgr(Manager):
         :return: A tuple. First element: True if operation was successful, False otherwise
                           Second element: community value if the first element is True no value otherwise
         """
-        log_debug("BGPAllowListMgr::__is_community_presented. community='%s'" % community_name)
-        match_string = 'bgp community-list standard %s permit ' % community_name
-        conf = self.cfg_mgr.get_text()
-        found = [line.strip() for line in conf if line.strip().startswith(match_string)]
+        log_debug("BGPAllowListMgr::__is_community_presented. community='%s'", community_name)
+        found = [value for action, value in self.cfg_mgr.get_index().get_community_list(community_name) if action == 'permit']
         if not found:
             return False, None
-        community_value = found[0].replace(match_string, '')
-        return True, community_value
+        return True, found[0]
 
     def __update_allow_route_map_entry(self, af, allow_address_pl_name, community_name, route_map_name):
         """
@@ -414,16 +418,15 @@ class BGPAllowListMgr(Manager):
         """
         assert af == self.V4 or af == self.V6
         info = af, route_map_name, allow_address_pl_name, community_name
-        log_debug("BGPAllowListMgr::__update_allow_route_map_entry. af='%s' Allow rm='%s' pl='%s' cl='%s'" % info)
+        log_debug("BGPAllowListMgr::__update_allow_route_map_entry. af='%s' Allow rm='%s' pl='%s' cl='%s'", *info)
         entries = self.__parse_allow_route_map_entries(af, route_map_name)
         found, _ = self.__find_route_map_entry(entries, allow_address_pl_name, community_name)
         if found:
-            log_debug("BGPAllowListMgr::__update_allow_route_map_entry. route-map='%s' is already found" % route_map_name)
+            log_debug("BGPAllowListMgr::__update_allow_route_map_entry. route-map='%s' is already found", route_map_name)
             return []
         seq_number = self.__find_next_seq_number(entries.keys(), community_name != self.EMPTY_COMMUNITY, route_map_name)
         info = af, seq_number, allow_address_pl_name, community_name
-        out = "af='%s' seqno='%d' Allow pl='%s' cl='%s'" % info
-        log_debug("BGPAllowListMgr::__update_allow_route_map_entry. %s" % out)
+        log_debug("BGPAllowListMgr::__update_allow_route_map_entry. af='%s' seqno='%d' Allow pl='%s' cl='%s'", *info)
         ip_version = "" if af == self.V4 else "v6"
         cmds = [
             'route-map %s permit %d' % (route_map_name, seq_number),
@@ -443,7 +446,7 @@ class BGPAllowListMgr(Manager):
         :param default_action_community: community value to mark not-matched prefixes
         """
         info = route_map_name, default_action_community
-        log_debug("BGPAllowListMgr::__update_default_route_map_entry. rm='%s' set_community='%s'" % info)
+        log_debug("BGPAllowListMgr::__update_default_route_map_entry. rm='%s' set_community='%s'", *info)
         current_default_action_value = self.__parse_default_action_route_map_entry(route_map_name)
         if current_default_action_value != default_action_community:
             return [
@@ -459,24 +462,16 @@ class BGPAllowListMgr(Manager):
         :param route_map_name: Name of the route-map to parse
         :return: a community value used for default action
         """
-        log_debug("BGPAllowListMgr::__parse_default_action_route_map_entries. rm='%s'" % route_map_name)
-        match_string = 'route-map %s permit 65535' % route_map_name
+        log_debug("BGPAllowListMgr::__parse_default_action_route_map_entries. rm='%s'", route_map_name)
         match_community = re.compile(r'^set community (\S+) additive$')
-        inside_route_map = False
         community_value = ""
-        conf = self.cfg_mgr.get_text()
-        for line in conf + [""]:
-            s_line = line.strip()
-            if inside_route_map:
-                matched = match_community.match(s_line)
-                if matched:
-                    community_value = matched.group(1)
-                    break
-                else:
-                    log_err("BGPAllowListMgr::Found incomplete route-map '%s' entry. seq_no=65535" % route_map_name)
-                inside_route_map = False
-            elif s_line == match_string:
-                inside_route_map = True
+        entry = self.cfg_mgr.get_index().get_route_map(route_map_name).get(65535)
+        if entry is not None and entry['action'] == 'permit':
+            matched = match_community.match(entry['lines'][0]) if entry['lines'] else None
+            if matched:
+                community_value = matched.group(1)
+            else:
+                log_err("BGPAllowListMgr::Found incomplete route-map '%s' entry. seq_no=65535" % route_map_name)
         if community_value == "":
             log_err("BGPAllowListMgr::Default action community value is not found. route-map '%s' entry. seq_no=65535" % route_map_name)
         return community_value
@@ -489,11 +484,11 @@ class BGPAllowListMgr(Manager):
         """
         assert af == self.V4 or af == self.V6
         info = af, route_map_name, allow_address_pl_name, community_name
-        log_debug("BGPAllowListMgr::__update_allow_route_map_entry. af='%s' Allow rm='%s' pl='%s' cl='%s'" % info)
+        log_debug("BGPAllowListMgr::__update_allow_route_map_entry. af='%s' Allow rm='%s' pl='%s' cl='%s'", *info)
         entries = self.__parse_allow_route_map_entries(af, route_map_name)
         found, seq_number = self.__find_route_map_entry(entries, allow_address_pl_name, community_name)
         if not found:
-            log_debug("BGPAllowListMgr::__update_allow_route_map_entry. Not found route-map '%s' entry" % allow_address_pl_name)
+            log_debug("BGPAllowListMgr::__update_allow_route_map_entry. Not found route-map '%s' entry", allow_address_pl_name)
             return []
         return ['no route-map %s permit %d' % (route_map_name, seq_number)]
 
@@ -513,7 +508,7 @@ class BGPAllowListMgr(Manager):
             allow_list_presented = values['pl_allow_list'] == allow_address_pl_name
             community_presented = values['community'] == community_name
             if allow_list_presented and community_presented:
-                log_debug("BGPAllowListMgr::__find_route_map_entry. found route-map '%s' entry" % allow_address_pl_name)
+                log_debug("BGPAllowListMgr::__find_route_map_entry. found route-map '%s' entry", allow_address_pl_name)
                 return True, sequence_number
         return False, None
 
@@ -525,45 +520,32 @@ class BGPAllowListMgr(Manager):
                           Second element: list of object with parsed route-map entries
         """
         assert af == self.V4 or af == self.V6
-        log_debug("BGPAllowListMgr::__parse_allow_route_map_entries. af='%s', rm='%s'" % (af, route_map_name))
-        match_string = 'route-map %s permit ' % route_map_name
+        log_debug("BGPAllowListMgr::__parse_allow_route_map_entries. af='%s', rm='%s'", af, route_map_name)
         entries = {}
-        inside_route_map = False
-        route_map_seq_number = None
-        pl_allow_list_name = None
-        community_name = self.EMPTY_COMMUNITY
         if af == self.V4:
             match_pl_allow_list = 'match ip address prefix-list '
         else:  # self.V6
             match_pl_allow_list = 'match ipv6 address prefix-list '
         match_community = 'match community '
-        conf = self.cfg_mgr.get_text()
-        for line in conf + [""]:
-            if inside_route_map:
-                if line.strip().startswith(match_pl_allow_list):
-                    pl_allow_list_name = line.strip()[len(match_pl_allow_list):]
-                    continue
-                elif line.strip().startswith(match_community):
-                    community_name = line.strip()[len(match_community):]
-                    continue
+        for route_map_seq_number, entry in self.cfg_mgr.get_index().get_route_map(route_map_name).items():
+            if entry['action'] != 'permit':
+                continue
+            pl_allow_list_name = None
+            community_name = self.EMPTY_COMMUNITY
+            for line in entry['lines']:
+                if line.startswith(match_pl_allow_list):
+                    pl_allow_list_name = line[len(match_pl_allow_list):]
+                elif line.startswith(match_community):
+                    community_name = line[len(match_community):]
                 else:
-                    if pl_allow_list_name is not None:
-                        entries[route_map_seq_number] = {
-                            'pl_allow_list': pl_allow_list_name,
-                            'community': community_name,
-                        }
-                    else:
-                        if route_map_seq_number != 65535:
-                            log_warn("BGPAllowListMgr::Found incomplete route-map '%s' entry. seq_no=%d" % (route_map_name, route_map_seq_number))
-                    inside_route_map = False
-                    pl_allow_list_name = None
-                    community_name = self.EMPTY_COMMUNITY
-                    route_map_seq_number = None
-            if line.startswith(match_string):
-                found = line[len(match_string):]
-                assert found.isdigit()
-                route_map_seq_number = int(found)
-                inside_route_map = True
+                    break
+            if pl_allow_list_name is not None:
+                entries[route_map_seq_number] = {
+                    'pl_allow_list': pl_allow_list_name,
+                    'community': community_name,
+                }
+            elif route_map_seq_number != 65535:
+                log_warn("BGPAllowListMgr::Found incomplete route-map '%s' entry. seq_no=%d" % (route_map_name, route_map_seq_number))
         return entries
 
     @staticmethod
@@ -589,7 +571,7 @@ class BGPAllowListMgr(Manager):
         if sequence_number is None:
             raise RuntimeError("No free sequence numbers for '%s'" % route_map_name)
         info = sequence_number, "yes" if has_community else "no"
-        log_debug("BGPAllowListMgr::__find_next_seq_number '%d' has_community='%s'" % info)
+        log_debug("BGPAllowListMgr::__find_next_seq_number '%d' has_community='%s'", *info)
         return sequence_number
 
     def __extract_peer_group_names(self):
@@ -597,14 +579,7 @@ class BGPAllowListMgr(Manager):
         Extract names of all peer-groups defined in the config
         :return: list of peer-group names
         """
-        # Find all peer-groups entries
-        re_peer_group = re.compile(r'^\s*neighbor (\S+) peer-group$')
-        peer_groups = []
-        for line in self.cfg_mgr.get_text():
-            result = re_peer_group.match(line)
-            if result:
-                peer_groups.append(result.group(1))
-        return peer_groups
+        return self.cfg_mgr.get_index().get_peer_groups()
 
     def __get_peer_group_to_route_map(self, peer_groups):
         """
@@ -614,13 +589,11 @@ class BGPAllowListMgr(Manager):
                  for the peer_group.
         """
         pg_2_rm = {}
+        config = self.cfg_mgr.get_index()
         for pg in peer_groups:
-            re_peer_group_rm = re.compile(r'^\s*neighbor %s route-map (\S+) in$' % pg)
-            for line in self.cfg_mgr.get_text():
-                result = re_peer_group_rm.match(line)
-                if result:
-                    pg_2_rm[pg] = result.group(1)
-                    break
+            route_map = config.get_neighbor_route_map(pg, 'in')
+            if route_map is not None:
+                pg_2_rm[pg] = route_map
         return pg_2_rm
 
     def __get_route_map_calls(self, rms):
@@ -630,23 +603,17 @@ class BGPAllowListMgr(Manager):
         :return: a dictionary: key - name of a route-map, value - name of a route-map call defined for the route-map
         """
         rm_2_call = {}
-        re_rm = re.compile(r'^route-map (\S+) permit \d+$')
-        re_call = re.compile(r'^\s*call (\S+)$')
-        inside_name = None
-        for line in self.cfg_mgr.get_text():
-            if inside_name:
-                inside_result = re_call.match(line)
-                if inside_result:
-                    rm_2_call[inside_name] = inside_result.group(1)
-                    inside_name = None
+        re_call = re.compile(r'^call (\S+)$')
+        config = self.cfg_mgr.get_index()
+        for rm in rms:
+            for entry in config.get_route_map(rm).values():
+                if entry['action'] != 'permit':
                     continue
-            result = re_rm.match(line)
-            if not result:
-                continue
-            inside_name = None
-            if result.group(1) not in rms:
-                continue
-            inside_name = result.group(1)
+                for line in entry['lines']:
+                    result = re_call.match(line)
+                    if result:
+                        rm_2_call[rm] = result.group(1)
+                        break
         return rm_2_call
 
     def __get_routemap_tag(self):
@@ -689,13 +656,27 @@ class BGPAllowListMgr(Manager):
         :param deployment_id: deployment_id number
         :return: a list of peer-groups which a used by devices with requested deployment_id number
         """
-        self.cfg_mgr.update()
-        peer_groups = self.__extract_peer_group_names()
-        pg_2_rm = self.__get_peer_group_to_route_map(peer_groups)
-        rm_2_call = self.__get_route_map_calls(set(pg_2_rm.values()))
+        if self.batch_peer_group_maps is not None:
+            pg_2_rm, rm_2_call = self.batch_peer_group_maps
+        else:
+            peer_groups = self.__extract_peer_group_names()
+            pg_2_rm = self.__get_peer_group_to_route_map(peer_groups)
+            rm_2_call = self.__get_route_map_calls(set(pg_2_rm.values()))
+            if self.batch_peer_groups is not None:
+                self.batch_peer_group_maps = pg_2_rm, rm_2_call
         ret = self.__get_peer_group_to_restart(deployment_id, pg_2_rm, rm_2_call, neighbor_type)
         return list(ret)
 
+    def __restart_peer_groups(self, peer_groups):
+        """
+        Schedule peer-groups for restart. While a batch is handled, they are scheduled after the batch
+        :param peer_groups: a list of peer-group names
+        """
+        if self.batch_peer_groups is not None:
+            self.batch_peer_groups.update(peer_groups)
+        else:
+            self.cfg_mgr.restart_peer_groups(peer_groups)
+
     def __get_enabled(self):
         """
         Load enable/disabled property from constants
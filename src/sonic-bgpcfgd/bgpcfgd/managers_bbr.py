@@ -1,5 +1,3 @@
-import re
-
 from swsscommon import swsscommon
 
 from .log import log_err, log_info
@@ -174,11 +172,4 @@ class BBRMgr(Manager):
         Extract configured peer-groups from the config
         :return: set of available peer-groups
         """
-        re_pg = re.compile(r'^\s*neighbor\s+(\S+)\s+peer-group\s*$')
-        res = set()
-        self.cfg_mgr.update()
-        for line in self.cfg_mgr.get_text():
-            m = re_pg.match(line)
-            if m:
-                res.add(m.group(1))
-        return res
\ No newline at end of file
+        return set(self.cfg_mgr.get_index().get_peer_groups())
\ No newline at end of file
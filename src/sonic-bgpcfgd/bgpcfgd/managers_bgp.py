@@ -1,4 +1,5 @@
 import json
+from collections import OrderedDict
 from swsscommon import swsscommon
 
 import jinja2
@@ -99,6 +100,8 @@ class BGPPeerMgrBase(Manager):
         self.peer_type = peer_type
         self.loopbacks = ["Loopback0"]
         self.post_dependencies_init_complete = False
+        self.pending_ops = None  # vrf -> commands of the handled batch, which are not pushed yet
+        self.state_peer_table = None  # STATE_DB table shared by the events of the handled batch
 
         base_template = "bgpd/templates/" + self.constants["bgp"]["peers"][peer_type]["template_dir"] + "/"
         self.templates = {
@@ -156,6 +159,21 @@ class BGPPeerMgrBase(Manager):
         self.peer_group_mgr = BGPPeerGroupMgr(self.common_objs, base_template)
         return
 
+    def batch_handler(self, events):
+        """
+        Handle the events of a batch together. The commands for all peers of a vrf are pushed to FRR
+        in one 'router bgp' section and STATE_DB is updated over one connection
+        :param events: list of tuples (key, op, data)
+        """
+        self.pending_ops = OrderedDict()
+        try:
+            super(BGPPeerMgrBase, self).batch_handler(events)
+        finally:
+            pending_ops, self.pending_ops = self.pending_ops, None
+            self.state_peer_table = None
+            for vrf, cmds in pending_ops.items():
+                self.push_op("\n".join(cmds), vrf)
+
     def set_handler(self, key, data):
         """
          It runs on 'SET' command
@@ -198,7 +216,7 @@ class BGPPeerMgrBase(Manager):
             interface = self.get_local_interface(data["local_addr"])
             if not interface:
                 print_data = nbr, data["local_addr"]
-                log_debug("Peer '%s' with local address '%s' wait for the corresponding interface to be set" % print_data)
+                log_debug("Peer '%s' with local address '%s' wait for the corresponding interface to be set", *print_data)
                 return False
 
         kwargs = {
@@ -283,8 +301,7 @@ class BGPPeerMgrBase(Manager):
             key = vrf + "|" + nbr
         # Update the peer in the STATE_DB table
         try:
-            state_db = swsscommon.DBConnector("STATE_DB", 0)
-            state_peer_table = swsscommon.Table(state_db, swsscommon.STATE_BGP_PEER_CONFIGURED_TABLE_NAME)
+            state_peer_table = self.get_state_peer_table()
             if (op == "SET"):
                 state_peer_table.set(key, list(sorted(data.items())))
                 log_info("Peer '(%s)' has been added to BGP_PEER_CONFIGURED_TABLE with attributes '%s'" % (key, data))
@@ -303,6 +320,19 @@ class BGPPeerMgrBase(Manager):
             log_err("Update of state db failed for peer '(%s)' with error: %s" % (key, str(e)))
             return False
 
+    def get_state_peer_table(self):
+        """
+        Get STATE_DB table of the configured peers. The table is reused while a batch is handled
+        :return: swsscommon Table object
+        """
+        if self.state_peer_table is not None:
+            return self.state_peer_table
+        state_db = swsscommon.DBConnector("STATE_DB", 0)
+        state_peer_table = swsscommon.Table(state_db, swsscommon.STATE_BGP_PEER_CONFIGURED_TABLE_NAME)
+        if self.pending_ops is not None:
+            self.state_peer_table = state_peer_table
+        return state_peer_table
+
     def update_peer(self, vrf, nbr, data):
         """
         Update a peer. This is used when the peer is already in the FRR
@@ -498,6 +528,18 @@ class BGPPeerMgrBase(Manager):
         :param vrf: vrf where the commands should be applied
         :return: True if no errors, False if there are errors
         """
+        if self.pending_ops is not None:
+            self.pending_ops.setdefault(vrf, []).append(cmd)
+            return True
+        self.push_op(cmd, vrf)
+        return True
+
+    def push_op(self, cmd, vrf):
+        """
+        Push commands cmd into FRR inside of the 'router bgp' section of the vrf
+        :param cmd: commands in raw format
+        :param vrf: vrf where the commands should be applied
+        """
         bgp_asn = self.directory.get_slot("CONFIG_DB", swsscommon.CFG_DEVICE_METADATA_TABLE_NAME)["localhost"]["bgp_asn"]
         enable_bgp_suppress_fib_pending_cmd = 'bgp suppress-fib-pending'
         if vrf == 'default':
@@ -505,7 +547,6 @@ class BGPPeerMgrBase(Manager):
         else:
             cmd = ('router bgp %s vrf %s\n %s\n' % (bgp_asn, vrf, enable_bgp_suppress_fib_pending_cmd)) + cmd + "\nexit"
         self.cfg_mgr.push(cmd)
-        return True
 
     def get_lo_ipv4(self, loopback_str):
         """
@@ -26,12 +26,33 @@ class StaticRouteMgr(Manager):
         self.static_routes = {}
         self.vrf_pending_redistribution = set()
         self.config_db = None
+        self.pending_cmds = None  # commands of the handled batch, which are not pushed yet
 
     OP_DELETE = 'DELETE'
     OP_ADD = 'ADD'
     ROUTE_ADVERTISE_ENABLE_TAG = '1'
     ROUTE_ADVERTISE_DISABLE_TAG = '2'
 
+    def batch_handler(self, events):
+        """
+        Handle the events of a batch together. The commands for all routes of the batch are pushed to FRR at once
+        :param events: list of tuples (key, op, data)
+        """
+        self.pending_cmds = []
+        try:
+            super(StaticRouteMgr, self).batch_handler(events)
+        finally:
+            cmd_list, self.pending_cmds = self.pending_cmds, None
+            if cmd_list:
+                self.cfg_mgr.push_list(cmd_list)
+
+    def push_list(self, cmd_list):
+        """ Push the commands to FRR. While a batch is handled, they are pushed after the batch """
+        if self.pending_cmds is not None:
+            self.pending_cmds.extend(cmd_list)
+        else:
+            self.cfg_mgr.push_list(cmd_list)
+
     def set_handler(self, key, data):
         vrf, ip_prefix = self.split_key(key)
         is_ipv6 = TemplateFabric.is_ipv6(ip_prefix)
@@ -70,7 +91,7 @@ class StaticRouteMgr(Manager):
                 self.vrf_pending_redistribution.add(vrf)
 
         if cmd_list:
-            self.cfg_mgr.push_list(cmd_list)
+            self.push_list(cmd_list)
             log_debug("{} Static route {} is scheduled for updates. {}".format(self.db_name, key, str(cmd_list)))
         else:
             log_debug("{} Nothing to update for static route {}".format(self.db_name, key))
@@ -146,7 +167,7 @@ class StaticRouteMgr(Manager):
             self.vrf_pending_redistribution.discard(vrf)
 
         if cmd_list:
-            self.cfg_mgr.push_list(cmd_list)
+            self.push_list(cmd_list)
             log_debug("{} Static route {} is scheduled for updates. {}".format(self.db_name, key, str(cmd_list)))
         else:
             log_debug("{} Nothing to update for static route {}".format(self.db_name, key))
@@ -317,7 +338,7 @@ class IpNextHopSet(set):
         if len(nums) != 1:
             log_err("Lists of next-hop attribute have different sizes: %s" % nums)
             for x in [bkh_list, ip_list, intf_list, dist_list, vrf_list]:
-                log_debug("List: %s" % x)
+                log_debug("List: %s", x)
             raise ValueError
         nh_cnt = nums.pop()
         item = lambda lst, i: lst[i] if lst is not None else None
@@ -1,7 +1,8 @@
-from collections import defaultdict
+import time
+from collections import defaultdict, OrderedDict
 from swsscommon import swsscommon
 
-from .log import log_debug, log_crit
+from .log import log_debug, log_crit, log_info
 
 
 g_run = True
@@ -19,14 +20,34 @@ class Runner(object):
         when corresponding db/table is updated
     """
     SELECT_TIMEOUT = 1000
+    COMMIT_DEBOUNCE = 50      # ms. Wait for more events this long before committing to FRR
+    COMMIT_MAX_DELAY = 1.0    # seconds. Commit at least this often while events keep coming
+    COUNTERS_LOG_INTERVAL = 60  # seconds
+    # Events of tables with lower priority value are handled first,
+    # so the data other managers depend on is ready when their events are handled
+    TABLE_PRIORITY = {
+        "DEVICE_METADATA": 0,
+        "DEVICE_NEIGHBOR_METADATA": 1,
+        "BGP_DEVICE_GLOBAL": 1,
+        "LOOPBACK_INTERFACE": 2,
+        "INTERFACE": 2,
+        "VLAN_INTERFACE": 2,
+        "PORTCHANNEL_INTERFACE": 2,
+        "VOQ_INBAND_INTERFACE": 2,
+        "VLAN_SUB_INTERFACE": 2,
+        "INTERFACE_TABLE": 2,
+    }
+    DEFAULT_TABLE_PRIORITY = 10
 
     def __init__(self, cfg_manager):
         """ Constructor """
         self.cfg_manager = cfg_manager
         self.db_connectors = {}
         self.selector = swsscommon.Select()
-        self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> handlers[]
-        self.subscribers = set()
+        self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> batch handlers[]
+        self.subscribers = []  # (priority, db, db_name, table_name, subscriber) ordered by priority
+        self.counters = defaultdict(lambda: defaultdict(int))  # 'db_name|table_name' -> counter -> value
+        self.counters_log_time = time.time()
 
     def add_manager(self, manager):
         """
@@ -47,9 +68,66 @@ class Runner(object):
         if table_name not in self.callbacks[db]:
             conn = self.db_connectors[db]
             subscriber = swsscommon.SubscriberStateTable(conn, table_name)
-            self.subscribers.add(subscriber)
+            priority = self.TABLE_PRIORITY.get(table_name, self.DEFAULT_TABLE_PRIORITY)
+            self.subscribers.append((priority, db, db_name, table_name, subscriber))
+            self.subscribers.sort(key=lambda item: item[0])  # the sort is stable, the order of adding is kept
             self.selector.addSelectable(subscriber)
-        self.callbacks[db][table_name].append(manager.handler)
+        self.callbacks[db][table_name].append(manager.batch_handler)
+
+    def collect_events(self, pending):
+        """
+        Read all events ready in the subscribers. Superseded events of the same key are dropped:
+        'SET' replaces the previous 'SET', 'DEL' replaces all 'SET' received after the previous 'DEL'
+        :param pending: collected events. Dictionary: (db, table_name) -> OrderedDict: key -> list of (op, data)
+        """
+        for _, db, db_name, table_name, subscriber in self.subscribers:
+            counters = self.counters["%s|%s" % (db_name, table_name)]
+            while True:
+                key, op, fvs = subscriber.pop()
+                if not key:
+                    break
+                log_debug("Received message : '%s'", (key, op, fvs))
+                counters['received'] += 1
+                key_events = pending.setdefault((db, table_name), OrderedDict()).setdefault(key, [])
+                if key_events and key_events[-1][0] == swsscommon.SET_COMMAND and op in (swsscommon.SET_COMMAND, swsscommon.DEL_COMMAND):
+                    key_events.pop()
+                    counters['collapsed'] += 1
+                if key_events and key_events[-1][0] == swsscommon.DEL_COMMAND and op == swsscommon.DEL_COMMAND:
+                    counters['collapsed'] += 1
+                    continue
+                key_events.append((op, dict(fvs)))
+
+    def dispatch_events(self, pending):
+        """
+        Run batch handlers of the managers for collected events in order of the table priorities
+        :param pending: events collected by collect_events()
+        """
+        for _, db, db_name, table_name, _ in self.subscribers:
+            table_events = pending.get((db, table_name))
+            if not table_events:
+                continue
+            events = [(key, op, data) for key, key_events in table_events.items() for op, data in key_events]
+            counters = self.counters["%s|%s" % (db_name, table_name)]
+            counters['handled'] += len(events)
+            counters['max_queue_depth'] = max(counters['max_queue_depth'], len(events))
+            start = time.time()
+            for callback in self.callbacks[db][table_name]:
+                self.cfg_manager.invalidate_index()  # every handler invocation starts from the current FRR configuration
+                callback([(key, op, dict(data)) for key, op, data in events])
+            elapsed_ms = int((time.time() - start) * 1000)
+            counters['handler_time_ms'] += elapsed_ms
+            counters['max_handler_time_ms'] = max(counters['max_handler_time_ms'], elapsed_ms)
+            log_debug("Runner::Handled %d events of '%s|%s' in %d ms", len(events), db_name, table_name, elapsed_ms)
+
+    def log_counters(self):
+        """ Report counters of handled events periodically """
+        now = time.time()
+        if now - self.counters_log_time < self.COUNTERS_LOG_INTERVAL:
+            return
+        self.counters_log_time = now
+        for table, counters in sorted(self.counters.items()):
+            if counters['received']:
+                log_info("Runner::Counters '%s': %s" % (table, ", ".join("%s=%d" % item for item in sorted(counters.items()))))
 
     def run(self):
         """ Main loop """
@@ -60,14 +138,17 @@ class Runner(object):
             elif state == self.selector.ERROR:
                 raise Exception("Received error from select")
 
-            for subscriber in self.subscribers:
-                while True:
-                    key, op, fvs = subscriber.pop()
-                    if not key:
-                        break
-                    log_debug("Received message : '%s'" % str((key, op, fvs)))
-                    for callback in self.callbacks[subscriber.getDbConnector().getDbId()][subscriber.getTableName()]:
-                        callback(key, op, dict(fvs))
+            pending = {}
+            self.collect_events(pending)
+            # Coalesce successive bursts of events into one batch and one commit
+            commit_time = time.time() + Runner.COMMIT_MAX_DELAY
+            while g_run and time.time() < commit_time:
+                state, _ = self.selector.select(Runner.COMMIT_DEBOUNCE)
+                if state != self.selector.OBJECT:
+                    break
+                self.collect_events(pending)
+            self.dispatch_events(pending)
             rc = self.cfg_manager.commit()
             if not rc:
                 log_crit("Runner::commit was unsuccessful")
+            self.log_counters()
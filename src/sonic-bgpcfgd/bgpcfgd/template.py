@@ -1,18 +1,64 @@
 from collections import OrderedDict
 from functools import partial
 
+import hashlib
 import jinja2
 import netaddr
 import os
 
-from .log import log_err
+from .log import log_err, log_notice
+
+TEMPLATE_CACHE_DIR = '/var/cache/sonic/jinja2/bgpcfgd'
+
+
+class TemplateBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    On-disk cache of compiled templates. Entries are keyed by template name and path
+    plus the options and filters of the environment. jinja2 drops an entry once the
+    template source checksum changes. Keep in sync with TemplateBytecodeCache of sonic-cfggen
+    """
+    @staticmethod
+    def environment_salt(environment):
+        salt = [jinja2.__version__, str(environment.trim_blocks), str(environment.lstrip_blocks)]
+        salt += sorted(environment.filters)
+        salt += sorted(environment.tests)
+        salt += sorted(environment.globals)
+        return hashlib.sha1('|'.join(salt).encode()).hexdigest()
+
+    def get_bucket(self, environment, name, filename, source):
+        return super(TemplateBytecodeCache, self).get_bucket(environment,
+            self.environment_salt(environment) + '|' + name, filename, source)
+
+    def load_bytecode(self, bucket):
+        # The cache is only an optimization, an entry which can't be read is treated as a miss
+        try:
+            super(TemplateBytecodeCache, self).load_bytecode(bucket)
+        except OSError:
+            bucket.reset()
+
+    def dump_bytecode(self, bucket):
+        try:
+            super(TemplateBytecodeCache, self).dump_bytecode(bucket)
+        except OSError:
+            pass
+
 
 class TemplateFabric(object):
     """ Fabric for rendering jinja2 templates """
-    def __init__(self, template_path = '/usr/share/sonic/templates'):
+    def __init__(self, template_path = '/usr/share/sonic/templates', cache_dir = None):
+        """
+        Initialize the object
+        :param template_path: path to the templates
+        :param cache_dir: directory of the compiled templates cache. The cache is used only when the directory exists
+                          and is readable and writable
+        """
+        self.template_path = template_path
+        bytecode_cache = None
+        if cache_dir is not None and os.path.isdir(cache_dir) and os.access(cache_dir, os.R_OK | os.W_OK):
+            bytecode_cache = TemplateBytecodeCache(cache_dir)
         j2_template_paths = [template_path]
         j2_loader = jinja2.FileSystemLoader(j2_template_paths)
-        j2_env = jinja2.Environment(loader=j2_loader, trim_blocks=False)
+        j2_env = jinja2.Environment(loader=j2_loader, trim_blocks=False, bytecode_cache=bytecode_cache)
         j2_env.filters['ipv4'] = self.is_ipv4
         j2_env.filters['ipv6'] = self.is_ipv6
         j2_env.filters['pfx_filter'] = self.pfx_filter
@@ -21,6 +67,21 @@ class TemplateFabric(object):
             j2_env.filters[attr] = partial(self.prefix_attr, attr)
         self.env = j2_env
 
+    def precompile(self):
+        """
+        Compile all templates under the template path into the bytecode cache
+        :return: number of compiled templates
+        """
+        compiled = 0
+        for name in self.env.list_templates(filter_func=lambda name: name.endswith('.j2')):
+            try:
+                self.env.get_template(name)
+                compiled += 1
+            except jinja2.TemplateError as e:
+                log_err("Can't compile template '%s': %s" % (name, str(e)))
+        log_notice("Compiled %d templates from '%s'" % (compiled, self.template_path))
+        return compiled
+
     def from_file(self, filename):
         """
         Read a template from a file
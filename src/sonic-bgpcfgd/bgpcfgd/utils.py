@@ -12,7 +12,7 @@ def run_command(command, shell=False, hide_errors=False):
     :param hide_errors: don't report errors to syslog when True. Type: Boolean
     :return: Tuple: integer exit code from the command, stdout as a string, stderr as a string
     """
-    log_debug("execute command '%s'." % str(command))
+    log_debug("execute command '%s'.", command)
     p = subprocess.Popen(command, shell=shell, stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding='utf-8')
     stdout, stderr = p.communicate()
     if p.returncode != 0:
@@ -11,31 +11,152 @@ Description: bgpmon.py -- populating bgp related information in stateDB.
     BGP related items that needs to be updated in a periodic manner in the
     future, then more can be added into this process.
 
-    The script check if there are any bgp activities by monitoring the bgp
-    frr.log file timestamp.  If activity is detected, then it will request bgp
-    neighbor state via vtysh cli interface. This bgp activity monitoring is
-    done periodically (every 15 second). When triggered, it looks specifically
-    for the neighbor state in the json output of show ip bgp neighbors json
-    and update the state DB for each neighbor accordingly.
+    The script follows bgpd's neighbor state changes by tailing the frr.log
+    file. bgpd is configured with 'bgp log-neighbor-changes', so every
+    session going up or down produces an %ADJCHANGE line. For each of them
+    only the affected neighbor is queried, over a persistent session with the
+    bgpd vty socket (no vtysh fork), and its state is pushed to the state DB
+    right away. Any other log activity schedules a full refresh of all the
+    neighbors using the json output of show bgp summary, at most once every
+    15 seconds, which also picks up configured and removed neighbors.
+    When the log file can't be read, the script falls back to polling the
+    summary with an adaptive interval: 1 second after a change, doubled on
+    every quiet poll up to 15 seconds.
     In order to not disturb and hold on to the State DB access too long and
     removal of the stale neighbors (neighbors that was there previously on
     previous get request but no longer there in the current get request), a
     "previous" neighbor dictionary will be kept and used to determine if there
     is a need to perform update or the peer is stale to be removed from the
-    state DB
+    state DB.
+    The time it takes for all the neighbors to become Established again after
+    a neighbor state change (and after the start of the service) is published
+    in BGP_CONVERGENCE_TABLE|global of the state DB.
 """
 import json
 import os
+import re
 import sys
 import syslog
 from swsscommon import swsscommon
 import time
 from sonic_py_common.general import getstatusoutput_noshell
+from bgpcfgd.frr import VtyClient
 
 PIPE_BATCH_MAX_COUNT = 50
+FRR_LOG_FILE = "/var/log/frr/frr.log"
+CONVERGENCE_KEY = "BGP_CONVERGENCE_TABLE|global"
+ADJCHANGE_RE = re.compile(r"%ADJCHANGE: neighbor (\S+?)(?:\([^)]*\))? in vrf (\S+) (?:Up|Down)")
 
-class BgpStateGet:
+
+class FrrLogWatcher:
+    """ Incremental reader of the lines appended to the FRR log file """
+    MAX_READ_SIZE = 1024 * 1024
+
+    def __init__(self, path=FRR_LOG_FILE):
+        self.path = path
+        self.inode = None
+        self.offset = 0
+        # start from the end of the file, the first full sync covers the history
+        st = self.stat()
+        if st is not None:
+            self.inode = st.st_ino
+            self.offset = st.st_size
+
+    def stat(self):
+        try:
+            return os.stat(self.path)
+        except (IOError, OSError):
+            return None
+
+    def read_lines(self):
+        """
+        Read the lines appended to the log since the previous call
+        :return: tuple (lines, complete). lines is None when the log file can't be read.
+                 complete is False when some lines were skipped (rotation or burst)
+        """
+        st = self.stat()
+        if st is None:
+            self.inode = None
+            return None, False
+        complete = True
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            # the log was rotated or truncated
+            complete = self.inode is None
+            self.inode = st.st_ino
+            self.offset = 0
+        if st.st_size == self.offset:
+            return [], complete
+        if st.st_size - self.offset > self.MAX_READ_SIZE:
+            self.offset = st.st_size
+            return [], False
+        try:
+            with open(self.path, 'rb') as fp:
+                fp.seek(self.offset)
+                data = fp.read(st.st_size - self.offset)
+        except (IOError, OSError):
+            return None, False
+        # keep a partially written line for the next call
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+        return data[:end].decode('utf-8', 'replace').splitlines(), complete
+
+
+class ConvergenceTracker:
+    """
+    Measure the time it takes for all the neighbors to become Established.
+    A measurement starts with the service, or with a state change while all
+    the neighbors were Established, and ends when all of them are Established again
+    """
     def __init__(self):
+        self.converging = True
+        self.started = time.monotonic()
+        self.last_convergence_ms = None
+        self.convergence_count = 0
+        self.state_changes = 0
+        self.published = None
+
+    def update(self, peer_state, changes):
+        """
+        Account the current neighbor states
+        :param peer_state: dictionary of neighbor -> state
+        :param changes: number of neighbor entries changed in the state DB
+        :return: the convergence entry for the state DB if it needs to be updated, None otherwise
+        """
+        now = time.monotonic()
+        self.state_changes += changes
+        total = len(peer_state)
+        established = sum(1 for state in peer_state.values() if state == "Established")
+        if self.converging:
+            if total > 0 and established == total:
+                self.converging = False
+                self.last_convergence_ms = int((now - self.started) * 1000)
+                self.convergence_count += 1
+                syslog.syslog(syslog.LOG_INFO, "BGP converged in {} ms, {} neighbors Established".format(self.last_convergence_ms, total))
+        elif changes and established < total:
+            self.converging = True
+            self.started = now
+        entry = {
+            'status': 'converging' if self.converging else 'converged',
+            'established_peers': str(established),
+            'total_peers': str(total),
+            'convergence_count': str(self.convergence_count),
+            'state_changes': str(self.state_changes),
+        }
+        if self.last_convergence_ms is not None:
+            entry['last_convergence_time_ms'] = str(self.last_convergence_ms)
+        if entry == self.published:
+            return None
+        self.published = entry
+        return dict(entry)
+
+
+class BgpStateGet:
+    EVENT_POLL_INTERVAL = 0.2
+    FULL_SYNC_INTERVAL = 15
+    POLL_INTERVAL_MIN = 1
+    POLL_INTERVAL_MAX = 15
+
+    def __init__(self, frr_log_file=FRR_LOG_FILE):
         # set peer_l stores the Neighbor peer Ip address
         # dic peer_state stores the Neighbor peer state entries
         # set new_peer_l stores the new snapshot of Neighbor peer ip address
@@ -44,28 +165,25 @@ class BgpStateGet:
         self.peer_state = {}
         self.new_peer_l = set()
         self.new_peer_state = {}
-        self.cached_timestamp = 0
         self.db = swsscommon.SonicV2Connector()
         self.db.connect(self.db.STATE_DB, False)
         self.pipe = swsscommon.RedisPipeline(self.db.get_redis_client(self.db.STATE_DB))
         self.db.delete_all_by_pattern(self.db.STATE_DB, "NEIGH_STATE_TABLE|*" )
         self.MAX_RETRY_ATTEMPTS = 3
+        self.vty = VtyClient("bgpd")
+        self.log_watcher = FrrLogWatcher(frr_log_file)
+        self.convergence = ConvergenceTracker()
 
-    # A quick way to check if there are anything happening within BGP is to
-    # check its log file has any activities. This is by checking its modified
-    # timestamp against the cached timestamp that we keep and if there is a
-    # difference, there is activity detected. In case the log file got wiped
-    # out, it will default back to constant pulling every 15 seconds
-    def bgp_activity_detected(self):
-        try:
-            timestamp = os.stat("/var/log/frr/frr.log").st_mtime
-            if timestamp != self.cached_timestamp:
-                self.cached_timestamp = timestamp
-                return True
-            else:
-                return False
-        except (IOError, OSError):
-            return True
+    def run_show_command(self, command):
+        """
+        Run a show command in bgpd. The persistent vty session is used when
+        bgpd is reachable, vtysh otherwise
+        :return: tuple (return code, output)
+        """
+        results = self.vty.execute([command])
+        if results is not None:
+            return results[0]
+        return getstatusoutput_noshell(["vtysh", "-H", "/dev/null", "-c", command])
 
     def update_new_peer_states(self, peer_dict):
         peer_l = peer_dict["peers"].keys()
@@ -77,12 +195,13 @@ class BgpStateGet:
 
     # Get a new snapshot of BGP neighbors and store them in the "new" location
     def get_all_neigh_states(self):
-        cmd = ["vtysh", "-H", "/dev/null",  "-c", 'show bgp summary json']
+        cmd = 'show bgp summary json'
         retry_attempt = 0
+        output = None
 
         while retry_attempt < self.MAX_RETRY_ATTEMPTS:
             try:
-                rc, output = getstatusoutput_noshell(cmd)
+                rc, output = self.run_show_command(cmd)
                 if rc:
                     syslog.syslog(syslog.LOG_ERR, "*ERROR* Failed with rc:{} when execute: {}".format(rc, cmd))
                     return
@@ -148,8 +267,18 @@ class BgpStateGet:
         self.pipe.flush()
         data.clear()
 
+    def add_convergence_entry(self, data, changes):
+        entry = self.convergence.update(self.peer_state, changes)
+        if entry is not None:
+            data[CONVERGENCE_KEY] = entry
+
     def update_neigh_states(self):
+        """
+        Update the state DB from the snapshot taken by get_all_neigh_states()
+        :return: number of neighbor entries changed in the state DB
+        """
         data = {}
+        changes = 0
         for peer in self.new_peer_l:
             key = "NEIGH_STATE_TABLE|%s" % peer
             if peer in self.peer_l:
@@ -160,6 +289,7 @@ class BgpStateGet:
                     peerType = "i-BGP" if self.new_peer_state[peer][1] == self.new_peer_state[peer][2] else "e-BGP"
                     data[key] = {'state':state, 'peerType':peerType}
                     self.peer_state[peer] = state
+                    changes += 1
                 # remove this neighbor from old set since it is accounted for
                 self.peer_l.remove(peer)
             else:
@@ -168,6 +298,7 @@ class BgpStateGet:
                 peerType = "i-BGP" if self.new_peer_state[peer][1] == self.new_peer_state[peer][2] else "e-BGP"
                 data[key] = {'state':state, 'peerType':peerType}
                 self.peer_state[peer] = state
+                changes += 1
             if len(data) > PIPE_BATCH_MAX_COUNT:
                 self.flush_pipe(data)
         # Check for stale state entries to be cleaned up
@@ -175,15 +306,103 @@ class BgpStateGet:
             # remove this from the stateDB and the current neighbor state entry
             del_key = "NEIGH_STATE_TABLE|%s" % peer
             data[del_key] = None
+            changes += 1
             if peer in self.peer_state:
                 del self.peer_state[peer]
             if len(data) > PIPE_BATCH_MAX_COUNT:
                 self.flush_pipe(data)
+        # Save the new set
+        self.peer_l = self.new_peer_l.copy()
+        self.add_convergence_entry(data, changes)
         # If anything in the pipeline not yet flushed, flush them now
         if len(data) > 0:
             self.flush_pipe(data)
-        # Save the new set
-        self.peer_l = self.new_peer_l.copy()
+        return changes
+
+    def get_neigh_state(self, peer):
+        """
+        Get the state of one neighbor
+        :param peer: neighbor address or interface name
+        :return: tuple (state, remote AS, local AS). None if the neighbor isn't found
+        """
+        rc, output = self.run_show_command("show bgp neighbors {} json".format(peer))
+        if rc or not output:
+            return None
+        try:
+            info = json.loads(output).get(peer)
+        except (ValueError, AttributeError):
+            return None
+        if not isinstance(info, dict) or "bgpState" not in info:
+            return None
+        return (info["bgpState"], info.get("remoteAs"), info.get("localAs"))
+
+    def update_peers(self, peers):
+        """
+        Query the given neighbors and update the state DB for the ones which changed
+        :param peers: neighbors reported by bgpd state change events
+        :return: False when a neighbor couldn't be queried and a full sync is required
+        """
+        data = {}
+        changes = 0
+        complete = True
+        for peer in sorted(peers):
+            peer_state = self.get_neigh_state(peer)
+            if peer_state is None:
+                complete = False
+                continue
+            state, remote_as, local_as = peer_state
+            if peer in self.peer_l and self.peer_state.get(peer) == state:
+                continue
+            peerType = "i-BGP" if remote_as == local_as else "e-BGP"
+            data["NEIGH_STATE_TABLE|%s" % peer] = {'state':state, 'peerType':peerType}
+            self.peer_l.add(peer)
+            self.peer_state[peer] = state
+            changes += 1
+        self.add_convergence_entry(data, changes)
+        if len(data) > 0:
+            self.flush_pipe(data)
+        return complete
+
+    def sync_all(self):
+        self.get_all_neigh_states()
+        return self.update_neigh_states()
+
+    def run(self):
+        """
+        Follow the bgpd state change events. Poll with an adaptive interval
+        while the FRR log file isn't available
+        """
+        self.sync_all()
+        last_full_sync = time.monotonic()
+        full_sync_pending = False
+        poll_interval = self.POLL_INTERVAL_MIN
+        while True:
+            lines, complete = self.log_watcher.read_lines()
+            if lines is None:
+                time.sleep(poll_interval)
+                if self.sync_all():
+                    poll_interval = self.POLL_INTERVAL_MIN
+                else:
+                    poll_interval = min(poll_interval * 2, self.POLL_INTERVAL_MAX)
+                last_full_sync = time.monotonic()
+                continue
+            poll_interval = self.POLL_INTERVAL_MIN
+            peers = set()
+            for line in lines:
+                m = ADJCHANGE_RE.search(line)
+                if m and m.group(2) == "default":
+                    peers.add(m.group(1))
+                else:
+                    full_sync_pending = True
+            if not complete:
+                full_sync_pending = True
+            if peers and not self.update_peers(peers):
+                full_sync_pending = True
+            if full_sync_pending and time.monotonic() - last_full_sync >= self.FULL_SYNC_INTERVAL:
+                self.sync_all()
+                last_full_sync = time.monotonic()
+                full_sync_pending = False
+            time.sleep(self.EVENT_POLL_INTERVAL)
 
 def main():
 
@@ -195,12 +414,8 @@ def main():
         syslog.syslog(syslog.LOG_ERR, "{}: error exit 1, reason {}".format("THIS_MODULE", str(e)))
         sys.exit(1)
 
-    # periodically obtain the new neighbor information and update if necessary
-    while True:
-        time.sleep(15)
-        if bgp_state_get.bgp_activity_detected():
-            bgp_state_get.get_all_neigh_states()
-            bgp_state_get.update_neigh_states()
+    # follow the neighbor state changes and update the state DB if necessary
+    bgp_state_get.run()
 
 if __name__ == '__main__':
     main()
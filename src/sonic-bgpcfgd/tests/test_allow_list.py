@@ -2,6 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import bgpcfgd.frr
 from bgpcfgd.directory import Directory
+from bgpcfgd.config import FrrConfigIndex
 from bgpcfgd.template import TemplateFabric
 import bgpcfgd
 from copy import deepcopy
@@ -58,7 +59,7 @@ def set_del_test(op, args, currect_config, expected_config, update_global_defaul
     cfg_mgr = MagicMock()
     cfg_mgr.update.return_value = None
     cfg_mgr.push_list = push_list
-    cfg_mgr.get_text.return_value = currect_config
+    cfg_mgr.get_index.return_value = FrrConfigIndex(currect_config)
     common_objs = {
         'directory': Directory(),
         'cfg_mgr':   cfg_mgr,
@@ -651,7 +652,7 @@ def test_set_handler_no_community_data_is_already_presented():
     from bgpcfgd.managers_allow_list import BGPAllowListMgr
     cfg_mgr = MagicMock()
     cfg_mgr.update.return_value = None
-    cfg_mgr.get_text.return_value = [
+    cfg_mgr.get_index.return_value = FrrConfigIndex([
         'ip prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_5_COMMUNITY_empty_V4 seq 10 deny 0.0.0.0/0 le 17',
         'ip prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_5_COMMUNITY_empty_V4 seq 20 permit 20.20.30.0/24 le 32',
         'ip prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_5_COMMUNITY_empty_V4 seq 30 permit 40.50.0.0/16 le 32',
@@ -668,7 +669,7 @@ def test_set_handler_no_community_data_is_already_presented():
         'route-map ALLOW_LIST_DEPLOYMENT_ID_5_V6 permit 65535',
         ' set community 123:123 additive',
         ""
-    ]
+    ])
     common_objs = {
             'directory': Directory(),
             'cfg_mgr': cfg_mgr,
@@ -1023,7 +1024,7 @@ def test___find_peer_group():
     from bgpcfgd.managers_allow_list import BGPAllowListMgr
     cfg_mgr = MagicMock()
     cfg_mgr.update.return_value = None
-    cfg_mgr.get_text.return_value = [
+    cfg_mgr.get_index.return_value = FrrConfigIndex([
         'router bgp 64601',
         ' neighbor BGPSLBPassive peer-group',
         ' neighbor BGPSLBPassive remote-as 65432',
@@ -1101,7 +1102,7 @@ def test___find_peer_group():
         'route-map TO_BGP_PEER_V4 permit 100',
         'route-map TO_BGP_PEER_V6 permit 100',
         'route-map TO_BGP_SPEAKER deny 1',
-    ]
+    ])
     common_objs = {
         'directory': Directory(),
         'cfg_mgr':   cfg_mgr,
@@ -1112,6 +1113,36 @@ def test___find_peer_group():
     values = mgr._BGPAllowListMgr__find_peer_group(0, '')
     assert set(values) == {'PEER_V4_INT', 'PEER_V6_INT', 'PEER_V6', 'PEER_V4'}
 
+@patch.dict("sys.modules", swsscommon=swsscommon_module_mock)
+def test_batch_restart_peer_groups():
+    from bgpcfgd.managers_allow_list import BGPAllowListMgr
+    cfg_mgr = MagicMock()
+    cfg_mgr.get_index.return_value = FrrConfigIndex([
+        'router bgp 64601',
+        ' neighbor PEER_V4 peer-group',
+        ' address-family ipv4 unicast',
+        '  neighbor PEER_V4 route-map FROM_BGP_PEER_V4 in',
+        ' exit-address-family',
+        'route-map FROM_BGP_PEER_V4 permit 2',
+        ' call ALLOW_LIST_DEPLOYMENT_ID_0_V4',
+        ' on-match next',
+    ])
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr':   cfg_mgr,
+        'tf':        TemplateFabric(),
+        'constants': global_constants,
+    }
+    mgr = BGPAllowListMgr(common_objs, "CONFIG_DB", "BGP_ALLOWED_PREFIXES")
+    with patch("bgpcfgd.manager.swsscommon", MagicMock(SET_COMMAND="SET", DEL_COMMAND="DEL")):
+        mgr.batch_handler([
+            ("DEPLOYMENT_ID|0|1010:2020", "SET", {"prefixes_v4": "10.20.30.0/24"}),
+            ("DEPLOYMENT_ID|0|3030:4040", "SET", {"prefixes_v4": "10.20.40.0/24"}),
+        ])
+    assert cfg_mgr.push_list.call_count == 2
+    cfg_mgr.restart_peer_groups.assert_called_once_with(['PEER_V4'])
+    assert mgr.batch_peer_groups is None and mgr.batch_peer_group_maps is None
+
 @patch.dict("sys.modules", swsscommon=swsscommon_module_mock)
 def test___to_prefix_list():
     from bgpcfgd.managers_allow_list import BGPAllowListMgr
@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, patch, call
 
 import os
+from bgpcfgd.config import FrrConfigIndex
 from bgpcfgd.directory import Directory
 from bgpcfgd.template import TemplateFabric
 from . import swsscommon_test
@@ -59,7 +60,7 @@ def test_metadata_with_asns():
 # test if T2_GROUP_ASNS has been updated
 def test_metadata_with_asns_update():
     m = constructor()
-    m.cfg_mgr.get_text = MagicMock(return_value=["bgp as-path access-list T2_GROUP_ASNS seq 5 permit _64128_"])
+    m.cfg_mgr.get_index = MagicMock(return_value=FrrConfigIndex(["bgp as-path access-list T2_GROUP_ASNS seq 5 permit _64128_"]))
     set_handler_test(m, "localhost",
                      {"bgp_asn": "65100", "type": "SpineRouter",
                       "subtype": "UpstreamLC", "t2_group_asns": "64120,64121"})
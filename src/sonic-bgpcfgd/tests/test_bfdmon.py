@@ -2,17 +2,21 @@ import pytest
 import json
 from unittest.mock import MagicMock, patch
 from swsscommon import swsscommon
+import socket
 import syslog
 import bfdmon.bfdmon
-from bfdmon.bfdmon import BfdFrrMon
+from bfdmon.bfdmon import BfdFrrMon, BfddControlClient, BFD_CONTROL_HEADER, BMT_NOTIFY, BMT_RESPONSE, BMT_VERSION
 
 @pytest.fixture
+@patch('swsscommon.swsscommon.RedisPipeline')
 @patch('swsscommon.swsscommon.Table')
 @patch('swsscommon.swsscommon.DBConnector', autospec=True)
 @patch('swsscommon.swsscommon.SonicV2Connector')
-def bfd_mon(mock_conn, mock_db, mock_tbl):
+def bfd_mon(mock_conn, mock_db, mock_tbl, mock_pipe):
     #mock_conn.return_value.get_db_list.return_value = ['STATE_DB']
     m = BfdFrrMon()
+    m.vty = MagicMock()
+    m.vty.execute.return_value = None
     return m
 
 def test_constructor(bfd_mon):
@@ -219,3 +223,60 @@ def test_update_state_db_del_all(mocked_syslog, bfd_mon):
     assert "DPU_BFD_PROBE_STATE table in STATE_DB updated" in mocked_syslog.call_args[0][1]
     assert all(value in bfd_mon.local_v4_peers for value in bfd_mon.frr_v4_peers), f"Expected {bfd_mon.frr_v4_peers} to be in {bfd_mon.local_v4_peers}"
     assert all(value in bfd_mon.local_v6_peers for value in bfd_mon.frr_v6_peers), f"Expected {bfd_mon.frr_v6_peers} to be in {bfd_mon.local_v6_peers}"
+
+@patch('syslog.syslog')
+def test_update_state_db_session_rows(mocked_syslog, bfd_mon):
+    # Per-session rows are written only for the sessions which changed
+    bfd_mon.session_table = MagicMock()
+    bfd_mon.frr_sessions = {"192.168.1.1": "up", "192.168.1.2": "down", "30ab::2": "up"}
+    bfd_mon.update_up_peers()
+    bfd_mon.update_state_db()
+    assert bfd_mon.session_table.set.call_count == 3
+    assert bfd_mon.table.set.call_args[0][1][:2] == [("v4_bfd_up_count", "1"), ("v6_bfd_up_count", "1")]
+    bfd_mon.pipe.flush.assert_called_once()
+
+    bfd_mon.session_table.reset_mock()
+    bfd_mon.table.reset_mock()
+    bfd_mon.apply_events([("192.168.1.2", "up"), ("30ab::2", None)])
+    bfd_mon.update_state_db()
+    bfd_mon.session_table.set.assert_called_once()
+    assert bfd_mon.session_table.set.call_args[0][0] == "192.168.1.2"
+    assert bfd_mon.session_table.set.call_args[0][1][0] == ("status", "up")
+    bfd_mon.session_table.delete.assert_called_once_with("30ab::2")
+    assert bfd_mon.local_v4_peers == {"192.168.1.1", "192.168.1.2"}
+    assert bfd_mon.local_v6_peers == set()
+
+@patch('syslog.syslog')
+def test_update_state_db_no_session_list(mocked_syslog, bfd_mon):
+    bfd_mon.publish_session_list = False
+    bfd_mon.frr_v4_peers = {"192.168.1.1"}
+    bfd_mon.frr_v6_peers = set()
+    bfd_mon.update_state_db()
+    fields = [field for field, _ in bfd_mon.table.set.call_args[0][1]]
+    assert "v4_bfd_up_sessions" not in fields
+    assert "v4_bfd_up_count" in fields
+
+def test_get_bfd_sessions_vty(bfd_mon):
+    bfd_mon.bfdd_running = True
+    bfd_mon.vty.execute.return_value = [(0, '[{"peer": "192.168.1.1", "status": "up"}, {"peer": "30ab::3", "status": "down"}]')]
+    assert bfd_mon.get_bfd_sessions()
+    bfd_mon.vty.execute.assert_called_once_with(["show bfd peers json"])
+    assert bfd_mon.frr_sessions == {"192.168.1.1": "up", "30ab::3": "down"}
+    assert bfd_mon.frr_v4_peers == {"192.168.1.1"}
+    assert bfd_mon.frr_v6_peers == set()
+
+def bfdd_message(msg_type, msg):
+    data = json.dumps(msg).encode()
+    return BFD_CONTROL_HEADER.pack(len(data), 0, msg_type, BMT_VERSION) + data
+
+def test_bfdd_control_client():
+    client = BfddControlClient()
+    client.sock, server = socket.socketpair()
+    server.sendall(bfdd_message(BMT_NOTIFY, {"op": "status", "peer-address": "192.168.1.1", "state": "down"}) +
+                   bfdd_message(BMT_NOTIFY, {"op": "status", "peer-address": "30ab::2", "state": "adm-down"}) +
+                   bfdd_message(BMT_RESPONSE, {"status": "ok"}) +
+                   bfdd_message(BMT_NOTIFY, {"op": "delete", "peer-address": "192.168.1.3"}))
+    assert client.read_events(1) == [("192.168.1.1", "down"), ("30ab::2", "shutdown"), ("192.168.1.3", None)]
+    assert client.read_events(0) == []
+    client.close()
+    server.close()
@@ -115,6 +115,28 @@ def test_add_peer_internal():
         res = m.set_handler("30.30.30.1", {'asn': '65200', 'holdtime': '180', 'keepalive': '60', 'local_addr': '30.30.30.30', 'name': 'TOR', 'nhopself': '0', 'rrclient': '0'})
         assert res, "Expect True return value"
 
+@patch('bgpcfgd.managers_bgp.swsscommon.Table')
+@patch('bgpcfgd.managers_bgp.swsscommon.DBConnector')
+def test_add_peers_batch(mock_db_conn, mock_table):
+    for constant in load_constant_files():
+        m = constructor(constant)
+        m.wait_for_all_deps = False
+        m.cfg_mgr.push.reset_mock()
+        mock_db_conn.reset_mock()
+        peer_data = {'asn': '65200', 'holdtime': '180', 'keepalive': '60', 'local_addr': '30.30.30.30', 'name': 'TOR', 'nhopself': '0', 'rrclient': '0'}
+        with patch("bgpcfgd.manager.swsscommon", MagicMock(SET_COMMAND="SET", DEL_COMMAND="DEL")):
+            m.batch_handler([
+                ("30.30.30.1", "SET", dict(peer_data)),
+                ("30.30.30.2", "SET", dict(peer_data)),
+            ])
+        assert ("default", "30.30.30.1") in m.peers and ("default", "30.30.30.2") in m.peers
+        neighbor_pushes = [args[0] for args, _ in m.cfg_mgr.push.call_args_list if 'neighbor 30.30.30.' in args[0]]
+        assert len(neighbor_pushes) == 1
+        assert neighbor_pushes[0].startswith("router bgp 65100\n bgp suppress-fib-pending\n")
+        assert "neighbor 30.30.30.1 " in neighbor_pushes[0] and "neighbor 30.30.30.2 " in neighbor_pushes[0]
+        assert mock_db_conn.call_count == 1
+        assert m.pending_ops is None and m.state_peer_table is None
+
 @patch('bgpcfgd.managers_bgp.log_info')
 def test_add_peer_internal_no_router_id_no_lo4096(mocked_log_info):
     for constant in load_constant_files():
@@ -243,7 +265,7 @@ def test_add_peer_invalid_local_addr(mocked_log_debug):
         m = constructor(constant)
         res = m.set_handler("30.30.30.1", {"local_addr": "40.40.40.40", "admin_status": "up"})
         assert not res, "Expect False return value"
-        mocked_log_debug.assert_called_with("Peer '30.30.30.1' with local address '40.40.40.40' wait for the corresponding interface to be set")
+        mocked_log_debug.assert_called_with("Peer '%s' with local address '%s' wait for the corresponding interface to be set", "30.30.30.1", "40.40.40.40")
 
 @patch('bgpcfgd.managers_bgp.log_info')
 def test_del_handler(mocked_log_info):
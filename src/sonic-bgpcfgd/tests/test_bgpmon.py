@@ -0,0 +1,96 @@
+import json
+import os
+import pytest
+from unittest.mock import MagicMock, patch
+from swsscommon import swsscommon
+from bgpmon.bgpmon import BgpStateGet, ConvergenceTracker, FrrLogWatcher, CONVERGENCE_KEY
+
+SUMMARY = {
+    "ipv4Unicast": {
+        "peers": {
+            "10.0.0.1": {"state": "Established", "remoteAs": 65100, "localAs": 65100},
+            "10.0.0.3": {"state": "Active", "remoteAs": 65200, "localAs": 65100},
+        }
+    },
+    "ipv6Unicast": {
+        "peers": {
+            "fc00::2": {"state": "Established", "remoteAs": 65200, "localAs": 65100},
+        }
+    },
+}
+
+@pytest.fixture
+@patch('swsscommon.swsscommon.RedisPipeline')
+@patch('swsscommon.swsscommon.SonicV2Connector')
+def bgp_mon(mock_conn, mock_pipe, tmp_path):
+    m = BgpStateGet(str(tmp_path / 'frr.log'))
+    m.vty = MagicMock()
+    m.flushed = []
+    m.flush_pipe = lambda data: (m.flushed.append(dict(data)), data.clear())
+    assert m.log_watcher.path == str(tmp_path / 'frr.log')
+    return m
+
+def test_sync_all_pushes_changes_only(bgp_mon):
+    bgp_mon.vty.execute.return_value = [(0, json.dumps(SUMMARY))]
+    assert bgp_mon.sync_all() == 3
+    assert bgp_mon.flushed[0]["NEIGH_STATE_TABLE|10.0.0.1"] == {'state': 'Established', 'peerType': 'i-BGP'}
+    assert bgp_mon.flushed[0]["NEIGH_STATE_TABLE|10.0.0.3"] == {'state': 'Active', 'peerType': 'e-BGP'}
+    assert bgp_mon.flushed[0][CONVERGENCE_KEY]['status'] == 'converging'
+    bgp_mon.vty.execute.assert_called_once_with(['show bgp summary json'])
+    bgp_mon.flushed.clear()
+    assert bgp_mon.sync_all() == 0
+    assert bgp_mon.flushed == []
+
+@patch('bgpmon.bgpmon.getstatusoutput_noshell')
+def test_vtysh_fallback(mocked_getstatusoutput, bgp_mon):
+    bgp_mon.vty.execute.return_value = None
+    mocked_getstatusoutput.return_value = (0, json.dumps(SUMMARY))
+    bgp_mon.sync_all()
+    mocked_getstatusoutput.assert_called_once_with(["vtysh", "-H", "/dev/null", "-c", "show bgp summary json"])
+    assert bgp_mon.peer_l == {"10.0.0.1", "10.0.0.3", "fc00::2"}
+
+def test_update_peers(bgp_mon):
+    bgp_mon.vty.execute.return_value = [(0, json.dumps(SUMMARY))]
+    bgp_mon.sync_all()
+    bgp_mon.flushed.clear()
+    neighbor = {"10.0.0.3": {"bgpState": "Established", "remoteAs": 65200, "localAs": 65100}}
+    bgp_mon.vty.execute.return_value = [(0, json.dumps(neighbor))]
+    assert bgp_mon.update_peers({"10.0.0.3"})
+    bgp_mon.vty.execute.assert_called_with(['show bgp neighbors 10.0.0.3 json'])
+    assert bgp_mon.flushed[0]["NEIGH_STATE_TABLE|10.0.0.3"] == {'state': 'Established', 'peerType': 'e-BGP'}
+    assert bgp_mon.flushed[0][CONVERGENCE_KEY]['status'] == 'converged'
+    assert bgp_mon.flushed[0][CONVERGENCE_KEY]['established_peers'] == '3'
+    # unknown neighbor requires a full sync
+    bgp_mon.vty.execute.return_value = [(0, json.dumps({"bgpNoSuchNeighbor": True}))]
+    assert not bgp_mon.update_peers({"10.0.0.5"})
+
+def test_log_watcher(tmp_path):
+    path = str(tmp_path / 'frr.log')
+    with open(path, 'w') as fp:
+        fp.write("old line\n")
+    watcher = FrrLogWatcher(path)
+    assert watcher.read_lines() == ([], True)
+    with open(path, 'a') as fp:
+        fp.write("bgpd[42]: %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T2) in vrf default Down\npartial")
+    assert watcher.read_lines() == (["bgpd[42]: %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T2) in vrf default Down"], True)
+    with open(path, 'a') as fp:
+        fp.write(" line\n")
+    assert watcher.read_lines() == (["partial line"], True)
+    os.rename(path, path + '.1')
+    assert watcher.read_lines() == (None, False)
+    with open(path, 'w') as fp:
+        fp.write("new line\n")
+    assert watcher.read_lines() == (["new line"], True)
+
+def test_convergence_tracker():
+    tracker = ConvergenceTracker()
+    entry = tracker.update({"10.0.0.1": "Connect"}, 1)
+    assert entry['status'] == 'converging'
+    entry = tracker.update({"10.0.0.1": "Established"}, 1)
+    assert entry['status'] == 'converged'
+    assert entry['convergence_count'] == '1'
+    assert 'last_convergence_time_ms' in entry
+    assert tracker.update({"10.0.0.1": "Established"}, 0) is None
+    entry = tracker.update({"10.0.0.1": "Idle"}, 1)
+    assert entry['status'] == 'converging'
+    assert entry['state_changes'] == '3'
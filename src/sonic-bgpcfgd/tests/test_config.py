@@ -1,6 +1,6 @@
 from unittest.mock import MagicMock
 
-from bgpcfgd.config import ConfigMgr
+from bgpcfgd.config import ConfigMgr, FrrConfigIndex
 
 
 def test_constructor():
@@ -115,6 +115,126 @@ def test_restart_get_text():
     c.update()
     assert c.get_text() == [' text1', ' text2', ' text3', ' text4', '    ', '     ']
 
+FRR_CONFIG = """!
+ip prefix-list PL_V4 seq 10 deny 0.0.0.0/0 le 17
+ip prefix-list PL_V4 seq 20 permit 20.20.30.0/24 le 32
+ipv6 prefix-list PL_V6 seq 10 permit fc01:20::/64 le 128
+bgp community-list standard COMMUNITY permit 1010:2020
+bgp as-path access-list T2_GROUP_ASNS seq 5 permit _64128_
+!
+router bgp 65100
+ neighbor PEER_V4 peer-group
+ address-family ipv4 unicast
+  neighbor PEER_V4 route-map FROM_BGP_PEER_V4 in
+  neighbor PEER_V4 route-map TO_BGP_PEER_V4 out
+ exit-address-family
+exit
+!
+route-map FROM_BGP_PEER_V4 permit 100
+ call ALLOW_LIST_V4
+exit
+!
+route-map ALLOW_LIST_V4 permit 10
+ match ip address prefix-list PL_V4
+ match community COMMUNITY
+exit
+!
+route-map ALLOW_LIST_V4 permit 65535
+ set community 123:123 additive
+exit
+"""
+
+def test_index():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value=FRR_CONFIG)
+    c = ConfigMgr(frr)
+    index = c.get_index()
+    assert index.get_prefix_list("ip", "PL_V4") == ["deny 0.0.0.0/0 le 17", "permit 20.20.30.0/24 le 32"]
+    assert index.get_prefix_list("ipv6", "PL_V6") == ["permit fc01:20::/64 le 128"]
+    assert index.get_prefix_list("ipv6", "PL_V4") is None
+    assert index.get_community_list("COMMUNITY") == [("permit", "1010:2020")]
+    assert index.get_as_path_list("T2_GROUP_ASNS") == ["bgp as-path access-list T2_GROUP_ASNS seq 5 permit _64128_"]
+    assert index.get_peer_groups() == ["PEER_V4"]
+    assert index.get_neighbor_route_map("PEER_V4", "in") == "FROM_BGP_PEER_V4"
+    assert index.get_neighbor_route_map("PEER_V4", "out") == "TO_BGP_PEER_V4"
+    assert list(index.get_route_map("ALLOW_LIST_V4").items()) == [
+        (10, {'action': 'permit', 'lines': ['match ip address prefix-list PL_V4', 'match community COMMUNITY']}),
+        (65535, {'action': 'permit', 'lines': ['set community 123:123 additive']}),
+    ]
+    assert c.get_index() is index
+    assert frr.get_config.call_count == 1
+
+def test_index_follows_pushed_changes():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value=FRR_CONFIG)
+    c = ConfigMgr(frr)
+    c.get_index()
+    c.push_list([
+        'no ip prefix-list PL_V4',
+        'ip prefix-list PL_V4 seq 10 permit 30.30.30.0/24 le 32',
+        'no bgp community-list standard COMMUNITY',
+        'bgp community-list standard COMMUNITY permit 3030:4040',
+        'route-map ALLOW_LIST_V4 permit 20',
+        ' match ip address prefix-list PL_V4',
+        'route-map ALLOW_LIST_V4 permit 65535',
+        ' set community no-export additive',
+        'no route-map ALLOW_LIST_V4 permit 10',
+        'router bgp 65100',
+        ' neighbor PEER_V6 peer-group',
+        ' address-family ipv6 unicast',
+        '  neighbor PEER_V6 route-map FROM_BGP_PEER_V6 in',
+        ' exit-address-family',
+        'exit',
+    ])
+    index = c.get_index()
+    assert frr.get_config.call_count == 1
+    assert not frr.write.called
+    assert index.get_prefix_list("ip", "PL_V4") == ["permit 30.30.30.0/24 le 32"]
+    assert index.get_community_list("COMMUNITY") == [("permit", "3030:4040")]
+    assert list(index.get_route_map("ALLOW_LIST_V4").items()) == [
+        (20, {'action': 'permit', 'lines': ['match ip address prefix-list PL_V4']}),
+        (65535, {'action': 'permit', 'lines': ['set community no-export additive']}),
+    ]
+    assert index.get_peer_groups() == ["PEER_V4", "PEER_V6"]
+    assert index.get_neighbor_route_map("PEER_V6", "in") == "FROM_BGP_PEER_V6"
+
+def test_index_unknown_change_is_not_committed():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value=FRR_CONFIG)
+    c = ConfigMgr(frr)
+    c.get_index()
+    c.push("bgp as-path access-list T2_GROUP_ASNS permit _64129_")
+    c.push("ip prefix-list PL_V4 seq 30 permit 40.40.0.0/16 le 32")
+    index = c.get_index()
+    assert not frr.write.called
+    assert frr.get_config.call_count == 2
+    assert c.changes != ""
+    assert index.get_prefix_list("ip", "PL_V4") == ["deny 0.0.0.0/0 le 17", "permit 20.20.30.0/24 le 32"]
+    assert c.get_index() is index
+    assert frr.get_config.call_count == 2
+
+def test_index_invalidate():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value=FRR_CONFIG)
+    c = ConfigMgr(frr)
+    c.get_index()
+    c.push("ip prefix-list PL_V4 seq 30 permit 40.40.0.0/16 le 32")
+    c.invalidate_index()
+    index = c.get_index()
+    assert frr.get_config.call_count == 2
+    assert not frr.write.called
+    assert index.get_prefix_list("ip", "PL_V4") == ["deny 0.0.0.0/0 le 17", "permit 20.20.30.0/24 le 32", "permit 40.40.0.0/16 le 32"]
+
+def test_index_dropped_on_write_error():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value=FRR_CONFIG)
+    frr.write = MagicMock(return_value=False)
+    c = ConfigMgr(frr)
+    c.get_index()
+    c.push("ip prefix-list PL_V4 seq 30 permit 40.40.0.0/16 le 32")
+    assert not c.commit()
+    assert c.index is None
+
 def to_canonical_common(raw_text, expected_canonical):
     frr = MagicMock()
     c = ConfigMgr(frr)
@@ -205,3 +325,15 @@ def test_from_canonical():
     c = ConfigMgr(frr)
     raw = c.from_canonical(canonical)
     assert raw == expected
+
+def test_index_dropped_on_restart_error():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value=FRR_CONFIG)
+    frr.write = MagicMock(return_value=True)
+    frr.restart_peer_groups = MagicMock(return_value=False)
+    c = ConfigMgr(frr)
+    c.get_index()
+    c.push("ip prefix-list PL_V4 seq 30 permit 40.40.0.0/16 le 32")
+    c.restart_peer_groups(["PEER_V4"])
+    assert not c.commit()
+    assert c.index is None
@@ -55,3 +55,71 @@ def test_directory(mocked_log_err):
     # Test remove_slot() with nonexist table
     directory.remove_slot("db_name", "table_nonexist")
     mocked_log_err.assert_called_with("Directory: Can't remove slot 'db_name__table_nonexist'. The slot doesn't exist")
+
+def test_directory_notify_touched_paths():
+    directory = Directory()
+    asn_handler = MagicMock()
+    slot_handler = MagicMock()
+    other_handler = MagicMock()
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"),
+                         ("CONFIG_DB", "DEVICE_METADATA", "localhost/type")], asn_handler)
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "")], slot_handler)
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "other")], other_handler)
+
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "other", {})
+    assert asn_handler.call_count == 0
+    assert slot_handler.call_count == 1
+    assert other_handler.call_count == 1
+
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100", "type": "LeafRouter"})
+    assert asn_handler.call_count == 1
+    assert slot_handler.call_count == 2
+    assert other_handler.call_count == 1
+
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"hostname": "sonic"})
+    assert asn_handler.call_count == 1
+
+def test_directory_notify_indexed_keys():
+    directory = Directory()
+    handlers = {}
+    for i in range(100):
+        key = "10.0.0.%d" % i
+        handlers[key] = MagicMock()
+        directory.subscribe([("CONFIG_DB", "BGP_NEIGHBOR", key + "/asn")], handlers[key])
+
+    directory.put("CONFIG_DB", "BGP_NEIGHBOR", "10.0.0.5", {"asn": "65100"})
+    assert handlers["10.0.0.5"].call_count == 1
+    assert sum(handler.call_count for handler in handlers.values()) == 1
+
+    directory.remove("CONFIG_DB", "BGP_NEIGHBOR", "10.0.0.5")
+    directory.put("CONFIG_DB", "BGP_NEIGHBOR", "10.0.0.6", {"asn": "65100"})
+    assert handlers["10.0.0.6"].call_count == 1
+    assert sum(handler.call_count for handler in handlers.values()) == 2
+
+def test_directory_available_deps():
+    directory = Directory()
+    deps = [
+        ("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"),
+        ("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0"),
+        ("LOCAL", "local_addresses", ""),
+    ]
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    directory.subscribe(deps, MagicMock())
+    assert not directory.available_deps(deps)
+    directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0", {})
+    assert not directory.available_deps(deps)
+    directory.put("LOCAL", "local_addresses", "10.1.0.32", {})
+    assert directory.available_deps(deps)
+    assert directory.available_deps(deps[:2])  # not subscribed dependencies
+    directory.remove("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0")
+    assert not directory.available_deps(deps)
+    directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0", {})
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {})
+    assert not directory.available_deps(deps)
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    assert directory.available_deps(deps)
+    directory.remove_slot("LOCAL", "local_addresses")
+    assert not directory.available_deps(deps)
+    directory.remove_slot("CONFIG_DB", "DEVICE_METADATA")
+    directory.put("LOCAL", "local_addresses", "10.1.0.32", {})
+    assert not directory.available_deps(deps)
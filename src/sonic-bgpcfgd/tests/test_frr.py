@@ -1,4 +1,6 @@
-from unittest.mock import patch
+import socket
+import threading
+from unittest.mock import MagicMock, patch
 import bgpcfgd.frr
 import pytest
 
@@ -66,3 +68,56 @@ def test_restart_peer_groups_fail(mocked_log_crit):
     res = f.restart_peer_groups(["pg_1", "pg_2"])
     assert not res, "Expect False return value"
     mocked_log_crit.assert_called_with("Can't restart bgp peer-group 'pg_2'. rc='1', out='some output', err='some error'")
+
+def test_restart_peer_groups_vty():
+    bgpcfgd.frr.run_command = lambda cmd: pytest.fail("vtysh must not be used when bgpd vty is reachable")
+    f = bgpcfgd.frr.FRR(["abc", "cde"])
+    f.bgpd_vty.execute = MagicMock(return_value=[(0, ""), (0, "")])
+    res = f.restart_peer_groups(["pg_2", "pg_1", "pg_2"])
+    assert res, "Expect True return value"
+    f.bgpd_vty.execute.assert_called_once_with(["clear bgp peer-group pg_1 soft in", "clear bgp peer-group pg_2 soft in"])
+
+@patch('bgpcfgd.frr.log_crit')
+def test_restart_peer_groups_vty_fail(mocked_log_crit):
+    f = bgpcfgd.frr.FRR(["abc", "cde"])
+    f.bgpd_vty.execute = MagicMock(return_value=[(0, ""), (1, "% Unknown peer-group")])
+    res = f.restart_peer_groups(["pg_1", "pg_2"])
+    assert not res, "Expect False return value"
+    mocked_log_crit.assert_called_with("Can't restart bgp peer-group 'pg_2'. rc='1', out='% Unknown peer-group', err=''")
+
+def test_vty_client(tmp_path):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(tmp_path / "bgpd.vty"))
+    server.listen(1)
+    received = []
+
+    def serve():
+        conn, _ = server.accept()
+        data = b''
+        while len(received) < 3:
+            data += conn.recv(1024)
+            while b'\0' in data:
+                command, data = data.split(b'\0', 1)
+                received.append(command.decode())
+                rc = 1 if command.startswith(b'bad') else 0
+                conn.sendall(b'output of ' + command + b'\0\0\0' + bytes([rc]))
+        conn.close()
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    client = bgpcfgd.frr.VtyClient("bgpd")
+    client.VTY_DIR = str(tmp_path)
+    assert client.execute(["clear bgp peer-group pg_1 soft in", "bad command"]) == [
+        (0, "output of clear bgp peer-group pg_1 soft in"),
+        (1, "output of bad command"),
+    ]
+    thread.join()
+    server.close()
+    assert received == ["enable", "clear bgp peer-group pg_1 soft in", "bad command"]
+    assert client.execute(["show version"]) is None
+    assert client.sock is None
+
+def test_vty_client_no_socket(tmp_path):
+    client = bgpcfgd.frr.VtyClient("bgpd")
+    client.VTY_DIR = str(tmp_path)
+    assert client.execute(["show version"]) is None
@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock, patch
+
+from bgpcfgd.directory import Directory
+from . import swsscommon_test
+
+with patch.dict("sys.modules", swsscommon=swsscommon_test):
+    import bgpcfgd.runner
+    from bgpcfgd.manager import Manager
+    from bgpcfgd.runner import Runner
+
+
+class Subscriber(object):
+    def __init__(self, events):
+        self.events = list(events)
+
+    def pop(self):
+        if not self.events:
+            return "", "", ()
+        return self.events.pop(0)
+
+
+class BatchManager(Manager):
+    def __init__(self, common_objs, db, table, handled):
+        super(BatchManager, self).__init__(common_objs, [], db, table)
+        self.handled = handled
+
+    def batch_handler(self, events):
+        self.handled.append((self.table_name, events))
+
+
+def get_runner(tables):
+    swsscommon_mock = MagicMock(SET_COMMAND="SET", DEL_COMMAND="DEL")
+    swsscommon_mock.SonicDBConfig.getDbId.return_value = 4
+    subscribers = {table: Subscriber(events) for table, events in tables}
+    swsscommon_mock.SubscriberStateTable.side_effect = lambda conn, table: subscribers[table]
+    handled = []
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr': MagicMock(),
+        'constants': {},
+    }
+    with patch.object(bgpcfgd.runner, "swsscommon", swsscommon_mock):
+        runner = Runner(common_objs['cfg_mgr'])
+        for table, _ in tables:
+            runner.add_manager(BatchManager(common_objs, "CONFIG_DB", table, handled))
+        pending = {}
+        runner.collect_events(pending)
+        runner.dispatch_events(pending)
+    return runner, handled
+
+
+def test_table_priority():
+    _, handled = get_runner([
+        ("BGP_NEIGHBOR", [("10.0.0.1", "SET", (("asn", "65100"),))]),
+        ("LOOPBACK_INTERFACE", [("Loopback0|10.1.0.1/32", "SET", ())]),
+        ("DEVICE_METADATA", [("localhost", "SET", (("bgp_asn", "65100"),))]),
+    ])
+    assert [table for table, _ in handled] == ["DEVICE_METADATA", "LOOPBACK_INTERFACE", "BGP_NEIGHBOR"]
+
+
+def test_index_invalidated_per_handler():
+    runner, _ = get_runner([
+        ("BGP_NEIGHBOR", [("10.0.0.1", "SET", (("asn", "65100"),))]),
+        ("DEVICE_METADATA", [("localhost", "SET", (("bgp_asn", "65100"),))]),
+    ])
+    assert runner.cfg_manager.invalidate_index.call_count == 2
+    assert not runner.cfg_manager.commit.called
+
+
+def test_superseded_events_collapsed():
+    runner, handled = get_runner([
+        ("BGP_NEIGHBOR", [
+            ("10.0.0.1", "SET", (("asn", "65100"),)),
+            ("10.0.0.2", "SET", (("asn", "65200"),)),
+            ("10.0.0.1", "SET", (("asn", "65101"),)),
+            ("10.0.0.2", "DEL", ()),
+            ("10.0.0.3", "DEL", ()),
+            ("10.0.0.3", "SET", (("asn", "65300"),)),
+            ("10.0.0.4", "DEL", ()),
+            ("10.0.0.4", "SET", (("asn", "65400"),)),
+            ("10.0.0.4", "DEL", ()),
+        ]),
+    ])
+    assert handled == [("BGP_NEIGHBOR", [
+        ("10.0.0.1", "SET", {"asn": "65101"}),
+        ("10.0.0.2", "DEL", {}),
+        ("10.0.0.3", "DEL", {}),
+        ("10.0.0.3", "SET", {"asn": "65300"}),
+        ("10.0.0.4", "DEL", {}),
+    ])]
+    counters = runner.counters["CONFIG_DB|BGP_NEIGHBOR"]
+    assert counters['received'] == 9
+    assert counters['collapsed'] == 4
+    assert counters['handled'] == 5
+    assert counters['max_queue_depth'] == 5
+
+
+def test_batch_handler_default():
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr': MagicMock(),
+        'constants': {},
+    }
+    m = Manager(common_objs, [], "CONFIG_DB", "BGP_NEIGHBOR")
+    m.handler = MagicMock()
+    m.batch_handler([("10.0.0.1", "SET", {"asn": "65100"}), ("10.0.0.2", "DEL", {})])
+    assert m.handler.call_count == 2
+    m.handler.assert_called_with("10.0.0.2", "DEL", {})
@@ -76,6 +76,22 @@ def test_set():
         ]
     )
 
+def test_set_batch():
+    mgr = constructor()
+    mgr.cfg_mgr.push_list = MagicMock()
+    with patch("bgpcfgd.manager.swsscommon", MagicMock(SET_COMMAND="SET", DEL_COMMAND="DEL")):
+        mgr.batch_handler([
+            ("10.1.0.0/24", "SET", {"nexthop": "10.0.0.57"}),
+            ("10.2.0.0/24", "SET", {"nexthop": "10.0.0.59"}),
+            ("10.1.0.0/24", "DEL", {}),
+        ])
+    mgr.cfg_mgr.push_list.assert_called_once()
+    cmds = mgr.cfg_mgr.push_list.call_args[0][0]
+    assert cmds[0] == "ip route 10.1.0.0/24 10.0.0.57 tag 1"
+    assert cmds.count("router bgp 65100") == 1
+    assert cmds[-2:] == ["ip route 10.2.0.0/24 10.0.0.59 tag 1", "no ip route 10.1.0.0/24 10.0.0.57 tag 1"]
+    assert mgr.pending_cmds is None
+
 @patch('bgpcfgd.managers_static_rt.log_debug')
 def test_del_for_appl(mocked_log_debug):
     class MockRedisConfigDbGet:
@@ -1,5 +1,7 @@
 import os
 import json
+import tempfile
+from unittest.mock import patch
 
 
 from bgpcfgd.template import TemplateFabric
@@ -164,3 +166,25 @@ def test_sentinel_pg():
 def test_sentinel_instance():
     test_data = load_tests("sentinels", "instance.conf")
     run_tests("sentinel_instance", *test_data)
+
+def test_precompiled_templates_are_reused():
+    cache_dir = tempfile.mkdtemp()
+    assert TemplateFabric(TEMPLATE_PATH, cache_dir=cache_dir).precompile() > 0
+    assert len(os.listdir(cache_dir)) > 0
+    tf = TemplateFabric(TEMPLATE_PATH, cache_dir=cache_dir)
+    tmpl_path, _ = load_tests("general", "instance.conf")
+    bucket_keys = set(os.listdir(cache_dir))
+    tf.from_file(tmpl_path)
+    assert set(os.listdir(cache_dir)) == bucket_keys
+
+def test_no_bytecode_cache_without_directory():
+    tf = TemplateFabric(TEMPLATE_PATH, cache_dir=os.path.join(tempfile.mkdtemp(), "missing"))
+    assert tf.env.bytecode_cache is None
+
+def test_unreadable_bytecode_cache_entry_is_a_miss():
+    cache_dir = tempfile.mkdtemp()
+    tf = TemplateFabric(TEMPLATE_PATH, cache_dir=cache_dir)
+    tmpl_path, _ = load_tests("general", "instance.conf")
+    with patch("jinja2.FileSystemBytecodeCache.load_bytecode", side_effect=PermissionError()), \
+         patch("jinja2.FileSystemBytecodeCache.dump_bytecode", side_effect=PermissionError()):
+        assert tf.from_file(tmpl_path) is not None
@@ -0,0 +1,277 @@
+"""cfggen_server.py
+
+Long-lived render server for sonic-cfggen.
+
+Container start scripts invoke sonic-cfggen many times during boot and every
+invocation pays interpreter startup, heavy module imports, the ConfigDB read
+and possibly a full minigraph parse. 'sonic-cfggen --daemon' keeps one process
+alive which serves requests over a unix socket; the CLI forwards its argv to
+that socket when it is available and falls back to in-process rendering
+otherwise.
+
+This module only depends on the standard library so that the forwarding
+client stays cheap.
+"""
+
+from __future__ import print_function
+
+import contextlib
+import copy
+import io
+import json
+import os
+import socket
+import sys
+import traceback
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+DEFAULT_SOCKET_PATH = '/var/run/sonic-cfggen.sock'
+# Set to the server socket path to force it, or to an empty string to disable forwarding
+SOCKET_PATH_ENV = 'SONIC_CFGGEN_SOCK'
+# Environment variables which sonic-cfggen consults while rendering
+FORWARDED_ENV = ('NAMESPACE_ID', 'PLATFORM')
+CLIENT_TIMEOUT = 120
+
+
+def get_socket_path():
+    path = os.environ.get(SOCKET_PATH_ENV)
+    if path is not None:
+        return path
+    return DEFAULT_SOCKET_PATH
+
+
+def _recv_all(sock):
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def forward(argv, socket_path=None, timeout=CLIENT_TIMEOUT):
+    """
+    Forward a sonic-cfggen command line to the render server
+
+    Returns the exit code of the request, or None when no server is reachable
+    and the caller should render locally.
+    """
+    if socket_path is None:
+        socket_path = get_socket_path()
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+
+    request = {
+        'argv': list(argv),
+        'cwd': os.getcwd(),
+        'env': dict((name, os.environ[name]) for name in FORWARDED_ENV if name in os.environ),
+    }
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode())
+        sock.shutdown(socket.SHUT_WR)
+        response = json.loads(_recv_all(sock).decode())
+    except (socket.error, ValueError):
+        return None
+    finally:
+        sock.close()
+
+    sys.stdout.write(response.get('stdout', ''))
+    sys.stderr.write(response.get('stderr', ''))
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return response.get('rc', 1)
+
+
+@contextlib.contextmanager
+def _request_context(cwd, env):
+    saved_cwd = os.getcwd()
+    saved_env = dict((name, os.environ.get(name)) for name in FORWARDED_ENV)
+    try:
+        os.chdir(cwd)
+        for name in FORWARDED_ENV:
+            if name in env:
+                os.environ[name] = env[name]
+            else:
+                os.environ.pop(name, None)
+        yield
+    finally:
+        os.chdir(saved_cwd)
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_request(handler, request):
+    """
+    Run one forwarded request through handler(argv) and capture its result
+    """
+    out = io.StringIO()
+    err = io.StringIO()
+    rc = 0
+    try:
+        with _request_context(request.get('cwd', '/'), request.get('env', {})):
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    ret = handler(request['argv'])
+                    if isinstance(ret, int):
+                        rc = ret
+                except SystemExit as e:
+                    if e.code is None:
+                        rc = 0
+                    elif isinstance(e.code, int):
+                        rc = e.code
+                    else:
+                        print(e.code, file=sys.stderr)
+                        rc = 1
+    except Exception:
+        err.write(traceback.format_exc())
+        rc = 1
+    return {'rc': rc, 'stdout': out.getvalue(), 'stderr': err.getvalue()}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.read().decode())
+        except ValueError:
+            return
+        response = run_request(self.server.cfggen_handler, request)
+        self.wfile.write(json.dumps(response).encode())
+
+
+class CfggenServer(socketserver.UnixStreamServer):
+    """
+    Unix socket server which runs sonic-cfggen requests one at a time
+
+    Requests are serialized on purpose: rendering changes the process working
+    directory and environment, and shares the warm caches of RenderCache.
+    """
+    def __init__(self, socket_path, handler):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        socket_dir = os.path.dirname(socket_path)
+        if socket_dir and not os.path.isdir(socket_dir):
+            os.makedirs(socket_dir)
+        self.cfggen_handler = handler
+        socketserver.UnixStreamServer.__init__(self, socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return (path, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class RenderCache(object):
+    """
+    Warm state kept by the render server between requests
+
+    - file backed entries (e.g. parsed minigraph) are keyed by the caller and
+      validated against the mtime of every input file.
+    - ConfigDB content is kept per namespace and dropped when a keyspace
+      notification for that namespace's CONFIG_DB is pending at the start of
+      a request, or when the server itself wrote into it.
+    - jinja2 environments are kept per template search path; jinja2 itself
+      recompiles a template when its file changes.
+    Callers always get a deep copy, since sonic-cfggen mutates its data dict.
+    """
+    def __init__(self):
+        self.file_entries = {}
+        self.db_entries = {}
+        self.db_pubsubs = {}
+        self.jinja2_envs = {}
+
+    def get_file_data(self, key, files, loader, value_files=None):
+        """
+        Return loader(), reused while none of the input files changed
+
+        value_files(value) returns the input files which are only known from
+        the loaded value, e.g. the port config files of the parsed hwsku.
+        """
+        def stamps(value):
+            paths = list(files)
+            if value_files is not None:
+                paths += value_files(value)
+            return tuple(_file_stamp(path) for path in paths)
+
+        entry = self.file_entries.get(key)
+        if entry is None or entry[0] != stamps(entry[1]):
+            value = loader()
+            entry = (stamps(value), value)
+            self.file_entries[key] = entry
+        return copy.deepcopy(entry[1])
+
+    def get_jinja2_env(self, paths, loader):
+        key = tuple(paths)
+        if key not in self.jinja2_envs:
+            self.jinja2_envs[key] = loader()
+        return self.jinja2_envs[key]
+
+    def invalidate_db(self, namespace):
+        """
+        Forget the cached ConfigDB content of a namespace, called after the
+        server itself wrote into that namespace's CONFIG_DB
+        """
+        self.db_entries.pop(namespace, None)
+
+    def _subscribe_db(self, namespace, configdb):
+        if namespace in self.db_pubsubs:
+            return self.db_pubsubs[namespace]
+        try:
+            pubsub = configdb.get_redis_client(configdb.CONFIG_DB).pubsub()
+            pubsub.psubscribe("__keyspace@{}__:*".format(configdb.get_dbid(configdb.CONFIG_DB)))
+        except Exception as e:
+            sys.stderr.write("sonic-cfggen: failed to watch CONFIG_DB keyspace: {}\n".format(e))
+            return None
+        self.db_pubsubs[namespace] = pubsub
+        return pubsub
+
+    def _db_changed(self, namespace, pubsub):
+        """
+        Drain the keyspace notifications received since the previous request
+
+        Redis sends the notification of a write before acknowledging it to the
+        writer, so every write which completed before this request is seen.
+        """
+        changed = False
+        try:
+            while pubsub.get_message(0, True):
+                changed = True
+        except Exception:
+            # Connection lost, subscribe again on the next request
+            self.db_pubsubs.pop(namespace, None)
+            return True
+        return changed
+
+    def get_db_config(self, namespace, configdb):
+        """
+        Return configdb.get_config(), served from cache while CONFIG_DB is unchanged
+        """
+        pubsub = self._subscribe_db(namespace, configdb)
+        if pubsub is None:
+            return configdb.get_config()
+        if self._db_changed(namespace, pubsub):
+            self.db_entries.pop(namespace, None)
+        if namespace not in self.db_entries:
+            self.db_entries[namespace] = configdb.get_config()
+        return copy.deepcopy(self.db_entries[namespace])
@@ -1,12 +1,15 @@
 from __future__ import print_function
 
+import hashlib
 import ipaddress
 import math
 import os
+import pickle
 import sys
 import json
 import jinja2
 import subprocess
+import tempfile
 from collections import defaultdict
 
 
@@ -15,7 +18,7 @@ from lxml.etree import QName
 
 from natsort import natsorted, ns as natsortns
 
-from portconfig import get_port_config, get_fabric_port_config, get_fabric_monitor_config
+from portconfig import get_port_config, get_fabric_port_config, get_fabric_monitor_config, get_port_config_files
 from sonic_py_common.interface import backplane_prefix
 from sonic_py_common.multi_asic import is_multi_asic, get_asic_id_from_name
 
@@ -87,6 +90,112 @@ CHASSIS_CARD_PACKET = 'chassis-packet'
 CHASSIS_CARD_FABRIC = 'Fabric'
 voq_internal_intfs =  ['cpu', 'recirc', 'inband']
 
+# Parsed minigraph results are cached here when the directory exists
+MINIGRAPH_CACHE_DIR = '/var/cache/sonic/minigraph'
+MINIGRAPH_CACHE_VERSION = 2
+
+_qname_cache = {}
+_minigraph_root_cache = {}
+
+def qname(namespace, tag):
+    """ Return the '{namespace}tag' name of a minigraph element, built once per tag """
+    key = (namespace, tag)
+    name = _qname_cache.get(key)
+    if name is None:
+        name = str(QName(namespace, tag))
+        _qname_cache[key] = name
+    return name
+
+def load_minigraph_root(filename):
+    """ Return the root element of the minigraph xml file.
+
+    The tree of the last parsed file is kept, so parse_xml and the
+    parse_hostname/parse_asic_* helpers parse an unchanged file only once
+    per process. The tree must not be modified by callers.
+    """
+    try:
+        st = os.stat(filename)
+    except (OSError, TypeError):
+        return ET.parse(filename).getroot()
+    stamp = (os.path.abspath(filename), st.st_ino, st.st_mtime, st.st_size)
+    root = _minigraph_root_cache.get(stamp)
+    if root is None:
+        root = ET.parse(filename).getroot()
+        _minigraph_root_cache.clear()
+        _minigraph_root_cache[stamp] = root
+    return root
+
+def _file_stamp(filename):
+    try:
+        st = os.stat(filename)
+    except (OSError, TypeError):
+        return None
+    return (filename, st.st_mtime, st.st_size)
+
+def get_port_config_stamps(hwsku, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file):
+    """ Return the stamps of the port config files parse_xml reads for hwsku
+
+    These files are resolved from the hwsku found in the minigraph, so they are
+    checked against a cache entry after it is loaded rather than in its key.
+    """
+    files = get_port_config_files(hwsku=hwsku, platform=platform, port_config_file=port_config_file,
+                                  hwsku_config_file=hwsku_config_file, fabric_port_config_file=fabric_port_config_file,
+                                  asic_name=asic_name)
+    return [_file_stamp(f) for f in files]
+
+def get_parsed_minigraph_cache(filename, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file):
+    """ Return the cache file and the cache key of a parse_xml result
+
+    The key covers the minigraph content hash, the arguments, the input files
+    given as arguments and this parser itself. The port config files resolved
+    from the hwsku are checked with get_port_config_stamps. (None, None) is returned when the cache is
+    not available.
+    """
+    if os.environ.get("CFGGEN_UNIT_TESTING", "0") == "2" or not os.path.isdir(MINIGRAPH_CACHE_DIR):
+        return None, None
+    try:
+        with open(filename, 'rb') as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+    except (IOError, OSError, TypeError):
+        return None, None
+
+    args = (os.path.abspath(filename), platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file)
+    cache_key = (MINIGRAPH_CACHE_VERSION, content_hash, args, is_multi_asic(), tuple(sys.version_info[:2]),
+                 _file_stamp(port_config_file), _file_stamp(hwsku_config_file), _file_stamp(fabric_port_config_file),
+                 _file_stamp(os.path.abspath(__file__)))
+    cache_name = hashlib.sha1(repr(args).encode()).hexdigest() + '.pickle'
+    return os.path.join(MINIGRAPH_CACHE_DIR, cache_name), cache_key
+
+def load_parsed_minigraph(cache_file, cache_key):
+    """ Load a parse_xml result stored with the same cache key, None if there is no such entry """
+    if cache_file is None:
+        return None
+    try:
+        # Only trust entries written by the same user
+        if os.stat(cache_file).st_uid != os.getuid():
+            return None
+        with open(cache_file, 'rb') as f:
+            key, value = pickle.load(f)
+    except Exception:
+        return None
+    if key != cache_key:
+        return None
+    return value
+
+def store_parsed_minigraph(cache_file, cache_key, value):
+    """ Store a parse_xml result, errors are ignored since the cache is an optimization only """
+    if cache_file is None:
+        return
+    tmp_file = None
+    try:
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file))
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((cache_key, value), f, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_file, cache_file)
+    except Exception:
+        if tmp_file is not None and os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
 def get_asic_switch_id(slot_index, asic_name):
     asic_id = 0
     if slot_index is None:
@@ -142,16 +251,16 @@ def get_chassis_type_and_hostname(root, hname):
     chassis_type = None
     chassis_hostname = None
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device_meta in devices.findall(str(QName(ns1, "DeviceMetadata"))):
-                device_name = device_meta.find(str(QName(ns1, "Name"))).text
+        if child.tag == qname(ns, "MetadataDeclaration"):
+            devices = child.find(qname(ns, "Devices"))
+            for device_meta in devices.findall(qname(ns1, "DeviceMetadata")):
+                device_name = device_meta.find(qname(ns1, "Name")).text
                 if device_name != hname:
                     continue
-                properties = device_meta.find(str(QName(ns1, "Properties")))
-                for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                    name = device_property.find(str(QName(ns1, "Name"))).text
-                    value = device_property.find(str(QName(ns1, "Value"))).text
+                properties = device_meta.find(qname(ns1, "Properties"))
+                for device_property in properties.findall(qname(ns1, "DeviceProperty")):
+                    name = device_property.find(qname(ns1, "Name")).text
+                    value = device_property.find(qname(ns1, "Value")).text
                     if name == "ForwardingMethod":
                         chassis_type = value
                     if name == "ParentRouter":
@@ -161,16 +270,16 @@ def get_chassis_type_and_hostname(root, hname):
 def is_chassis_lc_macsec_enabled(root, hname):
     macsec_enble = None
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device_meta in devices.findall(str(QName(ns1, "DeviceMetadata"))):
-                device_name = device_meta.find(str(QName(ns1, "Name"))).text
+        if child.tag == qname(ns, "MetadataDeclaration"):
+            devices = child.find(qname(ns, "Devices"))
+            for device_meta in devices.findall(qname(ns1, "DeviceMetadata")):
+                device_name = device_meta.find(qname(ns1, "Name")).text
                 if device_name != hname:
                     continue
-                properties = device_meta.find(str(QName(ns1, "Properties")))
-                for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                    name = device_property.find(str(QName(ns1, "Name"))).text
-                    value = device_property.find(str(QName(ns1, "Value"))).text
+                properties = device_meta.find(qname(ns1, "Properties"))
+                for device_property in properties.findall(qname(ns1, "DeviceProperty")):
+                    name = device_property.find(qname(ns1, "Name")).text
+                    value = device_property.find(qname(ns1, "Value")).text
                     if name == "MacSecEnabled":
                         macsec_enble = value
     return macsec_enble
@@ -224,16 +333,16 @@ def parse_chassis_metadata(root,hname, lcname):
     max_num_core = None
     num_voq = None
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device_meta in devices.findall(str(QName(ns1, "DeviceMetadata"))):
+        if child.tag == qname(ns, "MetadataDeclaration"):
+            devices = child.find(qname(ns, "Devices"))
+            for device_meta in devices.findall(qname(ns1, "DeviceMetadata")):
                 slot_index = None
-                device_name = device_meta.find(str(QName(ns1, "Name"))).text
+                device_name = device_meta.find(qname(ns1, "Name")).text
 
-                properties = device_meta.find(str(QName(ns1, "Properties")))
-                for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                    name = device_property.find(str(QName(ns1, "Name"))).text
-                    value = device_property.find(str(QName(ns1, "Value"))).text
+                properties = device_meta.find(qname(ns1, "Properties"))
+                for device_property in properties.findall(qname(ns1, "DeviceProperty")):
+                    name = device_property.find(qname(ns1, "Name")).text
+                    value = device_property.find(qname(ns1, "Value")).text
                     if device_name == hname or device_name == lcname:
                         if name == "TotalCountOfVoQ":
                             num_voq = value
@@ -271,15 +380,15 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
     port_default_speed = {}
     system_port_id = 1
 
-    interface_metadata = device_info.find(str(QName(ns, "InterfaceMetadata")))
-    for interface in interface_metadata.findall(str(QName(ns1, "DeviceInterfaceMetadata"))):
+    interface_metadata = device_info.find(qname(ns, "InterfaceMetadata"))
+    for interface in interface_metadata.findall(qname(ns1, "DeviceInterfaceMetadata")):
         linecard_name = None
         asic_name = None
         core_port_id = None
         core_id = None
         switch_id = None
         slot_index = None
-        intf_name = interface.find(str(QName(ns1, "InterfaceName"))).text
+        intf_name = interface.find(qname(ns1, "InterfaceName")).text
         # ignore the managment interfaces
         if any(mgmt_intf in intf_name for mgmt_intf in ['Management', 'console']) == True:
             continue
@@ -301,16 +410,16 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
                   (intf_name), file=sys.stderr)
             continue
 
-        intf_properties = interface.find(str(QName(ns1, "Properties")))
+        intf_properties = interface.find(qname(ns1, "Properties"))
         if intf_properties is None:
             print('Warning cannot find interface porperties  for interface' %
                   (intf_name), file=sys.stderr)
             continue
 
-        for intf_property in intf_properties.findall(str(QName(ns1, "InterfaceProperty"))):
+        for intf_property in intf_properties.findall(qname(ns1, "InterfaceProperty")):
 
-            name = intf_property.find(str(QName(ns1, "Name"))).text
-            value = intf_property.find(str(QName(ns1, "Value"))).text
+            name = intf_property.find(qname(ns1, "Name")).text
+            value = intf_property.find(qname(ns1, "Value")).text
             if name == "CoreId":
                 core_id = value
             if name == "SlotIndex":
@@ -391,14 +500,14 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
 
 def parse_chassis_deviceinfo_voq_int_intfs(device_info):
     backend_intf_map = {}
-    backend_interfaces = device_info.find(str(QName(ns, "BackendFabricInterfaces"))).findall(
-        str(QName(ns1, "BackendFabricInterface")))
+    backend_interfaces = device_info.find(qname(ns, "BackendFabricInterfaces")).findall(
+        qname(ns1, "BackendFabricInterface"))
     voq_internal_intf_attr = {}
     for backend_interface in backend_interfaces:
-        intf_name = backend_interface.find(str(QName(ns, "InterfaceName"))).text
+        intf_name = backend_interface.find(qname(ns, "InterfaceName")).text
         if any(voq_intf in intf_name.lower() for voq_intf in voq_internal_intfs) == True:
-            sonic_name = backend_interface.find(str(QName(ns, "SonicName"))).text
-            speed = backend_interface.find(str(QName(ns, "Speed"))).text
+            sonic_name = backend_interface.find(qname(ns, "SonicName")).text
+            speed = backend_interface.find(qname(ns, "Speed")).text
             backend_intf_map[intf_name] = {'sonic_name': sonic_name, 'speed': speed}
     return backend_intf_map
 
@@ -406,16 +515,16 @@ def parse_chassis_deviceinfo_voq_int_intfs(device_info):
 def parse_chassis_deviceinfo_intfs(device_info):
     interface_map = {}
 
-    interfaces = device_info.find(str(QName(ns, "EthernetInterfaces"))).findall(
-        str(QName(ns1, "EthernetInterface")))
+    interfaces = device_info.find(qname(ns, "EthernetInterfaces")).findall(
+        qname(ns1, "EthernetInterface"))
 
     for interface in interfaces:
         # the interface name is at the chassis level, so the interface name will have
         # the slot information. It will be of format
         # Ethernet<slot_index>/port
-        intf_name = interface.find(str(QName(ns, "InterfaceName"))).text
-        sonic_name = interface.find(str(QName(ns, "SonicName"))).text
-        speed = interface.find(str(QName(ns, "Speed"))).text
+        intf_name = interface.find(qname(ns, "InterfaceName")).text
+        sonic_name = interface.find(qname(ns, "SonicName")).text
+        speed = interface.find(qname(ns, "Speed")).text
         interface_map[intf_name] = {'sonic_name': sonic_name, 'speed': speed}
     return interface_map
 
@@ -426,8 +535,8 @@ def parse_chassis_deviceinfo(deviceinfos, chassis_linecards_info, chassis_hwsku,
     chassis_name = None
     port_default_speed = {}
 
-    for device_info in deviceinfos.findall(str(QName(ns, "DeviceInfo"))):
-        dev_sku = device_info.find(str(QName(ns, "HwSku"))).text
+    for device_info in deviceinfos.findall(qname(ns, "DeviceInfo")):
+        dev_sku = device_info.find(qname(ns, "HwSku")).text
         if dev_sku == chassis_hwsku:
             # The chassis device_info for sonic chassiss will 3 sections
             # level information
@@ -495,31 +604,31 @@ def parse_device(device):
     slice_type = None
 
     for node in device:
-        if node.tag == str(QName(ns, "Address")):
-            lo_prefix = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "AddressV6")):
-            lo_prefix_v6 = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "ManagementAddress")):
-            mgmt_prefix = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "ManagementAddressV6")):
-            mgmt_prefix_v6 = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "Hostname")):
+        if node.tag == qname(ns, "Address"):
+            lo_prefix = node.find(qname(ns2, "IPPrefix")).text
+        elif node.tag == qname(ns, "AddressV6"):
+            lo_prefix_v6 = node.find(qname(ns2, "IPPrefix")).text
+        elif node.tag == qname(ns, "ManagementAddress"):
+            mgmt_prefix = node.find(qname(ns2, "IPPrefix")).text
+        elif node.tag == qname(ns, "ManagementAddressV6"):
+            mgmt_prefix_v6 = node.find(qname(ns2, "IPPrefix")).text
+        elif node.tag == qname(ns, "Hostname"):
             name = node.text
-        elif node.tag == str(QName(ns, "HwSku")):
+        elif node.tag == qname(ns, "HwSku"):
             hwsku = node.text
-        elif node.tag == str(QName(ns, "DeploymentId")):
+        elif node.tag == qname(ns, "DeploymentId"):
             deployment_id = node.text
-        elif node.tag == str(QName(ns, "ElementType")):
+        elif node.tag == qname(ns, "ElementType"):
             d_type = node.text
-        elif node.tag == str(QName(ns, "ClusterName")):
+        elif node.tag == qname(ns, "ClusterName"):
             cluster = node.text
-        elif node.tag == str(QName(ns, "SubType")):
+        elif node.tag == qname(ns, "SubType"):
             d_subtype = node.text
-        elif node.tag == str(QName(ns, "AssociatedSliceStr")) and node.text and "AZNG_Production" in node.text:
+        elif node.tag == qname(ns, "AssociatedSliceStr") and node.text and "AZNG_Production" in node.text:
             slice_type = "AZNG_Production"
 
-    if d_type is None and str(QName(ns3, "type")) in device.attrib:
-        d_type = device.attrib[str(QName(ns3, "type"))]
+    if d_type is None and qname(ns3, "type") in device.attrib:
+        d_type = device.attrib[qname(ns3, "type")]
 
     return (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, d_subtype, slice_type)
 
@@ -604,16 +713,16 @@ def parse_png(png, hname, dpg_ecmp_content = None):
     NEIGH = {}
 
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
-                linktype = link.find(str(QName(ns, "ElementType"))).text
+        if child.tag == qname(ns, "DeviceInterfaceLinks"):
+            for link in child.findall(qname(ns, "DeviceLinkBase")):
+                linktype = link.find(qname(ns, "ElementType")).text
                 if linktype == "DeviceSerialLink":
-                    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                    endport = link.find(str(QName(ns, "EndPort"))).text
-                    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                    startport = link.find(str(QName(ns, "StartPort"))).text
-                    baudrate = link.find(str(QName(ns, "Bandwidth"))).text
-                    flowcontrol = 1 if link.find(str(QName(ns, "FlowControl"))) is not None and link.find(str(QName(ns, "FlowControl"))).text == 'true' else 0
+                    enddevice = link.find(qname(ns, "EndDevice")).text
+                    endport = link.find(qname(ns, "EndPort")).text
+                    startdevice = link.find(qname(ns, "StartDevice")).text
+                    startport = link.find(qname(ns, "StartPort")).text
+                    baudrate = link.find(qname(ns, "Bandwidth")).text
+                    flowcontrol = 1 if link.find(qname(ns, "FlowControl")) is not None and link.find(qname(ns, "FlowControl")).text == 'true' else 0
                     if enddevice.lower() == hname.lower() and endport.isdigit():
                         console_ports[endport] = {
                             'remote_device': startdevice,
@@ -629,18 +738,18 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     continue
 
                 if linktype == "DeviceInterfaceLink":
-                    endport = link.find(str(QName(ns, "EndPort"))).text
-                    startdevice = link.find(str(QName(ns, "StartDevice"))).text
+                    endport = link.find(qname(ns, "EndPort")).text
+                    startdevice = link.find(qname(ns, "StartDevice")).text
                     port_device_map[endport] = startdevice
 
                 if linktype != "DeviceInterfaceLink" and linktype != "UnderlayInterfaceLink" and linktype != "DeviceMgmtLink":
                     continue
 
-                enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                endport = link.find(str(QName(ns, "EndPort"))).text
-                startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                startport = link.find(str(QName(ns, "StartPort"))).text
-                bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+                enddevice = link.find(qname(ns, "EndDevice")).text
+                endport = link.find(qname(ns, "EndPort")).text
+                startdevice = link.find(qname(ns, "StartDevice")).text
+                startport = link.find(qname(ns, "StartPort")).text
+                bandwidth_node = link.find(qname(ns, "Bandwidth"))
                 bandwidth = bandwidth_node.text if bandwidth_node is not None else None
                 if enddevice.lower() == hname.lower():
                     if endport in port_alias_map:
@@ -657,8 +766,8 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     if bandwidth:
                         port_speeds[startport] = bandwidth
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == qname(ns, "Devices"):
+            for device in child.findall(qname(ns, "Device")):
                 (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, d_subtype, slice_type) = \
                                         parse_device(device)
                 device_data = {}
@@ -684,29 +793,29 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     device_data['slice_type'] = slice_type
                 devices[name] = device_data
 
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for if_link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if str(QName(ns3, "type")) in if_link.attrib:
-                    link_type = if_link.attrib[str(QName(ns3, "type"))]
+        if child.tag == qname(ns, "DeviceInterfaceLinks"):
+            for if_link in child.findall(qname(ns, 'DeviceLinkBase')):
+                if qname(ns3, "type") in if_link.attrib:
+                    link_type = if_link.attrib[qname(ns3, "type")]
                     if link_type == 'DeviceSerialLink':
                         for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
+                            if node.tag == qname(ns, "EndPort"):
                                 console_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
+                            elif node.tag == qname(ns, "EndDevice"):
                                 console_dev = node.text
                     elif link_type == 'DeviceMgmtLink':
                         for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
+                            if node.tag == qname(ns, "EndPort"):
                                 mgmt_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
+                            elif node.tag == qname(ns, "EndDevice"):
                                 mgmt_dev = node.text
 
 
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if link.find(str(QName(ns, "ElementType"))).text == "LogicalLink":
-                    intf_name = link.find(str(QName(ns, "EndPort"))).text
-                    start_device = link.find(str(QName(ns, "StartDevice"))).text
+        if child.tag == qname(ns, "DeviceInterfaceLinks"):
+            for link in child.findall(qname(ns, 'DeviceLinkBase')):
+                if link.find(qname(ns, "ElementType")).text == "LogicalLink":
+                    intf_name = link.find(qname(ns, "EndPort")).text
+                    start_device = link.find(qname(ns, "StartDevice")).text
                     if intf_name in port_alias_map:
                         intf_name = port_alias_map[intf_name]
 
@@ -727,11 +836,11 @@ def parse_png(png, hname, dpg_ecmp_content = None):
 def parse_asic_external_link(link, asic_name, hostname):
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link.find(qname(ns, "EndDevice")).text
+    endport = link.find(qname(ns, "EndPort")).text
+    startdevice = link.find(qname(ns, "StartDevice")).text
+    startport = link.find(qname(ns, "StartPort")).text
+    bandwidth_node = link.find(qname(ns, "Bandwidth"))
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     # if chassis internal is false, the interface name will be
     # interface alias which should be converted to asic port name
@@ -753,11 +862,11 @@ def parse_asic_external_link(link, asic_name, hostname):
 def parse_asic_internal_link(link, asic_name, hostname):
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link.find(qname(ns, "EndDevice")).text
+    endport = link.find(qname(ns, "EndPort")).text
+    startdevice = link.find(qname(ns, "StartDevice")).text
+    startport = link.find(qname(ns, "StartPort")).text
+    bandwidth_node = link.find(qname(ns, "Bandwidth"))
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     if ((enddevice.lower() == asic_name.lower()) and
             (startdevice.lower() != hostname.lower())):
@@ -781,13 +890,13 @@ def parse_asic_png(png, asic_name, hostname):
     devices = {}
     port_speeds = {}
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
+        if child.tag == qname(ns, "DeviceInterfaceLinks"):
+            for link in child.findall(qname(ns, "DeviceLinkBase")):
                 # Chassis internal node is used in multi-asic device or chassis minigraph
                 # where the minigraph will contain the internal asic connectivity and
                 # external neighbor information. The ChassisInternal node will be used to
                 # determine if the link is internal to the device or chassis.
-                chassis_internal_node = link.find(str(QName(ns, "ChassisInternal")))
+                chassis_internal_node = link.find(qname(ns, "ChassisInternal"))
                 chassis_internal = chassis_internal_node.text if chassis_internal_node is not None else "false"
 
                 # If the link is an external link include the external neighbor
@@ -801,8 +910,8 @@ def parse_asic_png(png, asic_name, hostname):
                     neighbors.update(int_neighbors)
                     port_speeds.update(int_port_speeds)
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == qname(ns, "Devices"):
+            for device in child.findall(qname(ns, "Device")):
                 (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, _, slice_type) = parse_device(device)
                 device_data = {}
                 if hwsku != None:
@@ -829,11 +938,11 @@ def parse_asic_png(png, asic_name, hostname):
 
 
 def parse_loopback_intf(child):
-    lointfs = child.find(str(QName(ns, "LoopbackIPInterfaces")))
+    lointfs = child.find(qname(ns, "LoopbackIPInterfaces"))
     lo_intfs = {}
-    for lointf in lointfs.findall(str(QName(ns1, "LoopbackIPInterface"))):
-        intfname = lointf.find(str(QName(ns, "AttachTo"))).text
-        ipprefix = lointf.find(str(QName(ns1, "PrefixStr"))).text
+    for lointf in lointfs.findall(qname(ns1, "LoopbackIPInterface")):
+        intfname = lointf.find(qname(ns, "AttachTo")).text
+        ipprefix = lointf.find(qname(ns1, "PrefixStr")).text
         lo_intfs[(intfname, ipprefix)] = {}
     return lo_intfs
 
@@ -866,34 +975,34 @@ def parse_dpg(dpg, hname):
             There is just one aclintf node in the minigraph
             Get the aclintfs node first.
         """
-        if not aclintfs and child.find(str(QName(ns, "AclInterfaces"))) is not None and child.find(str(QName(ns, "AclInterfaces"))).findall(str(QName(ns, "AclInterface"))):
-            aclintfs = child.find(str(QName(ns, "AclInterfaces"))).findall(str(QName(ns, "AclInterface")))
+        if not aclintfs and child.find(qname(ns, "AclInterfaces")) is not None and child.find(qname(ns, "AclInterfaces")).findall(qname(ns, "AclInterface")):
+            aclintfs = child.find(qname(ns, "AclInterfaces")).findall(qname(ns, "AclInterface"))
         """
             In Multi-NPU platforms the mgmt intfs are defined only for the host not for individual asic
             There is just one mgmtintf node in the minigraph
             Get the mgmtintfs node first. We need mgmt intf to get mgmt ip in per asic dockers.
         """
-        if not mgmtintfs and child.find(str(QName(ns, "ManagementIPInterfaces"))) is not None and  child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface"))):
-            mgmtintfs = child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface")))
-        hostname = child.find(str(QName(ns, "Hostname")))
+        if not mgmtintfs and child.find(qname(ns, "ManagementIPInterfaces")) is not None and  child.find(qname(ns, "ManagementIPInterfaces")).findall(qname(ns1, "ManagementIPInterface")):
+            mgmtintfs = child.find(qname(ns, "ManagementIPInterfaces")).findall(qname(ns1, "ManagementIPInterface"))
+        hostname = child.find(qname(ns, "Hostname"))
         if hostname.text.lower() != hname.lower():
             continue
 
         vni = vni_default
-        vni_element = child.find(str(QName(ns, "VNI")))
+        vni_element = child.find(qname(ns, "VNI"))
         if vni_element != None:
             if vni_element.text.isdigit():
                 vni = int(vni_element.text)
             else:
                 print("VNI must be an integer (use default VNI %d instead)" % vni_default, file=sys.stderr)
 
-        ipintfs = child.find(str(QName(ns, "IPInterfaces")))
+        ipintfs = child.find(qname(ns, "IPInterfaces"))
         intfs = {}
         ip_intfs_map = {}
-        for ipintf in ipintfs.findall(str(QName(ns, "IPInterface"))):
-            ipprefix = ipintf.find(str(QName(ns, "Prefix"))).text
-            ipintf_name  = ipintf.find(str(QName(ns, "Name"))).text
-            intfalias = ipintf.find(str(QName(ns, "AttachTo"))).text
+        for ipintf in ipintfs.findall(qname(ns, "IPInterface")):
+            ipprefix = ipintf.find(qname(ns, "Prefix")).text
+            ipintf_name  = ipintf.find(qname(ns, "Name")).text
+            intfalias = ipintf.find(qname(ns, "AttachTo")).text
             """
                 VoqInband interfaces are special ip interfaces needed on inter linecard
                 control plane communications on Voq Chassis
@@ -915,58 +1024,58 @@ def parse_dpg(dpg, hname):
             ip_intfs_map[ipprefix] = intfalias
         lo_intfs = parse_loopback_intf(child)
 
-        subintfs = child.find(str(QName(ns, "SubInterfaces")))
+        subintfs = child.find(qname(ns, "SubInterfaces"))
         if subintfs is not None:
-            for subintf in subintfs.findall(str(QName(ns, "SubInterface"))):
-                intfalias = subintf.find(str(QName(ns, "AttachTo"))).text
+            for subintf in subintfs.findall(qname(ns, "SubInterface")):
+                intfalias = subintf.find(qname(ns, "AttachTo")).text
                 intfname = port_alias_map.get(intfalias, intfalias)
-                ipprefix = subintf.find(str(QName(ns, "Prefix"))).text
-                subintfvlan = subintf.find(str(QName(ns, "Vlan"))).text
+                ipprefix = subintf.find(qname(ns, "Prefix")).text
+                subintfvlan = subintf.find(qname(ns, "Vlan")).text
                 subintfname = intfname + VLAN_SUB_INTERFACE_SEPARATOR + subintfvlan
                 intfs[(subintfname, ipprefix)] = {}
 
-        mvrfConfigs = child.find(str(QName(ns, "MgmtVrfConfigs")))
+        mvrfConfigs = child.find(qname(ns, "MgmtVrfConfigs"))
         mvrf = {}
         if mvrfConfigs != None:
-            mv = mvrfConfigs.find(str(QName(ns1, "MgmtVrfGlobal")))
+            mv = mvrfConfigs.find(qname(ns1, "MgmtVrfGlobal"))
             if mv != None:
-                mvrf_en_flag = mv.find(str(QName(ns, "mgmtVrfEnabled"))).text
+                mvrf_en_flag = mv.find(qname(ns, "mgmtVrfEnabled")).text
                 mvrf["vrf_global"] = {"mgmtVrfEnabled": mvrf_en_flag}
 
         mgmt_intf = {}
         for mgmtintf in mgmtintfs:
-            intfname = mgmtintf.find(str(QName(ns, "AttachTo"))).text
-            ipprefix = mgmtintf.find(str(QName(ns1, "PrefixStr"))).text
+            intfname = mgmtintf.find(qname(ns, "AttachTo")).text
+            ipprefix = mgmtintf.find(qname(ns1, "PrefixStr")).text
             mgmtipn = ipaddress.ip_network(UNICODE_TYPE(ipprefix), False)
             gwaddr = ipaddress.ip_address(next(mgmtipn.hosts()))
             mgmt_intf[(intfname, ipprefix)] = {'gwaddr': gwaddr}
 
-        voqinbandintfs = child.find(str(QName(ns, "VoqInbandInterfaces")))
+        voqinbandintfs = child.find(qname(ns, "VoqInbandInterfaces"))
         if voqinbandintfs:
-            for voqintf in voqinbandintfs.findall(str(QName(ns1, "VoqInbandInterface"))):
-                intfname = voqintf.find(str(QName(ns, "Name"))).text
-                intftype = voqintf.find(str(QName(ns, "Type"))).text
-                ipprefix = voqintf.find(str(QName(ns1, "PrefixStr"))).text
+            for voqintf in voqinbandintfs.findall(qname(ns1, "VoqInbandInterface")):
+                intfname = voqintf.find(qname(ns, "Name")).text
+                intftype = voqintf.find(qname(ns, "Type")).text
+                ipprefix = voqintf.find(qname(ns1, "PrefixStr")).text
                 if intfname not in voq_inband_intfs:
                    voq_inband_intfs[intfname] = {'inband_type': intftype}
                 voq_inband_intfs["%s|%s" % (intfname, ipprefix)] = {}
 
-        pcintfs = child.find(str(QName(ns, "PortChannelInterfaces")))
+        pcintfs = child.find(qname(ns, "PortChannelInterfaces"))
         pc_intfs = []
         pcs = {}
         pc_members = {}
         intfs_inpc = [] # List to hold all the LAG member interfaces
-        for pcintf in pcintfs.findall(str(QName(ns, "PortChannel"))):
-            pcintfname = pcintf.find(str(QName(ns, "Name"))).text
-            pcintfmbr = pcintf.find(str(QName(ns, "AttachTo"))).text
+        for pcintf in pcintfs.findall(qname(ns, "PortChannel")):
+            pcintfname = pcintf.find(qname(ns, "Name")).text
+            pcintfmbr = pcintf.find(qname(ns, "AttachTo")).text
             pcmbr_list = pcintfmbr.split(';')
             pc_intfs.append(pcintfname)
             for i, member in enumerate(pcmbr_list):
                 pcmbr_list[i] = port_alias_map.get(member, member)
                 intfs_inpc.append(pcmbr_list[i])
                 pc_members[(pcintfname, pcmbr_list[i])] = {}
-            if pcintf.find(str(QName(ns, "Fallback"))) != None:
-                pcs[pcintfname] = {'fallback': pcintf.find(str(QName(ns, "Fallback"))).text, 'min_links': str(int(math.ceil(len(pcmbr_list) * 0.75))), 'lacp_key': 'auto'}
+            if pcintf.find(qname(ns, "Fallback")) != None:
+                pcs[pcintfname] = {'fallback': pcintf.find(qname(ns, "Fallback")).text, 'min_links': str(int(math.ceil(len(pcmbr_list) * 0.75))), 'lacp_key': 'auto'}
             else:
                 pcs[pcintfname] = {'min_links': str(int(math.ceil(len(pcmbr_list) * 0.75))), 'lacp_key': 'auto' }
         port_nhipv4_map = {}
@@ -975,26 +1084,26 @@ def parse_dpg(dpg, hname):
         nhportlist = []
         dpg_ecmp_content = {}
         static_routes = {}
-        ipnhs = child.find(str(QName(ns, "IPNextHops")))
+        ipnhs = child.find(qname(ns, "IPNextHops"))
         if ipnhs is not None:
-            for ipnh in ipnhs.findall(str(QName(ns, "IPNextHop"))):
-                if ipnh.find(str(QName(ns, "Type"))).text == 'FineGrainedECMPGroupMember':
-                    ipnhfmbr = ipnh.find(str(QName(ns, "AttachTo"))).text
-                    ipnhaddr = ipnh.find(str(QName(ns, "Address"))).text
+            for ipnh in ipnhs.findall(qname(ns, "IPNextHop")):
+                if ipnh.find(qname(ns, "Type")).text == 'FineGrainedECMPGroupMember':
+                    ipnhfmbr = ipnh.find(qname(ns, "AttachTo")).text
+                    ipnhaddr = ipnh.find(qname(ns, "Address")).text
                     nhportlist.append(ipnhfmbr)
                     if "." in ipnhaddr:
                         port_nhipv4_map[ipnhfmbr] = ipnhaddr
                     elif ":" in ipnhaddr:
                         port_nhipv6_map[ipnhfmbr] = ipnhaddr
-                elif ipnh.find(str(QName(ns, "Type"))).text == 'StaticRoute':
-                    prefix = ipnh.find(str(QName(ns, "Address"))).text
+                elif ipnh.find(qname(ns, "Type")).text == 'StaticRoute':
+                    prefix = ipnh.find(qname(ns, "Address")).text
                     ifname = []
                     nexthop = []
-                    for nexthop_tuple in ipnh.find(str(QName(ns, "AttachTo"))).text.split(";"):
+                    for nexthop_tuple in ipnh.find(qname(ns, "AttachTo")).text.split(";"):
                         ifname.append(nexthop_tuple.split(",")[0])
                         nexthop.append(nexthop_tuple.split(",")[1])
-                    if ipnh.find(str(QName(ns, "Advertise"))):
-                       advertise = ipnh.find(str(QName(ns, "Advertise"))).text
+                    if ipnh.find(qname(ns, "Advertise")):
+                       advertise = ipnh.find(qname(ns, "Advertise")).text
                     else:
                         advertise = "false"
                     if '/' not in prefix:
@@ -1018,30 +1127,30 @@ def parse_dpg(dpg, hname):
                 dpg_ecmp_content['ipv4'] = ipv4_content
                 dpg_ecmp_content['ipv6'] = ipv6_content
 
-        vlanintfs = child.find(str(QName(ns, "VlanInterfaces")))
+        vlanintfs = child.find(qname(ns, "VlanInterfaces"))
         vlans = {}
         vlan_members = {}
         vlan_member_list = {}
         dhcp_relay_table = {}
         # Dict: vlan member (port/PortChannel) -> set of VlanID, in which the member if an untagged vlan member
         untagged_vlan_mbr = defaultdict(set)
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vlantype = vintf.find(str(QName(ns, "Type")))
+        for vintf in vlanintfs.findall(qname(ns, "VlanInterface")):
+            vlanid = vintf.find(qname(ns, "VlanID")).text
+            vlantype = vintf.find(qname(ns, "Type"))
             if vlantype is None:
                 vlantype_name = ""
             else:
                 vlantype_name = vlantype.text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
+            vintfmbr = vintf.find(qname(ns, "AttachTo")).text
             vmbr_list = vintfmbr.split(';')
             if vlantype_name != "Tagged":
                 for member in vmbr_list:
                     untagged_vlan_mbr[member].add(vlanid)
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vintfname = vintf.find(str(QName(ns, "Name"))).text
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
-            vlantype = vintf.find(str(QName(ns, "Type")))
+        for vintf in vlanintfs.findall(qname(ns, "VlanInterface")):
+            vintfname = vintf.find(qname(ns, "Name")).text
+            vlanid = vintf.find(qname(ns, "VlanID")).text
+            vintfmbr = vintf.find(qname(ns, "AttachTo")).text
+            vlantype = vintf.find(qname(ns, "Type"))
             if vlantype is None:
                 vlantype_name = ""
             else:
@@ -1062,13 +1171,13 @@ def parse_dpg(dpg, hname):
 
             # If this VLAN requires a DHCP relay agent, it will contain a <DhcpRelays> element
             # containing a list of DHCP server IPs
-            vintf_node = vintf.find(str(QName(ns, "DhcpRelays")))
+            vintf_node = vintf.find(qname(ns, "DhcpRelays"))
             if vintf_node is not None and vintf_node.text is not None:
                 vintfdhcpservers = vintf_node.text
                 vdhcpserver_list = vintfdhcpservers.split(';')
                 vlan_attributes['dhcp_servers'] = vdhcpserver_list
 
-            vintf_node = vintf.find(str(QName(ns, "Dhcpv6Relays")))
+            vintf_node = vintf.find(qname(ns, "Dhcpv6Relays"))
             if vintf_node is not None and vintf_node.text is not None:
                 vintfdhcpservers = vintf_node.text
                 vdhcpserver_list = vintfdhcpservers.split(';')
@@ -1077,11 +1186,11 @@ def parse_dpg(dpg, hname):
                 sonic_vlan_member_name = "Vlan%s" % (vlanid)
                 dhcp_relay_table[sonic_vlan_member_name] = dhcp_attributes
 
-            vlanmac = vintf.find(str(QName(ns, "MacAddress")))
+            vlanmac = vintf.find(qname(ns, "MacAddress"))
             if vlanmac is not None and vlanmac.text is not None:
                 vlan_attributes['mac'] = vlanmac.text
 
-            vintf_node = vintf.find(str(QName(ns, "SecondarySubnets")))
+            vintf_node = vintf.find(qname(ns, "SecondarySubnets"))
             if vintf_node is not None and vintf_node.text is not None:
                 subnets = vintf_node.text.split(';')
                 for subnet in subnets:
@@ -1099,15 +1208,15 @@ def parse_dpg(dpg, hname):
             vlan_member_list[sonic_vlan_name] = vmbr_list
 
         for aclintf in aclintfs:
-            if aclintf.find(str(QName(ns, "InAcl"))) is not None:
-                aclname = aclintf.find(str(QName(ns, "InAcl"))).text.upper().replace(" ", "_").replace("-", "_")
+            if aclintf.find(qname(ns, "InAcl")) is not None:
+                aclname = aclintf.find(qname(ns, "InAcl")).text.upper().replace(" ", "_").replace("-", "_")
                 stage = "ingress"
-            elif aclintf.find(str(QName(ns, "OutAcl"))) is not None:
-                aclname = aclintf.find(str(QName(ns, "OutAcl"))).text.upper().replace(" ", "_").replace("-", "_")
+            elif aclintf.find(qname(ns, "OutAcl")) is not None:
+                aclname = aclintf.find(qname(ns, "OutAcl")).text.upper().replace(" ", "_").replace("-", "_")
                 stage = "egress"
             else:
                 sys.exit("Error: 'AclInterface' must contain either an 'InAcl' or 'OutAcl' subelement.")
-            aclattach = aclintf.find(str(QName(ns, "AttachTo"))).text.split(';')
+            aclattach = aclintf.find(qname(ns, "AttachTo")).text.split(';')
             acl_intfs = []
             is_bmc_data = False
             is_bmc_data_v6 = False
@@ -1193,7 +1302,7 @@ def parse_dpg(dpg, hname):
                         if panel_port not in intfs_inpc and panel_port not in acl_intfs:
                             acl_intfs.append(panel_port)
                     break
-            if aclintf.find(str(QName(ns, "Type"))) is not None and aclintf.find(str(QName(ns, "Type"))).text.upper() == "BMCDATA":
+            if aclintf.find(qname(ns, "Type")) is not None and aclintf.find(qname(ns, "Type")).text.upper() == "BMCDATA":
                 if 'v6' in aclname.lower():
                     is_bmc_data_v6 = True
                     acl_table_types['BMCDATAV6'] = acl_table_type_defination['BMCDATAV6']
@@ -1229,7 +1338,7 @@ def parse_dpg(dpg, hname):
             else:
                 # This ACL has no interfaces to attach to -- consider this a control plane ACL
                 try:
-                    aclservice = aclintf.find(str(QName(ns, "Type"))).text
+                    aclservice = aclintf.find(qname(ns, "Type")).text
 
                     # If we already have an ACL with this name and this ACL is bound to a different service,
                     # append the service to our list of services
@@ -1249,7 +1358,7 @@ def parse_dpg(dpg, hname):
                     print("Warning: Ignoring Control Plane ACL %s without type" % aclname, file=sys.stderr)
 
 
-        mg_tunnels = child.find(str(QName(ns, "TunnelInterfaces")))
+        mg_tunnels = child.find(qname(ns, "TunnelInterfaces"))
         if mg_tunnels is not None:
             table_key_to_mg_key_map = {"encap_ecn_mode": "EcnEncapsulationMode",
                                        "ecn_mode": "EcnDecapsulationMode",
@@ -1262,7 +1371,7 @@ def parse_dpg(dpg, hname):
                                        "encap_tc_to_queue_map": "EncapTcToQueueMap",
                                        "encap_tc_to_dscp_map": "EncapTcToDscpMap"}
 
-            for mg_tunnel in mg_tunnels.findall(str(QName(ns, "TunnelInterface"))):
+            for mg_tunnel in mg_tunnels.findall(qname(ns, "TunnelInterface")):
                 tunnel_type = mg_tunnel.attrib["Type"]
                 tunnel_name = mg_tunnel.attrib["Name"]
                 tunnelintfs[tunnel_type][tunnel_name] = {
@@ -1287,7 +1396,7 @@ def parse_dpg(dpg, hname):
 
 def parse_host_loopback(dpg, hname):
     for child in dpg:
-        hostname = child.find(str(QName(ns, "Hostname")))
+        hostname = child.find(qname(ns, "Hostname"))
         if hostname.text.lower() != hname.lower():
             continue
         lo_intfs = parse_loopback_intf(child)
@@ -1303,38 +1412,38 @@ def parse_cpg(cpg, hname, local_devices=[]):
     bgp_sentinel_sessions = {}
     for child in cpg:
         tag = child.tag
-        if tag == str(QName(ns, "PeeringSessions")):
-            for session in child.findall(str(QName(ns, "BGPSession"))):
-                start_router = session.find(str(QName(ns, "StartRouter"))).text
-                start_peer = session.find(str(QName(ns, "StartPeer"))).text
-                end_router = session.find(str(QName(ns, "EndRouter"))).text
-                end_peer = session.find(str(QName(ns, "EndPeer"))).text
-                rrclient = 1 if session.find(str(QName(ns, "RRClient"))) is not None else 0
-                if session.find(str(QName(ns, "HoldTime"))) is not None:
-                    holdtime = session.find(str(QName(ns, "HoldTime"))).text
+        if tag == qname(ns, "PeeringSessions"):
+            for session in child.findall(qname(ns, "BGPSession")):
+                start_router = session.find(qname(ns, "StartRouter")).text
+                start_peer = session.find(qname(ns, "StartPeer")).text
+                end_router = session.find(qname(ns, "EndRouter")).text
+                end_peer = session.find(qname(ns, "EndPeer")).text
+                rrclient = 1 if session.find(qname(ns, "RRClient")) is not None else 0
+                if session.find(qname(ns, "HoldTime")) is not None:
+                    holdtime = session.find(qname(ns, "HoldTime")).text
                 else:
                     holdtime = 180
-                if session.find(str(QName(ns, "KeepAliveTime"))) is not None:
-                    keepalive = session.find(str(QName(ns, "KeepAliveTime"))).text
+                if session.find(qname(ns, "KeepAliveTime")) is not None:
+                    keepalive = session.find(qname(ns, "KeepAliveTime")).text
                 else:
                     keepalive = 60
-                nhopself = 1 if session.find(str(QName(ns, "NextHopSelf"))) is not None else 0
+                nhopself = 1 if session.find(qname(ns, "NextHopSelf")) is not None else 0
 
                 # choose the right table and admin_status for the peer
                 chassis_internal_ibgp = None
-                if session.find(str(QName(ns, "ChassisInternal")))is not None:
+                if session.find(qname(ns, "ChassisInternal"))is not None:
 
-                    chassis_internal_ibgp = session.find(str(QName(ns, "ChassisInternal"))).text
+                    chassis_internal_ibgp = session.find(qname(ns, "ChassisInternal")).text
                 else:
-                    if session.find(str(QName(ns, "BgpGroup"))) is not None:
-                        chassis_internal_ibgp_group = session.find(str(QName(ns, "BgpGroup")))
+                    if session.find(qname(ns, "BgpGroup")) is not None:
+                        chassis_internal_ibgp_group = session.find(qname(ns, "BgpGroup"))
                         start_group_peer = None
                         end_group_peer = None
 
-                        if chassis_internal_ibgp_group.find(str(QName(ns, "Start"))) is not None:
-                            start_group_peer = chassis_internal_ibgp_group.find(str(QName(ns, "Start"))).text
-                        if chassis_internal_ibgp_group.find(str(QName(ns, "End"))) is not None:
-                            end_group_peer = chassis_internal_ibgp_group.find(str(QName(ns, "End"))).text
+                        if chassis_internal_ibgp_group.find(qname(ns, "Start")) is not None:
+                            start_group_peer = chassis_internal_ibgp_group.find(qname(ns, "Start")).text
+                        if chassis_internal_ibgp_group.find(qname(ns, "End")) is not None:
+                            end_group_peer = chassis_internal_ibgp_group.find(qname(ns, "End")).text
 
                         if start_group_peer == CHASSIS_CARD_VOQ  and end_group_peer == CHASSIS_CARD_VOQ:
                             chassis_internal_ibgp = "voq"
@@ -1377,35 +1486,35 @@ def parse_cpg(cpg, hname, local_devices=[]):
                     }
                     if admin_status:
                         table[end_peer.lower()]['admin_status'] = admin_status
-        elif child.tag == str(QName(ns, "Routers")):
-            for router in child.findall(str(QName(ns1, "BGPRouterDeclaration"))):
-                asn = router.find(str(QName(ns1, "ASN"))).text
-                hostname = router.find(str(QName(ns1, "Hostname"))).text
+        elif child.tag == qname(ns, "Routers"):
+            for router in child.findall(qname(ns1, "BGPRouterDeclaration")):
+                asn = router.find(qname(ns1, "ASN")).text
+                hostname = router.find(qname(ns1, "Hostname")).text
                 if hostname.lower() == hname.lower():
                     myasn = asn
-                    peers = router.find(str(QName(ns1, "Peers")))
-                    for bgpPeer in peers.findall(str(QName(ns, "BGPPeer"))):
-                        addr = bgpPeer.find(str(QName(ns, "Address"))).text
-                        if bgpPeer.find(str(QName(ns1, "PeersRange"))) is not None: # FIXME: is better to check for type BGPPeerPassive
-                            name = bgpPeer.find(str(QName(ns1, "Name"))).text
-                            ip_range = bgpPeer.find(str(QName(ns1, "PeersRange"))).text
+                    peers = router.find(qname(ns1, "Peers"))
+                    for bgpPeer in peers.findall(qname(ns, "BGPPeer")):
+                        addr = bgpPeer.find(qname(ns, "Address")).text
+                        if bgpPeer.find(qname(ns1, "PeersRange")) is not None: # FIXME: is better to check for type BGPPeerPassive
+                            name = bgpPeer.find(qname(ns1, "Name")).text
+                            ip_range = bgpPeer.find(qname(ns1, "PeersRange")).text
                             ip_range_group = ip_range.split(';') if ip_range and ip_range != "" else []
                             if name == "BGPSentinel" or name == "BGPSentinelV6":
                                 bgp_sentinel_sessions[name] = {
                                     'name': name,
                                     'ip_range': ip_range_group
                                 }
-                                if bgpPeer.find(str(QName(ns, "Address"))) is not None:
-                                    bgp_sentinel_sessions[name]['src_address'] = bgpPeer.find(str(QName(ns, "Address"))).text
+                                if bgpPeer.find(qname(ns, "Address")) is not None:
+                                    bgp_sentinel_sessions[name]['src_address'] = bgpPeer.find(qname(ns, "Address")).text
                             else:
                                 bgp_peers_with_range[name] = {
                                     'name': name,
                                     'ip_range': ip_range_group
                                 }
-                                if bgpPeer.find(str(QName(ns, "Address"))) is not None:
-                                    bgp_peers_with_range[name]['src_address'] = bgpPeer.find(str(QName(ns, "Address"))).text
-                                if bgpPeer.find(str(QName(ns1, "PeerAsn"))) is not None:
-                                    bgp_peers_with_range[name]['peer_asn'] = bgpPeer.find(str(QName(ns1, "PeerAsn"))).text
+                                if bgpPeer.find(qname(ns, "Address")) is not None:
+                                    bgp_peers_with_range[name]['src_address'] = bgpPeer.find(qname(ns, "Address")).text
+                                if bgpPeer.find(qname(ns1, "PeerAsn")) is not None:
+                                    bgp_peers_with_range[name]['peer_asn'] = bgpPeer.find(qname(ns1, "PeerAsn")).text
                 else:
                     for peer in bgp_sessions:
                         bgp_session = bgp_sessions[peer]
@@ -1440,13 +1549,13 @@ def parse_chassis_meta(meta, hname):
     macsec_profile = {}
     qos_profile = None
 
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(qname(ns, "Devices"))
+    for device in device_metas.findall(qname(ns1, "DeviceMetadata")):
+        if device.find(qname(ns1, "Name")).text.lower() == hname.lower():
+            properties = device.find(qname(ns1, "Properties"))
+            for device_property in properties.findall(qname(ns1, "DeviceProperty")):
+                name = device_property.find(qname(ns1, "Name")).text
+                value = device_property.find(qname(ns1, "Value")).text
                 value_group = value.strip().split(';') if value and value != "" else []
                 if name == "NtpResources":
                     ntp_servers = value_group
@@ -1493,13 +1602,13 @@ def parse_meta(meta, hname):
     qos_profile = None
     rack_mgmt_map = None
 
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(qname(ns, "Devices"))
+    for device in device_metas.findall(qname(ns1, "DeviceMetadata")):
+        if device.find(qname(ns1, "Name")).text.lower() == hname.lower():
+            properties = device.find(qname(ns1, "Properties"))
+            for device_property in properties.findall(qname(ns1, "DeviceProperty")):
+                name = device_property.find(qname(ns1, "Name")).text
+                value = device_property.find(qname(ns1, "Value")).text
                 value_group = value.strip().split(';') if value and value != "" else []
                 if name == "DhcpResources":
                     dhcp_servers = value_group
@@ -1547,14 +1656,14 @@ def parse_meta(meta, hname):
 
 
 def parse_linkmeta(meta, hname):
-    link = meta.find(str(QName(ns, "Link")))
+    link = meta.find(qname(ns, "Link"))
     linkmetas = {}
-    for linkmeta in link.findall(str(QName(ns1, "LinkMetadata"))):
+    for linkmeta in link.findall(qname(ns1, "LinkMetadata")):
         port = None
         fec_disabled = None
 
         # Sample: ARISTA05T1:Ethernet1/33;switch-t0:fortyGigE0/4
-        key = linkmeta.find(str(QName(ns1, "Key"))).text
+        key = linkmeta.find(qname(ns1, "Key")).text
         endpoints = key.split(';')
         for endpoint in endpoints:
             t = endpoint.split(':')
@@ -1572,10 +1681,10 @@ def parse_linkmeta(meta, hname):
         macsec_enabled = False
         tx_power = None
         laser_freq = None
-        properties = linkmeta.find(str(QName(ns1, "Properties")))
-        for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-            name = device_property.find(str(QName(ns1, "Name"))).text
-            value = device_property.find(str(QName(ns1, "Value"))).text
+        properties = linkmeta.find(qname(ns1, "Properties"))
+        for device_property in properties.findall(qname(ns1, "DeviceProperty")):
+            name = device_property.find(qname(ns1, "Name")).text
+            value = device_property.find(qname(ns1, "Value")).text
             if name == "FECDisabled":
                 fec_disabled = value
             elif name in [ "GeminiPeeringLink", "LibraPeeringLink" ]:
@@ -1629,15 +1738,12 @@ def parse_global_info(root):
     hwsku = hostname = None
     docker_routing_config_mode = "separated"
 
-    hwsku_qn = QName(ns, "HwSku")
-    hostname_qn = QName(ns, "Hostname")
-    docker_routing_config_mode_qn = QName(ns, "DockerRoutingConfigMode")
     for child in root:
-        if child.tag == str(hwsku_qn):
+        if child.tag == qname(ns, "HwSku"):
             hwsku = child.text
-        if child.tag == str(hostname_qn):
+        if child.tag == qname(ns, "Hostname"):
             hostname = child.text
-        if child.tag == str(docker_routing_config_mode_qn):
+        if child.tag == qname(ns, "DockerRoutingConfigMode"):
             docker_routing_config_mode = child.text
             
     chassis_type, chassis_hostname  =  get_chassis_type_and_hostname(root, hostname)
@@ -1650,13 +1756,13 @@ def parse_asic_meta(meta, hname):
     max_cores = None
     deployment_id = None
     macsec_profile = {}
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(qname(ns, "Devices"))
+    for device in device_metas.findall(qname(ns1, "DeviceMetadata")):
+        if device.find(qname(ns1, "Name")).text.lower() == hname.lower():
+            properties = device.find(qname(ns1, "Properties"))
+            for device_property in properties.findall(qname(ns1, "DeviceProperty")):
+                name = device_property.find(qname(ns1, "Name")).text
+                value = device_property.find(qname(ns1, "Value")).text
                 if name == "SubRole":
                     sub_role = value
                 elif name == "SwitchId" or name == "AsicSwitchId":
@@ -1676,31 +1782,31 @@ def parse_deviceinfo(meta, hwsku):
     port_speeds = {}
     port_descriptions = {}
     sys_ports = {}
-    for device_info in meta.findall(str(QName(ns, "DeviceInfo"))):
-        dev_sku = device_info.find(str(QName(ns, "HwSku"))).text
+    for device_info in meta.findall(qname(ns, "DeviceInfo")):
+        dev_sku = device_info.find(qname(ns, "HwSku")).text
         if dev_sku == hwsku:
-            interfaces = device_info.find(str(QName(ns, "EthernetInterfaces"))).findall(str(QName(ns1, "EthernetInterface")))
-            interfaces = interfaces + device_info.find(str(QName(ns, "ManagementInterfaces"))).findall(str(QName(ns1, "ManagementInterface")))
+            interfaces = device_info.find(qname(ns, "EthernetInterfaces")).findall(qname(ns1, "EthernetInterface"))
+            interfaces = interfaces + device_info.find(qname(ns, "ManagementInterfaces")).findall(qname(ns1, "ManagementInterface"))
             for interface in interfaces:
-                alias = interface.find(str(QName(ns, "InterfaceName"))).text
-                speed = interface.find(str(QName(ns, "Speed"))).text
-                desc  = interface.find(str(QName(ns, "Description")))
+                alias = interface.find(qname(ns, "InterfaceName")).text
+                speed = interface.find(qname(ns, "Speed")).text
+                desc  = interface.find(qname(ns, "Description"))
                 if desc != None:
                     port_descriptions[port_alias_map.get(alias, alias)] = desc.text
                 port_speeds[port_alias_map.get(alias, alias)] = speed
 
-            sysports = device_info.find(str(QName(ns, "SystemPorts")))
+            sysports = device_info.find(qname(ns, "SystemPorts"))
             if sysports is not None:
-                for sysport in sysports.findall(str(QName(ns, "SystemPort"))):
-                    portname = sysport.find(str(QName(ns, "Name"))).text
-                    hostname = sysport.find(str(QName(ns, "Hostname")))
-                    asic_name = sysport.find(str(QName(ns, "AsicName")))
-                    system_port_id = sysport.find(str(QName(ns, "SystemPortId"))).text
-                    switch_id = sysport.find(str(QName(ns, "SwitchId"))).text
-                    core_id = sysport.find(str(QName(ns, "CoreId"))).text
-                    core_port_id = sysport.find(str(QName(ns, "CorePortId"))).text
-                    speed = sysport.find(str(QName(ns, "Speed"))).text
-                    num_voq = sysport.find(str(QName(ns, "NumVoq"))).text
+                for sysport in sysports.findall(qname(ns, "SystemPort")):
+                    portname = sysport.find(qname(ns, "Name")).text
+                    hostname = sysport.find(qname(ns, "Hostname"))
+                    asic_name = sysport.find(qname(ns, "AsicName"))
+                    system_port_id = sysport.find(qname(ns, "SystemPortId")).text
+                    switch_id = sysport.find(qname(ns, "SwitchId")).text
+                    core_id = sysport.find(qname(ns, "CoreId")).text
+                    core_port_id = sysport.find(qname(ns, "CorePortId")).text
+                    speed = sysport.find(qname(ns, "Speed")).text
+                    num_voq = sysport.find(qname(ns, "NumVoq")).text
                     key = portname
                     if asic_name is not None:
                        key = "%s|%s" % (asic_name.text, key)
@@ -1974,9 +2080,33 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     asic_name -- asic name; to parse multi-asic device minigraph to
     generate asic specific configuration.
     fabric_port_config_file -- fabric port config file name
+
+    The result is reused from the parsed minigraph cache when neither the
+    minigraph nor the port config inputs changed since it was stored.
      """
 
-    root = ET.parse(filename).getroot()
+    cache_file, cache_key = get_parsed_minigraph_cache(filename, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file)
+    cached = load_parsed_minigraph(cache_file, cache_key)
+    if cached is not None:
+        results, qos_profile, hwsku, port_maps, port_config_stamps = cached
+        if port_config_stamps != get_port_config_stamps(hwsku, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file):
+            cached = None
+    if cached is not None:
+        port_names_map.update(port_maps[0])
+        port_alias_map.update(port_maps[1])
+        port_alias_asic_map.update(port_maps[2])
+    else:
+        results, qos_profile, hwsku = _parse_xml(filename, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file)
+        port_maps = (port_names_map, port_alias_map, port_alias_asic_map)
+        port_config_stamps = get_port_config_stamps(hwsku, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file)
+        store_parsed_minigraph(cache_file, cache_key, (results, qos_profile, hwsku, port_maps, port_config_stamps))
+
+    select_mmu_profiles(qos_profile, platform, hwsku)
+
+    return results
+
+def _parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None):
+    root = load_minigraph_root(filename)
 
     u_neighbors = None
     u_devices = None
@@ -2047,17 +2177,6 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     card_type = None
     macsec_enabled = None
 
-    hwsku_qn = QName(ns, "HwSku")
-    hostname_qn = QName(ns, "Hostname")
-    docker_routing_config_mode_qn = QName(ns, "DockerRoutingConfigMode")
-    for child in root:
-        if child.tag == str(hwsku_qn):
-            hwsku = child.text
-        if child.tag == str(hostname_qn):
-            hostname = child.text
-        if child.tag == str(docker_routing_config_mode_qn):
-            docker_routing_config_mode = child.text
-
     hwsku, hostname, docker_routing_config_mode, chassis_type, chassis_hostname = parse_global_info(root)
     macsec_enabled = is_chassis_lc_macsec_enabled(root, hostname)
 
@@ -2082,46 +2201,44 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
 
     for child in root:
         if asic_hostname is None:
-            if child.tag == str(QName(ns, "DpgDec")):
+            if child.tag == qname(ns, "DpgDec"):
                 (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
+            elif child.tag == qname(ns, "CpgDec"):
                 (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_cpg(child, hostname)
-            elif child.tag == str(QName(ns, "PngDec")):
+            elif child.tag == qname(ns, "PngDec"):
                 (neighbors, devices, console_dev, console_port, mgmt_dev, mgmt_port, port_speed_png, console_ports, mux_cable_ports, png_ecmp_content) = parse_png(child, hostname, dpg_ecmp_content)
-            elif child.tag == str(QName(ns, "UngDec")):
+            elif child.tag == qname(ns, "UngDec"):
                 (u_neighbors, u_devices, _, _, _, _, _, _) = parse_png(child, hostname, None)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            elif child.tag == qname(ns, "MetadataDeclaration"):
                 (syslog_servers, dhcp_servers, dhcpv6_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, cloudtype, resource_type, downstream_subrole, switch_id, switch_type, max_cores, kube_data, macsec_profile, downstream_redundancy_types, redundancy_type, qos_profile, rack_mgmt_map) = parse_meta(child, hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            elif child.tag == qname(ns, "LinkMetadataDeclaration"):
                 linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
+            elif child.tag == qname(ns, "DeviceInfos"):
                 (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
         else:
-            if child.tag == str(QName(ns, "DpgDec")):
+            if child.tag == qname(ns, "DpgDec"):
                 (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, asic_hostname)
                 host_lo_intfs = parse_host_loopback(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
+            elif child.tag == qname(ns, "CpgDec"):
                 (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_cpg(child, asic_hostname, local_devices)
-            elif child.tag == str(QName(ns, "PngDec")):
+            elif child.tag == qname(ns, "PngDec"):
                 (neighbors, devices, port_speed_png) = parse_asic_png(child, asic_hostname, hostname)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            elif child.tag == qname(ns, "MetadataDeclaration"):
                 (sub_role, switch_id, switch_type, max_cores, deployment_id, macsec_profile) = parse_asic_meta(child, asic_hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            elif child.tag == qname(ns, "LinkMetadataDeclaration"):
                 linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
+            elif child.tag == qname(ns, "DeviceInfos"):
                 (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
 
         if chassis_hostname:
-            if child.tag == str(QName(ns, "DeviceInfos")):
+            if child.tag == qname(ns, "DeviceInfos"):
                 if asic_hostname is not None:
                     (sys_ports, chassis_port_alias, port_speeds_default) = parse_chassis_deviceinfo(child, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, voq_intf_attributes)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            elif child.tag == qname(ns, "MetadataDeclaration"):
                 (syslog_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, macsec_profile) = parse_chassis_meta(child, chassis_hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            elif child.tag == qname(ns, "LinkMetadataDeclaration"):
                 linkmetas = parse_linkmeta(child, chassis_hostname)
 
-    select_mmu_profiles(qos_profile, platform, hwsku)
-    
     # for chassis get the device type from chassis metadata not the asic or linecard type
     if chassis_hostname:
         device_type = devices.get(chassis_hostname, {}).get('type', None)
@@ -2743,7 +2860,7 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     if current_device and current_device['type'] in leafrouter_device_types:
         results['DEVICE_METADATA']['localhost']['suppress-fib-pending'] = 'enabled'
 
-    return results
+    return results, qos_profile, hwsku
 
 def get_tunnel_entries(tunnel_intfs, tunnel_intfs_qos_remap_config, lo_intfs, tunnel_qos_remap, mux_tunnel_name, peer_switch_ip):
     lo_addr = ''
@@ -2787,11 +2904,11 @@ def get_ports_in_active_active(root, devices, neighbors):
     """Parse out ports in active-active cable type."""
     servers = {hostname.lower(): device_data for hostname, device_data in devices.items() if device_data["type"] == "Server"}
     ports_in_active_active = {}
-    dpg_section = root.find(str(QName(ns, "DpgDec")))
+    dpg_section = root.find(qname(ns, "DpgDec"))
     neighbor_to_port_mapping = {neighbor["name"].lower(): port for port, neighbor in neighbors.items()}
     if dpg_section is not None:
         for child in dpg_section:
-            hostname = child.find(str(QName(ns, "Hostname")))
+            hostname = child.find(qname(ns, "Hostname"))
             if hostname is None:
                 continue
             hostname = hostname.text.lower()
@@ -2885,10 +3002,9 @@ def parse_hostname(filename):
     hostName = None
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
-    hostname_qn = QName(ns, "Hostname")
+    root = load_minigraph_root(filename)
     for child in root:
-        if child.tag == str(hostname_qn):
+        if child.tag == qname(ns, "Hostname"):
             hostName = child.text
             break
 
@@ -2897,20 +3013,20 @@ def parse_hostname(filename):
 def parse_asic_sub_role(filename, asic_name):
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
+    root = load_minigraph_root(filename)
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
+        if child.tag == qname(ns, "MetadataDeclaration"):
             sub_role, _, _, _, _, _= parse_asic_meta(child, asic_name)
             return sub_role
 
 def parse_asic_switch_type(filename, asic_name, hostname):
     if os.path.isfile(filename):
-        root = ET.parse(filename).getroot()
+        root = load_minigraph_root(filename)
         switch_type, _ = get_chassis_type_and_hostname(root, hostname)
         if switch_type:
             return switch_type
         for child in root:
-            if child.tag == str(QName(ns, "MetadataDeclaration")):
+            if child.tag == qname(ns, "MetadataDeclaration"):
                 _, _, switch_type, _, _, _ = parse_asic_meta(child, asic_name)
                 return switch_type
     return None
@@ -2919,29 +3035,29 @@ def parse_asic_meta_get_devices(root):
     local_devices = []
 
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            device_metas = child.find(str(QName(ns, "Devices")))
-            for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-                name = device.find(str(QName(ns1, "Name"))).text.lower()
+        if child.tag == qname(ns, "MetadataDeclaration"):
+            device_metas = child.find(qname(ns, "Devices"))
+            for device in device_metas.findall(qname(ns1, "DeviceMetadata")):
+                name = device.find(qname(ns1, "Name")).text.lower()
                 local_devices.append(name)
 
     return local_devices
 
 def parse_chassis_hwsku(root,chassis_hostname):
     for child in root:
-        if child.tag == str(QName(ns, "PngDec")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device in devices.findall(str(QName(ns, "Device"))):
-                if chassis_hostname.lower() ==  device.find(str(QName(ns, "Hostname"))).text.lower():
-                    hwsku =  device.find(str(QName(ns, "HwSku"))).text
+        if child.tag == qname(ns, "PngDec"):
+            devices = child.find(qname(ns, "Devices"))
+            for device in devices.findall(qname(ns, "Device")):
+                if chassis_hostname.lower() ==  device.find(qname(ns, "Hostname")).text.lower():
+                    hwsku =  device.find(qname(ns, "HwSku")).text
                     return hwsku
     return None
 
 def parse_mgmt_intf(child):
     mgmt_intf = {}
-    for mgmtintf in child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface"))):
-        intfname = mgmtintf.find(str(QName(ns, "AttachTo"))).text
-        ipprefix = mgmtintf.find(str(QName(ns1, "PrefixStr"))).text
+    for mgmtintf in child.find(qname(ns, "ManagementIPInterfaces")).findall(qname(ns1, "ManagementIPInterface")):
+        intfname = mgmtintf.find(qname(ns, "AttachTo")).text
+        ipprefix = mgmtintf.find(qname(ns1, "PrefixStr")).text
         mgmtipn = ipaddress.ip_network(UNICODE_TYPE(ipprefix), False)
         gwaddr = ipaddress.ip_address(next(mgmtipn.hosts()))
         mgmt_intf[(intfname, ipprefix)] = {'gwaddr': gwaddr}
@@ -2949,9 +3065,9 @@ def parse_mgmt_intf(child):
 
 def parse_linecard_mgmt_ip(root, hname):
     linecard_mgmt_intfs = {}
-    dpg = root.find(str(QName(ns, "DpgDec")))
+    dpg = root.find(qname(ns, "DpgDec"))
     for child in dpg:
-        hostname = child.find(str(QName(ns, "Hostname")))
+        hostname = child.find(qname(ns, "Hostname"))
         if hostname.text.lower() != hname.lower():
             continue
         linecard_mgmt_intfs = parse_mgmt_intf(child)
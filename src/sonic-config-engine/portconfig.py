@@ -168,6 +168,25 @@ def get_fabric_port_config(hwsku=None, platform=None, fabric_port_config_file=No
             ports[name] = data
     return ports
 
+def get_port_config_files(hwsku=None, platform=None, port_config_file=None, hwsku_config_file=None, fabric_port_config_file=None, asic_name=None):
+    """
+    Return the files get_port_config and get_fabric_port_config read for the
+    given arguments when the port config is not taken from CONFIG_DB, None
+    for a file which is not found
+    """
+    if asic_name is not None:
+        asic_id = str(get_asic_id_from_name(asic_name))
+    else:
+        asic_id = None
+
+    if not port_config_file:
+        port_config_file = device_info.get_path_to_port_config_file(hwsku, asic_id)
+    files = [port_config_file]
+    if port_config_file and port_config_file.endswith('.json'):
+        files.append(hwsku_config_file or get_hwsku_file_name(hwsku, platform))
+    files.append(fabric_port_config_file or device_info.get_path_to_fabric_port_config_file(hwsku, asic_id))
+    return files
+
 def get_port_config(hwsku=None, platform=None, port_config_file=None, hwsku_config_file=None, asic_name=None):
     config_db = db_connect_configdb(asic_name)
     
@@ -44,6 +44,7 @@ else:
 
 # Common modules for python2 and python3
 py_modules = [
+    'cfggen_server',
     'config_samples',
     'minigraph',
     'openconfig_acl',
@@ -83,6 +83,49 @@ class TestCfgGen(TestCase):
         output = self.run_script(argument)
         self.assertEqual(output, '')
 
+    def test_incremental_write_to_db_dry_run(self):
+        data = {
+            'FEATURE': {
+                'bgp': {'state': 'enabled', 'auto_restart': 'disabled'},
+                'bmp': {'state': 'enabled'},
+                'newfeature': {'state': 'enabled'}
+            }
+        }
+        argument = ['-a', json.dumps(data), '-w', '--incremental', '--dry-run']
+        output = self.run_script(argument)
+        self.assertEqual(json.loads(output), {
+            'FEATURE': {
+                'bgp': {'auto_restart': 'disabled'},
+                'newfeature': {'state': 'enabled'}
+            }
+        })
+
+    def test_incremental_requires_write_to_db(self):
+        argument = ['-a', '{}', '--incremental']
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.run_script(argument, check_stderr=True)
+
+    def test_render_manifest(self):
+        manifest_file = os.path.join(self.test_dir, 'manifest.yml')
+        with open(manifest_file, 'w') as f:
+            f.write('- template: {}\n  destination: {}\n'.format(os.path.join(self.test_dir, 'test.j2'), self.output_file))
+            f.write('- template: {}\n  destination: {}\n'.format(os.path.join(self.test_dir, 'test.j2'), self.output2_file))
+        try:
+            argument = ['-y', os.path.join(self.test_dir, 'test.yml'), '--render-manifest', manifest_file]
+            output = self.run_script(argument)
+            self.assertEqual(sorted(output.split()), sorted([self.output_file, self.output2_file]))
+            for output_file in [self.output_file, self.output2_file]:
+                with open(output_file) as f:
+                    self.assertEqual(f.read(), 'value1\nvalue2\n\n')
+
+            # Unchanged outputs are not rewritten
+            mtime = os.stat(self.output_file).st_mtime
+            output = self.run_script(argument)
+            self.assertEqual(output, '')
+            self.assertEqual(os.stat(self.output_file).st_mtime, mtime)
+        finally:
+            os.remove(manifest_file)
+
     def test_device_desc(self):
         argument = ['-v', "DEVICE_METADATA[\'localhost\'][\'hwsku\']", "-M", self.sample_device_desc]
         output = self.run_script(argument)
@@ -0,0 +1,162 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import cfggen_server
+
+from unittest import TestCase
+
+
+class TestCfggenServer(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp_dir, 'cfggen.sock')
+        self.requests = []
+
+        def handler(argv):
+            self.requests.append((list(argv), os.getcwd(), os.environ.get('NAMESPACE_ID'), os.environ.get('PLATFORM')))
+            if argv and argv[0] == 'fail':
+                print('bad arguments', file=sys.stderr)
+                sys.exit(2)
+            print(' '.join(argv))
+            return 0
+
+        self.server = cfggen_server.CfggenServer(self.socket_path, handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp_dir)
+        os.environ.pop('NAMESPACE_ID', None)
+        os.environ.pop('PLATFORM', None)
+
+    def test_forward(self):
+        os.environ['NAMESPACE_ID'] = '3'
+        os.environ['PLATFORM'] = 'x86_64-kvm_x86_64-r0'
+        rc = cfggen_server.forward(['-d', '-v', 'DEVICE_METADATA'], self.socket_path)
+        self.assertEqual(rc, 0)
+        self.assertEqual(self.requests, [(['-d', '-v', 'DEVICE_METADATA'], os.getcwd(), '3', 'x86_64-kvm_x86_64-r0')])
+
+    def test_forward_exit_code(self):
+        rc = cfggen_server.forward(['fail'], self.socket_path)
+        self.assertEqual(rc, 2)
+
+    def test_forward_no_server(self):
+        self.assertIsNone(cfggen_server.forward(['-d'], os.path.join(self.tmp_dir, 'missing.sock')))
+        self.assertIsNone(cfggen_server.forward(['-d'], ''))
+
+    def test_run_request_captures_output(self):
+        response = cfggen_server.run_request(lambda argv: print('hello'), {'argv': [], 'cwd': self.tmp_dir})
+        self.assertEqual(response, {'rc': 0, 'stdout': 'hello\n', 'stderr': ''})
+
+
+class TestRenderCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.input_file = os.path.join(self.tmp_dir, 'minigraph.xml')
+        with open(self.input_file, 'w') as f:
+            f.write('v1')
+        self.loads = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def loader(self):
+        self.loads += 1
+        with open(self.input_file) as f:
+            return {'DEVICE_METADATA': {'localhost': {'value': f.read()}}}
+
+    def test_file_data_reused_until_mtime_changes(self):
+        cache = cfggen_server.RenderCache()
+        data = cache.get_file_data('mg', [self.input_file], self.loader)
+        data['DEVICE_METADATA']['localhost']['value'] = 'modified by caller'
+        data = cache.get_file_data('mg', [self.input_file], self.loader)
+        self.assertEqual(data['DEVICE_METADATA']['localhost']['value'], 'v1')
+        self.assertEqual(self.loads, 1)
+
+        with open(self.input_file, 'w') as f:
+            f.write('v2')
+        stat = os.stat(self.input_file)
+        os.utime(self.input_file, (stat.st_atime, stat.st_mtime + 1))
+        data = cache.get_file_data('mg', [self.input_file], self.loader)
+        self.assertEqual(data['DEVICE_METADATA']['localhost']['value'], 'v2')
+        self.assertEqual(self.loads, 2)
+
+    def test_file_data_checks_files_of_loaded_value(self):
+        cache = cfggen_server.RenderCache()
+        value_file = os.path.join(self.tmp_dir, 'port_config.ini')
+        with open(value_file, 'w') as f:
+            f.write('v1')
+        value_files = lambda data: [value_file]
+        cache.get_file_data('mg', [self.input_file], self.loader, value_files)
+        cache.get_file_data('mg', [self.input_file], self.loader, value_files)
+        self.assertEqual(self.loads, 1)
+
+        with open(value_file, 'w') as f:
+            f.write('v2 longer')
+        cache.get_file_data('mg', [self.input_file], self.loader, value_files)
+        self.assertEqual(self.loads, 2)
+
+    def test_db_config_not_cached_without_keyspace_watch(self):
+        class ConfigDb(object):
+            CONFIG_DB = 'CONFIG_DB'
+            reads = 0
+
+            def get_redis_client(self, db_name):
+                raise RuntimeError('keyspace notification unavailable')
+
+            def get_config(self):
+                self.reads += 1
+                return {'PORT': {}}
+
+        configdb = ConfigDb()
+        cache = cfggen_server.RenderCache()
+        cache.get_db_config(None, configdb)
+        cache.get_db_config(None, configdb)
+        self.assertEqual(configdb.reads, 2)
+
+    def test_db_config_invalidated_by_keyspace_event(self):
+        events = []
+
+        class PubSub(object):
+            def psubscribe(self, pattern):
+                pass
+
+            def get_message(self, timeout, ignore_subscribe_messages):
+                if events:
+                    return events.pop()
+                return None
+
+        class ConfigDb(object):
+            CONFIG_DB = 'CONFIG_DB'
+            reads = 0
+
+            def get_redis_client(self, db_name):
+                return self
+
+            def pubsub(self):
+                return PubSub()
+
+            def get_dbid(self, db_name):
+                return 4
+
+            def get_config(self):
+                self.reads += 1
+                return {'PORT': {'Ethernet0': {'mtu': str(self.reads)}}}
+
+        configdb = ConfigDb()
+        cache = cfggen_server.RenderCache()
+        self.assertEqual(cache.get_db_config(None, configdb)['PORT']['Ethernet0']['mtu'], '1')
+        self.assertEqual(cache.get_db_config(None, configdb)['PORT']['Ethernet0']['mtu'], '1')
+        events.append({'channel': '__keyspace@4__:PORT|Ethernet0', 'data': 'hset'})
+        self.assertEqual(cache.get_db_config(None, configdb)['PORT']['Ethernet0']['mtu'], '2')
+        self.assertEqual(cache.get_db_config(None, configdb)['PORT']['Ethernet0']['mtu'], '2')
+        cache.invalidate_db(None)
+        self.assertEqual(cache.get_db_config(None, configdb)['PORT']['Ethernet0']['mtu'], '3')
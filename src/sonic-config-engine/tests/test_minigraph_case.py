@@ -1,11 +1,13 @@
 import json
 import os
+import shutil
 import subprocess
 import ipaddress
+import tempfile
 import tests.common_utils as utils
 import minigraph
 
-from unittest import TestCase
+from unittest import TestCase, mock
 
 TOR_ROUTER = 'ToRRouter'
 BACKEND_TOR_ROUTER = 'BackEndToRRouter'
@@ -575,3 +577,51 @@ class TestCfgGenCaseInsensitive(TestCase):
         # TC2: For other minigraph, result should not contain FLEX_COUNTER_TABLE
         result = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
         self.assertNotIn('FLEX_COUNTER_TABLE', result)
+
+    def test_parsed_minigraph_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            with mock.patch('minigraph.MINIGRAPH_CACHE_DIR', cache_dir), \
+                 mock.patch.dict(os.environ, {'CFGGEN_UNIT_TESTING': ''}):
+                result = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                with mock.patch('minigraph._parse_xml') as mock_parse_xml:
+                    cached = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
+                    mock_parse_xml.assert_not_called()
+                self.assertEqual(cached, result)
+
+                # A different port config is a different cache entry
+                minigraph.parse_xml(self.sample_graph, port_config_file=os.path.join(self.test_dir, 't0-sample-port-config-tiny.ini'))
+                self.assertEqual(len(os.listdir(cache_dir)), 2)
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_parsed_minigraph_cache_resolved_port_config(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            # e.g. the platform.json/hwsku.json resolved from the minigraph hwsku
+            resolved_file = os.path.join(cache_dir, 'hwsku.json')
+            with open(resolved_file, 'w') as f:
+                f.write('{}')
+            with mock.patch('minigraph.MINIGRAPH_CACHE_DIR', cache_dir), \
+                 mock.patch('minigraph.get_port_config_files', return_value=[resolved_file]) as mock_files, \
+                 mock.patch.dict(os.environ, {'CFGGEN_UNIT_TESTING': ''}):
+                minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
+                self.assertEqual(mock_files.call_args[1]['hwsku'], 'Force10-S6000')
+                with mock.patch('minigraph._parse_xml', wraps=minigraph._parse_xml) as mock_parse_xml:
+                    minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
+                    mock_parse_xml.assert_not_called()
+                    with open(resolved_file, 'w') as f:
+                        f.write('{"interfaces": {}}')
+                    minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
+                    mock_parse_xml.assert_called_once()
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_minigraph_root_shared_by_helpers(self):
+        with mock.patch('minigraph.ET.parse', wraps=minigraph.ET.parse) as mock_parse:
+            minigraph._minigraph_root_cache.clear()
+            minigraph.parse_hostname(self.sample_graph)
+            minigraph.parse_asic_sub_role(self.sample_graph, 'asic0')
+            minigraph.parse_asic_switch_type(self.sample_graph, 'asic0', 'switch-t0')
+            self.assertEqual(mock_parse.call_count, 1)
@@ -114,6 +114,24 @@ class TestMultiNpuCfgGen(TestCase):
             output = self.run_script_for_asic(argument, asic, self.port_config[asic])
             self.assertGreater(len(output.strip()) , 0)
 
+    def test_print_data_all_namespaces(self):
+        argument = ["-m", self.sample_graph, "--print-data"]
+        expected = json.loads(self.run_script(argument, check_stderr=False, validateYang=False))
+        argument = ["-m", self.sample_graph, "--all-namespaces", "--print-data"]
+        output = json.loads(self.run_script(argument, check_stderr=False, validateYang=False))
+        self.assertEqual(list(output.keys()), ['host'] + ['asic{}'.format(asic) for asic in range(NUM_ASIC)])
+        self.assertEqual(output['host'], expected)
+        for asic in range(NUM_ASIC):
+            argument = ["-m", self.sample_graph, "-n", "asic{}".format(asic), "--print-data"]
+            expected = json.loads(self.run_script(argument, check_stderr=False, validateYang=False))
+            self.assertEqual(output['asic{}'.format(asic)], expected)
+
+    def test_all_namespaces_invalid_arguments(self):
+        for argument in (["-m", self.sample_graph, "--all-namespaces", "-n", "asic0", "--print-data"],
+                         ["-m", self.sample_graph, "--all-namespaces", "-v", "DEVICE_METADATA"]):
+            with self.assertRaises(subprocess.CalledProcessError):
+                self.run_script(argument, validateYang=False)
+
     def test_additional_json_data(self):
         argument = ['-a', '{"key1":"value1"}', '-v', 'key1']
         output = self.run_script(argument)
@@ -1,10 +1,15 @@
 import ipaddress
 import sys
 import syslog
+import time
 from abc import abstractmethod
 from swsscommon import swsscommon
 
 DEFAULT_SELECT_TIMEOUT = 5000  # millisecond
+# Events arrived within debounce window after a change are coalesced with it, 0 means no debounce
+DEFAULT_DEBOUNCE_WINDOW = 0  # millisecond
+DEFAULT_MAX_DEBOUNCE_TIME = 2000  # millisecond
+FEATURE_CHECKER = "DhcpServerFeatureStateChecker"
 DHCP_SERVER_IPV4 = "DHCP_SERVER_IPV4"
 DHCP_SERVER_IPV4_PORT = "DHCP_SERVER_IPV4_PORT"
 DHCP_SERVER_IPV4_RANGE = "DHCP_SERVER_IPV4_RANGE"
@@ -439,13 +444,34 @@ def _disable_monitor_checkers(checker_names, checker_dict):
         checker_dict[checker].disable()
 
 
+def _wait_for_quiet(sel, debounce_window, deadline, process_event):
+    """
+    Keep processing events until no event arrives in debounce window or deadline is reached
+    Args:
+        sel: select object
+        debounce_window: debounce window in millisecond
+        deadline: monotonic time to stop waiting
+        process_event: function to proceed new event, return False to stop waiting
+    """
+    while True:
+        timeout = min(debounce_window, int((deadline - time.monotonic()) * 1000))
+        if timeout <= 0:
+            return
+        state, _ = sel.select(timeout)
+        if state != swsscommon.Select.OBJECT or not process_event():
+            return
+
+
 class DhcpRelaydDbMonitor(object):
     checker_dict = {}
 
-    def __init__(self, db_connector, sel, checkers, select_timeout=DEFAULT_SELECT_TIMEOUT):
+    def __init__(self, db_connector, sel, checkers, select_timeout=DEFAULT_SELECT_TIMEOUT,
+                 debounce_window=DEFAULT_DEBOUNCE_WINDOW, max_debounce_time=DEFAULT_MAX_DEBOUNCE_TIME):
         self.db_connector = db_connector
         self.sel = sel
         self.select_timeout = select_timeout
+        self.debounce_window = debounce_window
+        self.max_debounce_time = max_debounce_time
         self.checker_dict = {}
         for checker in checkers:
             self.checker_dict[checker.get_class_name()] = checker
@@ -477,21 +503,43 @@ class DhcpRelaydDbMonitor(object):
         state, _ = self.sel.select(self.select_timeout)
         if state == swsscommon.Select.TIMEOUT or state != swsscommon.Select.OBJECT:
             return {}
+        event_time = time.monotonic()
         check_res = {}
         for name, checker in self.checker_dict.items():
             if not checker.is_enabled():
                 continue
             check_res[name] = checker.check_update_event(db_snapshot)
+
+        def process_event():
+            for name, checker in self.checker_dict.items():
+                if not checker.is_enabled():
+                    continue
+                if check_res.get(name, False):
+                    checker.clear_event()
+                else:
+                    check_res[name] = checker.check_update_event(db_snapshot)
+            # Feature state change needs to be proceeded without merging with other events
+            return not check_res.get(FEATURE_CHECKER, False)
+
+        # Coalesce following events with this change, except for feature state change
+        if self.debounce_window > 0 and any(check_res.values()) and not check_res.get(FEATURE_CHECKER, False):
+            _wait_for_quiet(self.sel, self.debounce_window, event_time + self.max_debounce_time / 1000,
+                            process_event)
         return check_res
 
 
 class DhcpServdDbMonitor(object):
     checker_dict = {}
 
-    def __init__(self, db_connector, sel, checkers, select_timeout=DEFAULT_SELECT_TIMEOUT):
+    def __init__(self, db_connector, sel, checkers, select_timeout=DEFAULT_SELECT_TIMEOUT,
+                 debounce_window=DEFAULT_DEBOUNCE_WINDOW, max_debounce_time=DEFAULT_MAX_DEBOUNCE_TIME):
         self.db_connector = db_connector
         self.sel = sel
         self.select_timeout = select_timeout
+        self.debounce_window = debounce_window
+        self.max_debounce_time = max_debounce_time
+        # Monotonic time of the first event of last refresh
+        self.last_event_time = None
         self.checker_dict = {}
         for checker in checkers:
             self.checker_dict[checker.get_class_name()] = checker
@@ -523,6 +571,7 @@ class DhcpServdDbMonitor(object):
         state, _ = self.sel.select(self.select_timeout)
         if state == swsscommon.Select.TIMEOUT or state != swsscommon.Select.OBJECT:
             return False
+        event_time = time.monotonic()
         need_refresh = False
         for checker in self.checker_dict.values():
             if not checker.is_enabled():
@@ -531,4 +580,18 @@ class DhcpServdDbMonitor(object):
                 checker.clear_event()
             else:
                 need_refresh |= checker.check_update_event(db_snapshot)
-        return need_refresh
+        if not need_refresh:
+            return False
+
+        def process_event():
+            # Config would be generated from db after debounce, hence no need to check the events
+            for checker in self.checker_dict.values():
+                if checker.is_enabled():
+                    checker.clear_event()
+            return True
+
+        if self.debounce_window > 0:
+            _wait_for_quiet(self.sel, self.debounce_window, event_time + self.max_debounce_time / 1000,
+                            process_event)
+        self.last_event_time = event_time
+        return True
@@ -20,6 +20,8 @@ VLAN = "VLAN"
 MID_PLANE_BRIDGE = "MID_PLANE_BRIDGE"
 DEVICE_METADATA = "DEVICE_METADATA"
 DEFAULT_SELECT_TIMEOUT = 5000  # millisecond
+DEFAULT_DEBOUNCE_WINDOW = 200  # millisecond
+DEFAULT_MAX_DEBOUNCE_TIME = 2000  # millisecond
 DHCP_SERVER_INTERFACE = "eth0"
 FEATURE_CHECKER = "DhcpServerFeatureStateChecker"
 DHCP_SERVER_CHECKER = "DhcpServerTableIntfEnablementEventChecker"
@@ -32,6 +34,86 @@ NOT_KILLED = 2
 NOT_FOUND_PROC = 3
 
 
+def _get_dhcp_interfaces(cmds):
+    """
+    Get downstream interfaces from cmdline of dhcrelay/dhcpmon
+    """
+    return set(cmds[index + 1] for index in range(len(cmds) - 1) if cmds[index] == "-id")
+
+
+class RelayProcessSupervisor(object):
+    """
+    Track dhcrelay/dhcpmon processes started by dhcprelayd. They are children of dhcprelayd, hence their cmdlines are
+    kept in memory and exited ones are reaped by waitpid instead of scanning all processes in system.
+    """
+    def __init__(self):
+        # Dict of process name to list of [proc, cmdline], proc is Popen object for children and psutil Process object
+        # for processes found in system
+        self.procs = {}
+
+    def get_processes(self, process_name):
+        """
+        Get tracked processes, processes left by previous dhcprelayd are found by scanning system processes once
+        Args:
+            process_name: name of process
+        Returns:
+            List of [proc, cmdline]
+        """
+        if process_name not in self.procs:
+            procs = {}
+            for proc in psutil.process_iter():
+                try:
+                    if proc.name() == process_name:
+                        procs[proc.pid] = [proc.ppid(), proc, proc.cmdline()]
+                except psutil.NoSuchProcess:
+                    continue
+            # Ignore child processes created by dhcrelay to proceed network io
+            self.procs[process_name] = [[proc, cmds] for parent_pid, proc, cmds in procs.values()
+                                        if parent_pid not in procs]
+        return self.procs[process_name]
+
+    def start_process(self, process_name, cmds):
+        """
+        Start process and track it
+        """
+        popen_res = subprocess.Popen(cmds)
+        self.get_processes(process_name).append([popen_res, cmds])
+        return popen_res
+
+    def stop_processes(self, process_name):
+        """
+        Terminate all tracked processes with process_name
+        """
+        for proc, _ in self.get_processes(process_name):
+            terminate_proc(proc)
+        self.procs[process_name] = []
+
+    def reap_processes(self):
+        """
+        Reap exited processes
+        Returns:
+            List of [process_name, cmdline] of exited processes
+        """
+        exited = []
+        for process_name, procs in self.procs.items():
+            running = []
+            for proc, cmds in procs:
+                if isinstance(proc, subprocess.Popen):
+                    # Popen.poll calls waitpid without blocking
+                    is_exited = proc.poll() is not None
+                else:
+                    try:
+                        is_exited = not proc.is_running() or proc.status() == psutil.STATUS_ZOMBIE
+                    except psutil.NoSuchProcess:
+                        is_exited = True
+                if is_exited:
+                    exited.append([process_name, cmds])
+                else:
+                    running.append([proc, cmds])
+            procs[:] = running
+        return exited
+
+
 class DhcpRelayd(object):
     enabled_dhcp_interfaces = set()
     dhcp_server_feature_enabled = None
@@ -54,6 +136,9 @@ class DhcpRelayd(object):
         self.dhcp_server_feature_enabled = None
         self.supervisord_conf_path = supervisord_conf_path
         self.enabled_checkers = set(enabled_checkers)
+        self.relay_supervisor = RelayProcessSupervisor()
+        # dhcrelay processes started by supervisord which have been checked
+        self.checked_dhcrelay_procs = []
 
     def start(self):
         """
@@ -126,6 +211,16 @@ class DhcpRelayd(object):
             }
             res = (self.dhcp_relayd_monitor.check_db_update(check_param))
             self._proceed_with_check_res(res, self.dhcp_server_feature_enabled)
+            self._check_started_processes()
+
+    def _check_started_processes(self):
+        """
+        Check whether processes started by dhcprelayd exited, if dhcrelay exited, dhcprelayd will exit with code 1
+        """
+        for process_name, cmds in self.relay_supervisor.reap_processes():
+            syslog.syslog(syslog.LOG_ERR, "{} process exited unexpectedly, cmds: {}".format(process_name, cmds))
+            if process_name == "dhcrelay":
+                sys.exit(1)
 
     def _proceed_with_check_res(self, check_res, previous_dhcp_server_status):
         """
@@ -228,6 +323,10 @@ class DhcpRelayd(object):
         """
         Check whether dhcrelay running as expected, if not, dhcprelayd will exit with code 1
         """
+        # Cmdline of running process wouldn't change, only need to check again after checked processes exited
+        if self.checked_dhcrelay_procs and all(proc.is_running() for proc in self.checked_dhcrelay_procs):
+            return
+        self.checked_dhcrelay_procs = []
         procs = {}
         for proc in psutil.process_iter():
             err = None
@@ -235,7 +334,7 @@ class DhcpRelayd(object):
                 err = None
                 try:
                     if proc.name() == "dhcrelay":
-                        procs[proc.pid] = [proc.ppid(), proc.cmdline()]
+                        procs[proc.pid] = [proc.ppid(), proc.cmdline(), proc]
                 except psutil.NoSuchProcess:
                     pass
                 except Exception as e:
@@ -248,10 +347,12 @@ class DhcpRelayd(object):
         # When there is network io, dhcrelay would create child process to proceed them, psutil has chance to get
         # duplicated cmdline. Hence ignore chlid process in here
         running_cmds = []
-        for _, (parent_pid, cmdline) in procs.items():
+        running_procs = []
+        for _, (parent_pid, cmdline, proc) in procs.items():
             if parent_pid in procs:
                 continue
             running_cmds.append(cmdline)
+            running_procs.append(proc)
 
         running_cmds.sort()
         expected_cmds = [value for key, value in self.dhcp_relay_supervisor_config.items() if "isc-dhcpv4-relay" in key]
@@ -260,6 +361,7 @@ class DhcpRelayd(object):
             syslog.syslog(syslog.LOG_ERR, "Running processes is not as expected! Runnning: {}. Expected: {}"
                           .format(running_cmds, expected_cmds))
             sys.exit(1)
+        self.checked_dhcrelay_procs = running_procs
 
     def _get_dhcp_relay_config(self):
         """
@@ -303,16 +405,9 @@ class DhcpRelayd(object):
         for dhcp_interface in new_dhcp_interfaces:
             cmds += ["-id", dhcp_interface]
         cmds += ["-iu", "docker0", dhcp_server_ip]
-        popen_res = subprocess.Popen(cmds)
-        # To make sure process start successfully not in zombie status
-        proc = psutil.Process(popen_res.pid)
-        time.sleep(1)
-        if proc.status() == psutil.STATUS_ZOMBIE:
-            syslog.syslog(syslog.LOG_ERR, "Failed to start dhcrelay process with: {}".format(cmds))
-            terminate_proc(proc)
-            sys.exit(1)
-
-        syslog.syslog(syslog.LOG_INFO, "dhcrelay process started successfully, cmds: {}".format(cmds))
+        # Process failed to start would be reaped in _check_started_processes
+        self.relay_supervisor.start_process("dhcrelay", cmds)
+        syslog.syslog(syslog.LOG_INFO, "dhcrelay process started, cmds: {}".format(cmds))
 
     def _start_dhcpmon_process(self, new_dhcp_interfaces, force_kill):
         # To check whether need to kill dhcrelay process
@@ -325,51 +420,27 @@ class DhcpRelayd(object):
         if len(new_dhcp_interfaces) == 0:
             return
 
-        pids_cmds = {}
         for dhcp_interface in new_dhcp_interfaces:
             cmds = ["/usr/sbin/dhcpmon", "-id", dhcp_interface, "-iu", "docker0", "-im", "eth0"]
-            popen_res = subprocess.Popen(cmds)
-            pids_cmds[popen_res.pid] = cmds
-        time.sleep(1)
-        # To make sure process start successfully not in zombie status
-        for pid, cmds in pids_cmds.items():
-            proc = psutil.Process(pid)
-            if proc.status() == psutil.STATUS_ZOMBIE:
-                syslog.syslog(syslog.LOG_ERR, "Failed to start dhcpmon process: {}".format(cmds))
-                terminate_proc(proc)
-            else:
-                syslog.syslog(syslog.LOG_INFO, "dhcpmon process started successfully, cmds: {}".format(cmds))
+            self.relay_supervisor.start_process("dhcpmon", cmds)
+            syslog.syslog(syslog.LOG_INFO, "dhcpmon process started, cmds: {}".format(cmds))
 
     def _kill_exist_relay_releated_process(self, new_dhcp_interfaces, process_name, force_kill):
-        old_dhcp_interfaces = set()
         # Because in system there maybe more than 1 dhcpmon processes are running, so we need list to store
-        target_procs = []
-
-        # Get old dhcrelay process and get old dhcp interfaces
-        for proc in psutil.process_iter():
-            try:
-                if proc.name() == process_name:
-                    cmds = proc.cmdline()
-                    index = 0
-                    target_procs.append(proc)
-                    while index < len(cmds):
-                        if cmds[index] == "-id":
-                            old_dhcp_interfaces.add(cmds[index + 1])
-                            index += 2
-                        else:
-                            index += 1
-            except psutil.NoSuchProcess:
-                continue
+        target_procs = self.relay_supervisor.get_processes(process_name)
         if len(target_procs) == 0:
             return NOT_FOUND_PROC
 
+        # Get old dhcp interfaces
+        old_dhcp_interfaces = set()
+        for _, cmds in target_procs:
+            old_dhcp_interfaces |= _get_dhcp_interfaces(cmds)
+
         # No need to kill
-        if not force_kill and (process_name == "dhcrelay" and old_dhcp_interfaces == new_dhcp_interfaces or
-           process_name == "dhcpmon" and old_dhcp_interfaces == (new_dhcp_interfaces)):
+        if not force_kill and old_dhcp_interfaces == set(new_dhcp_interfaces):
             return NOT_KILLED
-        for proc in target_procs:
-            terminate_proc(proc)
-            syslog.syslog(syslog.LOG_INFO, "Kill process: {}".format(process_name))
+        self.relay_supervisor.stop_processes(process_name)
+        syslog.syslog(syslog.LOG_INFO, "Kill process: {}".format(process_name))
         return KILLED_OLD
 
     def _get_dhcp_server_ip(self):
@@ -394,7 +465,8 @@ def main():
     checkers.append(VlanTableEventChecker(sel, dhcp_db_connector.config_db))
     checkers.append(MidPlaneTableEventChecker(sel, dhcp_db_connector.config_db))
     checkers.append(DhcpServerFeatureStateChecker(sel, dhcp_db_connector.config_db))
-    db_monitor = DhcpRelaydDbMonitor(dhcp_db_connector, sel, checkers, DEFAULT_SELECT_TIMEOUT)
+    db_monitor = DhcpRelaydDbMonitor(dhcp_db_connector, sel, checkers, DEFAULT_SELECT_TIMEOUT,
+                                     DEFAULT_DEBOUNCE_WINDOW, DEFAULT_MAX_DEBOUNCE_TIME)
     dhcprelayd = DhcpRelayd(dhcp_db_connector, db_monitor, enabled_checkers=[FEATURE_CHECKER])
     dhcprelayd.start()
     dhcprelayd.wait()
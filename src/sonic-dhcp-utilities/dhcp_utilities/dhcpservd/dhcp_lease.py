@@ -1,15 +1,18 @@
+import os
 import signal
 import syslog
 import threading
 import time
 from abc import abstractmethod
-from collections import deque
 from datetime import datetime
 from dhcp_utilities.common.utils import is_smart_switch
+from swsscommon import swsscommon
 
 DHCP_SERVER_IPV4_LEASE = "DHCP_SERVER_IPV4_LEASE"
 KEA_LEASE_FILE_PATH = "/tmp/kea-lease.csv"
 DEFAULE_LEASE_UPDATE_INTERVAL = 2  # unit: sec
+# Columns of kea lease row used: address, hwaddr, client_id, valid_lifetime, expire, subnet_id
+KEA_LEASE_USED_COLUMNS = 6
 
 
 class LeaseManager(object):
@@ -24,12 +27,21 @@ class LeaseManager(object):
             handler.register()
 
 
+def _is_lease_invalid(lease):
+    # Start time equal to end time means lease has been released
+    return lease["lease_start"] == lease["lease_end"] or datetime.now().timestamp() >= int(lease["lease_end"])
+
+
 class LeaseHanlder(object):
     def __init__(self, db_connector, lease_update_interval=DEFAULE_LEASE_UPDATE_INTERVAL):
         self.db_connector = db_connector
         self.lease_update_interval = lease_update_interval
         self.last_update_time = None
         self.lock = threading.Lock()
+        # Lease table content in STATE_DB, None before the first update
+        self.published_lease = None
+        self.lease_pipe = None
+        self.lease_table = None
         device_metadata = self.db_connector.get_config_db_table("DEVICE_METADATA")
         self.is_smart_switch = is_smart_switch(device_metadata)
 
@@ -67,37 +79,60 @@ class LeaseHanlder(object):
                 return
         if not self.lock.acquire(False):
             return
-        new_lease = self._read()
-        # Store old lease key
-        old_lease_table = self.db_connector.get_state_db_table(DHCP_SERVER_IPV4_LEASE)
-        old_lease_key = set(old_lease_table.keys())
-
-        # 1.1 If start time equal to end time or lease expired, means lease has been released
-        #     1.1.1 If current lease table has this old lease, delete it
-        #     1.1.2 Else skip
-        # 1.2 Else, means lease valid, save it.
+        try:
+            new_lease = self._read()
+            self._update_state_db(new_lease)
+            self.last_update_time = datetime.now()
+        finally:
+            self.lock.release()
+
+    def _update_state_db(self, new_lease):
+        """
+        Write the difference between the valid leases and the lease table in STATE_DB, all changes are sent
+        in one pipeline
+        Args:
+            new_lease: Dict of newest lease information of each client
+        """
+        if self.published_lease is None:
+            # Compare with the lease table left by previous run
+            self.published_lease = self.db_connector.get_state_db_table(DHCP_SERVER_IPV4_LEASE)
+            self.lease_pipe = swsscommon.RedisPipeline(self.db_connector.state_db)
+            self.lease_table = swsscommon.Table(self.lease_pipe, DHCP_SERVER_IPV4_LEASE, True)
+
+        # 1.1 If start time equal to end time or lease expired, means lease has been released, skip it
+        # 1.2 Else, means lease valid, save it if it has been changed
+        valid_lease = {}
         for key, value in new_lease.items():
-            unix_time = datetime.now().timestamp()
-            if value["lease_start"] == value["lease_end"] or unix_time >= int(value["lease_end"]):
-                if key in old_lease_key:
-                    self.db_connector.state_db.delete("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key))
+            if _is_lease_invalid(value):
                 continue
-            new_key = "{}|{}".format(DHCP_SERVER_IPV4_LEASE, key)
-            for k, v in new_lease[key].items():
-                self.db_connector.state_db.hset(new_key, k, v)
-        # Delete old lease not in new lease set
-        for key in old_lease_key:
-            if key not in new_lease.keys():
-                # Delete entry
-                self.db_connector.state_db.delete("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key))
-        self.last_update_time = datetime.now()
-        self.lock.release()
+            valid_lease[key] = dict(value)
+            if self.published_lease.get(key) != value:
+                self.lease_table.set(key, list(value.items()))
+        # Delete old lease not in valid lease set
+        for key in self.published_lease.keys():
+            if key not in valid_lease:
+                self.lease_table.delete(key)
+        try:
+            self.lease_pipe.flush()
+        except Exception:
+            # Lease table in STATE_DB is unknown, read it again in next update
+            self.published_lease = None
+            raise
+        self.published_lease = valid_lease
 
 
 class KeaDhcp4LeaseHandler(LeaseHanlder):
     def __init__(self, db_connector, lease_file=KEA_LEASE_FILE_PATH):
         LeaseHanlder.__init__(self, db_connector)
         self.lease_file = lease_file
+        # Kea appends lease rows to the lease file, only the rows after offset are read. The file is opened again
+        # after lease file cleanup (LFC) moved it or when it is truncated.
+        self.lease_fp = None
+        self.lease_offset = 0
+        # The last row read had no newline yet, the rest of it is skipped
+        self.partial_row = False
+        # Newest lease information of each client
+        self.lease = {}
 
     def register(self):
         """
@@ -111,38 +146,84 @@ class KeaDhcp4LeaseHandler(LeaseHanlder):
         else:
             return f"Vlan{subnet_id}|{mac_address}"
 
-    def _read(self):
-        # Read lease file generated by kea-dhcp4
+    def _read_rows(self):
+        """
+        Read the rows appended to the lease file since the last read
+        Returns:
+            List of rows
+        """
+        self.lease_fp.seek(self.lease_offset)
+        data = self.lease_fp.read()
+        self.lease_offset += len(data)
+        lines = data.split(b"\n")
+        if self.partial_row:
+            if len(lines) == 1:
+                return []
+            lines.pop(0)
+            self.partial_row = False
+        tail = lines.pop()
+        if tail.count(b",") >= KEA_LEASE_USED_COLUMNS:
+            # All used columns of the row are complete
+            lines.append(tail)
+            self.partial_row = True
+        else:
+            self.lease_offset -= len(tail)
+        return [line.decode("utf-8") for line in lines]
+
+    def _open_lease_file(self):
         try:
-            with open(self.lease_file, "r", encoding="utf-8") as fb:
-                dq = deque(fb)
+            self.lease_fp = open(self.lease_file, "rb")
         except FileNotFoundError as err:
             syslog.syslog(syslog.LOG_ERR, "Cannot find lease file: {}".format(self.lease_file))
             raise err
+        self.lease_offset = 0
+        self.partial_row = False
 
-        new_lease = {}
+    def _read(self):
+        # Read rows appended to lease file generated by kea-dhcp4
+        rows = []
+        if self.lease_fp is not None:
+            # Rows written before the file was moved are read from the old file
+            rows = self._read_rows()
+            try:
+                stat = os.stat(self.lease_file)
+            except FileNotFoundError:
+                stat = None
+            if stat is not None and (stat.st_ino != os.fstat(self.lease_fp.fileno()).st_ino or
+                                     stat.st_size < self.lease_offset):
+                self.lease_fp.close()
+                self.lease_fp = None
+        if self.lease_fp is None:
+            self._open_lease_file()
+            rows += self._read_rows()
+
+        # Released and expired leases have been deleted from STATE_DB in last update, forget them
+        for key in [key for key, value in self.lease.items() if _is_lease_invalid(value)]:
+            del self.lease[key]
         # Get newest lease information of each client
-        while dq:
-            last_row = dq.pop()
-            splits = last_row.split(",")
-            # Skip header
-            if splits[0] == "address":
-                break
+        for row in rows:
+            splits = row.split(",")
+            # Skip header and incomplete rows
+            if splits[0] == "address" or len(splits) < KEA_LEASE_USED_COLUMNS:
+                continue
             ip_str = splits[0]
             mac_address = splits[1]
             valid_lifetime = splits[3]
             lease_end = splits[4]
             subnet_id = splits[5]
+            try:
+                lease_start = str(int(lease_end) - int(valid_lifetime))
+            except ValueError:
+                syslog.syslog(syslog.LOG_WARNING, "Invalid lease row: {}".format(row))
+                continue
 
             new_key = self._lease_key(subnet_id, mac_address)
-            if new_key in new_lease:
-                continue
-            new_lease[new_key] = {
-                "lease_start": str(int(lease_end) - int(valid_lifetime)),
+            self.lease[new_key] = {
+                "lease_start": lease_start,
                 "lease_end": lease_end,
                 "ip": ip_str
             }
-        return new_lease
+        return self.lease
 
     def _update_lease(self, signum, frame):
         self.update_lease()
@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import hashlib
 import psutil
 import signal
 import time
@@ -18,9 +19,12 @@ KEA_DHCP4_PROC_NAME = "kea-dhcp4"
 KEA_LEASE_FILE_PATH = "/tmp/kea-lease.csv"
 REDIS_SOCK_PATH = "/var/run/redis/redis.sock"
 DHCP_SERVER_IPV4_SERVER_IP = "DHCP_SERVER_IPV4_SERVER_IP"
+DHCP_SERVER_IPV4_CONFIG_UPDATE = "DHCP_SERVER_IPV4_CONFIG_UPDATE"
 DHCP_SERVER_INTERFACE = "eth0"
 AF_INET = 2
 DEFAULT_SELECT_TIMEOUT = 5000  # millisecond
+DEFAULT_DEBOUNCE_WINDOW = 200  # millisecond
+DEFAULT_MAX_DEBOUNCE_TIME = 2000  # millisecond
 
 
 class DhcpServd(object):
@@ -33,6 +37,9 @@ class DhcpServd(object):
         self.kea_dhcp4_config_path = kea_dhcp4_config_path
         self.dhcp_servd_monitor = monitor
         self.enabled_checker = None
+        self.kea_dhcp4_config_hash = None
+        self.reload_count = 0
+        self.skip_count = 0
 
     def _notify_kea_dhcp4_proc(self):
         """
@@ -46,10 +53,28 @@ class DhcpServd(object):
             except psutil.NoSuchProcess:
                 continue
 
-    def dump_dhcp4_config(self):
+    def _update_config_stats(self, latency):
         """
-        Generate kea-dhcp4 config file and dump it to config folder
+        Update kea-dhcp4 config reload statistics in STATE_DB
+        Args:
+            latency: seconds from db change to kea-dhcp4 config reloaded, None if config not reloaded
         """
+        fvs = [("reload_count", str(self.reload_count)), ("skip_count", str(self.skip_count)),
+               ("config_hash", self.kea_dhcp4_config_hash)]
+        if latency is not None:
+            fvs += [("last_reload_time", str(int(time.time()))), ("last_latency_ms", str(int(latency * 1000)))]
+        table = swsscommon.Table(self.db_connector.state_db, DHCP_SERVER_IPV4_CONFIG_UPDATE)
+        table.set(KEA_DHCP4_PROC_NAME, fvs)
+
+    def dump_dhcp4_config(self, event_time=None):
+        """
+        Generate kea-dhcp4 config file and dump it to config folder, kea-dhcp4 would not be reloaded if config
+        is not changed
+        Args:
+            event_time: monotonic time of db change which triggers this dump
+        """
+        if event_time is None:
+            event_time = time.monotonic()
         kea_dhcp4_config, used_ranges, enabled_dhcp_interfaces, used_options, enable_checker = \
             self.dhcp_cfg_generator.generate()
         if self.enabled_checker is not None and self.enabled_checker != enable_checker:
@@ -60,10 +85,19 @@ class DhcpServd(object):
         self.used_range = used_ranges
         self.enabled_dhcp_interfaces = enabled_dhcp_interfaces
         self.used_options = used_options
+        config_hash = hashlib.sha256(kea_dhcp4_config.encode()).hexdigest()
+        if config_hash == self.kea_dhcp4_config_hash:
+            self.skip_count += 1
+            syslog.syslog(syslog.LOG_INFO, "kea-dhcp4 config is not changed, skip reloading")
+            self._update_config_stats(None)
+            return
         with open(self.kea_dhcp4_config_path, "w") as write_file:
             write_file.write(kea_dhcp4_config)
         # After refresh kea-config, we need to SIGHUP kea-dhcp4 process to read new config
         self._notify_kea_dhcp4_proc()
+        self.kea_dhcp4_config_hash = config_hash
+        self.reload_count += 1
+        self._update_config_stats(time.monotonic() - event_time)
 
     def _update_dhcp_server_ip(self):
         """
@@ -99,7 +133,7 @@ class DhcpServd(object):
             }
             res = self.dhcp_servd_monitor.check_db_update(db_snapshot)
             if res:
-                self.dump_dhcp4_config()
+                self.dump_dhcp4_config(self.dhcp_servd_monitor.last_event_time)
 
 
 def main():
@@ -121,7 +155,8 @@ def main():
     checkers.append(VlanMemberTableEventChecker(sel, dhcp_db_connector.config_db))
     checkers.append(DpusTableEventChecker(sel, dhcp_db_connector.config_db))
     checkers.append(MidPlaneTableEventChecker(sel, dhcp_db_connector.config_db))
-    dhcp_servd_monitor = DhcpServdDbMonitor(dhcp_db_connector, sel, checkers, DEFAULT_SELECT_TIMEOUT)
+    dhcp_servd_monitor = DhcpServdDbMonitor(dhcp_db_connector, sel, checkers, DEFAULT_SELECT_TIMEOUT,
+                                            DEFAULT_DEBOUNCE_WINDOW, DEFAULT_MAX_DEBOUNCE_TIME)
     dhcpservd = DhcpServd(dhcp_cfg_generator, dhcp_db_connector, dhcp_servd_monitor)
     dhcpservd.start()
     dhcpservd.wait()
@@ -1,6 +1,7 @@
 import heapq
 import json
 import psutil
+import subprocess
 from dhcp_utilities.common.dhcp_db_monitor import DhcpRelaydDbMonitor
 from dhcp_utilities.common.utils import DhcpDbConnector
 from dhcp_utilities.dhcprelayd.dhcprelayd import DhcpRelayd, FEATURE_CHECKER, DHCP_SERVER_CHECKER, VLAN_INTF_CHECKER
@@ -100,10 +101,18 @@ class MockProc(object):
     def ppid(self):
         return self.parent_id
 
+    def is_running(self):
+        return not self.exited
 
-class MockPopen(object):
-    def __init__(self, pid):
+
+class MockPopen(subprocess.Popen):
+    def __init__(self, pid, returncode=None):
         self.pid = pid
+        self.returncode = returncode
+        self._child_created = False
+
+    def poll(self):
+        return self.returncode
 
 
 def mock_exit_func(status):
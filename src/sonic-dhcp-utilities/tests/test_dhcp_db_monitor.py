@@ -9,7 +9,7 @@ from dhcp_utilities.common.dhcp_db_monitor import DhcpRelaydDbMonitor, DhcpServd
     MidPlaneTableEventChecker, DpusTableEventChecker
 from dhcp_utilities.common.utils import DhcpDbConnector
 from swsscommon import swsscommon
-from unittest.mock import patch, ANY, PropertyMock, MagicMock
+from unittest.mock import patch, ANY, PropertyMock, MagicMock, call
 
 
 @pytest.mark.parametrize("checker_enabled", [True, False])
@@ -102,6 +102,52 @@ def test_dhcp_servd_monitor_check_db_update(mock_swsscommon_dbconnector_init, se
             mock_clear.assert_not_called()
 
 
+def test_dhcp_servd_monitor_debounce(mock_swsscommon_dbconnector_init):
+    select_results = [(swsscommon.Select.OBJECT, None)] * 3 + [(swsscommon.Select.TIMEOUT, None)]
+    with patch.object(DhcpServerTableCfgChangeEventChecker, "check_update_event", return_value=True) as mock_check, \
+         patch.object(swsscommon.Select, "select", side_effect=select_results) as mock_select, \
+         patch.object(ConfigDbEventChecker, "clear_event") as mock_clear:
+        db_connector = DhcpDbConnector()
+        dhcp_checker = DhcpServerTableCfgChangeEventChecker(None, None)
+        dhcp_checker.enabled = True
+        db_monitor = DhcpServdDbMonitor(db_connector, swsscommon.Select(), [dhcp_checker], debounce_window=100)
+        assert db_monitor.check_db_update({})
+        # Events arrived in debounce window are cleared without being checked
+        mock_check.assert_called_once_with({})
+        assert mock_clear.call_count == 2
+        assert mock_select.call_args_list[1:] == [call(100)] * 3
+        assert db_monitor.last_event_time is not None
+
+
+@pytest.mark.parametrize("feature_changed", [True, False])
+def test_dhcp_relayd_monitor_debounce(mock_swsscommon_dbconnector_init, feature_changed):
+    select_results = [(swsscommon.Select.OBJECT, None)] * 2 + [(swsscommon.Select.TIMEOUT, None)]
+    with patch.object(VlanTableEventChecker, "check_update_event", side_effect=[True]) as mock_check_vlan, \
+         patch.object(VlanIntfTableEventChecker, "check_update_event", side_effect=[False, True]), \
+         patch.object(DhcpServerFeatureStateChecker, "check_update_event",
+                      side_effect=[feature_changed, False]), \
+         patch.object(swsscommon.Select, "select", side_effect=select_results) as mock_select, \
+         patch.object(ConfigDbEventChecker, "clear_event") as mock_clear:
+        db_connector = DhcpDbConnector()
+        checkers = [VlanTableEventChecker(None, None), VlanIntfTableEventChecker(None, None),
+                    DhcpServerFeatureStateChecker(None, None)]
+        for checker in checkers:
+            checker.enabled = True
+        db_monitor = DhcpRelaydDbMonitor(db_connector, swsscommon.Select(), checkers, debounce_window=100)
+        res = db_monitor.check_db_update({})
+        mock_check_vlan.assert_called_once_with({})
+        if feature_changed:
+            # Feature state change is not coalesced
+            assert res == {"VlanTableEventChecker": True, "VlanIntfTableEventChecker": False,
+                           "DhcpServerFeatureStateChecker": True}
+            assert mock_select.call_count == 1
+        else:
+            assert res == {"VlanTableEventChecker": True, "VlanIntfTableEventChecker": True,
+                           "DhcpServerFeatureStateChecker": False}
+            assert mock_select.call_count == 3
+            mock_clear.assert_called_once_with()
+
+
 @pytest.mark.parametrize("tables", [set(["VlanIntfTableEventChecker"]), set(["dummy1"])])
 def test_dhcp_servd_monitor_enable_checkers(mock_swsscommon_dbconnector_init, tables):
     with patch.object(ConfigDbEventChecker, "enable") as mock_enable:
@@ -1,3 +1,4 @@
+import os
 from dhcp_utilities.common.utils import DhcpDbConnector
 from dhcp_utilities.dhcpservd.dhcp_lease import KeaDhcp4LeaseHandler, LeaseHanlder
 from freezegun import freeze_time
@@ -63,31 +64,71 @@ def test_update_kea_lease(mock_swsscommon_dbconnector_init, mock_swsscommon_tabl
         "Vlan1000|10:70:fd:b6:13:17": {},
         "Vlan1000|10:70:fd:b6:13:18": {}
     }
-    with patch.object(swsscommon.Table, "getKeys"), \
-         patch.object(swsscommon.DBConnector, "hset") as mock_hset, \
+    with patch.object(swsscommon.Table, "set") as mock_set, \
          patch.object(KeaDhcp4LeaseHandler, "_read", MagicMock(return_value=tested_lease)), \
          patch.object(DhcpDbConnector, "get_state_db_table",
-                      return_value=mock_lease_table), \
-         patch.object(swsscommon.DBConnector, "delete") as mock_delete, \
+                      return_value=mock_lease_table) as mock_get_table, \
+         patch.object(swsscommon.Table, "delete") as mock_delete, \
+         patch.object(swsscommon.RedisPipeline, "flush") as mock_flush, \
          patch("time.sleep", return_value=None) as mock_sleep:
         db_connector = DhcpDbConnector()
         kea_lease_handler = KeaDhcp4LeaseHandler(db_connector)
         kea_lease_handler.update_lease()
         # Verify that old key was deleted
         mock_delete.assert_has_calls([
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:00"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:17"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|aa:bb:cc:dd:ee:ff")
-        ])
+            call("Vlan1000|10:70:fd:b6:13:00"),
+            call("Vlan1000|10:70:fd:b6:13:17"),
+            call("Vlan1000|aa:bb:cc:dd:ee:ff")
+        ], any_order=True)
         # Verify that lease has been updated, to be noted that lease for "192.168.0.2" didn't been updated because
         # lease_start equals to lease_end
-        mock_hset.assert_has_calls([
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "lease_start", "1697607205"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "lease_end", "1697610805"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "ip", "193.168.0.132")
+        mock_set.assert_called_once_with("Vlan1000|10:70:fd:b6:13:18", [
+            ("lease_start", "1697607205"),
+            ("lease_end", "1697610805"),
+            ("ip", "193.168.0.132")
         ])
+        mock_flush.assert_called_once_with()
+        mock_set.reset_mock()
+        mock_delete.reset_mock()
         kea_lease_handler.update_lease()
         mock_sleep.assert_called_once_with(2)
+        # Verify that unchanged lease is not written again and lease table is only read once
+        mock_set.assert_not_called()
+        mock_delete.assert_not_called()
+        mock_get_table.assert_called_once_with("DHCP_SERVER_IPV4_LEASE")
+
+
+@freeze_time("2023-09-08")
+def test_read_kea_lease_incrementally(mock_swsscommon_dbconnector_init, tmp_path):
+    lease_file = str(tmp_path / "kea-lease.csv")
+    header = "address,hwaddr,client_id,valid_lifetime,expire,subnet_id,fqdn_fwd,fqdn_rev,hostname,state," + \
+             "user_context,pool_id\n"
+    with open(lease_file, "w") as file:
+        file.write(header)
+        file.write("192.168.0.2,10:70:fd:b6:13:00,,3600,1694167200,1000,0,0,host,0,,0\n")
+        file.write("192.168.0.3,10:70:fd:b6:13:01,,3600,1694167200,1000,0,0")
+    with patch.object(DhcpDbConnector, "get_config_db_table", side_effect=mock_get_config_db_table):
+        db_connector = DhcpDbConnector()
+        kea_lease_handler = KeaDhcp4LeaseHandler(db_connector, lease_file=lease_file)
+        assert kea_lease_handler._read() == {
+            "Vlan1000|10:70:fd:b6:13:00": {"lease_start": "1694163600", "lease_end": "1694167200",
+                                           "ip": "192.168.0.2"},
+            "Vlan1000|10:70:fd:b6:13:01": {"lease_start": "1694163600", "lease_end": "1694167200",
+                                           "ip": "192.168.0.3"}
+        }
+        # Rest of the partially written row is skipped, newer row of the same client replaces the old one
+        with open(lease_file, "a") as file:
+            file.write(",host,0,,0\n")
+            file.write("192.168.0.2,10:70:fd:b6:13:00,,0,1694163600,1000,0,0,host,0,,0\n")
+        lease = kea_lease_handler._read()
+        assert lease["Vlan1000|10:70:fd:b6:13:00"]["lease_start"] == lease["Vlan1000|10:70:fd:b6:13:00"]["lease_end"]
+        assert len(lease) == 2
+        # Released lease is forgotten, lease file rewritten by lease file cleanup is read from the beginning
+        with open(lease_file + ".2", "w") as file:
+            file.write(header)
+            file.write("192.168.0.4,10:70:fd:b6:13:02,,3600,1694167200,1000,0,0,host,0,,0\n")
+        os.rename(lease_file + ".2", lease_file)
+        assert list(kea_lease_handler._read().keys()) == ["Vlan1000|10:70:fd:b6:13:01", "Vlan1000|10:70:fd:b6:13:02"]
 
 
 def test_no_implement(mock_swsscommon_dbconnector_init):
@@ -42,21 +42,18 @@ def test_refresh_dhcrelay(mock_swsscommon_dbconnector_init):
 
 @pytest.mark.parametrize("new_dhcp_interfaces", [[], ["Vlan1000"], ["Vlan1000", "Vlan2000"]])
 @pytest.mark.parametrize("kill_res", [KILLED_OLD, NOT_KILLED, NOT_FOUND_PROC])
-@pytest.mark.parametrize("proc_status", [psutil.STATUS_ZOMBIE, psutil.STATUS_RUNNING])
-def test_start_dhcrelay_process(mock_swsscommon_dbconnector_init, new_dhcp_interfaces, kill_res, proc_status,):
+def test_start_dhcrelay_process(mock_swsscommon_dbconnector_init, new_dhcp_interfaces, kill_res):
     with patch.object(DhcpRelayd, "_kill_exist_relay_releated_process", return_value=kill_res), \
          patch.object(subprocess, "Popen", return_value=MockPopen(999)) as mock_popen, \
-         patch.object(time, "sleep"), \
-         patch("dhcp_utilities.dhcprelayd.dhcprelayd.terminate_proc", return_value=None) as mock_terminate, \
-         patch.object(psutil.Process, "__init__", return_value=None), \
-         patch.object(psutil.Process, "status", return_value=proc_status), \
-         patch.object(sys, "exit") as mock_exit, \
+         patch.object(time, "sleep") as mock_sleep, \
          patch.object(ConfigDbEventChecker, "enable"):
         dhcp_db_connector = DhcpDbConnector()
         dhcprelayd = DhcpRelayd(dhcp_db_connector, None)
+        dhcprelayd.relay_supervisor.procs["dhcrelay"] = []
         dhcprelayd._start_dhcrelay_process(new_dhcp_interfaces, "240.127.1.2", False)
         if len(new_dhcp_interfaces) == 0 or kill_res == NOT_KILLED:
             mock_popen.assert_not_called()
+            assert dhcprelayd.relay_supervisor.procs["dhcrelay"] == []
         else:
             call_param = ["/usr/sbin/dhcrelay", "-d", "-m", "discard", "-a", "%h:%p", "%P", "--name-alias-map-file",
                           "/tmp/port-name-alias-map.txt"]
@@ -64,28 +61,21 @@ def test_start_dhcrelay_process(mock_swsscommon_dbconnector_init, new_dhcp_inter
                 call_param += ["-id", interface]
             call_param += ["-iu", "docker0", "240.127.1.2"]
             mock_popen.assert_called_once_with(call_param)
-        if len(new_dhcp_interfaces) != 0 and kill_res != NOT_KILLED and proc_status == psutil.STATUS_ZOMBIE:
-            mock_terminate.assert_called_once()
-            mock_exit.assert_called_once_with(1)
-        else:
-            mock_terminate.assert_not_called()
-            mock_exit.assert_not_called()
+            assert dhcprelayd.relay_supervisor.procs["dhcrelay"] == [[mock_popen.return_value, call_param]]
+        mock_sleep.assert_not_called()
 
 
 @pytest.mark.parametrize("new_dhcp_interfaces_list", [[], ["Vlan1000"], ["Vlan1000", "Vlan2000"]])
 @pytest.mark.parametrize("kill_res", [KILLED_OLD, NOT_KILLED, NOT_FOUND_PROC])
-@pytest.mark.parametrize("proc_status", [psutil.STATUS_ZOMBIE, psutil.STATUS_RUNNING])
-def test_start_dhcpmon_process(mock_swsscommon_dbconnector_init, new_dhcp_interfaces_list, kill_res, proc_status):
+def test_start_dhcpmon_process(mock_swsscommon_dbconnector_init, new_dhcp_interfaces_list, kill_res):
     new_dhcp_interfaces = set(new_dhcp_interfaces_list)
     with patch.object(DhcpRelayd, "_kill_exist_relay_releated_process", return_value=kill_res), \
          patch.object(subprocess, "Popen", return_value=MockPopen(999)) as mock_popen, \
-         patch.object(time, "sleep"), \
-         patch("dhcp_utilities.dhcprelayd.dhcprelayd.terminate_proc", return_value=None) as mock_terminate, \
-         patch.object(psutil.Process, "__init__", return_value=None), \
-         patch.object(psutil.Process, "status", return_value=proc_status), \
+         patch.object(time, "sleep") as mock_sleep, \
          patch.object(ConfigDbEventChecker, "enable"):
         dhcp_db_connector = DhcpDbConnector()
         dhcprelayd = DhcpRelayd(dhcp_db_connector, None)
+        dhcprelayd.relay_supervisor.procs["dhcpmon"] = []
         dhcprelayd._start_dhcpmon_process(new_dhcp_interfaces, False)
         if len(new_dhcp_interfaces) == 0 or kill_res == NOT_KILLED:
             mock_popen.assert_not_called()
@@ -95,10 +85,32 @@ def test_start_dhcpmon_process(mock_swsscommon_dbconnector_init, new_dhcp_interf
                 call_param = ["/usr/sbin/dhcpmon", "-id", interface, "-iu", "docker0", "-im", "eth0"]
                 calls.append(call(call_param))
             mock_popen.assert_has_calls(calls)
-        if len(new_dhcp_interfaces) != 0 and kill_res != NOT_KILLED and proc_status == psutil.STATUS_ZOMBIE:
-            mock_terminate.assert_called_once()
+        assert len(dhcprelayd.relay_supervisor.procs["dhcpmon"]) == mock_popen.call_count
+        mock_sleep.assert_not_called()
+
+
+@pytest.mark.parametrize("exited_process", ["dhcrelay", "dhcpmon"])
+def test_check_started_processes(mock_swsscommon_dbconnector_init, exited_process):
+    dhcrelay_proc = MockPopen(998, None if exited_process != "dhcrelay" else 1)
+    dhcpmon_proc = MockPopen(999, None if exited_process != "dhcpmon" else 1)
+    with patch.object(sys, "exit", mock_exit_func), \
+         patch.object(ConfigDbEventChecker, "enable"):
+        dhcp_db_connector = DhcpDbConnector()
+        dhcprelayd = DhcpRelayd(dhcp_db_connector, None)
+        dhcprelayd.relay_supervisor.procs = {
+            "dhcrelay": [[dhcrelay_proc, ["/usr/sbin/dhcrelay"]]],
+            "dhcpmon": [[dhcpmon_proc, ["/usr/sbin/dhcpmon"]]]
+        }
+        if exited_process == "dhcrelay":
+            with pytest.raises(SystemExit):
+                dhcprelayd._check_started_processes()
         else:
-            mock_terminate.assert_not_called()
+            dhcprelayd._check_started_processes()
+        # Exited process is not tracked anymore
+        assert dhcprelayd.relay_supervisor.procs == {
+            "dhcrelay": [] if exited_process == "dhcrelay" else [[dhcrelay_proc, ["/usr/sbin/dhcrelay"]]],
+            "dhcpmon": [] if exited_process == "dhcpmon" else [[dhcpmon_proc, ["/usr/sbin/dhcpmon"]]]
+        }
 
 
 @pytest.mark.parametrize("new_dhcp_interfaces_list", [[], ["Vlan1000"], ["Vlan1000", "Vlan2000"]])
@@ -110,7 +122,7 @@ def test_kill_exist_relay_releated_process(mock_swsscommon_dbconnector_init, new
     new_dhcp_interfaces = set(new_dhcp_interfaces_list)
     process_iter_ret = []
     for running_proc in running_procs:
-        process_iter_ret.append(MockProc(running_proc))
+        process_iter_ret.append(MockProc(running_proc, pid=2))
     process_iter_ret.append(MockProc("exited_proc", exited=True))
     with patch.object(psutil, "process_iter", return_value=process_iter_ret), \
          patch.object(ConfigDbEventChecker, "enable"):
@@ -222,6 +234,13 @@ def test_check_dhcp_relay_process(mock_swsscommon_dbconnector_init, mock_swsscom
             assert all(process[0] != "dhcrelay" for process in iter_process)
         else:
             assert any(process[0] == "dhcrelay" for process in iter_process)
+            # Processes would not be scanned again if checked processes are still running
+            with patch.object(psutil, "process_iter", return_value=process_iter_ret) as mock_process_iter:
+                dhcprelayd._check_dhcp_relay_processes()
+                mock_process_iter.assert_not_called()
+                dhcprelayd.checked_dhcrelay_procs[0].exited = True
+                dhcprelayd._check_dhcp_relay_processes()
+                mock_process_iter.assert_called_once_with()
 
 
 def test_get_dhcp_relay_config(mock_swsscommon_dbconnector_init, mock_swsscommon_table_init):
@@ -38,6 +38,8 @@ def test_dump_dhcp4_config(mock_swsscommon_dbconnector_init, enabled_checker):
          patch.object(DhcpServdDbMonitor, "disable_checkers") as mock_unsubscribe, \
          patch.object(DhcpServdDbMonitor, "enable_checkers") as mock_subscribe, \
          patch.object(DhcpServd, "enabled_checker", return_value=enabled_checker, new_callable=PropertyMock), \
+         patch.object(swsscommon.Table, "__init__", return_value=None), \
+         patch.object(swsscommon.Table, "set") as mock_set, \
          patch.object(DhcpServCfgGenerator, "_parse_port_map_alias"):
         dhcp_db_connector = DhcpDbConnector()
         dhcp_cfg_generator = DhcpServCfgGenerator(dhcp_db_connector, "/usr/local/lib/kea/hooks/libdhcp_run_script.so",
@@ -60,6 +62,15 @@ def test_dump_dhcp4_config(mock_swsscommon_dbconnector_init, enabled_checker):
         else:
             mock_unsubscribe.assert_called_once_with(enabled_checker - new_enabled_checker)
             mock_subscribe.assert_called_once_with(new_enabled_checker - enabled_checker)
+        assert mock_set.call_args[0][0] == "kea-dhcp4"
+        stats = dict(mock_set.call_args[0][1])
+        assert stats["reload_count"] == "1" and stats["skip_count"] == "0"
+        assert "last_latency_ms" in stats
+        # Verify that kea-dhcp4 is not reloaded if config is not changed
+        dhcpservd.dump_dhcp4_config()
+        mock_notify_kea_dhcp4_proc.assert_called_once_with()
+        stats = dict(mock_set.call_args[0][1])
+        assert stats["reload_count"] == "1" and stats["skip_count"] == "1"
 
 
 @pytest.mark.parametrize("process_list", [["proc1", "proc2", "kea-dhcp4"], ["proc1", "proc2"]])
@@ -35,10 +35,11 @@ def db_connect(db_name, namespace=EMPTY_NAMESPACE):
 
 
 class DaemonBase(Logger):
-    def __init__(self, log_identifier, use_syslogger=True, enable_runtime_log_config=False):
+    def __init__(self, log_identifier, use_syslogger=True, enable_runtime_log_config=False, subscribe_runtime_log_config=False):
         super().__init__()
         if use_syslogger:
-            self.logger_instance = SysLogger(log_identifier, enable_runtime_config=enable_runtime_log_config)
+            self.logger_instance = SysLogger(log_identifier, enable_runtime_config=enable_runtime_log_config,
+                                             subscribe_runtime_config=subscribe_runtime_log_config)
         else:
             self.logger_instance = Logger(
                 log_identifier=log_identifier,
@@ -55,23 +56,23 @@ class DaemonBase(Logger):
         if not signal.getsignal(signal.SIGTERM):
             signal.signal(signal.SIGTERM, self.signal_handler)
 
-    def log(self, priority, message, also_print_to_console=False):
-        self.logger_instance.log(priority, message, also_print_to_console)
+    def log(self, priority, message, *args, also_print_to_console=False):
+        self.logger_instance.log(priority, message, *args, also_print_to_console=also_print_to_console)
 
-    def log_error(self, message, also_print_to_console=False):
-        self.logger_instance.log_error(message, also_print_to_console)
+    def log_error(self, message, *args, also_print_to_console=False):
+        self.logger_instance.log_error(message, *args, also_print_to_console=also_print_to_console)
 
-    def log_warning(self, message, also_print_to_console=False):
-        self.logger_instance.log_warning(message, also_print_to_console)
+    def log_warning(self, message, *args, also_print_to_console=False):
+        self.logger_instance.log_warning(message, *args, also_print_to_console=also_print_to_console)
 
-    def log_notice(self, message, also_print_to_console=False):
-        self.logger_instance.log_notice(message, also_print_to_console)
+    def log_notice(self, message, *args, also_print_to_console=False):
+        self.logger_instance.log_notice(message, *args, also_print_to_console=also_print_to_console)
 
-    def log_info(self, message, also_print_to_console=False):
-        self.logger_instance.log_info(message, also_print_to_console)
+    def log_info(self, message, *args, also_print_to_console=False):
+        self.logger_instance.log_info(message, *args, also_print_to_console=also_print_to_console)
 
-    def log_debug(self, message, also_print_to_console=False):
-        self.logger_instance.log_debug(message, also_print_to_console)
+    def log_debug(self, message, *args, also_print_to_console=False):
+        self.logger_instance.log_debug(message, *args, also_print_to_console=also_print_to_console)
 
     
     # Default signal handler; can be overridden by subclass
@@ -1,10 +1,14 @@
+import copy
 import glob
 import hashlib
 import json
+import mmap
 import os
 import random
 import re
 import subprocess
+import threading
+import time
 import yaml
 from natsort import natsorted
 from sonic_py_common.general import getstatusoutput_noshell_pipe
@@ -17,6 +21,7 @@ CONTAINER_PLATFORM_PATH = USR_SHARE_SONIC_PATH + "/platform"
 
 MACHINE_CONF_PATH = "/host/machine.conf"
 SONIC_VERSION_YAML_PATH = "/etc/sonic/sonic_version.yml"
+DEVICE_FACTS_PATH = "/run/sonic_device_facts.json"
 
 # Port configuration file names
 PORT_CONFIG_FILE = "port_config.ini"
@@ -58,12 +63,170 @@ DPU_NAME_PREFIX = "dpu"
 sonic_ver_info = {}
 hw_info_dict = {}
 
+# Parsed content of the static files read by this module, per parser and path.
+# An entry is used while the inode, size and mtime of the file are unchanged
+_file_cache = {}
+_device_facts_loaded = False
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def _parse_conf_file(path):
+    with open(path) as conf_file:
+        return [(tokens[0], tokens[1].strip()) for tokens in (line.split('=') for line in conf_file) if len(tokens) >= 2]
+
+
+def _parse_yaml_file(path):
+    with open(path) as stream:
+        if yaml.__version__ >= "5.1":
+            return yaml.full_load(stream)
+        else:
+            return yaml.safe_load(stream)
+
+
+def _parse_json_file(path):
+    with open(path) as json_file:
+        return json.loads(json_file.read())
+
+
+def _load_device_facts():
+    global _device_facts_loaded
+    _device_facts_loaded = True
+    try:
+        with open(DEVICE_FACTS_PATH, 'rb') as facts_file:
+            with mmap.mmap(facts_file.fileno(), 0, access=mmap.ACCESS_READ) as facts:
+                entries = json.loads(facts[:])
+    except (OSError, ValueError):
+        return
+    for entry in entries:
+        _file_cache.setdefault((entry['parser'], entry['path']), (entry['stamp'], entry['data']))
+
+
+def _read_file_cached(path, parser, cache_unstamped=False):
+    """
+    Returns parser(path), served from the cache while the file is unchanged.
+    The result is shared and must not be modified
+    """
+    stamp = _file_stamp(path)
+    if stamp is None and not cache_unstamped:
+        return parser(path)
+    key = (parser.__name__, path)
+    if key not in _file_cache and stamp is not None and not _device_facts_loaded:
+        _load_device_facts()
+    entry = _file_cache.get(key)
+    if entry is None or entry[0] != stamp:
+        entry = (stamp, parser(path))
+        _file_cache[key] = entry
+    return entry[1]
+
+
+def refresh():
+    """
+    Forget the cached static device facts. The next calls read the files
+    again, without the facts stored by write_device_facts()
+    """
+    global sonic_ver_info, hw_info_dict, _device_facts_loaded
+    _file_cache.clear()
+    sonic_ver_info = {}
+    hw_info_dict = {}
+    _device_facts_loaded = True
+
+
+def write_device_facts(path=None):
+    """
+    Read the static files of the device and store their parsed content in a
+    file which is used by the other processes to seed their cache.
+    Meant to be called once at boot. Entries are validated against the
+    inode, size and mtime of their file, so a stale entry is never used
+    """
+    if path is None:
+        path = DEVICE_FACTS_PATH
+    refresh()
+    get_machine_info()
+    get_sonic_version_info()
+    get_num_npus()
+    is_supervisor()
+    try:
+        get_platform_json_data()
+    except OSError:
+        pass
+    entries = [{'parser': key[0], 'path': key[1], 'stamp': entry[0], 'data': entry[1]}
+               for key, entry in _file_cache.items() if entry[0] is not None]
+    tmp_path = '{}.tmp'.format(path)
+    with open(tmp_path, 'w') as facts_file:
+        json.dump(entries, facts_file)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+# Pool of the DB connections used by the helpers of this module and of
+# multi_asic. Connections are kept per process and per thread, so a forked
+# child or another thread never shares a socket with its owner
+DB_POOL_HEALTH_CHECK_INTERVAL = 30
+_db_pool = threading.local()
+
+
+def _get_db_pool():
+    pid = os.getpid()
+    if getattr(_db_pool, 'pid', None) != pid:
+        _db_pool.pid = pid
+        _db_pool.connections = {}
+    return _db_pool.connections
+
+
+def _is_db_alive(db, db_name):
+    try:
+        db.exists(db_name, 'DEVICE_METADATA|localhost')
+        return True
+    except Exception:
+        return False
+
+
+def get_pooled_db(db_name='CONFIG_DB', namespace=''):
+    """
+    Get a connected DB handle from the connection pool
+
+    A ConfigDBConnector is returned for CONFIG_DB, a SonicV2Connector for the
+    other databases. A handle idle for more than DB_POOL_HEALTH_CHECK_INTERVAL
+    seconds is checked and replaced if the connection was lost.
+    The handle is shared: callers must not close it
+    """
+    connections = _get_db_pool()
+    connector = ConfigDBConnector if db_name == 'CONFIG_DB' else SonicV2Connector
+    key = (namespace, db_name)
+    now = time.monotonic()
+    entry = connections.get(key)
+    if entry is not None and now - entry[1] > DB_POOL_HEALTH_CHECK_INTERVAL and not _is_db_alive(entry[0], db_name):
+        entry = None
+    if entry is None:
+        db = connector(namespace=namespace) if namespace else connector()
+        if db_name == 'CONFIG_DB':
+            db.connect()
+        else:
+            db.connect(db_name)
+    else:
+        db = entry[0]
+    connections[key] = (db, now)
+    return db
+
+
+def clear_db_pool():
+    """
+    Drop the pooled connections of the calling thread
+    """
+    _get_db_pool().clear()
+
+
 def get_localhost_info(field, config_db=None):
     try:
         # TODO: enforce caller to provide config_db explicitly and remove its default value
         if not config_db:
-            config_db = ConfigDBConnector()
-            config_db.connect()
+            config_db = get_pooled_db()
 
         metadata = config_db.get_table('DEVICE_METADATA')
 
@@ -90,15 +253,7 @@ def get_machine_info():
     if not os.path.isfile(MACHINE_CONF_PATH):
         return None
 
-    machine_vars = {}
-    with open(MACHINE_CONF_PATH) as machine_conf_file:
-        for line in machine_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-                continue
-            machine_vars[tokens[0]] = tokens[1].strip()
-
-    return machine_vars
+    return dict(_read_file_cached(MACHINE_CONF_PATH, _parse_conf_file))
 
 def get_platform(**kwargs):
     """
@@ -176,7 +331,7 @@ def get_platform_json_data():
     Retrieve the data from platform.json file
 
     Returns:
-        A dictionary containing the key/value pairs as found in the platform.json file
+        A dictionary containing the key/value pairs as found in the platform.json file.
     """
     platform = get_platform()
     if not platform:
@@ -191,9 +346,7 @@ def get_platform_json_data():
         return None
 
     try:
-        with open(platform_json, 'r') as f:
-            platform_data = json.loads(f.read())
-            return platform_data
+        return copy.deepcopy(_read_file_cached(platform_json, _parse_json_file))
     except (json.JSONDecodeError, IOError, TypeError, ValueError):
         # Handle any file reading and JSON parsing errors
         return None
@@ -489,7 +642,7 @@ def get_path_to_port_config_file(hwsku=None, asic=None):
     if os.path.isfile(hwsku_json_file):
         if os.path.isfile(os.path.join(platform_path, PLATFORM_JSON_FILE)):
             json_file = os.path.join(platform_path, PLATFORM_JSON_FILE)
-            platform_data = json.loads(open(json_file).read())
+            platform_data = _read_file_cached(json_file, _parse_json_file)
             interfaces = platform_data.get('interfaces', None)
             if interfaces is not None and len(interfaces) > 0:
                 port_config_candidates.append(os.path.join(platform_path, PLATFORM_JSON_FILE))
@@ -511,14 +664,7 @@ def get_sonic_version_info():
         return None
 
     global sonic_ver_info
-    if sonic_ver_info:
-        return sonic_ver_info
-
-    with open(SONIC_VERSION_YAML_PATH) as stream:
-        if yaml.__version__ >= "5.1":
-            sonic_ver_info = yaml.full_load(stream)
-        else:
-            sonic_ver_info = yaml.safe_load(stream)
+    sonic_ver_info = _read_file_cached(SONIC_VERSION_YAML_PATH, _parse_yaml_file, cache_unstamped=True)
 
     return sonic_ver_info
 
@@ -555,8 +701,7 @@ def get_platform_info(config_db=None):
     try:
         # TODO: enforce caller to provide config_db explicitly and remove its default value
         if not config_db:
-            config_db = ConfigDBConnector()
-            config_db.connect()
+            config_db = get_pooled_db()
 
         metadata = config_db.get_table('DEVICE_METADATA')["localhost"]
         switch_type = metadata.get('switch_type')
@@ -577,8 +722,7 @@ def get_chassis_info():
 
     try:
         # Init statedb connection
-        db = SonicV2Connector()
-        db.connect(db.STATE_DB)
+        db = get_pooled_db('STATE_DB')
         table = CHASSIS_INFO_TABLE.format(1)
 
         chassis_info_dict['serial'] = db.get(db.STATE_DB, table, CHASSIS_INFO_SERIAL_FIELD)
@@ -601,14 +745,10 @@ def get_num_npus():
     asic_conf_file_path = get_asic_conf_file_path()
     if asic_conf_file_path is None:
         return 1
-    with open(asic_conf_file_path) as asic_conf_file:
-        for line in asic_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'num_asic':
-                num_npus = tokens[1].strip()
-        return int(num_npus)
+    for key, value in _read_file_cached(asic_conf_file_path, _parse_conf_file):
+        if key.lower() == 'num_asic':
+            num_npus = value
+    return int(num_npus)
 
 
 def is_multi_npu():
@@ -640,16 +780,10 @@ def is_disaggregated_chassis():
     platform_env_conf_file_path = get_platform_env_conf_file_path()
     if platform_env_conf_file_path is None:
         return False
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0] == 'disaggregated_chassis':
-                val = tokens[1].strip()
-                if val == '1':
-                    return True
-        return False
+    for key, value in _read_file_cached(platform_env_conf_file_path, _parse_conf_file):
+        if key == 'disaggregated_chassis' and value == '1':
+            return True
+    return False
 
 
 def is_virtual_chassis():
@@ -697,16 +831,10 @@ def is_supervisor():
     platform_env_conf_file_path = get_platform_env_conf_file_path()
     if platform_env_conf_file_path is None:
         return False
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'supervisor':
-                val = tokens[1].strip()
-                if val == '1':
-                    return True
-        return False
+    for key, value in _read_file_cached(platform_env_conf_file_path, _parse_conf_file):
+        if key.lower() == 'supervisor' and value == '1':
+            return True
+    return False
 
 # Check if this platform has macsec capability.
 def is_macsec_supported():
@@ -717,15 +845,11 @@ def is_macsec_supported():
     if platform_env_conf_file_path is None:
         return supported
 
-    # Else open the file check for keyword - macsec_enabled -
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'macsec_enabled':
-                supported = tokens[1].strip()
-                break
+    # Else check the file for keyword - macsec_enabled -
+    for key, value in _read_file_cached(platform_env_conf_file_path, _parse_conf_file):
+        if key.lower() == 'macsec_enabled':
+            supported = value
+            break
     return int(supported)
 
 
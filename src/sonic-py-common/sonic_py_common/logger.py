@@ -89,8 +89,16 @@ class Logger(object):
     # Methods for logging messages
     #
 
-    def log(self, priority, msg, also_print_to_console=False):
+    def log(self, priority, msg, *args, also_print_to_console=False):
+        """
+        Log msg % args. Messages below the minimum priority are dropped
+        before formatting, so arguments should be passed in args rather
+        than formatted by the caller
+        """
         if self._min_log_priority >= priority:
+            if args:
+                msg = msg % args
+
             # Send message to syslog
             self._syslog.syslog(priority, msg)
 
@@ -98,17 +106,17 @@ class Logger(object):
             if also_print_to_console:
                 print(msg)
 
-    def log_error(self, msg, also_print_to_console=False):
-        self.log(self.LOG_PRIORITY_ERROR, msg, also_print_to_console)
+    def log_error(self, msg, *args, also_print_to_console=False):
+        self.log(self.LOG_PRIORITY_ERROR, msg, *args, also_print_to_console=also_print_to_console)
 
-    def log_warning(self, msg, also_print_to_console=False):
-        self.log(self.LOG_PRIORITY_WARNING, msg, also_print_to_console)
+    def log_warning(self, msg, *args, also_print_to_console=False):
+        self.log(self.LOG_PRIORITY_WARNING, msg, *args, also_print_to_console=also_print_to_console)
 
-    def log_notice(self, msg, also_print_to_console=False):
-        self.log(self.LOG_PRIORITY_NOTICE, msg, also_print_to_console)
+    def log_notice(self, msg, *args, also_print_to_console=False):
+        self.log(self.LOG_PRIORITY_NOTICE, msg, *args, also_print_to_console=also_print_to_console)
 
-    def log_info(self, msg, also_print_to_console=False):
-        self.log(self.LOG_PRIORITY_INFO, msg, also_print_to_console)
+    def log_info(self, msg, *args, also_print_to_console=False):
+        self.log(self.LOG_PRIORITY_INFO, msg, *args, also_print_to_console=also_print_to_console)
 
-    def log_debug(self, msg, also_print_to_console=False):
-        self.log(self.LOG_PRIORITY_DEBUG, msg, also_print_to_console)
+    def log_debug(self, msg, *args, also_print_to_console=False):
+        self.log(self.LOG_PRIORITY_DEBUG, msg, *args, also_print_to_console=also_print_to_console)
@@ -1,11 +1,13 @@
 import glob
 import os
 import subprocess
+import time
 
 from natsort import natsorted
 from swsscommon import swsscommon
 
-from .device_info import get_asic_conf_file_path
+from .device_info import get_asic_conf_file_path, get_pooled_db
+from .device_info import _parse_conf_file, _read_file_cached
 from .device_info import is_supervisor, is_chassis
 from .interface import inband_prefix, backplane_prefix, recirc_prefix, front_panel_prefix
 
@@ -30,9 +32,13 @@ PORT_ROLE = 'role'
 CHASSIS_STATE_DB='CHASSIS_STATE_DB'
 CHASSIS_FABRIC_ASIC_INFO_TABLE='CHASSIS_FABRIC_ASIC_TABLE'
 
-# Dictionary to cache config_db connection handle per namespace
-# to prevent duplicate connections from being opened
-config_db_handle = {}
+# Snapshots of CONFIG_DB tables per namespace, returned by get_table_snapshot()
+# to the bulk callers which accept data up to TABLE_CACHE_TTL seconds old. The
+# other helpers of this module always read the DB. Writes done through
+# mod_entry() invalidate the snapshots, other writers can call
+# invalidate_table_cache()
+TABLE_CACHE_TTL = 1.0
+table_cache = {}
 
 def connect_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
     """
@@ -51,6 +57,40 @@ def connect_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
     return config_db
 
 
+def get_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
+    """
+    Returns the pooled handle to the config DB for a given namespace.
+    Unlike connect_config_db_for_ns(), the handle is shared and must not be closed
+    """
+    return get_pooled_db('CONFIG_DB', namespace)
+
+
+def get_table_snapshot(table, namespace):
+    """
+    Returns the content of a CONFIG_DB table, served from the table cache
+    while it is younger than TABLE_CACHE_TTL seconds. This is an opt-in for
+    bulk callers, e.g. a query per port: changes done by another connection
+    may not be seen yet.
+    The snapshot is shared and must not be modified
+    """
+    key = (namespace, table)
+    now = time.monotonic()
+    entry = table_cache.get(key)
+    if entry is None or now - entry[0] > TABLE_CACHE_TTL:
+        entry = (now, get_config_db_for_ns(namespace).get_table(table))
+        table_cache[key] = entry
+    return entry[1]
+
+
+def invalidate_table_cache(table=None, namespace=None):
+    """
+    Drop the cached snapshots of a table, of a namespace, or all of them
+    """
+    for key in list(table_cache.keys()):
+        if (namespace is None or key[0] == namespace) and (table is None or key[1] == table):
+            table_cache.pop(key, None)
+
+
 def connect_to_all_dbs_for_ns(namespace=DEFAULT_NAMESPACE):
     """
     The function connects to the DBs for a given namespace and
@@ -93,14 +133,10 @@ def get_num_asics():
     if asic_conf_file_path is None:
         return 1
 
-    with open(asic_conf_file_path) as asic_conf_file:
-        for line in asic_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-                continue
-            if tokens[0].lower() == 'num_asic':
-                num_asics = tokens[1].strip()
-        return int(num_asics)
+    for key, value in _read_file_cached(asic_conf_file_path, _parse_conf_file):
+        if key.lower() == 'num_asic':
+            num_asics = value
+    return int(num_asics)
 
 
 def is_multi_asic():
@@ -233,11 +269,7 @@ def get_all_namespaces():
     if is_multi_asic():
         for asic in range(num_asics):
             namespace = "{}{}".format(ASIC_NAME_PREFIX, asic)
-            if namespace not in config_db_handle:
-                config_db_handle[namespace] =  connect_config_db_for_ns(namespace)
-            config_db = config_db_handle[namespace]
-
-            metadata = config_db.get_table('DEVICE_METADATA')
+            metadata = get_config_db_for_ns(namespace).get_table('DEVICE_METADATA')
             if metadata['localhost']['sub_role'] == FRONTEND_ASIC_SUB_ROLE:
                 front_ns.append(namespace)
             elif metadata['localhost']['sub_role'] == BACKEND_ASIC_SUB_ROLE:
@@ -315,7 +347,7 @@ def get_port_entry_for_asic(port, namespace):
 
 def get_table_entry_for_asic(table, entry, namespace):
 
-    config_db = connect_config_db_for_ns(namespace)
+    config_db = get_config_db_for_ns(namespace)
     return config_db.get_entry(table, entry)
 
 def get_port_table_for_asic(namespace):
@@ -325,7 +357,7 @@ def get_port_table_for_asic(namespace):
 
 def get_table_for_asic(table, namespace):
 
-    config_db = connect_config_db_for_ns(namespace)
+    config_db = get_config_db_for_ns(namespace)
     return config_db.get_table(table)
 
 
@@ -340,8 +372,9 @@ def mod_entry(table, key, value, namespace=None, modIfExists=False):
 
     for ns in ns_list:
         if not modIfExists or get_table_entry_for_asic(table, key, ns):
-            config_db = connect_config_db_for_ns(ns)
+            config_db = get_config_db_for_ns(ns)
             config_db.mod_entry(table, key, value)
+            invalidate_table_cache(table, ns)
 
 
 def get_namespace_for_port(port_name):
@@ -406,7 +439,7 @@ def is_port_channel_internal(port_channel, namespace=None):
     ns_list = get_namespace_list(namespace)
 
     for ns in ns_list:
-        config_db = connect_config_db_for_ns(ns)
+        config_db = get_config_db_for_ns(ns)
         port_channel_members = config_db.get_keys(PORT_CHANNEL_MEMBER_CFG_DB_TABLE)
 
         for port_channel_member in port_channel_members:
@@ -431,7 +464,7 @@ def get_back_end_interface_set(namespace=None):
     if len(bk_end_intf_list):
         ns_list = get_namespace_list(namespace)
         for ns in ns_list:
-            config_db = connect_config_db_for_ns(ns)
+            config_db = get_config_db_for_ns(ns)
             port_channel_members = config_db.get_keys(PORT_CHANNEL_MEMBER_CFG_DB_TABLE)
             # a back-end LAG must be configured with all of its member from back-end interfaces.
             # mixing back-end and front-end interfaces is miss configuration and not allowed.
@@ -453,15 +486,14 @@ def is_bgp_session_internal(bgp_neigh_ip, namespace=None):
 
     for ns in ns_list:
 
-        config_db = connect_config_db_for_ns(ns)
-        bgp_sessions = config_db.get_entry(
-            BGP_INTERNAL_NEIGH_CFG_DB_TABLE, bgp_neigh_ip
+        bgp_sessions = get_table_entry_for_asic(
+            BGP_INTERNAL_NEIGH_CFG_DB_TABLE, bgp_neigh_ip, ns
         )
         if bgp_sessions:
             return True
 
-        bgp_sessions = config_db.get_entry(
-            'BGP_VOQ_CHASSIS_NEIGHBOR', bgp_neigh_ip
+        bgp_sessions = get_table_entry_for_asic(
+            'BGP_VOQ_CHASSIS_NEIGHBOR', bgp_neigh_ip, ns
         )
         if bgp_sessions:
             return True
@@ -3,6 +3,9 @@ from logging.handlers import SysLogHandler
 import os
 import socket
 import sys
+import threading
+import time
+import weakref
 
 CONFIG_DB = 'CONFIG_DB'
 FIELD_LOG_LEVEL = 'LOGLEVEL'
@@ -15,6 +18,104 @@ logging.addLevelName(logging.NOTICE, "NOTICE")
 SysLogHandler.priority_map['NOTICE'] = 'notice'
 
 
+_config_db = None
+_config_db_owner = None
+_config_db_lock = threading.Lock()
+
+
+def _get_config_db():
+    """
+    Returns the CONFIG_DB connection shared by all the loggers of the process
+    """
+    global _config_db, _config_db_owner
+    from swsscommon import swsscommon
+    # A forked child, or a replaced connector class, gets its own connection
+    owner = (os.getpid(), swsscommon.SonicV2Connector)
+    with _config_db_lock:
+        if _config_db is None or _config_db_owner != owner:
+            config_db = swsscommon.SonicV2Connector(use_unix_socket_path=True)
+            config_db.connect(CONFIG_DB)
+            _config_db = config_db
+            _config_db_owner = owner
+        return _config_db
+
+
+def _reset_config_db():
+    global _config_db
+    with _config_db_lock:
+        _config_db = None
+
+
+class LogLevelSubscriber:
+    """
+    Process wide listener of the CONFIG_DB LOGGER table keyspace notifications.
+    One connection and one thread serve all the registered SysLogger
+    instances, their log level is updated as soon as it is changed in CONFIG_DB
+    """
+
+    RETRY_INTERVAL = 5
+    POLL_TIMEOUT = 1
+
+    def __init__(self):
+        self.loggers = {}
+        self.lock = threading.Lock()
+        self.thread = None
+        self.pid = None
+
+    def register(self, logger):
+        with self.lock:
+            self.loggers.setdefault(logger.log_identifier, weakref.WeakSet()).add(logger)
+            if self.thread is None or self.pid != os.getpid() or not self.thread.is_alive():
+                self.pid = os.getpid()
+                self.thread = threading.Thread(target=self.run, name='SysLoggerSubscriber')
+                self.thread.daemon = True
+                self.thread.start()
+
+    def get_loggers(self, log_identifier):
+        with self.lock:
+            return list(self.loggers.get(log_identifier, ()))
+
+    def update_loggers(self, config_db, table, log_identifier):
+        loggers = self.get_loggers(log_identifier)
+        if not loggers:
+            return
+        log_level_in_db = config_db.get(CONFIG_DB, f'{table}|{log_identifier}', FIELD_LOG_LEVEL)
+        if log_level_in_db:
+            for logger in loggers:
+                logger.set_min_log_priority(logger.log_priority_from_str(log_level_in_db))
+
+    def run(self):
+        try:
+            from swsscommon import swsscommon
+        except ImportError:
+            return
+        table = swsscommon.CFG_LOGGER_TABLE_NAME
+        while True:
+            try:
+                config_db = swsscommon.SonicV2Connector(use_unix_socket_path=True)
+                config_db.connect(CONFIG_DB)
+                pubsub = config_db.get_redis_client(CONFIG_DB).pubsub()
+                prefix = '__keyspace@{}__:{}|'.format(config_db.get_dbid(CONFIG_DB), table)
+                pubsub.psubscribe(prefix + '*')
+                # Catch up with the changes done before the subscription
+                with self.lock:
+                    log_identifiers = list(self.loggers.keys())
+                for log_identifier in log_identifiers:
+                    self.update_loggers(config_db, table, log_identifier)
+                while True:
+                    message = pubsub.get_message(self.POLL_TIMEOUT)
+                    if not message or message.get('type') != 'pmessage':
+                        continue
+                    channel = message.get('channel', '')
+                    if channel.startswith(prefix):
+                        self.update_loggers(config_db, table, channel[len(prefix):])
+            except Exception:
+                time.sleep(self.RETRY_INTERVAL)
+
+
+_subscriber = LogLevelSubscriber()
+
+
 class SysLogger:
     """
     SysLogger class for Python applications using SysLogHandler
@@ -23,7 +124,8 @@ class SysLogger:
     DEFAULT_LOG_FACILITY = SysLogHandler.LOG_USER
     DEFAULT_LOG_LEVEL = logging.NOTICE
 
-    def __init__(self, log_identifier=None, log_facility=DEFAULT_LOG_FACILITY, log_level=DEFAULT_LOG_LEVEL, enable_runtime_config=False):
+    def __init__(self, log_identifier=None, log_facility=DEFAULT_LOG_FACILITY, log_level=DEFAULT_LOG_LEVEL, enable_runtime_config=False,
+                 subscribe_runtime_config=False):
         self.log_identifier = log_identifier if log_identifier else os.path.basename(sys.argv[0]) 
 
         # Initialize SysLogger
@@ -42,7 +144,10 @@ class SysLogger:
         
         if enable_runtime_config:
             self.update_log_level()
-                            
+            if subscribe_runtime_config:
+                # Follow the log level changes without calls to update_log_level()
+                _subscriber.register(self)
+
     def update_log_level(self):
         """Refresh log level.
 
@@ -51,8 +156,7 @@ class SysLogger:
         """        
         from swsscommon import swsscommon
         try:
-            config_db = swsscommon.SonicV2Connector(use_unix_socket_path=True)
-            config_db.connect(CONFIG_DB)
+            config_db = _get_config_db()
             log_level_in_db = config_db.get(CONFIG_DB, f'{swsscommon.CFG_LOGGER_TABLE_NAME}|{self.log_identifier}', FIELD_LOG_LEVEL)
             if log_level_in_db:
                 self.set_min_log_priority(self.log_priority_from_str(log_level_in_db))
@@ -64,6 +168,8 @@ class SysLogger:
                 config_db.hmset(CONFIG_DB, f'{swsscommon.CFG_LOGGER_TABLE_NAME}|{self.log_identifier}', data)
             return True, ''
         except Exception as e:
+            # The connection is opened again on the next refresh
+            _reset_config_db()
             return False, f'Failed to refresh log configuration - {e}'
 
     def log_priority_to_str(self, priority):
@@ -116,26 +222,41 @@ class SysLogger:
         self._min_log_level = priority
         self.logger.setLevel(priority)
 
+    def is_enabled_for(self, priority):
+        """
+        Returns True if messages of the given priority are logged
+        """
+        return priority >= self._min_log_level
+
     # Methods for logging messages
-    def log(self, priority, msg, also_print_to_console=False):
+    def log(self, priority, msg, *args, also_print_to_console=False):
+        """
+        Log msg % args. Messages below the minimum priority are dropped
+        before formatting, so arguments should be passed in args rather
+        than formatted by the caller
+        """
+        if priority < self._min_log_level:
+            return
+        if args:
+            msg = msg % args
         self.logger.log(priority, msg)
 
         if also_print_to_console:
             print(msg)
 
     # Convenience methods
-    def log_error(self, msg, also_print_to_console=False):
-        self.log(logging.ERROR, msg, also_print_to_console)
+    def log_error(self, msg, *args, also_print_to_console=False):
+        self.log(logging.ERROR, msg, *args, also_print_to_console=also_print_to_console)
 
-    def log_warning(self, msg, also_print_to_console=False):
-        self.log(logging.WARNING, msg, also_print_to_console)
+    def log_warning(self, msg, *args, also_print_to_console=False):
+        self.log(logging.WARNING, msg, *args, also_print_to_console=also_print_to_console)
 
-    def log_notice(self, msg, also_print_to_console=False):
-        self.log(logging.NOTICE, msg, also_print_to_console)
+    def log_notice(self, msg, *args, also_print_to_console=False):
+        self.log(logging.NOTICE, msg, *args, also_print_to_console=also_print_to_console)
 
-    def log_info(self, msg, also_print_to_console=False):
-        self.log(logging.INFO, msg, also_print_to_console)
+    def log_info(self, msg, *args, also_print_to_console=False):
+        self.log(logging.INFO, msg, *args, also_print_to_console=also_print_to_console)
 
-    def log_debug(self, msg, also_print_to_console=False):
-        self.log(logging.DEBUG, msg, also_print_to_console)
+    def log_debug(self, msg, *args, also_print_to_console=False):
+        self.log(logging.DEBUG, msg, *args, also_print_to_console=also_print_to_console)
     
\ No newline at end of file
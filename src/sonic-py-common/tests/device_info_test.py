@@ -103,6 +103,7 @@ class TestDeviceInfo(object):
             assert result == "x86_64-mlnx_msn2700-r0"
 
     def test_get_chassis_info(self):
+        device_info.clear_db_pool()
         with mock.patch("sonic_py_common.device_info.SonicV2Connector", new=SonicV2Connector):
             result = device_info.get_chassis_info()
             truth = {"serial": SonicV2Connector.TEST_SERIAL,
@@ -180,6 +181,7 @@ class TestDeviceInfo(object):
     @mock.patch("sonic_py_common.device_info.get_machine_info")
     @mock.patch("sonic_py_common.device_info.get_hwsku")
     def test_get_platform_info(self, mock_hwsku, mock_machine_info, mock_sonic_ver, mock_cfg_db):
+        device_info.clear_db_pool()
         mock_cfg_inst = mock_cfg_db.return_value
         mock_cfg_inst.get_table.return_value = {"localhost": {"switch_type": "npu"}}
         mock_sonic_ver.return_value = SONIC_VERISON_YML_RESULT
@@ -241,6 +243,19 @@ class TestDeviceInfo(object):
         result = device_info.get_platform_json_data()
         assert result is None
 
+    @mock.patch("sonic_py_common.device_info.get_path_to_platform_dir")
+    @mock.patch("sonic_py_common.device_info.get_platform")
+    def test_get_platform_json_data_copy(self, mock_get_platform, mock_get_path_to_platform_dir, tmp_path):
+        mock_get_platform.return_value = "x86_64-mlnx_msn2700-r0"
+        mock_get_path_to_platform_dir.return_value = str(tmp_path)
+        (tmp_path / "platform.json").write_text(json.dumps({"chassis": {"name": "MSN2700"}}))
+        device_info.refresh()
+
+        result = device_info.get_platform_json_data()
+        result["chassis"]["name"] = "modified"
+        assert device_info.get_platform_json_data() == {"chassis": {"name": "MSN2700"}}
+        device_info.refresh()
+
     @mock.patch("sonic_py_common.device_info.get_platform_json_data")
     @mock.patch("sonic_py_common.device_info.get_platform")
     def test_is_smartswitch(self, mock_get_platform, mock_get_platform_json_data):
@@ -367,6 +382,58 @@ class TestDeviceInfo(object):
         mock_get_platform_json_data.return_value = {"DPUS": {"dpu0": {}, "dpu1": {}}}
         assert device_info.get_dpu_list() == ["dpu0", "dpu1"]
 
+    def test_file_cache_refresh(self, tmpdir):
+        machine_conf = tmpdir.join("machine.conf")
+        machine_conf.write(MACHINE_CONF_CONTENTS)
+        with mock.patch("sonic_py_common.device_info.MACHINE_CONF_PATH", str(machine_conf)), \
+                mock.patch("sonic_py_common.device_info.DEVICE_FACTS_PATH", str(tmpdir.join("facts.json"))):
+            device_info.refresh()
+            open_mocked = mock.mock_open(read_data=MACHINE_CONF_CONTENTS)
+            with mock.patch("{}.open".format(BUILTINS), open_mocked):
+                for _ in range(0, 5):
+                    assert device_info.get_machine_info() == EXPECTED_GET_MACHINE_INFO_RESULT
+                open_mocked.assert_called_once_with(str(machine_conf))
+
+            # A modified file is read again
+            machine_conf.write("onie_platform=x86_64-kvm_x86_64-r0\n")
+            stat = os.stat(str(machine_conf))
+            os.utime(str(machine_conf), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+            assert device_info.get_platform() == "x86_64-kvm_x86_64-r0"
+
+            # refresh() forgets the cached content
+            with mock.patch("sonic_py_common.device_info._parse_conf_file") as parse_mocked:
+                parse_mocked.__name__ = "_parse_conf_file"
+                parse_mocked.return_value = [("onie_platform", "x86_64-refreshed-r0")]
+                assert device_info.get_platform() == "x86_64-kvm_x86_64-r0"
+                device_info.refresh()
+                assert device_info.get_platform() == "x86_64-refreshed-r0"
+            device_info.refresh()
+
+    def test_device_facts(self, tmpdir):
+        machine_conf = tmpdir.join("machine.conf")
+        machine_conf.write(MACHINE_CONF_CONTENTS)
+        facts = tmpdir.join("facts.json")
+        with mock.patch("sonic_py_common.device_info.MACHINE_CONF_PATH", str(machine_conf)), \
+                mock.patch("sonic_py_common.device_info.DEVICE_FACTS_PATH", str(facts)), \
+                mock.patch("sonic_py_common.device_info.get_sonic_version_info"), \
+                mock.patch("sonic_py_common.device_info.get_platform", return_value=None):
+            device_info.write_device_facts()
+            assert facts.check()
+
+            # A new process is seeded from the facts file and doesn't parse machine.conf
+            device_info._file_cache.clear()
+            device_info._device_facts_loaded = False
+            with mock.patch("sonic_py_common.device_info._parse_conf_file") as parse_mocked:
+                parse_mocked.__name__ = "_parse_conf_file"
+                assert device_info.get_machine_info() == EXPECTED_GET_MACHINE_INFO_RESULT
+                parse_mocked.assert_not_called()
+
+                # A fact which doesn't match the file anymore is ignored
+                machine_conf.write(MACHINE_CONF_CONTENTS + "new_key=1\n")
+                parse_mocked.return_value = [("new_key", "1")]
+                assert device_info.get_machine_info() == {"new_key": "1"}
+            device_info.refresh()
+
     @classmethod
     def teardown_class(cls):
         print("TEARDOWN")
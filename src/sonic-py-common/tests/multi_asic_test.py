@@ -23,3 +23,63 @@ class TestMultiAsic:
                 assert multi_asic.get_asic_sub_role(0) == 'FrontEnd'
                 assert multi_asic.get_asic_sub_role(1) == 'BackEnd'
                 assert multi_asic.get_asic_sub_role(2) == None
+
+    @mock.patch('sonic_py_common.multi_asic.is_multi_asic', return_value=False)
+    @mock.patch('sonic_py_common.device_info.ConfigDBConnector')
+    def test_table_cache(self, mock_config_db, mock_is_multi_asic):
+        from sonic_py_common import device_info
+        device_info.clear_db_pool()
+        multi_asic.invalidate_table_cache()
+        config_db = mock_config_db.return_value
+        config_db.get_table.return_value = {
+            'Ethernet0': {'role': 'Int'},
+            'Ethernet4': {'admin_status': 'up'},
+        }
+        config_db.get_entry.return_value = {'role': 'Int'}
+
+        # the helpers read the DB on every call over one pooled connection
+        assert multi_asic.is_port_internal('Ethernet0')
+        assert multi_asic.get_port_role('Ethernet0') == 'Int'
+        assert multi_asic.get_table_for_asic('PORT', '') == config_db.get_table.return_value
+        mock_config_db.assert_called_once_with()
+        config_db.connect.assert_called_once_with()
+        assert config_db.get_entry.call_count == 2
+        assert config_db.get_table.call_count == 1
+
+        # the snapshot is read once until it is invalidated
+        config_db.get_table.reset_mock()
+        assert 'Ethernet4' in multi_asic.get_table_snapshot('PORT', '')
+        assert 'Ethernet4' in multi_asic.get_table_snapshot('PORT', '')
+        config_db.get_table.assert_called_once_with('PORT')
+
+        multi_asic.mod_entry('PORT', 'Ethernet4', {'role': 'Int'})
+        config_db.mod_entry.assert_called_once_with('PORT', 'Ethernet4', {'role': 'Int'})
+        multi_asic.get_table_snapshot('PORT', '')
+        assert config_db.get_table.call_count == 2
+
+        multi_asic.invalidate_table_cache('PORT')
+        multi_asic.get_table_snapshot('PORT', '')
+        assert config_db.get_table.call_count == 3
+        multi_asic.invalidate_table_cache()
+        device_info.clear_db_pool()
+
+    @mock.patch('sonic_py_common.device_info.ConfigDBConnector')
+    def test_db_pool(self, mock_config_db):
+        from sonic_py_common import device_info
+        device_info.clear_db_pool()
+        config_db = mock_config_db.return_value
+        assert multi_asic.get_config_db_for_ns('asic0') is config_db
+        assert multi_asic.get_config_db_for_ns('asic0') is config_db
+        mock_config_db.assert_called_once_with(namespace='asic0')
+
+        # a handle which lost its connection is replaced after the health check interval
+        config_db.exists.side_effect = RuntimeError('connection lost')
+        with mock.patch('sonic_py_common.device_info.DB_POOL_HEALTH_CHECK_INTERVAL', -1):
+            multi_asic.get_config_db_for_ns('asic0')
+        assert mock_config_db.call_count == 2
+
+        # a forked child opens its own connections
+        with mock.patch('os.getpid', return_value=-1):
+            multi_asic.get_config_db_for_ns('asic0')
+        assert mock_config_db.call_count == 3
+        device_info.clear_db_pool()
@@ -1,6 +1,7 @@
 import logging
 import os
 import sys
+import threading
 from io import StringIO
 from contextlib import redirect_stdout
 
@@ -89,3 +90,40 @@ class TestSysLogger:
         ret, msg = log.update_log_level()
         assert not ret
         assert msg
+
+    def test_lazy_format(self, capsys):
+        log = syslogger.SysLogger(log_level=logging.INFO)
+        log.logger.log = mock.MagicMock()
+        arg = mock.MagicMock()
+        log.log_debug('debug %s', arg)
+        log.logger.log.assert_not_called()
+        arg.__str__.assert_not_called()
+        assert not log.is_enabled_for(logging.DEBUG)
+        assert log.is_enabled_for(logging.INFO)
+
+        log.log_info('info %s %d', 'message', 1, also_print_to_console=True)
+        log.logger.log.assert_called_once_with(logging.INFO, 'info message 1')
+        assert capsys.readouterr().out == 'info message 1\n'
+
+        # a boolean argument is formatted, only the keyword prints to the console
+        log.log_info('enabled: %s', True)
+        log.logger.log.assert_called_with(logging.INFO, 'enabled: True')
+        assert capsys.readouterr().out == ''
+
+    def test_subscriber_update_loggers(self):
+        subscriber = syslogger.LogLevelSubscriber()
+        log1 = syslogger.SysLogger(log_identifier='log1')
+        log2 = syslogger.SysLogger(log_identifier='log2')
+        with mock.patch.object(threading.Thread, 'start'):
+            subscriber.register(log1)
+            subscriber.register(log2)
+        mock_db = mock.MagicMock()
+        mock_db.get = mock.MagicMock(return_value='DEBUG')
+        subscriber.update_loggers(mock_db, 'LOGGER', 'log1')
+        mock_db.get.assert_called_once_with('CONFIG_DB', 'LOGGER|log1', 'LOGLEVEL')
+        assert log1.logger.level == logging.DEBUG
+        assert log2.logger.level == logging.NOTICE
+
+        mock_db.get.reset_mock()
+        subscriber.update_loggers(mock_db, 'LOGGER', 'unknown')
+        mock_db.get.assert_not_called()
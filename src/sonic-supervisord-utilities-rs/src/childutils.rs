@@ -4,7 +4,10 @@
 //! and managing listener state transitions.
 
 use std::collections::HashMap;
-use std::io::{self, Write};
+use std::io::{self, Read, Write};
+use std::net::TcpStream;
+use std::os::unix::net::UnixStream;
+use std::time::Duration;
 
 
 /// Parse supervisor event headers - returns HashMap like Python version
@@ -51,6 +54,114 @@ pub mod listener {
     }
 }
 
+/// Process information returned by supervisor.getAllProcessInfo
+#[derive(Debug, Clone, PartialEq)]
+pub struct ProcessInfo {
+    pub name: String,
+    pub group: String,
+    pub statename: String,
+}
+
+const GET_ALL_PROCESS_INFO_REQUEST: &str = "<?xml version=\"1.0\"?>\n\
+    <methodCall><methodName>supervisor.getAllProcessInfo</methodName><params></params></methodCall>\n";
+
+fn invalid_data(message: String) -> io::Error {
+    io::Error::new(io::ErrorKind::InvalidData, message)
+}
+
+/// Send an HTTP/1.0 POST request and read the response body until supervisord closes the connection
+fn post_xml_rpc<S: Read + Write>(mut stream: S, body: &str) -> io::Result<String> {
+    let request = format!(
+        "POST /RPC2 HTTP/1.0\r\nHost: localhost\r\nContent-Type: text/xml\r\nContent-Length: {}\r\n\r\n{}",
+        body.len(), body
+    );
+    stream.write_all(request.as_bytes())?;
+
+    let mut response = String::new();
+    stream.read_to_string(&mut response)?;
+
+    let (status, body) = response.split_once("\r\n\r\n")
+        .ok_or_else(|| invalid_data("Malformed HTTP response from supervisord".to_string()))?;
+    let status_line = status.lines().next().unwrap_or_default();
+    if status_line.split_whitespace().nth(1) != Some("200") {
+        return Err(invalid_data(format!("Unexpected HTTP status from supervisord: {}", status_line)));
+    }
+    Ok(body.to_string())
+}
+
+/// Read the information of all the processes from the supervisord XML-RPC interface, like
+/// getRPCInterface(os.environ).supervisor.getAllProcessInfo() in the Python version.
+/// Only unix:// and http:// server URLs without credentials are supported
+pub fn get_all_process_info(server_url: &str, timeout: Duration) -> io::Result<Vec<ProcessInfo>> {
+    let response = if let Some(path) = server_url.strip_prefix("unix://") {
+        let stream = UnixStream::connect(path)?;
+        stream.set_read_timeout(Some(timeout))?;
+        stream.set_write_timeout(Some(timeout))?;
+        post_xml_rpc(stream, GET_ALL_PROCESS_INFO_REQUEST)?
+    } else if let Some(address) = server_url.strip_prefix("http://") {
+        let stream = TcpStream::connect(address.trim_end_matches('/'))?;
+        stream.set_read_timeout(Some(timeout))?;
+        stream.set_write_timeout(Some(timeout))?;
+        post_xml_rpc(stream, GET_ALL_PROCESS_INFO_REQUEST)?
+    } else {
+        return Err(io::Error::new(io::ErrorKind::InvalidInput,
+            format!("Unsupported supervisor server URL: {}", server_url)));
+    };
+
+    parse_all_process_info(&response)
+}
+
+fn xml_unescape(text: &str) -> String {
+    text.replace("&lt;", "<")
+        .replace("&gt;", ">")
+        .replace("&quot;", "\"")
+        .replace("&apos;", "'")
+        .replace("&amp;", "&")
+}
+
+/// Get the text of a scalar XML-RPC value, e.g. "<string>orchagent</string>" or "orchagent"
+fn xml_rpc_scalar(value: &str) -> String {
+    let value = value.trim();
+    if !value.starts_with('<') {
+        return xml_unescape(value);
+    }
+    match (value.find('>'), value.rfind("</")) {
+        (Some(begin), Some(end)) if begin < end => xml_unescape(&value[begin + 1..end]),
+        // Empty element such as "<string/>"
+        _ => String::new(),
+    }
+}
+
+fn xml_element<'a>(text: &'a str, tag: &str) -> Option<&'a str> {
+    let begin = text.find(&format!("<{}>", tag))? + tag.len() + 2;
+    let end = text[begin..].find(&format!("</{}>", tag))? + begin;
+    Some(&text[begin..end])
+}
+
+/// Parse the XML-RPC response of supervisor.getAllProcessInfo
+pub fn parse_all_process_info(response: &str) -> io::Result<Vec<ProcessInfo>> {
+    if response.contains("<fault>") {
+        return Err(invalid_data(format!("XML-RPC fault from supervisord: {}", response.trim())));
+    }
+
+    let mut process_info_list = Vec::new();
+    for process_struct in response.split("<struct>").skip(1) {
+        let process_struct = process_struct.split("</struct>").next().unwrap_or_default();
+        let mut fields = HashMap::new();
+        for member in process_struct.split("<member>").skip(1) {
+            if let (Some(name), Some(value)) = (xml_element(member, "name"), xml_element(member, "value")) {
+                fields.insert(name.trim().to_string(), xml_rpc_scalar(value));
+            }
+        }
+
+        if let (Some(name), Some(group), Some(statename)) = (fields.remove("name"), fields.remove("group"), fields.remove("statename")) {
+            process_info_list.push(ProcessInfo { name, group, statename });
+        }
+    }
+
+    Ok(process_info_list)
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -88,4 +199,54 @@ mod tests {
         assert_eq!(headers.get("processname"), Some(&"test".to_string()));
         assert_eq!(data, "Some payload data\nMore data");
     }
-}
\ No newline at end of file
+
+    #[test]
+    fn test_parse_all_process_info() {
+        let response = "<?xml version='1.0'?>\n<methodResponse>\n<params>\n<param>\n<value><array><data>\n\
+            <value><struct>\n\
+            <member>\n<name>name</name>\n<value><string>orchagent</string></value>\n</member>\n\
+            <member>\n<name>group</name>\n<value><string>orchagent</string></value>\n</member>\n\
+            <member>\n<name>pid</name>\n<value><int>42</int></value>\n</member>\n\
+            <member>\n<name>statename</name>\n<value><string>RUNNING</string></value>\n</member>\n\
+            <member>\n<name>description</name>\n<value><string>pid 42, uptime 1 day, 0:00:01</string></value>\n</member>\n\
+            </struct></value>\n\
+            <value><struct>\n\
+            <member>\n<name>name</name>\n<value><string>isc-dhcpv4-relay-Vlan1000</string></value>\n</member>\n\
+            <member>\n<name>group</name>\n<value><string>dhcp-relay</string></value>\n</member>\n\
+            <member>\n<name>statename</name>\n<value>STOPPED</value>\n</member>\n\
+            <member>\n<name>description</name>\n<value><string/></value>\n</member>\n\
+            </struct></value>\n\
+            </data></array></value>\n</param>\n</params>\n</methodResponse>\n";
+
+        let process_info_list = parse_all_process_info(response).unwrap();
+        assert_eq!(process_info_list, vec![
+            ProcessInfo { name: "orchagent".to_string(), group: "orchagent".to_string(), statename: "RUNNING".to_string() },
+            ProcessInfo { name: "isc-dhcpv4-relay-Vlan1000".to_string(), group: "dhcp-relay".to_string(), statename: "STOPPED".to_string() },
+        ]);
+    }
+
+    #[test]
+    fn test_parse_all_process_info_fault() {
+        let response = "<?xml version='1.0'?>\n<methodResponse>\n<fault>\n<value><struct>\n\
+            <member>\n<name>faultCode</name>\n<value><int>1</int></value>\n</member>\n\
+            <member>\n<name>faultString</name>\n<value><string>UNKNOWN_METHOD</string></value>\n</member>\n\
+            </struct></value>\n</fault>\n</methodResponse>\n";
+
+        assert!(parse_all_process_info(response).is_err());
+    }
+
+    #[test]
+    fn test_post_xml_rpc() {
+        let (mut server, client) = UnixStream::pair().unwrap();
+        server.write_all(b"HTTP/1.0 200 OK\r\nContent-Type: text/xml\r\n\r\n<methodResponse/>").unwrap();
+        server.shutdown(std::net::Shutdown::Write).unwrap();
+
+        let body = post_xml_rpc(client, GET_ALL_PROCESS_INFO_REQUEST).unwrap();
+        assert_eq!(body, "<methodResponse/>");
+
+        let mut request = String::new();
+        server.read_to_string(&mut request).unwrap();
+        assert!(request.starts_with("POST /RPC2 HTTP/1.0\r\n"));
+        assert!(request.ends_with(GET_ALL_PROCESS_INFO_REQUEST));
+    }
+}
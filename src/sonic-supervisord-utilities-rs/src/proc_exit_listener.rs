@@ -7,14 +7,14 @@ use log::{error, info, warn};
 use mio::{Events, Token};
 use nix::sys::signal::{self, Signal};
 use nix::unistd::getppid;
-use std::collections::HashMap;
+use std::collections::{HashMap, HashSet};
 use std::fs::File;
 use std::io::{self, BufRead, BufReader, Read};
 use std::os::unix::io::AsRawFd;
 use std::process;
 use std::sync::OnceLock;
-use std::time::{Duration, Instant};
-use swss_common::{ConfigDBConnector, EventPublisher};
+use std::time::{Duration, Instant, SystemTime, UNIX_EPOCH};
+use swss_common::{ConfigDBConnector, CxxString, DbConnector, EventPublisher, Table};
 use syslog::Severity;
 use thiserror::Error;
 
@@ -26,10 +26,28 @@ const CRITICAL_PROCESSES_FILE: &str = "/etc/supervisor/critical_processes";
 const FEATURE_TABLE_NAME: &str = "FEATURE";
 const HEARTBEAT_TABLE_NAME: &str = "HEARTBEAT";
 
+// The STATE_DB table of the supervisor process states, one entry per <container>:<process>
+pub const PROCESS_STATE_TABLE_NAME: &str = "PROCESS_STATE";
+
+// The STATE_DB table of the listener heartbeats, one entry per container
+pub const PROCESS_STATE_LISTENER_TABLE_NAME: &str = "PROCESS_STATE_LISTENER";
+
 // Timing constants
 const SELECT_TIMEOUT_SECS: u64 = 1;
 pub const ALERTING_INTERVAL_SECS: u64 = 60;
 
+// Process state changes are written into STATE_DB in batches in the following interval
+pub const PROCESS_STATE_FLUSH_INTERVAL_SECS: f64 = 1.0;
+
+// All the process states are read from supervisord and published in the following interval
+pub const PROCESS_STATE_SNAPSHOT_INTERVAL_SECS: f64 = 30.0;
+
+// Timeout of the XML-RPC requests to supervisord
+const SUPERVISOR_RPC_TIMEOUT_SECS: u64 = 5;
+
+// Used when supervisord does not set SUPERVISOR_SERVER_URL in the environment of the listener
+const DEFAULT_SUPERVISOR_SERVER_URL: &str = "unix:///var/run/supervisor.sock";
+
 // Events configuration
 const EVENTS_PUBLISHER_SOURCE: &str = "sonic-events-host";
 const EVENTS_PUBLISHER_TAG: &str = "process-exited-unexpectedly";
@@ -105,6 +123,194 @@ impl ConfigDBTrait for ConfigDBConnector {
     }
 }
 
+/// The STATE_DB writes of one flush of ProcessStatePublisher
+#[derive(Debug, Default, Clone, PartialEq)]
+pub struct ProcessStateBatch {
+    /// PROCESS_STATE keys to write, with the state of the process
+    pub states: Vec<(String, String)>,
+    /// PROCESS_STATE keys of the processes which are gone
+    pub stale: Vec<String>,
+    /// PROCESS_STATE_LISTENER key whose heartbeat is refreshed
+    pub heartbeat: Option<String>,
+    pub timestamp: String,
+}
+
+/// Trait for the STATE_DB tables written by ProcessStatePublisher - allows for mocking in tests
+pub trait ProcessStateDBTrait {
+    /// Get the keys of the PROCESS_STATE table
+    fn get_process_state_keys(&self) -> std::result::Result<Vec<String>, Box<dyn std::error::Error>>;
+    /// Write all the changes of a flush at once
+    fn write_process_states(&self, batch: &ProcessStateBatch) -> std::result::Result<(), Box<dyn std::error::Error>>;
+}
+
+/// Production implementation using the STATE_DB tables. The swss-common Rust bindings do not expose
+/// RedisPipeline, so the batch is written back to back, with nothing read in between
+pub struct ProcessStateDB {
+    state_table: Table,
+    listener_table: Table,
+}
+
+impl ProcessStateDB {
+    pub fn new(use_unix_socket_path: bool) -> std::result::Result<Self, swss_common::Exception> {
+        let state_table = Table::new(DbConnector::new_named("STATE_DB", !use_unix_socket_path, 0)?, PROCESS_STATE_TABLE_NAME)?;
+        let listener_table = Table::new(DbConnector::new_named("STATE_DB", !use_unix_socket_path, 0)?, PROCESS_STATE_LISTENER_TABLE_NAME)?;
+        Ok(ProcessStateDB { state_table, listener_table })
+    }
+}
+
+impl ProcessStateDBTrait for ProcessStateDB {
+    fn get_process_state_keys(&self) -> std::result::Result<Vec<String>, Box<dyn std::error::Error>> {
+        Ok(self.state_table.get_keys()?)
+    }
+
+    fn write_process_states(&self, batch: &ProcessStateBatch) -> std::result::Result<(), Box<dyn std::error::Error>> {
+        for key in &batch.stale {
+            self.state_table.del(key)?;
+        }
+        for (key, state) in &batch.states {
+            self.state_table.set(key, [("state", CxxString::from(state.as_str())), ("timestamp", CxxString::from(batch.timestamp.as_str()))])?;
+        }
+        if let Some(container_name) = &batch.heartbeat {
+            self.listener_table.set(container_name, [("timestamp", CxxString::from(batch.timestamp.as_str()))])?;
+        }
+        Ok(())
+    }
+}
+
+/// Trait for the supervisord XML-RPC interface - allows for mocking in tests
+pub trait SupervisorRPCTrait {
+    fn get_all_process_info(&self) -> std::result::Result<Vec<childutils::ProcessInfo>, Box<dyn std::error::Error>>;
+}
+
+/// Production implementation using the XML-RPC server of the parent supervisord
+pub struct SupervisorRPC {
+    server_url: String,
+}
+
+impl SupervisorRPC {
+    pub fn from_env() -> Self {
+        let server_url = std::env::var("SUPERVISOR_SERVER_URL").unwrap_or_else(|_| DEFAULT_SUPERVISOR_SERVER_URL.to_string());
+        SupervisorRPC { server_url }
+    }
+}
+
+impl SupervisorRPCTrait for SupervisorRPC {
+    fn get_all_process_info(&self) -> std::result::Result<Vec<childutils::ProcessInfo>, Box<dyn std::error::Error>> {
+        Ok(childutils::get_all_process_info(&self.server_url, Duration::from_secs(SUPERVISOR_RPC_TIMEOUT_SECS))?)
+    }
+}
+
+/// Publish the state of the processes of a container into STATE_DB. The states come from the
+/// PROCESS_STATE events and from a periodic snapshot read from supervisord, which also refreshes
+/// the heartbeat of the listener. Nothing is published when STATE_DB is not available.
+pub struct ProcessStatePublisher<'a> {
+    container_name: String,
+    state_db: Option<&'a dyn ProcessStateDBTrait>,
+    supervisor_rpc: &'a dyn SupervisorRPCTrait,
+    pending: HashMap<String, String>,
+    published: Option<HashSet<String>>,
+    last_flush: Option<f64>,
+    last_snapshot: Option<f64>,
+}
+
+impl<'a> ProcessStatePublisher<'a> {
+    pub fn new(container_name: &str, state_db: Option<&'a dyn ProcessStateDBTrait>, supervisor_rpc: &'a dyn SupervisorRPCTrait) -> Self {
+        let namespace_id = std::env::var("NAMESPACE_ID").unwrap_or_default();
+        ProcessStatePublisher {
+            container_name: format!("{}{}", container_name, namespace_id),
+            state_db,
+            supervisor_rpc,
+            pending: HashMap::new(),
+            published: None,
+            last_flush: None,
+            last_snapshot: None,
+        }
+    }
+
+    /// Same name as in the output of 'supervisorctl status'
+    pub fn get_process_name(process_name: &str, group_name: &str) -> String {
+        if process_name == group_name {
+            process_name.to_string()
+        } else {
+            format!("{}:{}", group_name, process_name)
+        }
+    }
+
+    pub fn update(&mut self, process_name: &str, group_name: &str, state: &str) {
+        self.pending.insert(Self::get_process_name(process_name, group_name), state.to_string());
+    }
+
+    /// Write the pending process states, and a snapshot of all the process states when it is due.
+    /// `now` is the monotonic time of get_current_time(), `timestamp` the wall clock time written to STATE_DB
+    pub fn flush(&mut self, now: f64, timestamp: u64, force: bool) {
+        let state_db = match self.state_db {
+            Some(state_db) => state_db,
+            None => return,
+        };
+
+        let mut snapshot = None;
+        if self.last_snapshot.map_or(true, |last_snapshot| now - last_snapshot >= PROCESS_STATE_SNAPSHOT_INTERVAL_SECS) {
+            self.last_snapshot = Some(now);
+            match self.supervisor_rpc.get_all_process_info() {
+                Ok(process_info_list) => {
+                    snapshot = Some(process_info_list.iter()
+                        .map(|info| (Self::get_process_name(&info.name, &info.group), info.statename.clone()))
+                        .collect::<HashMap<String, String>>());
+                }
+                Err(e) => warn!("Failed to read the process states from supervisord: {}", e),
+            }
+        }
+
+        if snapshot.is_none() {
+            if self.pending.is_empty() {
+                return;
+            }
+            if !force && self.last_flush.map_or(false, |last_flush| now - last_flush < PROCESS_STATE_FLUSH_INTERVAL_SECS) {
+                return;
+            }
+        }
+
+        if let Err(e) = self.write(state_db, snapshot, &timestamp.to_string()) {
+            warn!("Failed to publish the process states to STATE_DB: {}", e);
+            self.published = None;
+        }
+
+        self.pending.clear();
+        self.last_flush = Some(now);
+    }
+
+    fn write(&mut self, state_db: &dyn ProcessStateDBTrait, snapshot: Option<HashMap<String, String>>, timestamp: &str) -> std::result::Result<(), Box<dyn std::error::Error>> {
+        let prefix = format!("{}:", self.container_name);
+        if self.published.is_none() {
+            // Drop the entries left by the previous instance of the container
+            self.published = Some(state_db.get_process_state_keys()?
+                .iter()
+                .filter_map(|key| key.strip_prefix(&prefix))
+                .map(|process_name| process_name.to_string())
+                .collect());
+        }
+        let published = self.published.as_mut().unwrap();
+
+        let mut batch = ProcessStateBatch { timestamp: timestamp.to_string(), ..Default::default() };
+        let mut stale = Vec::new();
+        if let Some(mut snapshot) = snapshot {
+            snapshot.extend(self.pending.drain());
+            self.pending = snapshot;
+            stale = published.iter().filter(|process_name| !self.pending.contains_key(*process_name)).cloned().collect();
+            batch.heartbeat = Some(self.container_name.clone());
+        }
+        batch.stale = stale.iter().map(|process_name| format!("{}{}", prefix, process_name)).collect();
+        batch.states = self.pending.iter().map(|(process_name, state)| (format!("{}{}", prefix, process_name), state.clone())).collect();
+
+        state_db.write_process_states(&batch)?;
+        for process_name in &stale {
+            published.remove(process_name);
+        }
+        published.extend(self.pending.keys().cloned());
+        Ok(())
+    }
+}
+
 #[derive(Parser, Debug)]
 #[command(name = "supervisor-proc-exit-listener")]
 #[command(about = "SONiC supervisor process exit listener")]
@@ -257,6 +463,11 @@ pub fn get_current_time() -> f64 {
     start.elapsed().as_secs_f64()
 }
 
+/// Get wall clock time as seconds since the UNIX epoch, used for the timestamps in STATE_DB
+pub fn get_wall_clock_time() -> u64 {
+    SystemTime::now().duration_since(UNIX_EPOCH).map(|d| d.as_secs()).unwrap_or(0)
+}
+
 /// Main function with testable parameters
 pub fn main_with_args(args: Option<Vec<String>>) -> Result<()> {
     // Initialize syslog logging to match Python version behavior
@@ -279,12 +490,22 @@ pub fn main_with_parsed_args(args: Args) -> Result<()> {
         .map_err(|e| SupervisorError::Database(format!("Failed to create ConfigDB connector: {}", e)))?;
     config_db.connect(true, false)
         .map_err(|e| SupervisorError::Database(format!("Failed to connect to ConfigDB: {}", e)))?;
+    // The listener keeps running without STATE_DB, ServiceChecker falls back to supervisorctl then
+    let state_db = match ProcessStateDB::new(args.use_unix_socket_path) {
+        Ok(state_db) => Some(state_db),
+        Err(e) => {
+            warn!("Failed to connect to STATE_DB, the process states are not published: {}", e);
+            None
+        }
+    };
+    let supervisor_rpc = SupervisorRPC::from_env();
     let poller = MioPoller::new().map_err(|e| SupervisorError::Io(e))?;
-    main_with_parsed_args_and_stdin(args, io::stdin(), CRITICAL_PROCESSES_FILE, WATCH_PROCESSES_FILE, &config_db, poller)
+    main_with_parsed_args_and_stdin(args, io::stdin(), CRITICAL_PROCESSES_FILE, WATCH_PROCESSES_FILE, &config_db,
+        state_db.as_ref().map(|state_db| state_db as &dyn ProcessStateDBTrait), &supervisor_rpc, poller)
 }
 
 /// Main function with parsed arguments and custom stdin - allows for easy testing
-pub fn main_with_parsed_args_and_stdin<S: Read + AsRawFd, P: Poller>(args: Args, stdin: S, critical_processes_file: &str, watch_processes_file: &str, config_db: &dyn ConfigDBTrait, mut poller: P) -> Result<()> {
+pub fn main_with_parsed_args_and_stdin<S: Read + AsRawFd, P: Poller>(args: Args, stdin: S, critical_processes_file: &str, watch_processes_file: &str, config_db: &dyn ConfigDBTrait, state_db: Option<&dyn ProcessStateDBTrait>, supervisor_rpc: &dyn SupervisorRPCTrait, mut poller: P) -> Result<()> {
     let container_name = args.container_name;
 
     // Get critical processes and groups
@@ -300,6 +521,7 @@ pub fn main_with_parsed_args_and_stdin<S: Read + AsRawFd, P: Poller>(args: Args,
     // Process state tracking
     let mut process_under_alerting: HashMap<String, HashMap<String, f64>> = HashMap::new();
     let mut process_heart_beat_info: HashMap<String, HashMap<String, f64>> = HashMap::new();
+    let mut process_state_publisher = ProcessStatePublisher::new(&container_name, state_db, supervisor_rpc);
 
     // Load heartbeat alert intervals once at startup
     let heartbeat_intervals = load_heartbeat_alert_interval(config_db);
@@ -374,6 +596,14 @@ pub fn main_with_parsed_args_and_stdin<S: Read + AsRawFd, P: Poller>(args: Args,
 
                     // Handle different event types
                     let eventname = headers.get("eventname").cloned().unwrap_or_default();
+                    if let Some(state) = eventname.strip_prefix("PROCESS_STATE_") {
+                        let (payload_headers, _payload_data) = childutils::eventdata(&(payload.to_string() + "\n"));
+                        process_state_publisher.update(
+                            payload_headers.get("processname").map(String::as_str).unwrap_or_default(),
+                            payload_headers.get("groupname").map(String::as_str).unwrap_or_default(),
+                            state);
+                    }
+
                     match eventname.as_str() {
                         "PROCESS_STATE_EXITED" => {
                             // Handle the PROCESS_STATE_EXITED event
@@ -399,6 +629,8 @@ pub fn main_with_parsed_args_and_stdin<S: Read + AsRawFd, P: Poller>(args: Args,
                                     // Deinit publisher
                                     events_handle.deinit().ok();
 
+                                    process_state_publisher.flush(get_current_time(), get_wall_clock_time(), true);
+
                                     // Terminate supervisor
                                     if let Err(e) = terminate_supervisor() {
                                         error!("Failed to terminate supervisor: {}", e);
@@ -488,6 +720,8 @@ pub fn main_with_parsed_args_and_stdin<S: Read + AsRawFd, P: Poller>(args: Args,
                 }
             }
         }
+
+        process_state_publisher.flush(current_time, get_wall_clock_time(), false);
     }
 }
 
@@ -2,12 +2,14 @@
 //! Mirrors the Python test_listener.py structure and function names exactly
 
 use sonic_supervisord_utilities_rs::{
+    childutils::ProcessInfo,
     proc_exit_listener::*,
 };
 use injectorpp::interface::injector::*;
 use injectorpp::interface::injector::InjectorPP;
 use mio::Token;
 use scopeguard::guard;
+use std::cell::RefCell;
 use std::collections::HashMap;
 use std::io::{BufRead, BufReader};
 use std::sync::atomic::{AtomicU32, Ordering};
@@ -209,6 +211,49 @@ impl ConfigDBTrait for MockConfigDB {
     }
 }
 
+/// Mock STATE_DB tables of the process state publisher, records the writes
+#[derive(Debug, Default)]
+pub struct MockProcessStateDB {
+    pub keys: Vec<String>,
+    pub set_calls: RefCell<Vec<(String, String, String)>>,
+    pub del_calls: RefCell<Vec<String>>,
+    pub heartbeat_calls: RefCell<Vec<(String, String)>>,
+    pub batch_calls: RefCell<usize>,
+}
+
+impl ProcessStateDBTrait for MockProcessStateDB {
+    fn get_process_state_keys(&self) -> std::result::Result<Vec<String>, Box<dyn std::error::Error>> {
+        Ok(self.keys.clone())
+    }
+
+    fn write_process_states(&self, batch: &ProcessStateBatch) -> std::result::Result<(), Box<dyn std::error::Error>> {
+        *self.batch_calls.borrow_mut() += 1;
+        self.del_calls.borrow_mut().extend(batch.stale.iter().cloned());
+        self.set_calls.borrow_mut().extend(batch.states.iter().map(|(key, state)| (key.clone(), state.clone(), batch.timestamp.clone())));
+        if let Some(container_name) = &batch.heartbeat {
+            self.heartbeat_calls.borrow_mut().push((container_name.clone(), batch.timestamp.clone()));
+        }
+        Ok(())
+    }
+}
+
+/// Mock supervisord XML-RPC interface
+pub struct MockSupervisorRPC {
+    process_info_list: Vec<ProcessInfo>,
+}
+
+impl MockSupervisorRPC {
+    pub fn new(process_info_list: Vec<ProcessInfo>) -> Self {
+        Self { process_info_list }
+    }
+}
+
+impl SupervisorRPCTrait for MockSupervisorRPC {
+    fn get_all_process_info(&self) -> std::result::Result<Vec<ProcessInfo>, Box<dyn std::error::Error>> {
+        Ok(self.process_info_list.clone())
+    }
+}
+
 /// Test supervisor listener with mocking
 pub struct TestSupervisorListener {
     mock_configdb: MockConfigDB,
@@ -307,7 +352,8 @@ impl TestSupervisorListener {
         let watch_path = format!("{}/tests/etc/supervisor/watchdog_processes", env!("CARGO_MANIFEST_DIR"));
         // Use our MockConfigDB instead of real ConfigDBConnector
         let mock_poller = MockPoller::new();
-        let result = main_with_parsed_args_and_stdin(args, stdin_reader, &critical_path, &watch_path, &self.mock_configdb, mock_poller);
+        let mock_supervisor_rpc = MockSupervisorRPC::new(Vec::new());
+        let result = main_with_parsed_args_and_stdin(args, stdin_reader, &critical_path, &watch_path, &self.mock_configdb, None, &mock_supervisor_rpc, mock_poller);
         
         // The main function should process the stdin data and load the test files correctly
         // However, it will fail when trying to connect to ConfigDB or initialize EventPublisher
@@ -398,7 +444,8 @@ impl TestSupervisorListener {
         let watch_path = format!("{}/tests/etc/supervisor/watchdog_processes", env!("CARGO_MANIFEST_DIR"));
         // Use our MockConfigDB instead of real ConfigDBConnector
         let mock_poller = MockPoller::new();
-        let result = main_with_parsed_args_and_stdin(args, stdin_reader, &critical_path, &watch_path, &self.mock_configdb, mock_poller);
+        let mock_supervisor_rpc = MockSupervisorRPC::new(Vec::new());
+        let result = main_with_parsed_args_and_stdin(args, stdin_reader, &critical_path, &watch_path, &self.mock_configdb, None, &mock_supervisor_rpc, mock_poller);
         
         // The main function should process the stdin data but NOT call kill() for snmp
         // since snmp has auto-restart disabled - it should add to alerting instead
@@ -633,6 +680,67 @@ mod tests {
             println!("✓ Correctly avoided kill() call for disabled auto-restart");
         }
     }
+
+    #[test]
+    fn test_process_state_publisher() {
+        std::env::set_var("NAMESPACE_ID", "0");
+        let state_db = MockProcessStateDB {
+            keys: vec!["swss0:orchagent".to_string(), "swss0:portsyncd".to_string(), "swss1:orchagent".to_string()],
+            ..Default::default()
+        };
+        let supervisor_rpc = MockSupervisorRPC::new(vec![
+            ProcessInfo { name: "orchagent".to_string(), group: "orchagent".to_string(), statename: "RUNNING".to_string() },
+            ProcessInfo { name: "isc-dhcpv4-relay-Vlan1000".to_string(), group: "dhcp-relay".to_string(), statename: "STARTING".to_string() },
+        ]);
+        let mut publisher = ProcessStatePublisher::new("swss", Some(&state_db), &supervisor_rpc);
+        std::env::remove_var("NAMESPACE_ID");
+
+        // The first flush publishes a snapshot and removes the stale entries
+        publisher.update("isc-dhcpv4-relay-Vlan1000", "dhcp-relay", "RUNNING");
+        publisher.flush(0.0, 1000, false);
+        assert_eq!(*state_db.del_calls.borrow(), vec!["swss0:portsyncd".to_string()]);
+        let mut set_calls = state_db.set_calls.borrow_mut().drain(..).collect::<Vec<_>>();
+        set_calls.sort();
+        assert_eq!(set_calls, vec![
+            ("swss0:dhcp-relay:isc-dhcpv4-relay-Vlan1000".to_string(), "RUNNING".to_string(), "1000".to_string()),
+            ("swss0:orchagent".to_string(), "RUNNING".to_string(), "1000".to_string()),
+        ]);
+        assert_eq!(*state_db.heartbeat_calls.borrow(), vec![("swss0".to_string(), "1000".to_string())]);
+        assert_eq!(*state_db.batch_calls.borrow(), 1);
+
+        // Events are written in batches
+        publisher.update("orchagent", "orchagent", "EXITED");
+        publisher.flush(0.5, 1000, false);
+        assert!(state_db.set_calls.borrow().is_empty());
+        publisher.update("orchagent", "orchagent", "BACKOFF");
+        publisher.flush(1.0, 1001, false);
+        assert_eq!(*state_db.set_calls.borrow(), vec![("swss0:orchagent".to_string(), "BACKOFF".to_string(), "1001".to_string())]);
+        assert_eq!(*state_db.batch_calls.borrow(), 2);
+
+        // A forced flush does not wait for the batch interval
+        state_db.set_calls.borrow_mut().clear();
+        publisher.update("orchagent", "orchagent", "EXITED");
+        publisher.flush(1.2, 1001, true);
+        assert_eq!(*state_db.set_calls.borrow(), vec![("swss0:orchagent".to_string(), "EXITED".to_string(), "1001".to_string())]);
+
+        // Nothing is written when there is no change, the next snapshot refreshes the heartbeat
+        state_db.set_calls.borrow_mut().clear();
+        publisher.flush(10.0, 1010, false);
+        assert!(state_db.set_calls.borrow().is_empty());
+        publisher.flush(30.0, 1030, false);
+        assert_eq!(state_db.set_calls.borrow().len(), 2);
+        assert_eq!(state_db.heartbeat_calls.borrow().last(), Some(&("swss0".to_string(), "1030".to_string())));
+        assert_eq!(state_db.del_calls.borrow().len(), 1);
+        assert_eq!(*state_db.batch_calls.borrow(), 4);
+    }
+
+    #[test]
+    fn test_process_state_publisher_without_state_db() {
+        let supervisor_rpc = MockSupervisorRPC::new(Vec::new());
+        let mut publisher = ProcessStatePublisher::new("swss", None, &supervisor_rpc);
+        publisher.update("orchagent", "orchagent", "EXITED");
+        publisher.flush(0.0, 1000, true);
+    }
 }
 
 /// Main function for running tests standalone
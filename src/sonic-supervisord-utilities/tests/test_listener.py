@@ -147,3 +147,44 @@ def test_main_snmp(mock_time, mock_os_kill):
             with pytest.raises(StopTestLoop):
                 main(["--container-name", "snmp"])
     mock_os_kill.assert_not_called()
+
+
+@mock.patch.dict(os.environ, {"NAMESPACE_ID": "0"})
+@mock.patch('supervisor_proc_exit_listener.swsscommon.DBConnector', MagicMock())
+@mock.patch('supervisor_proc_exit_listener.swsscommon.RedisPipeline')
+@mock.patch('supervisor_proc_exit_listener.swsscommon.Table')
+def test_process_state_publisher(mock_table, mock_pipeline):
+    state_table = MagicMock()
+    state_table.getKeys.return_value = ['swss0:orchagent', 'swss0:portsyncd', 'swss1:orchagent']
+    listener_table = MagicMock()
+    mock_table.side_effect = [state_table, listener_table]
+    publisher = ProcessStatePublisher('swss', True)
+    publisher.get_all_process_info = MagicMock(return_value=[
+        {'name': 'orchagent', 'group': 'orchagent', 'statename': 'RUNNING'},
+        {'name': 'isc-dhcpv4-relay-Vlan1000', 'group': 'dhcp-relay', 'statename': 'STARTING'},
+    ])
+
+    # The first flush publishes a snapshot and removes the stale entries
+    publisher.update('isc-dhcpv4-relay-Vlan1000', 'dhcp-relay', 'RUNNING')
+    publisher.flush(1000)
+    state_table.delete.assert_called_once_with('swss0:portsyncd')
+    state_table.set.assert_has_calls([
+        call('swss0:orchagent', [('state', 'RUNNING'), ('timestamp', '1000')]),
+        call('swss0:dhcp-relay:isc-dhcpv4-relay-Vlan1000', [('state', 'RUNNING'), ('timestamp', '1000')]),
+    ], any_order=True)
+    listener_table.set.assert_called_once_with('swss0', [('timestamp', '1000')])
+    assert mock_pipeline.return_value.flush.call_count == 1
+
+    # Events are written in batches
+    state_table.set.reset_mock()
+    publisher.update('orchagent', 'orchagent', 'EXITED')
+    publisher.flush(1000.5)
+    state_table.set.assert_not_called()
+    publisher.update('orchagent', 'orchagent', 'BACKOFF')
+    publisher.flush(1001)
+    state_table.set.assert_called_once_with('swss0:orchagent', [('state', 'BACKOFF'), ('timestamp', '1001')])
+    assert mock_pipeline.return_value.flush.call_count == 2
+
+    # Nothing is written when there is no change
+    publisher.flush(1010)
+    assert mock_pipeline.return_value.flush.call_count == 2
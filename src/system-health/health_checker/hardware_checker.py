@@ -17,6 +17,9 @@ class HardwareChecker(HealthChecker):
     PSU_TABLE_NAME = 'PSU_INFO'
     LIQUID_COOLING_TABLE_NAME = 'LIQUID_COOLING_INFO'
 
+    # Hardware status is read from STATE_DB only
+    CHECK_TIMEOUT = 10
+
     def __init__(self):
         HealthChecker.__init__(self)
         self._db = SonicV2Connector(use_unix_socket_path=True)
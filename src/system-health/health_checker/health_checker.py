@@ -6,12 +6,20 @@ class HealthChecker(object):
     INFO_FIELD_OBJECT_TYPE = 'type'
     INFO_FIELD_OBJECT_STATUS = 'status'
     INFO_FIELD_OBJECT_MSG = 'message'
+    # Set when the object status comes from a previous check
+    INFO_FIELD_OBJECT_STALE = 'stale'
 
     STATUS_OK = 'OK'
     STATUS_NOT_OK = 'Not OK'
 
     summary = STATUS_OK
 
+    # Minimal time in seconds between two checks, the last result is reused in between
+    REFRESH_INTERVAL = 0
+
+    # Time in seconds to wait for a check before reusing the last result
+    CHECK_TIMEOUT = 30
+
     def __init__(self):
         self._info = {}
 
@@ -37,6 +45,21 @@ class HealthChecker(object):
         """
         return self._info
 
+    def get_refresh_interval(self):
+        """
+        Get the minimal time between two checks of the checker.
+        :return: Interval in seconds
+        """
+        return self.REFRESH_INTERVAL
+
+    def get_timeout(self):
+        """
+        Get the time to wait for a check. A check that takes longer is not interrupted, its last result is
+        reported as stale until it is done.
+        :return: Timeout in seconds
+        """
+        return self.CHECK_TIMEOUT
+
     def check(self, config):
         """
         Perform the check.
@@ -1,3 +1,7 @@
+import concurrent.futures
+import copy
+import time
+
 from .config import Config
 from .health_checker import HealthChecker
 from .service_checker import ServiceChecker
@@ -6,12 +10,31 @@ from .user_defined_checker import UserDefinedChecker
 from . import utils
 
 
+class CheckerState(object):
+    """
+    Pending check and last known result of a checker.
+    """
+    def __init__(self):
+        self.future = None
+        self.deadline = None
+        self.timeout = None
+        self.last_check = None
+        self.result = None
+
+
 class HealthCheckerManager(object):
     """
     Manage all system health checkers and system health configuration.
     """
+    # Maximum number of checkers that run at the same time
+    MAX_WORKERS = 8
+
     def __init__(self):
         self._checkers = []
+        self._user_defined_checkers = {}
+        self._states = {}
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=HealthCheckerManager.MAX_WORKERS,
+                                                               thread_name_prefix='health_checker')
         self.config = Config()
         self.initialize()
 
@@ -25,52 +48,127 @@ class HealthCheckerManager(object):
 
     def check(self, chassis):
         """
-        Load new configuration if any and perform the system health check for all existing checkers.
+        Load new configuration if any and perform the system health check for all existing checkers. The checkers
+        run concurrently, a checker that is not due for refresh or does not finish in time reports its last result.
         :param chassis: A chassis object.
         :return: A dictionary that contains the status for all objects that was checked.
         """
-        HealthChecker.summary = HealthChecker.STATUS_OK
         stats = {}
         self.config.load_config()
+        # The checks run in other threads and may outlive this call, each gets the configuration it was started with
+        config = copy.deepcopy(self.config)
 
-        for checker in self._checkers:
-            self._do_check(checker, stats)
+        checkers = self._checkers + self._get_user_defined_checkers()
+        for checker in checkers:
+            self._schedule(checker, config)
 
-        if self.config.user_defined_checkers:
-            for udc in self.config.user_defined_checkers:
-                checker = UserDefinedChecker(udc)
-                self._do_check(checker, stats)
+        for checker in checkers:
+            self._do_check(checker, stats)
 
+        HealthChecker.summary = self._get_summary(stats)
         self._set_system_led(chassis)
         return stats
 
+    def _get_user_defined_checkers(self):
+        """
+        Get the user defined checkers of the current configuration. The checkers are kept between the checks so
+        that their last result can be reused.
+        :return: A list of checker objects.
+        """
+        cmds = self.config.user_defined_checkers or set()
+        for cmd in set(self._user_defined_checkers.keys()).difference(cmds):
+            self._states.pop(self._user_defined_checkers.pop(cmd), None)
+
+        for cmd in cmds:
+            if cmd not in self._user_defined_checkers:
+                self._user_defined_checkers[cmd] = UserDefinedChecker(cmd)
+        return [self._user_defined_checkers[cmd] for cmd in sorted(cmds)]
+
+    def _schedule(self, checker, config):
+        """
+        Submit a check if the checker is due for refresh and has no pending check.
+        :param checker: A checker object.
+        :param config: Health checker configuration for the check.
+        :return:
+        """
+        state = self._states.setdefault(checker, CheckerState())
+        if state.future is not None:
+            return
+
+        now = time.monotonic()
+        if state.last_check is not None and now - state.last_check < checker.get_refresh_interval():
+            return
+
+        state.timeout = min(checker.get_timeout(), config.interval)
+        state.deadline = now + state.timeout
+        state.future = self._executor.submit(self._run_checker, checker, config)
+
+    def _run_checker(self, checker, config):
+        checker.check(config)
+        return checker.get_category(), copy.deepcopy(checker.get_info())
+
     def _do_check(self, checker, stats):
         """
-        Do check for a particular checker and collect the check statistic.
+        Wait for the check of a particular checker and collect the check statistic.
         :param checker: A checker object.
         :param stats: Check statistic.
         :return:
         """
-        try:
-            checker.check(self.config)
-            category = checker.get_category()
-            info = checker.get_info()
-            if category not in stats:
-                stats[category] = info
-            else:
-                stats[category].update(info)
-        except Exception as e:
-            HealthChecker.summary = HealthChecker.STATUS_NOT_OK
-            error_msg = 'Failed to perform health check for {} due to exception - {}'.format(checker, repr(e))
-            entry = {str(checker): {
-                HealthChecker.INFO_FIELD_OBJECT_STATUS: HealthChecker.STATUS_NOT_OK,
-                HealthChecker.INFO_FIELD_OBJECT_MSG: error_msg,
-                HealthChecker.INFO_FIELD_OBJECT_TYPE: "Internal"
-            }}
-            if 'Internal' not in stats:
-                stats['Internal'] = entry
-            else:
-                stats['Internal'].update(entry)
+        state = self._states[checker]
+        stale = False
+        if state.future is not None:
+            try:
+                state.result = state.future.result(timeout=max(0, state.deadline - time.monotonic()))
+            except concurrent.futures.TimeoutError:
+                stale = True
+            except Exception as e:
+                state.result = None
+                error_msg = 'Failed to perform health check for {} due to exception - {}'.format(checker, repr(e))
+                self._add_internal_error(checker, error_msg, stats)
+            if not stale:
+                state.future = None
+                state.last_check = time.monotonic()
+
+        if state.result is None:
+            if stale:
+                error_msg = 'Health check for {} did not finish in {} seconds'.format(checker, state.timeout)
+                self._add_internal_error(checker, error_msg, stats)
+            return
+
+        category, info = state.result
+        info = copy.deepcopy(info)
+        if stale:
+            for obj_data in info.values():
+                obj_data[HealthChecker.INFO_FIELD_OBJECT_STALE] = 'True'
+        if category not in stats:
+            stats[category] = info
+        else:
+            stats[category].update(info)
+
+    def _add_internal_error(self, checker, error_msg, stats):
+        entry = {str(checker): {
+            HealthChecker.INFO_FIELD_OBJECT_STATUS: HealthChecker.STATUS_NOT_OK,
+            HealthChecker.INFO_FIELD_OBJECT_MSG: error_msg,
+            HealthChecker.INFO_FIELD_OBJECT_TYPE: "Internal"
+        }}
+        if 'Internal' not in stats:
+            stats['Internal'] = entry
+        else:
+            stats['Internal'].update(entry)
+
+    @staticmethod
+    def _get_summary(stats):
+        """
+        Get the system health summary from the status of all objects, including the ones reused from a previous
+        check.
+        :param stats: Check statistic.
+        :return: Summary status
+        """
+        for info in stats.values():
+            for obj_data in info.values():
+                if obj_data.get(HealthChecker.INFO_FIELD_OBJECT_STATUS) == HealthChecker.STATUS_NOT_OK:
+                    return HealthChecker.STATUS_NOT_OK
+        return HealthChecker.STATUS_OK
 
     def _set_system_led(self, chassis):
         try:
@@ -2,6 +2,8 @@ import docker
 import os
 import pickle
 import re
+import redis
+import time
 
 from swsscommon import swsscommon
 from sonic_py_common import multi_asic, device_info
@@ -55,6 +57,22 @@ class ServiceChecker(HealthChecker):
     # These containers will be excluded from both expected and running container sets.
     CONTAINER_K8S_WHITELIST = {'telemetry', 'acms', 'restapi'}
 
+    # monit and docker may stall, the last result is reported meanwhile
+    CHECK_TIMEOUT = 20
+
+    # Querying monit, docker and the process states of all containers is expensive, the result is reused meanwhile
+    REFRESH_INTERVAL = 30
+
+    # STATE_DB tables of the process states published by supervisor-proc-exit-listener
+    PROCESS_STATE_TABLE = 'PROCESS_STATE'
+    PROCESS_STATE_LISTENER_TABLE = 'PROCESS_STATE_LISTENER'
+
+    # The process states of a container are used if its listener published a heartbeat within this time
+    PROCESS_STATE_LISTENER_TIMEOUT = 90
+
+    # Number of keys examined by each SCAN call when reading the process states
+    PROCESS_STATE_SCAN_COUNT = 1000
+
     def __init__(self):
         HealthChecker.__init__(self)
         self.container_critical_processes = {}
@@ -67,6 +85,11 @@ class ServiceChecker(HealthChecker):
 
         self.config_db = None
 
+        self.state_dbs = {}
+
+        # Process states published by the listener of the containers, {<container_name>: {<process_name>: <state>}}
+        self.process_states = {}
+
         self.load_critical_process_cache()
 
     def get_expected_running_containers(self, feature_table):
@@ -98,7 +121,7 @@ class ServiceChecker(HealthChecker):
         for container_name in feature_table.keys():
             # Skip containers in the whitelist
             if container_name in ServiceChecker.CONTAINER_K8S_WHITELIST:
-                logger.log_debug("Skipping whitelisted kubesonic managed container '{}' from expected running check".format(container_name))
+                logger.log_debug("Skipping whitelisted kubesonic managed container '%s' from expected running check", container_name)
                 continue
             # skip frr_bmp since it's not container just bmp option used by bgpd
             if container_name == "frr_bmp":
@@ -225,7 +248,7 @@ class ServiceChecker(HealthChecker):
         critical_processes_file = os.path.join(container_folder, ServiceChecker.CRITICAL_PROCESSES_PATH)
         if not os.path.isfile(critical_processes_file):
             # Critical process file does not exist, the container has no critical processes.
-            logger.log_debug('Failed to get critical process file for {}, {} does not exist'.format(container, critical_processes_file))
+            logger.log_debug('Failed to get critical process file for %s, %s does not exist', container, critical_processes_file)
             self._update_container_critical_processes(container, [])
             return
 
@@ -311,6 +334,73 @@ class ServiceChecker(HealthChecker):
                 self.set_object_ok(service_type, name)
         return
 
+    def _get_state_db(self, namespace):
+        if namespace not in self.state_dbs:
+            if namespace and not swsscommon.SonicDBConfig.isGlobalInit():
+                swsscommon.SonicDBConfig.initializeGlobalConfig()
+            self.state_dbs[namespace] = redis.Redis(
+                unix_socket_path=swsscommon.SonicDBConfig.getDbSock('STATE_DB', namespace),
+                db=swsscommon.SonicDBConfig.getDbId('STATE_DB', namespace),
+                decode_responses=True
+            )
+        return self.state_dbs[namespace]
+
+    def get_process_states(self, running_containers):
+        """Get the process states published in STATE_DB by supervisor-proc-exit-listener. The containers
+           whose listener did not publish a recent heartbeat are omitted. The entries of both tables are
+           read with one SCAN and one pipelined HGETALL per namespace.
+
+        Args:
+            running_containers (set): A set of running container names
+
+        Returns:
+            process_states: A dictionary {<container_name>: {<process_name>: <state>}}
+        """
+        namespaces = [multi_asic.DEFAULT_NAMESPACE]
+        if multi_asic.is_multi_asic():
+            namespaces.extend(multi_asic.get_namespace_list())
+
+        listener_prefix = ServiceChecker.PROCESS_STATE_LISTENER_TABLE + '|'
+        state_prefix = ServiceChecker.PROCESS_STATE_TABLE + '|'
+        process_states = {}
+        now = time.time()
+        for namespace in namespaces:
+            try:
+                db = self._get_state_db(namespace)
+                # The pattern matches the keys of both PROCESS_STATE and PROCESS_STATE_LISTENER
+                keys = list(db.scan_iter(match=ServiceChecker.PROCESS_STATE_TABLE + '*',
+                                         count=ServiceChecker.PROCESS_STATE_SCAN_COUNT))
+                if not keys:
+                    continue
+                pipe = db.pipeline(transaction=False)
+                for key in keys:
+                    pipe.hgetall(key)
+                entries = dict(zip(keys, pipe.execute()))
+
+                healthy_containers = set()
+                for key, data in entries.items():
+                    if not key.startswith(listener_prefix):
+                        continue
+                    container_name = key[len(listener_prefix):]
+                    timestamp = data.get('timestamp')
+                    if container_name in running_containers and timestamp and \
+                            now - float(timestamp) < ServiceChecker.PROCESS_STATE_LISTENER_TIMEOUT:
+                        healthy_containers.add(container_name)
+
+                for key, data in entries.items():
+                    if not key.startswith(state_prefix):
+                        continue
+                    container_name, _, process_name = key[len(state_prefix):].partition(':')
+                    if container_name in healthy_containers and 'state' in data:
+                        process_states.setdefault(container_name, {})[process_name] = data['state']
+                for container_name in healthy_containers:
+                    process_states.setdefault(container_name, {})
+            except Exception as e:
+                logger.log_warning("Failed to read process states from STATE_DB of namespace '{}': {}".format(namespace, e))
+                self.state_dbs.pop(namespace, None)
+
+        return process_states
+
     def check_services(self, config):
         """Check status of critical services and critical processes
 
@@ -323,6 +413,7 @@ class ServiceChecker(HealthChecker):
         feature_table = self.config_db.get_table("FEATURE")
         expected_running_containers, self.container_feature_dict = self.get_expected_running_containers(feature_table)
         current_running_containers = self.get_current_running_containers()
+        self.process_states = self.get_process_states(current_running_containers)
 
         newly_disabled_containers = set(self.container_critical_processes.keys()).difference(expected_running_containers)
         for newly_disabled_container in newly_disabled_containers:
@@ -374,6 +465,24 @@ class ServiceChecker(HealthChecker):
             data[items[0].strip()] = items[1].strip()
         return data
 
+    def _get_process_status_by_supervisorctl(self, container_name):
+        """Get the process status of a container whose listener does not publish it in STATE_DB
+
+        Args:
+            container_name (str): Container name
+
+        Returns:
+            process_status: A dictionary {<process_name>: <state>}, None if the status is not available
+        """
+        # We are using supervisorctl status to check the critical process status. We cannot leverage psutil here because
+        # it not always possible to get process cmdline in supervisor.conf. E.g, cmdline of orchagent is "/usr/bin/orchagent",
+        # however, in supervisor.conf it is "/usr/bin/orchagent.sh"
+        cmd = 'docker exec {} bash -c "supervisorctl status"'.format(container_name)
+        process_status = utils.run_command(cmd, timeout=15)
+        if process_status is None:
+            return None
+        return self._parse_supervisorctl_status(process_status.strip().splitlines())
+
     def publish_events(self, container_name, critical_process_list):
         params = swsscommon.FieldValueMap()
         params["ctr_name"] = container_name
@@ -399,18 +508,15 @@ class ServiceChecker(HealthChecker):
             if ("state" in feature_table[feature_name]
                     and feature_table[feature_name]["state"] not in ["disabled", "always_disabled"]):
 
-                # We are using supervisorctl status to check the critical process status. We cannot leverage psutil here because
-                # it not always possible to get process cmdline in supervisor.conf. E.g, cmdline of orchagent is "/usr/bin/orchagent",
-                # however, in supervisor.conf it is "/usr/bin/orchagent.sh"
-                cmd = 'docker exec {} bash -c "supervisorctl status"'.format(container_name)
-                process_status = utils.run_command(cmd, timeout=15)
+                process_status = self.process_states.get(container_name)
+                if process_status is None:
+                    process_status = self._get_process_status_by_supervisorctl(container_name)
                 if process_status is None:
                     for process_name in critical_process_list:
                         self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
                     self.publish_events(container_name, critical_process_list)
                     return
 
-                process_status = self._parse_supervisorctl_status(process_status.strip().splitlines())
                 for process_name in critical_process_list:
                     if config and config.ignore_services and process_name in config.ignore_services:
                         continue
@@ -26,6 +26,13 @@ QUEUE_TIMEOUT = 15
 TASK_STOP_TIMEOUT = 10
 logger = Logger(log_identifier=SYSLOG_IDENTIFIER)
 exclude_srv_list = ['ztp.service']
+target_wants_dirs = ["/etc/systemd/system/multi-user.target.wants", "/etc/systemd/system/sonic.target.wants"]
+SYSTEMD_BUS_NAME = 'org.freedesktop.systemd1'
+SYSTEMD_OBJECT_PATH = '/org/freedesktop/systemd1'
+SYSTEMD_MANAGER_INTERFACE = 'org.freedesktop.systemd1.Manager'
+SYSTEMD_UNIT_INTERFACE = 'org.freedesktop.systemd1.Unit'
+SYSTEMD_SERVICE_INTERFACE = 'org.freedesktop.systemd1.Service'
+DBUS_PROPERTIES_INTERFACE = 'org.freedesktop.DBus.Properties'
 
 #Thread which subscribes to STATE_DB FEATURE table for any update
 #and push service events to main thread via queue
@@ -119,6 +126,49 @@ class MonitorSystemBusTask(ThreadTaskBase):
             return
         self.task_queue.put(msg)
 
+#Reads the properties of systemd units over the system dbus, the properties
+#of a whole service list are read with a couple of calls to the systemd manager
+class SystemdUnitReader(object):
+
+    def __init__(self):
+        import dbus
+        self.dbus = dbus
+        self.bus = dbus.SystemBus()
+        systemd = self.bus.get_object(SYSTEMD_BUS_NAME, SYSTEMD_OBJECT_PATH)
+        self.manager = dbus.Interface(systemd, SYSTEMD_MANAGER_INTERFACE)
+
+    def get_unit_property(self, unit_path, interface, name):
+        unit = self.dbus.Interface(self.bus.get_object(SYSTEMD_BUS_NAME, unit_path), DBUS_PROPERTIES_INTERFACE)
+        return str(unit.Get(interface, name))
+
+    #Returns {unit: properties}, with the properties of 'systemctl show' used by Sysmonitor
+    def get_units_properties(self, units):
+        units_properties = {}
+        unit_paths = {}
+        for unit in self.manager.ListUnitsByNames(units):
+            name = str(unit[0])
+            units_properties[name] = {'Id': name, 'LoadState': str(unit[2]), 'ActiveState': str(unit[3]), 'SubState': str(unit[4])}
+            unit_paths[name] = unit[6]
+
+        unit_file_states = {}
+        for path, state in self.manager.ListUnitFilesByPatterns([], units):
+            unit_file_states[os.path.basename(str(path))] = str(state)
+
+        for name, properties in units_properties.items():
+            if properties['LoadState'] != 'loaded':
+                continue
+            properties['UnitFileState'] = unit_file_states.get(name)
+            if properties['UnitFileState'] is None:
+                properties['UnitFileState'] = self.get_unit_property(unit_paths[name], SYSTEMD_UNIT_INTERFACE, 'UnitFileState')
+            if properties['ActiveState'] == 'active':
+                #The result of a service is reset when it starts, the type is not used for active services
+                properties['Result'] = 'success'
+            else:
+                properties['Result'] = self.get_unit_property(unit_paths[name], SYSTEMD_SERVICE_INTERFACE, 'Result')
+                properties['Type'] = self.get_unit_property(unit_paths[name], SYSTEMD_SERVICE_INTERFACE, 'Type')
+
+        return units_properties
+
 #Main thread which launches 2 subtasks - systembus task and statedb task
 #and on receiving events, checks and updates the system ready status to state db
 class Sysmonitor(ThreadTaskBase):
@@ -131,6 +181,10 @@ class Sysmonitor(ThreadTaskBase):
         self.config_db = None
         self.config = Config()
         self.myQ = queue.Queue()
+        self.unit_reader = None
+        #Service list and the state of its sources when it was formed
+        self.service_list = None
+        self.service_list_sources = None
 
     #Sets system ready status to state db
     def post_system_status(self, state):
@@ -145,8 +199,34 @@ class Sysmonitor(ThreadTaskBase):
         except Exception as e:
             logger.log_error("Unable to post system ready status: {}".format(str(e)))
 
-    #Forms the service list to be monitored
+    #Returns the state of the sources of the service list, a unit file
+    #enabled or disabled in a target changes the mtime of its wants directory
+    def get_service_list_sources(self):
+        sources = []
+        for path in target_wants_dirs:
+            try:
+                sources.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                sources.append(None)
+        self.config.load_config()
+        sources.append(self.config._last_mtime)
+        return sources
+
+    #Drops the cached service list, it is formed again on the next use
+    def invalidate_service_list(self):
+        self.service_list = None
+
+    #Returns the service list to be monitored, formed again only if the
+    #FEATURE table, the unit files in the targets or the configuration changed
     def get_all_service_list(self):
+        sources = self.get_service_list_sources()
+        if self.service_list is None or sources != self.service_list_sources:
+            self.service_list = self.form_service_list()
+            self.service_list_sources = sources
+        return list(self.service_list)
+
+    #Forms the service list to be monitored
+    def form_service_list(self):
 
         if not self.config_db:
             self.config_db = swsscommon.ConfigDBConnector(use_unix_socket_path=True)
@@ -154,14 +234,12 @@ class Sysmonitor(ThreadTaskBase):
 
         dir_list = []
         #add the services from the below targets
-        targets= ["/etc/systemd/system/multi-user.target.wants", "/etc/systemd/system/sonic.target.wants"]
-        for path in targets:
+        for path in target_wants_dirs:
             dir_list += [os.path.basename(i) for i in glob.glob('{}/*.service'.format(path))]
 
         #add the enabled docker services from config db feature table
         self.get_service_from_feature_table(dir_list)
 
-        self.config.load_config()
         if self.config and self.config.ignore_services:
             for srv in self.config.ignore_services:
                 if srv in dir_list:
@@ -291,6 +369,18 @@ class Sysmonitor(ThreadTaskBase):
 
         return prop_dict
 
+    #Gets the properties of the services, with one batch of dbus calls if
+    #systemd is reachable on the system bus, else with 'systemctl show'
+    def get_units_properties(self, services):
+        try:
+            if self.unit_reader is None:
+                self.unit_reader = SystemdUnitReader()
+            return self.unit_reader.get_units_properties(services)
+        except Exception as e:
+            logger.log_debug("Unable to read unit properties from dbus, using systemctl: %s", e)
+            self.unit_reader = None
+            return {service: self.run_systemctl_show(service) for service in services}
+
     #Sets the service status to state db
     def post_unit_status(self, srv_name, srv_status, app_status, fail_reason, update_time):
         if not self.state_db:
@@ -306,7 +396,7 @@ class Sysmonitor(ThreadTaskBase):
         self.state_db.hmset(self.state_db.STATE_DB, key, statusvalue)
 
     #Reads the current status of the service and posts it to state db
-    def get_unit_status(self, event):
+    def get_unit_status(self, event, sysctl_show=None):
         """ Get a unit status"""
         global spl_srv_list
         unit_status = "NOT OK"
@@ -317,7 +407,8 @@ class Sysmonitor(ThreadTaskBase):
             service_up_status = "Down"
             service_name,last_name = event.rsplit('.', 1)
 
-            sysctl_show = self.run_systemctl_show(event)
+            if sysctl_show is None:
+                sysctl_show = self.get_units_properties([event]).get(event, {})
 
             load_state = sysctl_show.get('LoadState')
             if load_state == "loaded":
@@ -325,7 +416,7 @@ class Sysmonitor(ThreadTaskBase):
                 fail_reason = sysctl_show['Result']
                 active_state = sysctl_show['ActiveState']
                 sub_state = sysctl_show['SubState']
-                srv_type = sysctl_show['Type']
+                srv_type = sysctl_show.get('Type')
 
                 #Raise syslog for service state change
                 logger.log_info("{} service state changed to [{}/{}]".format(event, active_state, sub_state))
@@ -384,8 +475,9 @@ class Sysmonitor(ThreadTaskBase):
         scan_srv_list = []
 
         scan_srv_list = self.get_all_service_list()
+        units_properties = self.get_units_properties(scan_srv_list)
         for service in scan_srv_list:
-            ustate = self.get_unit_status(service)
+            ustate = self.get_unit_status(service, units_properties.get(service, {}))
             if ustate == "NOT OK":
                 if service not in self.dnsrvs_name:
                     self.dnsrvs_name.add(service)
@@ -500,7 +592,9 @@ class Sysmonitor(ThreadTaskBase):
                 event = msg["unit"]
                 event_src = msg["evt_src"]
                 event_time = msg["time"]
-                logger.log_debug("Main process- received event:{} from source:{} time:{}".format(event,event_src,event_time))
+                logger.log_debug("Main process- received event:%s from source:%s time:%s", event, event_src, event_time)
+                if event_src == "feature":
+                    self.invalidate_service_list()
                 logger.log_info("check_unit_status for [ "+event+" ] ")
                 self.check_unit_status(event)
             except (Empty, EOFError):
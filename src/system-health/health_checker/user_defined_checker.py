@@ -20,6 +20,9 @@ class UserDefinedChecker(HealthChecker):
     Device3:Out of power
     """
 
+    # A user defined command may be expensive, the result is reused meanwhile
+    REFRESH_INTERVAL = 60
+
     def __init__(self, cmd):
         """
         Constructor.
@@ -9,7 +9,8 @@ sonic_dependencies = ['sonic-py-common']
 
 dependencies = [
     'natsort',
-    'docker'
+    'docker',
+    'redis'
 ]
 
 dependencies += sonic_dependencies
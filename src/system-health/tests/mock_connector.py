@@ -1,8 +1,11 @@
+import fnmatch
+
+
 class MockConnector(object):
     STATE_DB = None
     data = {}
 
-    def __init__(self, use_unix_socket_path):
+    def __init__(self, use_unix_socket_path, namespace=None):
         pass
 
     def connect(self, db_id):
@@ -34,3 +37,24 @@ class MockConnector(object):
         self.data[key] = {}
         for field,value in fieldsvalues.items():
             self.data[key][field] = value
+
+
+class MockRedis(object):
+    """redis.Redis backed by the data of MockConnector"""
+    def scan_iter(self, match=None, count=None):
+        return [key for key in MockConnector.data if fnmatch.fnmatchcase(key, match)]
+
+    def pipeline(self, transaction=True):
+        return MockPipeline()
+
+
+class MockPipeline(object):
+    def __init__(self):
+        self.replies = []
+
+    def hgetall(self, key):
+        self.replies.append(dict(MockConnector.data.get(key, {})))
+
+    def execute(self):
+        replies, self.replies = self.replies, []
+        return replies
@@ -12,6 +12,7 @@
 import copy
 import os
 import sys
+import time
 import docker
 import importlib.util
 import importlib.machinery
@@ -20,7 +21,7 @@ from swsscommon import swsscommon
 from mock import Mock, MagicMock, patch, call
 from sonic_py_common import device_info
 
-from .mock_connector import MockConnector
+from .mock_connector import MockConnector, MockRedis
 
 swsscommon.SonicV2Connector = MockConnector
 swsscommon.RestartWaiter = MagicMock()
@@ -41,6 +42,7 @@ from health_checker.user_defined_checker import UserDefinedChecker
 from health_checker.sysmonitor import Sysmonitor
 from health_checker.sysmonitor import MonitorStateDbTask
 from health_checker.sysmonitor import MonitorSystemBusTask
+from health_checker.sysmonitor import SystemdUnitReader
 
 def load_source(modname, filename):
     loader = importlib.machinery.SourceFileLoader(modname, filename)
@@ -315,6 +317,40 @@ def test_service_checker_no_critical_process(mock_get_table, mock_docker_client)
     assert 'system' in checker._info
     assert checker._info['system'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
 
+@patch('sonic_py_common.multi_asic.is_multi_asic', MagicMock(return_value=False))
+@patch('health_checker.service_checker.ServiceChecker._get_state_db', MagicMock(return_value=MockRedis()))
+@patch('health_checker.utils.run_command')
+def test_service_checker_process_states(mock_run):
+    now = time.time()
+    MockConnector.data.update({
+        'PROCESS_STATE_LISTENER|swss': {'timestamp': str(int(now))},
+        'PROCESS_STATE_LISTENER|bgp': {'timestamp': str(int(now) - 3600)},
+        'PROCESS_STATE_LISTENER|stopped': {'timestamp': str(int(now))},
+        'PROCESS_STATE|swss:orchagent': {'state': 'RUNNING', 'timestamp': str(int(now))},
+        'PROCESS_STATE|swss:portsyncd': {'state': 'EXITED', 'timestamp': str(int(now))},
+        'PROCESS_STATE|bgp:bgpd': {'state': 'RUNNING', 'timestamp': str(int(now) - 3600)},
+    })
+    checker = ServiceChecker()
+    checker.process_states = checker.get_process_states({'swss', 'bgp'})
+    assert checker.process_states == {'swss': {'orchagent': 'RUNNING', 'portsyncd': 'EXITED'}}
+
+    checker.container_feature_dict = {'swss': 'swss', 'bgp': 'bgp'}
+    feature_table = {'swss': {'state': 'enabled'}, 'bgp': {'state': 'enabled'}}
+    checker.check_process_existence('swss', ['orchagent', 'portsyncd'], None, feature_table)
+    mock_run.assert_not_called()
+    assert checker._info['swss:orchagent'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+    assert checker._info['swss:portsyncd'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+
+    # The heartbeat of the bgp listener is too old, the status is read from supervisorctl
+    mock_run.return_value = 'bgpd                       EXITED    Oct 19 01:53 AM'
+    checker.check_process_existence('bgp', ['bgpd'], None, feature_table)
+    mock_run.assert_called_once_with('docker exec bgp bash -c "supervisorctl status"', timeout=15)
+    assert checker._info['bgp:bgpd'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+
+    for key in list(MockConnector.data.keys()):
+        if key.startswith('PROCESS_STATE'):
+            MockConnector.data.pop(key)
+
 @patch('health_checker.service_checker.ServiceChecker.check_services', MagicMock())
 @patch('health_checker.utils.run_command')
 def test_service_checker_check_by_monit(mock_run):
@@ -767,6 +803,8 @@ def test_config():
 @patch('health_checker.user_defined_checker.UserDefinedChecker.get_info')
 @patch('health_checker.service_checker.ServiceChecker.get_info')
 @patch('health_checker.hardware_checker.HardwareChecker.get_info')
+@patch('health_checker.service_checker.ServiceChecker.REFRESH_INTERVAL', 0)
+@patch('health_checker.user_defined_checker.UserDefinedChecker.REFRESH_INTERVAL', 0)
 def test_manager(mock_hw_info, mock_service_info, mock_udc_info):
     chassis = MagicMock()
     chassis.set_status_led = MagicMock()
@@ -827,6 +865,86 @@ def test_manager(mock_hw_info, mock_service_info, mock_udc_info):
     chassis.set_status_led.side_effect = RuntimeError()
     manager._set_system_led(chassis)
 
+class SlowChecker(HealthChecker):
+    CHECK_TIMEOUT = 0.2
+    REFRESH_INTERVAL = 0
+
+    def __init__(self):
+        HealthChecker.__init__(self)
+        self.checks = 0
+        self.delay = 0
+        self.status = 'OK'
+
+    def get_category(self):
+        return 'Slow'
+
+    def check(self, config):
+        self.checks += 1
+        time.sleep(self.delay)
+        self._info = {'slow': {'type': 'Slow', 'message': '', 'status': self.status}}
+
+
+@patch('health_checker.manager.HealthCheckerManager.initialize', MagicMock())
+def test_manager_stale_result():
+    chassis = MagicMock()
+    manager = HealthCheckerManager()
+    checker = SlowChecker()
+    manager._checkers.append(checker)
+
+    stat = manager.check(chassis)
+    assert stat['Slow']['slow']['status'] == 'OK'
+    assert 'stale' not in stat['Slow']['slow']
+
+    # A check that exceeds its timeout reports its last result
+    checker.delay = 0.5
+    checker.status = 'Not OK'
+    stat = manager.check(chassis)
+    assert stat['Slow']['slow'] == {'type': 'Slow', 'message': '', 'status': 'OK', 'stale': 'True'}
+    assert HealthChecker.summary == HealthChecker.STATUS_OK
+
+    # The pending check is not submitted again
+    stat = manager.check(chassis)
+    assert checker.checks == 2
+    time.sleep(0.5)
+    stat = manager.check(chassis)
+    assert stat['Slow']['slow']['status'] == 'Not OK'
+    assert HealthChecker.summary == HealthChecker.STATUS_NOT_OK
+
+    # A checker is not run again before its refresh interval
+    checker.delay = 0
+    checker.REFRESH_INTERVAL = 60
+    stat = manager.check(chassis)
+    assert checker.checks == 2
+    assert stat['Slow']['slow']['status'] == 'Not OK'
+    assert 'stale' not in stat['Slow']['slow']
+
+
+@patch('health_checker.manager.HealthCheckerManager.initialize', MagicMock())
+def test_manager_config_snapshot():
+    manager = HealthCheckerManager()
+    checker = SlowChecker()
+    checker.check = MagicMock()
+    manager._checkers.append(checker)
+    manager.check(MagicMock())
+    config = checker.check.call_args[0][0]
+    assert config is not manager.config
+    assert config.interval == manager.config.interval
+
+
+@patch('health_checker.manager.HealthCheckerManager.initialize', MagicMock())
+def test_manager_checker_timeout_without_result():
+    manager = HealthCheckerManager()
+    checker = SlowChecker()
+    checker.delay = 0.5
+    manager._checkers.append(checker)
+    # The polling interval is shorter than the checker timeout and is the effective deadline
+    manager.config.interval = 0.1
+    stat = manager.check(MagicMock())
+    assert stat['Internal']['SlowChecker']['status'] == 'Not OK'
+    assert stat['Internal']['SlowChecker']['message'] == 'Health check for SlowChecker did not finish in 0.1 seconds'
+    assert HealthChecker.summary == HealthChecker.STATUS_NOT_OK
+
+
 def test_utils():
     output = utils.run_command('some invalid command')
     assert not output
@@ -967,6 +1085,78 @@ mock_srv_props={
 'mock_syncd_generated.service':{'Type': 'simple', 'Result': 'success', 'Id': 'mock_syncd_generated.service', 'LoadState': 'loaded', 'ActiveState': 'inactive', 'SubState': 'dead', 'UnitFileState': 'generated'}
 }
 
+def test_systemd_unit_reader():
+    reader = SystemdUnitReader.__new__(SystemdUnitReader)
+    reader.manager = MagicMock()
+    reader.manager.ListUnitsByNames.return_value = [
+        ('mock_radv.service', '', 'loaded', 'active', 'running', '', '/unit/radv', 0, '', '/'),
+        ('mock_bgp.service', '', 'loaded', 'inactive', 'dead', '', '/unit/bgp', 0, '', '/'),
+        ('mock_ns.service', '', 'not-found', 'inactive', 'dead', '', '/unit/ns', 0, '', '/'),
+    ]
+    reader.manager.ListUnitFilesByPatterns.return_value = [('/lib/systemd/system/mock_radv.service', 'enabled')]
+    unit_properties = {
+        ('/unit/bgp', 'UnitFileState'): 'enabled',
+        ('/unit/bgp', 'Result'): 'exit-code',
+        ('/unit/bgp', 'Type'): 'simple',
+    }
+    reader.get_unit_property = MagicMock(side_effect=lambda path, interface, name: unit_properties[(path, name)])
+
+    result = reader.get_units_properties(['mock_radv.service', 'mock_bgp.service', 'mock_ns.service'])
+    reader.manager.ListUnitsByNames.assert_called_once_with(['mock_radv.service', 'mock_bgp.service', 'mock_ns.service'])
+    assert result['mock_radv.service'] == {'Id': 'mock_radv.service', 'LoadState': 'loaded', 'ActiveState': 'active',
+                                           'SubState': 'running', 'UnitFileState': 'enabled', 'Result': 'success'}
+    assert result['mock_bgp.service'] == {'Id': 'mock_bgp.service', 'LoadState': 'loaded', 'ActiveState': 'inactive',
+                                         'SubState': 'dead', 'UnitFileState': 'enabled', 'Result': 'exit-code',
+                                         'Type': 'simple'}
+    assert result['mock_ns.service']['LoadState'] == 'not-found'
+
+
+@patch('health_checker.sysmonitor.Sysmonitor.get_all_service_list', MagicMock(return_value=['mock_radv.service', 'mock_bgp.service']))
+@patch('health_checker.sysmonitor.Sysmonitor.run_systemctl_show')
+@patch('health_checker.sysmonitor.SystemdUnitReader')
+@patch('health_checker.sysmonitor.Sysmonitor.get_app_ready_status', MagicMock(return_value=('Up','-','-')))
+@patch('health_checker.sysmonitor.Sysmonitor.post_unit_status', MagicMock())
+def test_get_all_system_status_batched(mock_reader, mock_systemctl_show):
+    mock_reader.return_value.get_units_properties.return_value = {
+        'mock_radv.service': mock_srv_props['mock_radv.service'],
+        'mock_bgp.service': mock_srv_props['mock_bgp.service'],
+    }
+    sysmon = Sysmonitor()
+    assert sysmon.get_all_system_status() == 'DOWN'
+    mock_reader.return_value.get_units_properties.assert_called_once_with(['mock_radv.service', 'mock_bgp.service'])
+    mock_systemctl_show.assert_not_called()
+    assert sysmon.dnsrvs_name == {'mock_bgp.service'}
+
+    # systemctl is used when systemd can not be reached over dbus
+    mock_reader.side_effect = Exception('no system bus')
+    sysmon = Sysmonitor()
+    mock_systemctl_show.side_effect = lambda service: mock_srv_props[service]
+    assert sysmon.get_all_system_status() == 'DOWN'
+    assert mock_systemctl_show.call_count == 2
+
+
+@patch('health_checker.sysmonitor.Sysmonitor.form_service_list')
+def test_service_list_cache(mock_form_service_list, tmpdir):
+    wants_dir = tmpdir.mkdir('sonic.target.wants')
+    mock_form_service_list.return_value = ['bgp.service', 'swss.service']
+    with patch('health_checker.sysmonitor.target_wants_dirs', [str(wants_dir)]):
+        sysmon = Sysmonitor()
+        assert sysmon.get_all_service_list() == ['bgp.service', 'swss.service']
+        assert sysmon.get_all_service_list() == ['bgp.service', 'swss.service']
+        assert mock_form_service_list.call_count == 1
+
+        # A FEATURE table change
+        sysmon.invalidate_service_list()
+        sysmon.get_all_service_list()
+        assert mock_form_service_list.call_count == 2
+
+        # A unit file enabled in the target
+        wants_dir.join('snmp.service').write('')
+        os.utime(str(wants_dir), ns=(0, 1))
+        sysmon.get_all_service_list()
+        assert mock_form_service_list.call_count == 3
+
+
 @patch('health_checker.sysmonitor.Sysmonitor.get_all_service_list', MagicMock(return_value=['mock_snmp.service', 'mock_bgp.service', 'mock_ns.service']))
 @patch('health_checker.sysmonitor.Sysmonitor.run_systemctl_show', MagicMock(return_value=mock_srv_props['mock_bgp.service']))
 @patch('health_checker.sysmonitor.Sysmonitor.get_app_ready_status', MagicMock(return_value=('Down','-','-')))
@@ -1215,6 +1405,70 @@ def test_healthd_check_interval(mock_log_warning, mock_log_notice, mock_time):
     assert not daemon._run_checker(manager, chassis)
 
 
+class MockRedisCommand(object):
+    def formatHSET(self, key, values):
+        self.command = ('HSET', key, dict(values))
+
+    def formatHDEL(self, key, field):
+        self.command = ('HDEL', key, field)
+
+
+@patch('healthd.time.time', MagicMock(return_value=1000))
+@patch('healthd.RedisCommand', MockRedisCommand)
+@patch('healthd.RedisPipeline')
+def test_healthd_publish_changes_only(mock_pipeline):
+    daemon = HealthDaemon()
+    daemon._db = MagicMock()
+    daemon._db.get_all.return_value = {'summary': 'Not OK', 'fan1': 'fan1 is broken'}
+    daemon._db.get.return_value = '7'
+    pipe = mock_pipeline.return_value
+    pushed = lambda: [args[0].command for args, _ in pipe.push.call_args_list]
+
+    stat = {
+        'Hardware': {
+            'fan1': {'type': 'Fan', 'message': '', 'status': 'OK'},
+            'psu1': {'type': 'PSU', 'message': 'psu1 is broken', 'status': 'Not OK'},
+        }
+    }
+    HealthChecker.summary = HealthChecker.STATUS_NOT_OK
+    daemon._process_stat(MagicMock(), None, stat)
+    assert pushed() == [
+        ('HDEL', 'SYSTEM_HEALTH_INFO', 'fan1'),
+        ('HSET', 'SYSTEM_HEALTH_INFO', {'psu1': 'psu1 is broken'}),
+        ('HSET', 'SYSTEM_HEALTH_INFO_GENERATION', {'generation': '8', 'last_change': '1000'}),
+    ]
+    pipe.flush.assert_called_once()
+
+    # Nothing is written when nothing changed
+    pipe.push.reset_mock()
+    daemon._process_stat(MagicMock(), None, stat)
+    assert pushed() == []
+    pipe.flush.assert_called_once()
+
+    stat['Hardware']['psu1'] = {'type': 'PSU', 'message': '', 'status': 'OK'}
+    HealthChecker.summary = HealthChecker.STATUS_OK
+    daemon._process_stat(MagicMock(), None, stat)
+    assert pushed() == [
+        ('HDEL', 'SYSTEM_HEALTH_INFO', 'psu1'),
+        ('HSET', 'SYSTEM_HEALTH_INFO', {'summary': 'OK'}),
+        ('HSET', 'SYSTEM_HEALTH_INFO_GENERATION', {'generation': '9', 'last_change': '1000'}),
+    ]
+    daemon._db.get_all.assert_called_once()
+
+
+@patch('healthd.time.time', MagicMock(return_value=1000))
+def test_healthd_deinit_keeps_generation():
+    daemon = HealthDaemon()
+    daemon._db = MagicMock()
+    daemon._db.get.return_value = '9'
+    daemon._published = {'summary': 'OK'}
+    daemon.deinit()
+    daemon._db.delete_all_by_pattern.assert_called_once_with(daemon._db.STATE_DB, 'SYSTEM_HEALTH_INFO')
+    daemon._db.hmset.assert_called_once_with(daemon._db.STATE_DB, 'SYSTEM_HEALTH_INFO_GENERATION',
+                                             {'generation': '10', 'last_change': '1000'})
+    assert daemon._published is None
+
+
 @patch('health_checker.sysmonitor.Sysmonitor.get_all_service_list', MagicMock(return_value=['mock_snmp.service']))
 @patch('health_checker.sysmonitor.Sysmonitor.publish_system_status', MagicMock())
 def test_check_unit_status_multi_dot_unit_name():